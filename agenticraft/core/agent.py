@@ -39,9 +39,11 @@ Example:
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import logging
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
 from datetime import datetime
 from typing import Any
 from uuid import UUID, uuid4
@@ -49,13 +51,19 @@ from uuid import UUID, uuid4
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .config import settings
+from .context import ContextBuilder, ContextStats, context_window_for, get_tokenizer
 from .exceptions import AgentError, ProviderError
-from .memory import BaseMemory, MemoryStore
+from .memory import BaseMemory, ConversationMemory, MemoryStore
 from .provider import BaseProvider, ProviderFactory
 from .reasoning import ReasoningTrace, SimpleReasoning
-from .streaming import StreamChunk, StreamInterruptedError
+from .streaming import (
+    StreamChunk,
+    StreamingManager,
+    StreamInterruptedError,
+    get_streaming_manager,
+)
 from .tool import BaseTool, ToolRegistry
-from .types import Message, MessageRole, ToolCall, ToolResult
+from .types import CompletionResponse, Message, MessageRole, ToolCall, ToolResult
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +88,45 @@ class AgentResponse(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
 
 
+class BatchResult(BaseModel):
+    """Result for a single prompt of a batch run.
+
+    Attributes:
+        index: Position of the prompt in the submitted batch
+        prompt: The prompt that was run
+        response: The agent response if the run succeeded
+        error: Error message if the run failed
+    """
+
+    index: int
+    prompt: str
+    response: AgentResponse | None = None
+    error: str | None = None
+
+    @property
+    def success(self) -> bool:
+        """Check if the prompt was run successfully."""
+        return self.error is None
+
+
+class ToolLoopStats(BaseModel):
+    """Work done by the tool loop of one agent run.
+
+    Attributes:
+        rounds: Rounds of tool execution
+        tokens: Tokens used by the LLM calls of the run
+        elapsed: Seconds spent in the run so far
+        stopped: Budget that cut the loop while the model still requested
+            tools (``"max_tool_rounds"``, ``"token_budget"`` or
+            ``"timeout"``), or None if the model answered on its own
+    """
+
+    rounds: int = 0
+    tokens: int = 0
+    elapsed: float = 0.0
+    stopped: str | None = None
+
+
 class AgentConfig(BaseModel):
     """Configuration for an Agent.
 
@@ -97,6 +144,27 @@ class AgentConfig(BaseModel):
         base_url: Optional base URL for the LLM provider
         timeout: Request timeout in seconds
         max_retries: Maximum number of retry attempts
+        parallel_tool_calls: Execute the tool calls of a turn concurrently
+        max_concurrent_tools: Maximum tools running at once for this agent
+        tool_timeout: Per-tool execution timeout in seconds
+        stream_tool_execution: Start tools while streaming, as soon as their
+            arguments are complete (off by default, since tools may have side
+            effects and run before the model has finished its turn)
+        max_tool_rounds: Maximum rounds of tool calls in one run
+        tool_loop_token_budget: Tokens the LLM calls of one run may use
+            before the model must answer without tools
+        tool_loop_timeout: Seconds one run may take before the model must
+            answer without tools
+        stream_timeout: Total seconds one ``stream`` call may take
+        first_token_timeout: Seconds each streamed LLM call may take to
+            produce its first chunk
+        inter_token_timeout: Maximum seconds between two chunks of a
+            streamed LLM call
+        max_context_tokens: Token budget for the prompt (defaults to the
+            model's context window minus max_tokens)
+        max_history_messages: Most recent conversation messages sent to the
+            LLM; None sends as much history as the token budget allows
+        tokenizer: Token counting function (defaults to one for the model)
         metadata: Additional metadata
     """
 
@@ -127,6 +195,47 @@ class AgentConfig(BaseModel):
     base_url: str | None = None
     timeout: int = Field(default_factory=lambda: settings.default_timeout, gt=0)
     max_retries: int = Field(default_factory=lambda: settings.default_max_retries, ge=0)
+    parallel_tool_calls: bool = Field(
+        default=False,
+        description="Execute the tool calls of a single turn concurrently",
+    )
+    max_concurrent_tools: int = Field(
+        default=5, gt=0, description="Maximum number of tools running at once"
+    )
+    tool_timeout: float | None = Field(
+        default=None, gt=0, description="Per-tool execution timeout in seconds"
+    )
+    stream_tool_execution: bool = Field(
+        default=False,
+        description="Start tools as soon as their streamed arguments are complete",
+    )
+    max_tool_rounds: int = Field(
+        default=10, ge=1, description="Maximum rounds of tool calls in one run"
+    )
+    tool_loop_token_budget: int | None = Field(
+        default=None, gt=0, description="Token budget for the LLM calls of one run"
+    )
+    tool_loop_timeout: float | None = Field(
+        default=None, gt=0, description="Time budget in seconds for one run"
+    )
+    stream_timeout: float | None = Field(
+        default=None, gt=0, description="Total timeout in seconds for a stream"
+    )
+    first_token_timeout: float | None = Field(
+        default=None, gt=0, description="Time-to-first-token timeout in seconds"
+    )
+    inter_token_timeout: float | None = Field(
+        default=None, gt=0, description="Maximum gap in seconds between tokens"
+    )
+    max_context_tokens: int | None = Field(
+        default=None, gt=0, description="Token budget for the prompt"
+    )
+    max_history_messages: int | None = Field(
+        default=10,
+        gt=0,
+        description="Most recent conversation messages sent to the LLM",
+    )
+    tokenizer: Callable[[str], int] | None = Field(default=None, exclude=True)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
     @field_validator("provider")
@@ -232,6 +341,19 @@ class Agent:
         # Message history
         self._messages: list[Message] = []
 
+        # Token-budgeted context assembly (tokenizer bound lazily per model)
+        self._context_builder: ContextBuilder | None = None
+        self._context_builder_model: str | None = None
+        self._context_stats: ContextStats | None = None
+        self._tools_tokens: tuple[list[dict[str, Any]], int] | None = None
+
+        # Registry of active streams, shared by all agents by default
+        self.streaming_manager: StreamingManager = get_streaming_manager()
+
+        # Concurrency limit for parallel tool execution (bound lazily per loop)
+        self._tool_semaphore: asyncio.Semaphore | None = None
+        self._tool_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
         logger.info(f"Initialized agent '{self.name}' with ID {self.id}")
 
     @property
@@ -305,6 +427,7 @@ class Agent:
         Returns:
             AgentResponse containing the result
         """
+        started = time.perf_counter()
         try:
             # Start reasoning
             reasoning_trace = self._reasoning.start_trace(prompt)
@@ -342,43 +465,10 @@ class Agent:
                 **kwargs,
             )
 
-            # Process tool calls if any
-            tool_results = []
-            executed_tool_calls = []  # Track the tool calls we executed
-            if response.tool_calls:
-                executed_tool_calls = response.tool_calls  # Save for later
-                tool_results = await self._execute_tools(
-                    response.tool_calls, reasoning_trace
-                )
-
-                # If tools were called, we need another LLM call with results
-                if tool_results:
-                    tool_message = Message(
-                        role=MessageRole.ASSISTANT,
-                        content=response.content,
-                        tool_calls=[tc.model_dump() for tc in response.tool_calls],
-                    )
-                    self._messages.append(tool_message)
-
-                    # Add assistant message with tool calls to messages
-                    messages.append(tool_message.to_dict())
-
-                    # Add tool results
-                    for result in tool_results:
-                        result_message = Message(
-                            role=MessageRole.TOOL,
-                            content=json.dumps(result.result),
-                            metadata={"tool_call_id": result.tool_call_id},
-                        )
-                        messages.append(result_message.to_dict())
-
-                    # Get final response
-                    response = await self.provider.complete(
-                        messages=messages,
-                        temperature=self.config.temperature,
-                        max_tokens=self.config.max_tokens,
-                        **kwargs,
-                    )
+            # Run tool rounds until the model answers or a budget runs out
+            response, executed_tool_calls, loop_stats = await self._run_tool_loop(
+                messages, response, tools_schema, reasoning_trace, started, **kwargs
+            )
 
             # Add assistant message
             assistant_message = Message(
@@ -406,6 +496,12 @@ class Agent:
                 metadata={
                     "model": self.config.model,
                     "reasoning_pattern": self._reasoning.__class__.__name__,
+                    "context": (
+                        self._context_stats.model_dump()
+                        if self._context_stats
+                        else None
+                    ),
+                    "tool_loop": loop_stats.model_dump(),
                     **response.metadata,
                 },
                 agent_id=self.id,
@@ -415,17 +511,147 @@ class Agent:
             logger.error(f"Agent execution failed: {e}")
             raise AgentError(f"Agent execution failed: {e}") from e
 
+    async def arun_many(
+        self,
+        prompts: Iterable[str],
+        context: dict[str, Any] | None = None,
+        max_concurrency: int = 10,
+        **kwargs: Any,
+    ) -> AsyncIterator[BatchResult]:
+        """Run many independent prompts, yielding results as they complete.
+
+        Each prompt runs against an isolated copy of the agent that shares
+        the provider, tools and configuration but has its own conversation
+        history, so concurrent items never see each other's messages. A
+        failing prompt produces a ``BatchResult`` with ``error`` set instead
+        of aborting the batch.
+
+        Args:
+            prompts: The prompts to run
+            context: Optional context shared by every prompt
+            max_concurrency: Maximum number of prompts in flight at once
+            **kwargs: Additional arguments passed to the LLM
+
+        Yields:
+            BatchResult: One result per prompt, in completion order
+
+        Example:
+            Processing results as they arrive::
+
+                async for result in agent.arun_many(prompts, max_concurrency=20):
+                    if result.success:
+                        print(result.index, result.response.content)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        items = list(enumerate(prompts))
+        if not items:
+            return
+
+        pending = iter(items)
+        results: asyncio.Queue[BatchResult] = asyncio.Queue()
+
+        async def worker() -> None:
+            # Workers share one iterator, so each prompt is taken exactly once
+            for index, prompt in pending:
+                result = await self._run_batch_item(index, prompt, context, **kwargs)
+                results.put_nowait(result)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrency, len(items)))
+        ]
+        try:
+            for _ in range(len(items)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def abatch(
+        self,
+        prompts: Iterable[str],
+        context: dict[str, Any] | None = None,
+        max_concurrency: int = 10,
+        **kwargs: Any,
+    ) -> list[BatchResult]:
+        """Run many independent prompts and return results in input order.
+
+        Args:
+            prompts: The prompts to run
+            context: Optional context shared by every prompt
+            max_concurrency: Maximum number of prompts in flight at once
+            **kwargs: Additional arguments passed to the LLM
+
+        Returns:
+            List of BatchResult, one per prompt, ordered like ``prompts``
+        """
+        results = [
+            result
+            async for result in self.arun_many(
+                prompts, context, max_concurrency=max_concurrency, **kwargs
+            )
+        ]
+        return sorted(results, key=lambda result: result.index)
+
+    async def _run_batch_item(
+        self,
+        index: int,
+        prompt: str,
+        context: dict[str, Any] | None,
+        **kwargs: Any,
+    ) -> BatchResult:
+        """Run one batch prompt on an isolated copy of the agent."""
+        try:
+            response = await self._fork().arun(prompt, context, **kwargs)
+            return BatchResult(index=index, prompt=prompt, response=response)
+        except Exception as e:
+            return BatchResult(index=index, prompt=prompt, error=str(e))
+
+    def _fork(self) -> Agent:
+        """Copy the agent with isolated conversation state.
+
+        The copy shares the provider, tool registry, reasoning pattern and
+        non-conversation memories (e.g. knowledge) with this agent. Message
+        history is snapshotted and conversation memories are replaced with
+        empty ones so the copy's turns are never written back.
+        """
+        provider = self.provider
+
+        clone = copy.copy(self)
+        clone._provider = provider
+        clone._messages = list(self._messages)
+        clone._memory_store = MemoryStore()
+        for memory in self._memory_store.memories.values():
+            if isinstance(memory, ConversationMemory):
+                memory = ConversationMemory(max_entries=memory.max_entries)
+            clone._memory_store.add_memory(memory)
+        return clone
+
     async def stream(
-        self, prompt: str, context: dict[str, Any] | None = None, **kwargs: Any
+        self,
+        prompt: str,
+        context: dict[str, Any] | None = None,
+        stream_id: str | None = None,
+        **kwargs: Any,
     ) -> AsyncIterator[StreamChunk]:
         """Stream the agent's response token by token.
 
         This method provides real-time streaming of responses, allowing for
         better user experience with long responses.
 
+        The stream is registered with ``streaming_manager`` under
+        ``stream_id`` and each LLM call under ``"<stream_id>:llm-<n>"``, so
+        it can be interrupted with ``interrupt_stream``. The deadlines come
+        from ``stream_timeout``, ``first_token_timeout`` and
+        ``inter_token_timeout``.
+
         Args:
             prompt: The user's prompt/question
             context: Optional context to provide to the agent
+            stream_id: ID to register the stream under (generated if omitted)
             **kwargs: Additional arguments passed to the LLM
 
         Yields:
@@ -451,6 +677,22 @@ class Agent:
                 except StreamInterruptedError as e:
                     print(f"Stream interrupted: {e.partial_response}")
         """
+        stream_id = stream_id or str(uuid4())
+        async for chunk in self.streaming_manager.supervise(
+            self._stream(prompt, context, stream_id, **kwargs),
+            stream_id=stream_id,
+            timeout=self.config.stream_timeout,
+        ):
+            yield chunk
+
+    async def _stream(
+        self,
+        prompt: str,
+        context: dict[str, Any] | None,
+        stream_id: str,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream the agent's response (see ``stream``)."""
         # Check if provider supports streaming
         if not hasattr(self.provider, "stream"):
             raise ProviderError(
@@ -458,6 +700,9 @@ class Agent:
                 f"Use run() or arun() instead."
             )
 
+        # Tools started from streamed tool calls, by tool call ID
+        early_tools: dict[str, asyncio.Task] = {}
+
         try:
             # Start reasoning
             reasoning_trace = self._reasoning.start_trace(prompt)
@@ -492,21 +737,34 @@ class Agent:
             )
 
             # Stream from provider
-            accumulated_content = ""
-            accumulated_tool_calls = []
-
-            async for chunk in self.provider.stream(
-                messages=messages,
-                tools=tools_schema if tools_schema else None,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                **kwargs,
+            parts: list[str] = []
+
+            async for chunk in self._supervise_llm(
+                self.provider.stream(
+                    messages=messages,
+                    tools=tools_schema if tools_schema else None,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    **kwargs,
+                ),
+                f"{stream_id}:llm-1",
             ):
                 # Yield content chunks
                 if chunk.content:
-                    accumulated_content += chunk.content
+                    parts.append(chunk.content)
                     yield chunk
 
+                # Start tools while the model is still generating
+                if (
+                    self.config.stream_tool_execution
+                    and chunk.metadata.get("type") == "tool_call"
+                ):
+                    tool_call = ToolCall(**chunk.metadata["tool_call"])
+                    if tool_call.id not in early_tools:
+                        early_tools[tool_call.id] = self._start_tool(
+                            tool_call, reasoning_trace, early_tools
+                        )
+
                 # Handle final chunk with metadata
                 if chunk.is_final and chunk.metadata:
                     # Extract tool calls if any
@@ -516,16 +774,26 @@ class Agent:
                             ToolCall(**tc) for tc in chunk.metadata["tool_calls"]
                         ]
 
-                        # Execute tools
-                        tool_results = await self._execute_tools(
-                            tool_calls, reasoning_trace
-                        )
+                        # Execute tools, reusing those already started
+                        if early_tools:
+                            for tool_call in tool_calls:
+                                if tool_call.id not in early_tools:
+                                    early_tools[tool_call.id] = self._start_tool(
+                                        tool_call, reasoning_trace, early_tools
+                                    )
+                            tool_results = [
+                                await early_tools[tc.id] for tc in tool_calls
+                            ]
+                        else:
+                            tool_results = await self._execute_tools(
+                                tool_calls, reasoning_trace
+                            )
 
                         if tool_results:
                             # Add tool message
                             tool_message = Message(
                                 role=MessageRole.ASSISTANT,
-                                content=accumulated_content,
+                                content="".join(parts),
                                 tool_calls=[tc.model_dump() for tc in tool_calls],
                             )
                             self._messages.append(tool_message)
@@ -543,21 +811,25 @@ class Agent:
                                 messages.append(result_message.to_dict())
 
                             # Stream final response after tool execution
-                            accumulated_content = ""
-                            async for final_chunk in self.provider.stream(
-                                messages=messages,
-                                temperature=self.config.temperature,
-                                max_tokens=self.config.max_tokens,
-                                **kwargs,
+                            parts = []
+                            async for final_chunk in self._supervise_llm(
+                                self.provider.stream(
+                                    messages=messages,
+                                    temperature=self.config.temperature,
+                                    max_tokens=self.config.max_tokens,
+                                    **kwargs,
+                                ),
+                                f"{stream_id}:llm-2",
                             ):
                                 if final_chunk.content:
-                                    accumulated_content += final_chunk.content
+                                    parts.append(final_chunk.content)
                                 yield final_chunk
 
             # Add assistant message
+            content = "".join(parts)
             assistant_message = Message(
                 role=MessageRole.ASSISTANT,
-                content=accumulated_content,
+                content=content,
                 metadata={"streamed": True},
             )
             self._messages.append(assistant_message)
@@ -568,9 +840,7 @@ class Agent:
             )
 
             # Complete reasoning
-            reasoning_trace.complete(
-                {"response": accumulated_content, "streamed": True}
-            )
+            reasoning_trace.complete({"response": content, "streamed": True})
 
         except StreamInterruptedError:
             # Re-raise stream interruptions
@@ -578,68 +848,271 @@ class Agent:
         except Exception as e:
             logger.error(f"Agent streaming failed: {e}")
             raise AgentError(f"Agent streaming failed: {e}") from e
+        finally:
+            # Tools the model announced but did not keep are abandoned
+            for task in early_tools.values():
+                task.cancel()
+
+    def _supervise_llm(
+        self, stream: AsyncIterator[StreamChunk], stream_id: str
+    ) -> AsyncIterator[StreamChunk]:
+        """Register an LLM stream with the per-call token deadlines."""
+        return self.streaming_manager.supervise(
+            stream,
+            stream_id=stream_id,
+            first_token_timeout=self.config.first_token_timeout,
+            inter_token_timeout=self.config.inter_token_timeout,
+        )
 
     def _build_messages(
         self,
         memory_context: list[Message],
         user_context: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
-        """Build the message list for the LLM."""
-        messages = []
+        """Build the message list for the LLM within the token budget."""
+        history = self._messages
+        if self.config.max_history_messages is not None:
+            history = history[-self.config.max_history_messages :]
+        messages, self._context_stats = self._get_context_builder().build(
+            system_prompt=self.config.instructions,
+            history=history,
+            memory=memory_context,
+            user_context=user_context,
+            budget=self._context_budget(),
+        )
+        return messages
+
+    def _get_context_builder(self) -> ContextBuilder:
+        """Get the context builder, rebinding the tokenizer if the model changed."""
+        if (
+            self._context_builder is None
+            or self._context_builder_model != self.config.model
+        ):
+            tokenizer = self.config.tokenizer or get_tokenizer(self.config.model)
+            self._context_builder = ContextBuilder(tokenizer)
+            self._context_builder_model = self.config.model
+            self._tools_tokens = None
+        return self._context_builder
+
+    def _context_budget(self) -> int:
+        """Get the prompt token budget, leaving room for tools and the reply."""
+        if self.config.max_context_tokens is not None:
+            budget = self.config.max_context_tokens
+        else:
+            budget = context_window_for(self.config.model) - (
+                self.config.max_tokens or 0
+            )
+
+        tools_schema = self._tool_registry.get_tools_schema()
+        if tools_schema:
+            # The registry returns the same list until its tools change
+            if self._tools_tokens is None or self._tools_tokens[0] is not tools_schema:
+                tokens = self._get_context_builder().count(
+                    json.dumps(tools_schema, default=str)
+                )
+                self._tools_tokens = (tools_schema, tokens)
+            budget -= self._tools_tokens[1]
+        return max(budget, 0)
 
-        # System message
-        system_content = self.config.instructions
-        if user_context:
-            context_str = "\n".join(f"{k}: {v}" for k, v in user_context.items())
-            system_content += f"\n\nContext:\n{context_str}"
+    async def _run_tool_loop(
+        self,
+        messages: list[dict[str, Any]],
+        response: CompletionResponse,
+        tools_schema: list[dict[str, Any]],
+        reasoning_trace: ReasoningTrace,
+        started: float,
+        **kwargs: Any,
+    ) -> tuple[CompletionResponse, list[ToolCall], ToolLoopStats]:
+        """Execute tool calls and call the LLM again until it answers.
 
-        messages.append({"role": "system", "content": system_content})
+        Each round appends the assistant message and its tool results to
+        ``messages`` in place. When the model requests more tools after a
+        budget (``max_tool_rounds``, ``tool_loop_token_budget`` or
+        ``tool_loop_timeout``) is used up, those calls are not run; the
+        request is repeated without tools so the model has to answer.
 
-        # Add memory context
-        for msg in memory_context:
-            messages.append(msg.to_dict())
+        Returns:
+            The final response, every executed tool call and loop statistics
+        """
+        stats = ToolLoopStats(tokens=self._total_tokens(response))
+        executed: list[ToolCall] = []
+
+        while response.tool_calls:
+            stats.stopped = self._tool_loop_limit(stats, started)
+            if stats.stopped:
+                response = await self.provider.complete(
+                    messages=messages,
+                    tools=None,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    **kwargs,
+                )
+                stats.tokens += self._total_tokens(response)
+                break
 
-        # Add recent messages
-        for msg in self._messages[-10:]:  # Last 10 messages
-            messages.append(msg.to_dict())
+            round_calls = response.tool_calls
+            round_started = time.perf_counter()
+            tool_results = await self._execute_tools(round_calls, reasoning_trace)
+            tool_latency = time.perf_counter() - round_started
+            executed.extend(round_calls)
+            stats.rounds += 1
 
-        return messages
+            tool_message = Message(
+                role=MessageRole.ASSISTANT,
+                content=response.content,
+                tool_calls=[tc.model_dump() for tc in round_calls],
+            )
+            self._messages.append(tool_message)
+            messages.append(tool_message.to_dict())
+            for result in tool_results:
+                result_message = Message(
+                    role=MessageRole.TOOL,
+                    content=json.dumps(result.result),
+                    metadata={"tool_call_id": result.tool_call_id},
+                )
+                messages.append(result_message.to_dict())
+
+            llm_started = time.perf_counter()
+            response = await self.provider.complete(
+                messages=messages,
+                tools=tools_schema if tools_schema else None,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                **kwargs,
+            )
+            stats.tokens += self._total_tokens(response)
+
+            reasoning_trace.add_step(
+                "tool_round",
+                {
+                    "round": stats.rounds,
+                    "tools": [tc.name for tc in round_calls],
+                    "tool_latency": tool_latency,
+                    "llm_latency": time.perf_counter() - llm_started,
+                    "tokens": stats.tokens,
+                },
+            )
+
+        stats.elapsed = time.perf_counter() - started
+        if stats.stopped:
+            reasoning_trace.add_step("tool_loop_stopped", stats.model_dump())
+        return response, executed, stats
+
+    def _tool_loop_limit(self, stats: ToolLoopStats, started: float) -> str | None:
+        """Get the tool loop budget that has run out, if any."""
+        if stats.rounds >= self.config.max_tool_rounds:
+            return "max_tool_rounds"
+        budget = self.config.tool_loop_token_budget
+        if budget is not None and stats.tokens >= budget:
+            return "token_budget"
+        timeout = self.config.tool_loop_timeout
+        if timeout is not None and time.perf_counter() - started >= timeout:
+            return "timeout"
+        return None
+
+    @staticmethod
+    def _total_tokens(response: CompletionResponse) -> int:
+        """Get the tokens a response used, or 0 if unreported."""
+        usage = response.usage if isinstance(response.usage, dict) else {}
+        tokens = usage.get("total_tokens")
+        return tokens if isinstance(tokens, int) else 0
 
     async def _execute_tools(
         self, tool_calls: list[ToolCall], reasoning_trace: ReasoningTrace
     ) -> list[ToolResult]:
-        """Execute tool calls."""
-        results = []
+        """Execute tool calls.
 
-        for tool_call in tool_calls:
-            reasoning_trace.add_step(
-                "executing_tool",
-                {"tool": tool_call.name, "arguments": tool_call.arguments},
-            )
+        Tool calls run one after another unless ``parallel_tool_calls`` is
+        enabled, in which case they run concurrently (bounded by
+        ``max_concurrent_tools``). Results are always returned in the order
+        of ``tool_calls``.
+        """
+        if not self.config.parallel_tool_calls or len(tool_calls) < 2:
+            results = []
+            for tool_call in tool_calls:
+                results.append(await self._execute_tool(tool_call, reasoning_trace))
+            return results
 
-            try:
-                result = await self._tool_registry.execute(
-                    tool_call.name, **tool_call.arguments
-                )
+        semaphore = self._get_tool_semaphore()
 
-                results.append(ToolResult(tool_call_id=tool_call.id, result=result))
+        async def run_bounded(tool_call: ToolCall) -> ToolResult:
+            async with semaphore:
+                return await self._execute_tool(tool_call, reasoning_trace)
 
-                reasoning_trace.add_step(
-                    "tool_result", {"tool": tool_call.name, "result": result}
-                )
+        return list(await asyncio.gather(*(run_bounded(tc) for tc in tool_calls)))
 
-            except Exception as e:
-                logger.error(f"Tool execution failed: {e}")
-                error_result = ToolResult(
-                    tool_call_id=tool_call.id, result={"error": str(e)}, error=str(e)
+    def _start_tool(
+        self,
+        tool_call: ToolCall,
+        reasoning_trace: ReasoningTrace,
+        started: dict[str, asyncio.Task],
+    ) -> asyncio.Task:
+        """Start a tool call in the background.
+
+        Follows the same ordering rules as ``_execute_tools``: without
+        ``parallel_tool_calls`` the tool waits for the previously started one.
+        """
+        previous = next(reversed(started.values()), None)
+
+        async def run() -> ToolResult:
+            if self.config.parallel_tool_calls:
+                async with self._get_tool_semaphore():
+                    return await self._execute_tool(tool_call, reasoning_trace)
+            if previous is not None:
+                await asyncio.wait([previous])
+            return await self._execute_tool(tool_call, reasoning_trace)
+
+        return asyncio.create_task(run())
+
+    async def _execute_tool(
+        self, tool_call: ToolCall, reasoning_trace: ReasoningTrace
+    ) -> ToolResult:
+        """Execute a single tool call, converting failures into a ToolResult."""
+        reasoning_trace.add_step(
+            "executing_tool",
+            {"tool": tool_call.name, "arguments": tool_call.arguments},
+        )
+
+        try:
+            execution = self._tool_registry.execute(
+                tool_call.name, **tool_call.arguments
+            )
+            if self.config.tool_timeout:
+                result = await asyncio.wait_for(
+                    execution, timeout=self.config.tool_timeout
                 )
-                results.append(error_result)
+            else:
+                result = await execution
+
+            reasoning_trace.add_step(
+                "tool_result", {"tool": tool_call.name, "result": result}
+            )
+            return ToolResult(tool_call_id=tool_call.id, result=result)
 
-                reasoning_trace.add_step(
-                    "tool_error", {"tool": tool_call.name, "error": str(e)}
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                error = (
+                    f"Tool '{tool_call.name}' timed out after "
+                    f"{self.config.tool_timeout} seconds"
                 )
+            else:
+                error = str(e)
+            logger.error(f"Tool execution failed: {error}")
+
+            reasoning_trace.add_step(
+                "tool_error", {"tool": tool_call.name, "error": error}
+            )
+            return ToolResult(
+                tool_call_id=tool_call.id, result={"error": error}, error=error
+            )
 
-        return results
+    def _get_tool_semaphore(self) -> asyncio.Semaphore:
+        """Get the tool concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._tool_semaphore is None or self._tool_semaphore_loop is not loop:
+            self._tool_semaphore = asyncio.Semaphore(self.config.max_concurrent_tools)
+            self._tool_semaphore_loop = loop
+        return self._tool_semaphore
 
     def add_tool(self, tool: BaseTool | callable) -> None:
         """Add a tool to the agent dynamically.
@@ -674,7 +1147,7 @@ class Agent:
 
     def set_provider(
         self,
-        provider_name: str,
+        provider_name: str | BaseProvider,
         model: str | None = None,
         api_key: str | None = None,
         base_url: str | None = None,
@@ -686,7 +1159,8 @@ class Agent:
         preserving the agent's configuration, tools, memory, and state.
 
         Args:
-            provider_name: Name of the provider ("openai", "anthropic", "ollama")
+            provider_name: Name of the provider ("openai", "anthropic", "ollama"),
+                or a provider instance such as a wrapping CachedProvider
             model: Optional model override for the new provider
             api_key: Optional API key for the new provider
             base_url: Optional base URL (mainly for Ollama)
@@ -704,6 +1178,9 @@ class Agent:
             >>>
             >>> # Switch back to OpenAI with specific model
             >>> agent.set_provider("openai", model="gpt-3.5-turbo")
+            >>>
+            >>> # Use a provider instance directly
+            >>> agent.set_provider(CachedProvider(agent.provider))
 
         Note:
             When switching providers, the agent will:
@@ -712,6 +1189,10 @@ class Agent:
             - Keep conversation memory intact
             - Continue with the same reasoning patterns
         """
+        if isinstance(provider_name, BaseProvider):
+            self._use_provider_instance(provider_name, model)
+            return
+
         # Map of provider names to their default models
         provider_defaults = {
             "openai": "gpt-4",
@@ -773,6 +1254,28 @@ class Agent:
             logger.error(f"Failed to switch provider: {e}")
             raise ProviderError(f"Failed to switch to {provider_name}: {e}") from e
 
+    def _use_provider_instance(
+        self, provider: BaseProvider, model: str | None = None
+    ) -> None:
+        """Install an already constructed provider."""
+        try:
+            provider.validate_auth()
+        except Exception as e:
+            logger.error(f"Failed to switch provider: {e}")
+            raise ProviderError(
+                f"Failed to switch to {provider.__class__.__name__}: {e}"
+            ) from e
+
+        self._provider = provider
+        model = model or getattr(provider, "model", None)
+        if model:
+            self.config.model = model
+
+        logger.info(
+            f"Agent '{self.name}' switched to {provider.__class__.__name__} "
+            f"(model: {self.config.model})"
+        )
+
     def get_provider_info(self) -> dict[str, Any]:
         """Get information about the current provider.
 
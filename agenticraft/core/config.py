@@ -83,6 +83,20 @@ class AgentiCraftSettings(BaseSettings):
         default="http://localhost:11434", description="Ollama base URL"
     )
 
+    # HTTP connection pool settings
+    http_max_connections: int = Field(
+        default=100, gt=0, description="Maximum connections per provider pool"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum idle keep-alive connections per pool"
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0, gt=0, description="Seconds idle connections are kept alive"
+    )
+    http2_enabled: bool = Field(
+        default=True, description="Use HTTP/2 for provider requests when available"
+    )
+
     # Memory settings
     memory_backend: str = Field(
         default="sqlite", description="Memory backend (sqlite, json, redis)"
@@ -0,0 +1,250 @@
+"""Token-budget-aware context assembly for AgentiCraft agents.
+
+The ``ContextBuilder`` packs the system prompt, user context, retrieved
+memory and recent conversation turns into the model's token budget.
+Required parts (system prompt, user context and the current user message)
+are always included; the remaining sections are filled by priority until
+the budget is spent. Token counts are cached per message text, so each
+message is only tokenized once.
+
+Example:
+    Limiting the prompt size of an agent::
+
+        from agenticraft import Agent
+
+        agent = Agent(model="gpt-4", max_context_tokens=2000)
+        response = await agent.arun("Summarize our discussion")
+        print(response.metadata["context"]["tokens_saved"])
+"""
+
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+
+from .types import Message, MessageRole
+
+logger = logging.getLogger(__name__)
+
+# Optional exact tokenization for OpenAI models
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+    tiktoken = None
+
+Tokenizer = Callable[[str], int]
+
+# Tokens a chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Context window sizes by model name prefix (longest prefix wins)
+MODEL_CONTEXT_WINDOWS: dict[str, int] = {
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4-32k": 32_768,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 128_000,
+    "claude": 200_000,
+    "llama3": 8_192,
+    "llama2": 4_096,
+    "mistral": 32_768,
+    "gemma": 8_192,
+}
+
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def get_tokenizer(model: str | None = None) -> Tokenizer:
+    """Get a token counting function for a model.
+
+    Uses tiktoken for OpenAI models when it is installed, otherwise a
+    character-based estimate.
+    """
+    if HAS_TIKTOKEN and model:
+        name = model.split("/", 1)[-1]
+        try:
+            encoding = tiktoken.encoding_for_model(name)
+        except KeyError:
+            encoding = None
+        if encoding is not None:
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+    return estimate_tokens
+
+
+def context_window_for(model: str | None) -> int:
+    """Get the context window size of a model."""
+    if not model:
+        return DEFAULT_CONTEXT_WINDOW
+    name = model.split("/", 1)[-1].lower()
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+class ContextStats(BaseModel):
+    """Token accounting for one assembled context.
+
+    Attributes:
+        budget: Tokens available for the prompt (None if unlimited)
+        used_tokens: Tokens of the messages sent
+        candidate_tokens: Tokens of all candidate messages
+        tokens_saved: Candidate tokens left out (over budget or duplicate)
+        dropped_messages: Candidate messages left out for the budget
+        over_budget: Whether required messages alone exceed the budget
+    """
+
+    budget: int | None = None
+    used_tokens: int = 0
+    candidate_tokens: int = 0
+    tokens_saved: int = 0
+    dropped_messages: int = 0
+    over_budget: bool = False
+
+
+class ContextBuilder:
+    """Assembles LLM messages within a token budget.
+
+    Args:
+        tokenizer: Token counting function (defaults to ``estimate_tokens``)
+        priorities: Order in which optional sections are packed;
+            "recent" (conversation turns, newest first) and "memory"
+            (retrieved memory, in retrieval order)
+        cache_size: Number of per-message token counts to cache
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer | None = None,
+        priorities: Sequence[str] = ("recent", "memory"),
+        cache_size: int = 4096,
+    ):
+        """Initialize the context builder."""
+        unknown = set(priorities) - {"recent", "memory"}
+        if unknown:
+            raise ValueError(f"Unknown context sections: {sorted(unknown)}")
+        self.tokenizer = tokenizer or estimate_tokens
+        self.priorities = tuple(priorities)
+        self.cache_size = cache_size
+        self._counts: OrderedDict[str, int] = OrderedDict()
+
+    def count(self, text: str) -> int:
+        """Count the tokens of text, using the cache."""
+        cached = self._counts.get(text)
+        if cached is not None:
+            self._counts.move_to_end(text)
+            return cached
+
+        tokens = self.tokenizer(text)
+        self._counts[text] = tokens
+        if len(self._counts) > self.cache_size:
+            self._counts.popitem(last=False)
+        return tokens
+
+    def count_message(self, message: Message | dict[str, Any]) -> int:
+        """Count the tokens of a message."""
+        if isinstance(message, Message):
+            content, tool_calls = message.content, message.tool_calls
+        else:
+            content, tool_calls = message.get("content"), message.get("tool_calls")
+
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count(content or "")
+        if tool_calls:
+            tokens += self.count(json.dumps(tool_calls, default=str))
+        return tokens
+
+    def build(
+        self,
+        system_prompt: str,
+        history: Sequence[Message],
+        memory: Sequence[Message] = (),
+        user_context: dict[str, Any] | None = None,
+        budget: int | None = None,
+    ) -> tuple[list[dict[str, Any]], ContextStats]:
+        """Assemble messages for an LLM call.
+
+        Args:
+            system_prompt: Agent instructions
+            history: Conversation messages, oldest first; a trailing user
+                message is treated as the current prompt and always kept
+            memory: Retrieved memory messages
+            user_context: Extra context appended to the system prompt
+            budget: Token budget for the prompt (None means unlimited)
+
+        Returns:
+            Messages in provider format and their token accounting
+        """
+        system_content = system_prompt
+        if user_context:
+            context_str = "\n".join(f"{k}: {v}" for k, v in user_context.items())
+            system_content += f"\n\nContext:\n{context_str}"
+        system = {"role": "system", "content": system_content}
+
+        history = list(history)
+        current = None
+        if history and history[-1].role == MessageRole.USER:
+            current = history.pop()
+
+        required = [system] + ([current.to_dict()] if current is not None else [])
+        used = sum(self.count_message(m) for m in required)
+        stats = ContextStats(budget=budget, candidate_tokens=used)
+        stats.over_budget = budget is not None and used > budget
+
+        # Memory often repeats conversation turns; skip retrieved messages
+        # that are already part of the history (repeats within the history
+        # itself are legitimate and always kept)
+        seen = set()
+        if memory:
+            seen = {m.wire_key() for m in history}
+            if current is not None:
+                seen.add(current.wire_key())
+
+        sections: dict[str, Sequence[Message]] = {
+            "recent": history[::-1],
+            "memory": memory,
+        }
+        kept: dict[str, list[Message]] = {"recent": [], "memory": []}
+        for name in self.priorities:
+            full = False
+            for message in sections[name]:
+                tokens = self.count_message(message)
+                stats.candidate_tokens += tokens
+                if name == "memory":
+                    key = message.wire_key()
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                if full or (budget is not None and used + tokens > budget):
+                    # Keep sections contiguous: once a message does not fit,
+                    # the ones after it are dropped too
+                    full = True
+                    stats.dropped_messages += 1
+                    continue
+                kept[name].append(message)
+                used += tokens
+
+        stats.used_tokens = used
+        stats.tokens_saved = stats.candidate_tokens - used
+        if stats.over_budget:
+            logger.warning(
+                f"Required context ({used} tokens) exceeds the budget ({budget})"
+            )
+
+        messages = [system]
+        messages.extend(m.to_dict() for m in kept["memory"])
+        messages.extend(m.to_dict() for m in reversed(kept["recent"]))
+        if current is not None:
+            messages.append(required[1])
+        return messages, stats
@@ -19,7 +19,12 @@ Example:
 """
 
 import hashlib
+import heapq
+import itertools
+import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -27,8 +32,18 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+# Optional vectorized similarity search
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None
+
 from .config import settings
-from .types import Message, MessageRole
+from .storage import KnowledgeStorage, create_storage, default_storage_path
+from .types import CompletionResponse, Message, MessageRole
 
 
 def compute_embedding(text: str) -> list[float]:
@@ -58,6 +73,7 @@ class MemoryType(str, Enum):
     CONVERSATION = "conversation"
     KNOWLEDGE = "knowledge"
     EPISODIC = "episodic"
+    CACHE = "cache"
 
 
 class MemoryEntry(BaseModel):
@@ -130,11 +146,76 @@ class BaseMemory(ABC):
         return len(self.entries)
 
 
+class _ConversationRecord:
+    """Compact record of one conversation message.
+
+    Holds a reference to the original Message; the MemoryEntry view is
+    only built when requested.
+    """
+
+    __slots__ = ("key", "role", "message", "timestamp", "entry")
+
+    def __init__(
+        self,
+        key: str,
+        role: str,
+        message: Message | None,
+        timestamp: datetime,
+        entry: MemoryEntry | None = None,
+    ):
+        self.key = key
+        self.role = role
+        self.message = message
+        self.timestamp = timestamp
+        self.entry = entry
+
+    @property
+    def content(self) -> str:
+        """Get the labelled content, e.g. "User: Hello"."""
+        if self.entry is not None:
+            return self.entry.content
+        label = "User" if self.role == "user" else "Assistant"
+        return f"{label}: {self.message.content}"
+
+    def to_entry(self) -> MemoryEntry:
+        """Materialize a MemoryEntry for this record."""
+        if self.entry is not None:
+            return self.entry
+        return MemoryEntry(
+            id=self.key,
+            content=self.content,
+            entry_type=MemoryType.CONVERSATION,
+            metadata={
+                "role": self.role,
+                "original_message": self.message.model_dump(),
+            },
+            timestamp=self.timestamp,
+        )
+
+    def to_message(self) -> Message:
+        """Get the Message for this record."""
+        if self.message is not None:
+            return self.message
+        return _entry_to_message(self.entry)
+
+
+def _entry_to_message(entry: MemoryEntry) -> Message:
+    """Convert a memory entry to a message."""
+    if "original_message" in entry.metadata:
+        return Message(**entry.metadata["original_message"])
+    role = MessageRole(entry.metadata.get("role", "user"))
+    return Message(role=role, content=entry.content, metadata=entry.metadata)
+
+
 class ConversationMemory(BaseMemory):
     """Memory for recent conversation history.
 
     This memory type stores recent messages in a conversation,
-    automatically managing the history size.
+    automatically managing the history size. Messages are kept in a
+    fixed-capacity ring buffer of compact records, so storing a turn and
+    evicting the oldest one are O(1). ``MemoryEntry`` views are only
+    built when ``entries``, ``search`` or ``get_recent`` are used;
+    ``entries`` is a read-only snapshot.
 
     Args:
         max_entries: Maximum number of entries to keep
@@ -142,73 +223,315 @@ class ConversationMemory(BaseMemory):
 
     def __init__(self, max_entries: int | None = None):
         """Initialize conversation memory."""
+        self._max_entries = max_entries or settings.conversation_memory_size * 2
+        self._records: deque[_ConversationRecord] = deque(maxlen=self._max_entries)
+        self._prefix = uuid4().hex
+        self._counter = itertools.count()
         super().__init__(memory_type="conversation")
-        self.max_entries = max_entries or settings.conversation_memory_size * 2
-        self.entries: list[MemoryEntry] = []
+
+    @property
+    def max_entries(self) -> int:
+        """Get the ring buffer capacity."""
+        return self._max_entries
+
+    @max_entries.setter
+    def max_entries(self, value: int) -> None:
+        """Resize the ring buffer, keeping the newest records."""
+        self._max_entries = value
+        self._records = deque(self._records, maxlen=value)
+
+    @property
+    def entries(self) -> tuple[MemoryEntry, ...]:
+        """Get a read-only snapshot of all entries, oldest first.
+
+        Use ``store()`` to add turns and ``clear()`` to remove them, or
+        assign a new sequence to replace every entry.
+        """
+        return tuple(record.to_entry() for record in self._records)
+
+    @entries.setter
+    def entries(self, entries: Iterable[MemoryEntry]) -> None:
+        """Replace all entries."""
+        self._records = deque(
+            (
+                _ConversationRecord(
+                    entry.id,
+                    entry.metadata.get("role", "user"),
+                    None,
+                    entry.timestamp,
+                    entry,
+                )
+                for entry in entries
+            ),
+            maxlen=self._max_entries,
+        )
 
     async def store(self, user_message: Message, assistant_message: Message) -> str:
         """Store a conversation turn in memory."""
-        # Store user message
-        user_entry = MemoryEntry(
-            content=f"User: {user_message.content}",
-            entry_type=MemoryType.CONVERSATION,
-            metadata={"role": "user", "original_message": user_message.model_dump()},
+        now = datetime.now()
+        self._records.append(
+            _ConversationRecord(self._next_key(), "user", user_message, now)
         )
-        self.entries.append(user_entry)
-
-        # Store assistant message
-        assistant_entry = MemoryEntry(
-            content=f"Assistant: {assistant_message.content}",
-            entry_type=MemoryType.CONVERSATION,
-            metadata={
-                "role": "assistant",
-                "original_message": assistant_message.model_dump(),
-            },
+        assistant_key = self._next_key()
+        self._records.append(
+            _ConversationRecord(assistant_key, "assistant", assistant_message, now)
         )
-        self.entries.append(assistant_entry)
-
-        # Trim to max entries
-        if len(self.entries) > self.max_entries:
-            self.entries = self.entries[-self.max_entries :]
-
-        return assistant_entry.id
+        return assistant_key
 
     async def search(self, query: str, max_results: int = 5) -> list[MemoryEntry]:
         """Search conversation history."""
-        results = []
-        query_lower = query.lower()
-
-        for entry in self.entries:
-            if query_lower in entry.content.lower():
-                results.append(entry)
-
-        return results[:max_results]
+        return [record.to_entry() for record in self._search(query, max_results)]
 
     async def get_recent(self, limit: int = 10) -> list[MemoryEntry]:
         """Get recent conversation entries."""
         # Return in reverse chronological order (newest first)
-        return list(reversed(self.entries[-limit:]))
+        return [record.to_entry() for record in self._recent(limit)]
 
     def get_messages(self) -> list[Message]:
         """Get all messages in conversation memory."""
-        messages = []
-        for entry in self.entries:
-            if "original_message" in entry.metadata:
-                msg_data = entry.metadata["original_message"]
-                messages.append(Message(**msg_data))
-        return messages
+        return [record.to_message() for record in self._records]
+
+    def clear(self) -> None:
+        """Clear all items from memory."""
+        self._records.clear()
+
+    async def size(self) -> int:
+        """Get the number of entries in memory."""
+        return len(self._records)
+
+    def _next_key(self) -> str:
+        """Get a unique entry id."""
+        return f"{self._prefix}-{next(self._counter)}"
+
+    def _recent(self, limit: int) -> list[_ConversationRecord]:
+        """Get the newest records, newest first."""
+        return list(itertools.islice(reversed(self._records), max(limit, 0)))
+
+    def _search(self, query: str, max_results: int) -> list[_ConversationRecord]:
+        """Find records containing a query, oldest first."""
+        query_lower = query.lower()
+        matches = (r for r in self._records if query_lower in r.content.lower())
+        return list(itertools.islice(matches, max(max_results, 0)))
+
+
+def _normalize_vector(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length."""
+    magnitude = sum(x**2 for x in vector) ** 0.5
+    if magnitude == 0:
+        return list(vector)
+    return [x / magnitude for x in vector]
+
+
+def _tokenize(text: str) -> set[str]:
+    """Split text into lowercase word tokens."""
+    return set(re.findall(r"\w+", text.lower()))
+
+
+class EmbeddingIndex:
+    """Cosine similarity index over unit-normalized embeddings.
+
+    With NumPy installed, vectors live in one contiguous float32 matrix that
+    grows in amortized chunks, so a query is a single matrix-vector product
+    followed by an ``argpartition`` top-k. Deleting a key moves the last row
+    into its slot, so neither adds nor deletes rebuild the matrix. Without
+    NumPy, a pure Python scan is used.
+
+    Args:
+        min_capacity: Rows allocated on the first add
+    """
+
+    def __init__(self, min_capacity: int = 1024):
+        """Initialize the index."""
+        self.min_capacity = max(1, min_capacity)
+        self.dim: int | None = None
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._matrix: Any = None if HAS_NUMPY else []
+
+    def __len__(self) -> int:
+        """Get the number of indexed vectors."""
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is indexed."""
+        return key in self._rows
+
+    @property
+    def capacity(self) -> int:
+        """Get the number of allocated rows."""
+        if HAS_NUMPY:
+            return 0 if self._matrix is None else self._matrix.shape[0]
+        return len(self._matrix)
+
+    def add(self, key: str, vector: list[float]) -> None:
+        """Add or replace the vector for a key."""
+        vector = self._prepare(vector)
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._ensure_capacity(row + 1)
+            self._keys.append(key)
+            self._rows[key] = row
+            if not HAS_NUMPY:
+                self._matrix.append(vector)
+                return
+        self._matrix[row] = vector
+
+    def remove(self, key: str) -> bool:
+        """Remove a key.
+
+        Returns:
+            True if the key was indexed
+        """
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+            self._matrix[row] = self._matrix[last]
+        self._keys.pop()
+        if not HAS_NUMPY:
+            self._matrix.pop()
+        return True
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self._keys.clear()
+        self._rows.clear()
+        self._matrix = None if HAS_NUMPY else []
+        self.dim = None
+
+    def search(
+        self,
+        vector: list[float],
+        k: int = 5,
+        boost: dict[str, float] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Find the keys most similar to a vector.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            boost: Extra score added to specific keys (e.g. keyword matches)
+
+        Returns:
+            (key, score) pairs sorted by descending score
+        """
+        if not self._keys or k < 1:
+            return []
+        scores = self._scores(self._prepare(vector))
+        return self._top_k(scores, k, boost)
+
+    def search_batch(
+        self, vectors: Iterable[list[float]], k: int = 5
+    ) -> list[list[tuple[str, float]]]:
+        """Find the most similar keys for several query vectors at once."""
+        queries = [self._prepare(vector) for vector in vectors]
+        if not self._keys or k < 1:
+            return [[] for _ in queries]
+        if not HAS_NUMPY:
+            return [self._top_k(self._scores(q), k) for q in queries]
+
+        n = len(self._keys)
+        scores = self._matrix[:n] @ np.stack(queries).T  # (n, queries)
+        return [self._top_k(scores[:, i], k) for i in range(len(queries))]
+
+    def _prepare(self, vector: list[float]) -> Any:
+        """Validate dimensions and normalize a vector."""
+        if self.dim is None:
+            self.dim = len(vector)
+        elif len(vector) != self.dim:
+            raise ValueError(
+                f"Embedding has dimension {len(vector)}, index expects {self.dim}"
+            )
+
+        if not HAS_NUMPY:
+            return _normalize_vector(vector)
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the matrix geometrically to hold at least ``rows`` rows."""
+        if not HAS_NUMPY or rows <= self.capacity:
+            return
+        capacity = max(self.min_capacity, self.capacity * 2, rows)
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        if self._matrix is not None:
+            matrix[: len(self._keys)] = self._matrix[: len(self._keys)]
+        self._matrix = matrix
+
+    def _scores(self, query: Any) -> Any:
+        """Compute cosine similarity of every indexed vector to a query."""
+        if HAS_NUMPY:
+            return self._matrix[: len(self._keys)] @ query
+        return [
+            sum(a * b for a, b in zip(row, query, strict=True)) for row in self._matrix
+        ]
+
+    def _top_k(
+        self,
+        scores: Any,
+        k: int,
+        boost: dict[str, float] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Select the k best scoring keys."""
+        if boost:
+            if HAS_NUMPY:
+                scores = scores.copy()
+            else:
+                scores = list(scores)
+            for key, extra in boost.items():
+                row = self._rows.get(key)
+                if row is not None:
+                    scores[row] += extra
+
+        k = min(k, len(self._keys))
+        if not HAS_NUMPY:
+            best = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+            return [(self._keys[i], scores[i]) for i in best]
+
+        if k < len(self._keys):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(self._keys))
+        best = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._keys[i], float(scores[i])) for i in best]
 
 
 class KnowledgeMemory(BaseMemory):
     """Memory for persistent knowledge and facts.
 
     This memory type stores long-term knowledge that persists
-    across conversations.
+    across conversations. With ``use_embeddings`` enabled and an
+    ``embedding_fn`` supplied, search ranks entries by embedding similarity,
+    optionally blended with keyword overlap between the query and each entry
+    (hybrid scoring), and drops results scoring below ``min_score``. Without
+    an ``embedding_fn`` the placeholder embeddings carry no meaning, so search
+    falls back to case-insensitive substring matching.
+
+    With ``persist`` enabled, every write is appended to a durable storage
+    engine (see ``agenticraft.core.storage``) and entries are reloaded on
+    startup. Call ``close()`` (or ``flush()``) to commit pending writes.
 
     Args:
         use_embeddings: Whether to compute embeddings for entries
         persist: Whether to persist memory to disk
-        storage_path: Path to store persistent memory
+        storage_path: Path to store persistent memory (defaults to a file
+            in ``settings.memory_path``)
+        backend: Storage backend, "sqlite" or "json" (defaults to
+            ``settings.memory_backend``)
+        embedding_fn: Function mapping text to an embedding vector
+            (defaults to ``compute_embedding``, which is only a placeholder
+            and is not used for ranking)
+        keyword_weight: Score added for matching every query keyword in
+            hybrid scoring (0 disables hybrid scoring)
+        min_score: Minimum similarity (including any keyword boost) for a
+            result of embedding search
     """
 
     def __init__(
@@ -216,17 +539,30 @@ class KnowledgeMemory(BaseMemory):
         use_embeddings: bool = False,
         persist: bool = False,
         storage_path: str | None = None,
+        embedding_fn: Callable[[str], list[float]] | None = None,
+        keyword_weight: float = 0.0,
+        backend: str | None = None,
+        min_score: float = 0.25,
     ):
         """Initialize knowledge memory."""
+        # Entries live in an insertion-ordered dict keyed by id so deletes
+        # are O(1); set it up before BaseMemory assigns ``entries``.
+        self._by_id: dict[str, MemoryEntry] = {}
         super().__init__(memory_type="knowledge")
         self.use_embeddings = use_embeddings
         self.persist = persist
-        self.storage_path = storage_path or "./memory/knowledge.json"
-        self.entries: list[MemoryEntry] = []
-        self.embeddings = None
+        self.storage_path = storage_path or str(default_storage_path(backend))
+        self.embedding_fn = embedding_fn or compute_embedding
+        self.keyword_weight = keyword_weight
+        self.min_score = min_score
+        self.embeddings = EmbeddingIndex() if use_embeddings else None
+        self._rank_by_embedding = use_embeddings and embedding_fn is not None
+        self._postings: dict[str, set[str]] = {}
+        self._storage: KnowledgeStorage | None = None
 
         # Load from storage if persisting
         if self.persist:
+            self._storage = create_storage(self.storage_path, backend)
             self._load()
 
     async def store(self, *args, **kwargs) -> str:
@@ -238,6 +574,23 @@ class KnowledgeMemory(BaseMemory):
         metadata = kwargs.get("metadata", {})
         return await self.store_knowledge(content, metadata)
 
+    @property
+    def entries(self) -> tuple[MemoryEntry, ...]:
+        """Get a read-only snapshot of all knowledge entries in insertion order.
+
+        Use ``store_knowledge()``, ``update_knowledge()`` and
+        ``delete_knowledge()`` to change them.
+        """
+        return tuple(self._by_id.values())
+
+    @entries.setter
+    def entries(self, entries: Iterable[MemoryEntry]) -> None:
+        """Replace all knowledge entries (without persisting)."""
+        if self._by_id:
+            self._clear_indexes()
+        for entry in entries:
+            self._index(entry)
+
     async def store_knowledge(
         self, content: str, metadata: dict[str, Any] | None = None
     ) -> str:
@@ -248,62 +601,311 @@ class KnowledgeMemory(BaseMemory):
 
         # Compute embedding if enabled
         if self.use_embeddings:
-            entry.embedding = compute_embedding(content)
+            entry.embedding = self.embedding_fn(content)
 
-        self.entries.append(entry)
+        self._index(entry)
 
         # Persist if enabled
-        if self.persist:
-            self._save()
+        if self._storage is not None:
+            self._storage.put(entry.id, entry.model_dump_json())
 
         return entry.id
 
     async def search(self, query: str, max_results: int = 5) -> list[MemoryEntry]:
-        """Search knowledge entries."""
-        # Simple text matching for now
-        # TODO: Implement vector similarity search
+        """Search knowledge entries.
+
+        Uses similarity search when embeddings are enabled with an
+        ``embedding_fn``, otherwise a case-insensitive substring match.
+        """
+        if not self._rank_by_embedding:
+            query_lower = query.lower()
+            matches = (
+                e for e in self._by_id.values() if query_lower in e.content.lower()
+            )
+            return list(itertools.islice(matches, max_results))
+
+        results = self.embeddings.search(
+            self.embedding_fn(query), max_results, boost=self._keyword_boost(query)
+        )
+        return self._above_min_score(results)
 
-        matches = []
-        query_lower = query.lower()
+    async def search_many(
+        self, queries: list[str], max_results: int = 5
+    ) -> list[list[MemoryEntry]]:
+        """Search knowledge entries for several queries at once.
 
-        for entry in self.entries:
-            if query_lower in entry.content.lower():
-                matches.append(entry)
+        With embeddings enabled and no hybrid scoring, all queries are
+        scored in a single matrix product.
+        """
+        if not self._rank_by_embedding or self.keyword_weight:
+            return [await self.search(query, max_results) for query in queries]
 
-        return matches[:max_results]
+        batches = self.embeddings.search_batch(
+            [self.embedding_fn(query) for query in queries], max_results
+        )
+        return [self._above_min_score(batch) for batch in batches]
 
     async def get_recent(self, limit: int = 10) -> list[MemoryEntry]:
         """Get recent knowledge entries."""
-        return list(reversed(self.entries[-limit:]))
+        return list(itertools.islice(reversed(self._by_id.values()), limit))
+
+    async def size(self) -> int:
+        """Get the number of knowledge entries."""
+        return len(self._by_id)
 
     async def update_knowledge(
         self, entry_id: str, content: str, metadata: dict[str, Any] | None = None
     ) -> None:
         """Update an existing knowledge entry."""
-        for entry in self.entries:
-            if entry.id == entry_id:
-                entry.content = content
-                if metadata:
-                    entry.metadata = metadata
-                if self.persist:
-                    self._save()
-                break
+        entry = self._by_id.get(entry_id)
+        if entry is None:
+            return
+
+        self._unindex(entry)
+        entry.content = content
+        if metadata:
+            entry.metadata = metadata
+        if self.use_embeddings:
+            entry.embedding = self.embedding_fn(content)
+        self._index(entry)
+
+        if self._storage is not None:
+            self._storage.put(entry.id, entry.model_dump_json())
 
     async def delete_knowledge(self, entry_id: str) -> None:
         """Delete a knowledge entry."""
-        self.entries = [e for e in self.entries if e.id != entry_id]
-        if self.persist:
-            self._save()
+        entry = self._by_id.get(entry_id)
+        if entry is None:
+            return
+
+        self._unindex(entry)
+        del self._by_id[entry_id]
+        if self._storage is not None:
+            self._storage.delete(entry.id)
+
+    def clear(self) -> None:
+        """Clear all entries and indexes."""
+        self._clear_indexes()
+        if self._storage is not None:
+            self._storage.clear()
+
+    def flush(self) -> None:
+        """Commit pending writes to storage."""
+        if self._storage is not None:
+            self._storage.flush()
+
+    def compact(self) -> None:
+        """Compact persistent storage."""
+        if self._storage is not None:
+            self._storage.compact()
+
+    def close(self) -> None:
+        """Commit pending writes and close storage."""
+        if self._storage is not None:
+            self._storage.close()
+
+    def _index(self, entry: MemoryEntry) -> None:
+        """Add an entry to the lookup, keyword and embedding indexes."""
+        self._by_id[entry.id] = entry
+        if self.keyword_weight:
+            for token in _tokenize(entry.content):
+                self._postings.setdefault(token, set()).add(entry.id)
+        if self.embeddings is not None and entry.embedding is not None:
+            self.embeddings.add(entry.id, entry.embedding)
+
+    def _unindex(self, entry: MemoryEntry) -> None:
+        """Remove an entry from the keyword and embedding indexes.
+
+        The id lookup is left alone so an updated entry keeps its position.
+        """
+        if self.keyword_weight:
+            for token in _tokenize(entry.content):
+                posting = self._postings.get(token)
+                if posting is not None:
+                    posting.discard(entry.id)
+                    if not posting:
+                        del self._postings[token]
+        if self.embeddings is not None:
+            self.embeddings.remove(entry.id)
+
+    def _clear_indexes(self) -> None:
+        """Remove every entry from the lookup, keyword and embedding indexes."""
+        self._by_id.clear()
+        self._postings.clear()
+        if self.embeddings is not None:
+            self.embeddings.clear()
+
+    def _above_min_score(self, results: list[tuple[str, float]]) -> list[MemoryEntry]:
+        """Resolve ranked (id, score) pairs, dropping those below min_score."""
+        return [self._by_id[key] for key, score in results if score >= self.min_score]
+
+    def _keyword_boost(self, query: str) -> dict[str, float] | None:
+        """Score entries by the fraction of query tokens they contain."""
+        if not self.keyword_weight:
+            return None
+
+        tokens = _tokenize(query)
+        if not tokens:
+            return None
+
+        boost: dict[str, float] = {}
+        weight = self.keyword_weight / len(tokens)
+        for token in tokens:
+            for entry_id in self._postings.get(token, ()):
+                boost[entry_id] = boost.get(entry_id, 0.0) + weight
+        return boost
 
     def _load(self) -> None:
         """Load memory from storage."""
-        # TODO: Implement persistence
-        pass
+        for data in self._storage.load():
+            entry = MemoryEntry.model_validate_json(data)
+            if self.use_embeddings and entry.embedding is None:
+                entry.embedding = self.embedding_fn(entry.content)
+            self._index(entry)
 
-    def _save(self) -> None:
-        """Save memory to storage."""
-        # TODO: Implement persistence
-        pass
+
+class SemanticCache(BaseMemory):
+    """Similarity-keyed cache of LLM completions.
+
+    Stores (prompt, CompletionResponse) pairs with prompt embeddings and
+    returns a cached response when a new prompt is similar enough to a
+    stored one. Entries are kept per namespace (e.g. one per agent), each
+    bounded by ``max_entries`` with least-recently-used eviction.
+
+    Args:
+        threshold: Minimum cosine similarity for a cache hit
+        max_entries: Maximum entries kept per namespace
+        embedding_fn: Function mapping text to an embedding vector
+            (defaults to ``compute_embedding``)
+        metrics: Optional MetricsCollector that receives lookup hits/misses
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        embedding_fn: Callable[[str], list[float]] | None = None,
+        metrics: Any | None = None,
+    ):
+        """Initialize semantic cache."""
+        super().__init__(memory_type="semantic_cache")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedding_fn = embedding_fn or compute_embedding
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self._namespaces: dict[str, OrderedDict[str, MemoryEntry]] = {}
+        self._indexes: dict[str, EmbeddingIndex] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    async def store(
+        self,
+        prompt: str,
+        response: CompletionResponse,
+        namespace: str = "default",
+    ) -> str:
+        """Store a completion for a prompt."""
+        entry = MemoryEntry(
+            content=prompt,
+            entry_type=MemoryType.CACHE,
+            metadata={
+                "namespace": namespace,
+                "response": response.model_dump(mode="json"),
+            },
+            embedding=self.embedding_fn(prompt),
+        )
+
+        entries = self._namespaces.setdefault(namespace, OrderedDict())
+        index = self._indexes.setdefault(
+            namespace, EmbeddingIndex(min_capacity=min(self.max_entries, 1024))
+        )
+        entries[entry.id] = entry
+        index.add(entry.id, entry.embedding)
+        while len(entries) > self.max_entries:
+            evicted, _ = entries.popitem(last=False)
+            index.remove(evicted)
+
+        return entry.id
+
+    async def lookup(
+        self, prompt: str, namespace: str = "default"
+    ) -> CompletionResponse | None:
+        """Get the cached completion for the most similar stored prompt.
+
+        Returns:
+            The cached response if its similarity reaches the threshold,
+            otherwise None
+        """
+        matches = self._rank(prompt, namespace, limit=1)
+        hit = bool(matches) and matches[0][0] >= self.threshold
+        self._record_lookup(hit)
+        if not hit:
+            return None
+
+        similarity, entry = matches[0]
+        self._namespaces[namespace].move_to_end(entry.id)
+        response = CompletionResponse.model_validate(entry.metadata["response"])
+        response.metadata["semantic_cache_hit"] = True
+        response.metadata["similarity"] = similarity
+        return response
+
+    async def search(
+        self, query: str, max_results: int = 5, namespace: str = "default"
+    ) -> list[MemoryEntry]:
+        """Search stored prompts by similarity."""
+        return [entry for _, entry in self._rank(query, namespace, max_results)]
+
+    async def get_recent(self, limit: int = 10) -> list[MemoryEntry]:
+        """Get recently stored entries across all namespaces."""
+        entries = [e for ns in self._namespaces.values() for e in ns.values()]
+        entries.sort(key=lambda e: e.timestamp, reverse=True)
+        return entries[:limit]
+
+    def clear(self, namespace: str | None = None) -> None:
+        """Clear one namespace, or all of them."""
+        if namespace is None:
+            self._namespaces.clear()
+            self._indexes.clear()
+        else:
+            self._namespaces.pop(namespace, None)
+            self._indexes.pop(namespace, None)
+
+    async def size(self) -> int:
+        """Get the number of cached entries across all namespaces."""
+        return sum(len(entries) for entries in self._namespaces.values())
+
+    def _rank(
+        self, text: str, namespace: str, limit: int
+    ) -> list[tuple[float, MemoryEntry]]:
+        """Rank entries of a namespace by cosine similarity to text."""
+        index = self._indexes.get(namespace)
+        if not index:
+            return []
+
+        entries = self._namespaces[namespace]
+        return [
+            (score, entries[key])
+            for key, score in index.search(self.embedding_fn(text), limit)
+        ]
+
+    def _record_lookup(self, hit: bool) -> None:
+        """Update hit/miss counters and report to metrics."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.metrics is not None:
+            self.metrics.record_memory_operation(
+                operation="get", memory_type=self.memory_type, hit=hit
+            )
 
 
 class MemoryStore:
@@ -333,42 +935,37 @@ class MemoryStore:
 
     async def get_context(self, query: str, max_items: int = 10) -> list[Message]:
         """Get relevant context from all memories."""
-        all_items = []
+        # (id, record or entry) pairs; conversation records yield their
+        # original Message without building a MemoryEntry
+        all_items: list[tuple[str, Any]] = []
 
         # First, get recent conversation history
         for memory in self.memories.values():
             if isinstance(memory, ConversationMemory):
-                # Get recent entries from conversation memory
-                recent_items = await memory.get_recent(limit=max_items // 2)
                 # Reverse them back to chronological order for context
-                all_items.extend(reversed(recent_items))
+                recent = memory._recent(limit=max_items // 2)
+                all_items.extend((r.key, r) for r in reversed(recent))
 
         # Then search for relevant items
         for memory in self.memories.values():
-            items = await memory.search(query, max_results=max_items // 2)
-            all_items.extend(items)
+            if isinstance(memory, ConversationMemory):
+                records = memory._search(query, max_results=max_items // 2)
+                all_items.extend((r.key, r) for r in records)
+            else:
+                items = await memory.search(query, max_results=max_items // 2)
+                all_items.extend((item.id, item) for item in items)
 
-        # Remove duplicates while preserving order
+        # Remove duplicates while preserving order, converting to messages
         seen_ids = set()
-        unique_items = []
-        for item in all_items:
-            if item.id not in seen_ids:
-                seen_ids.add(item.id)
-                unique_items.append(item)
-
-        # Convert memory entries to messages
         messages = []
-        for item in unique_items:
-            # Try to reconstruct original message if available
-            if "original_message" in item.metadata:
-                msg_data = item.metadata["original_message"]
-                messages.append(Message(**msg_data))
+        for item_id, item in all_items:
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+            if isinstance(item, _ConversationRecord):
+                messages.append(item.to_message())
             else:
-                # Create message from entry
-                role = MessageRole(item.metadata.get("role", "user"))
-                messages.append(
-                    Message(role=role, content=item.content, metadata=item.metadata)
-                )
+                messages.append(_entry_to_message(item))
 
         return messages[:max_items]
 
@@ -108,6 +108,8 @@ class ReasoningTrace(BaseModel):
             "executing_tool": f"Executing tool: {data.get('tool', 'unknown')}",
             "tool_result": f"Received result from {data.get('tool', 'tool')}",
             "tool_error": f"Tool {data.get('tool', 'unknown')} failed",
+            "tool_round": f"Completed tool round {data.get('round', '?')}",
+            "tool_loop_stopped": f"Tool budget reached: {data.get('stopped')}",
             "formulating_response": "Formulating the response",
         }
         return descriptions.get(step_type, f"Processing: {step_type}")
@@ -0,0 +1,474 @@
+"""Durable storage engines for persistent memory.
+
+Storage engines persist opaque string records keyed by id. Writes are
+queued and committed in groups by a background thread, so a burst of
+updates costs one append (and one fsync) instead of one per record.
+
+Two engines are included:
+
+- ``JSONLogStorage``: an append-only write-ahead log of line-delimited
+  records that is periodically compacted into a snapshot file. Startup memory-maps the
+  snapshot and replays the log written since.
+- ``SQLiteStorage``: a SQLite table in WAL journal mode, committing each
+  group of writes in a single transaction.
+
+Example:
+    Persisting knowledge::
+
+        from agenticraft.core.memory import KnowledgeMemory
+
+        # Uses settings.memory_backend and settings.memory_path
+        memory = KnowledgeMemory(persist=True)
+        await memory.store_knowledge("Paris is the capital of France")
+        memory.close()  # flush pending writes
+"""
+
+import atexit
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO
+
+from .config import settings
+from .exceptions import MemoryStorageError
+
+logger = logging.getLogger(__name__)
+
+_open_storages: "weakref.WeakSet[KnowledgeStorage]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_storages() -> None:
+    """Flush pending writes of storages still open at interpreter exit."""
+    for storage in list(_open_storages):
+        try:
+            storage.close()
+        except Exception as e:
+            logger.warning(f"Failed to close memory storage: {e}")
+
+
+def default_storage_path(backend: str | None = None) -> Path:
+    """Get the default knowledge storage path for a backend."""
+    backend = (backend or settings.memory_backend).lower()
+    filename = "knowledge.db" if backend == "sqlite" else "knowledge.json"
+    return Path(settings.memory_path) / filename
+
+
+def create_storage(
+    path: str | Path | None = None, backend: str | None = None, **kwargs
+) -> "KnowledgeStorage":
+    """Create a storage engine.
+
+    Args:
+        path: Storage file (defaults to ``default_storage_path(backend)``)
+        backend: "sqlite" or "json" (defaults to ``settings.memory_backend``)
+        **kwargs: Engine options (e.g. ``commit_interval``)
+
+    Returns:
+        A storage engine (call ``load()`` before writing)
+
+    Raises:
+        MemoryStorageError: If the backend is not supported
+    """
+    backend = (backend or settings.memory_backend).lower()
+    path = Path(path) if path else default_storage_path(backend)
+
+    if backend == "sqlite":
+        return SQLiteStorage(path, **kwargs)
+    if backend == "json":
+        return JSONLogStorage(path, **kwargs)
+    raise MemoryStorageError(
+        f"Unsupported memory backend for knowledge storage: {backend}"
+    )
+
+
+class KnowledgeStorage(ABC):
+    """Base class for storage engines with group commit.
+
+    ``put`` and ``delete`` only queue the operation; a background thread
+    commits queued operations every ``commit_interval`` seconds or as soon
+    as ``commit_batch`` operations are waiting. ``flush`` commits
+    synchronously.
+
+    Args:
+        path: Storage file
+        commit_interval: Seconds to gather writes into one commit
+        commit_batch: Queued operations that trigger an immediate commit
+        sync: Whether to fsync each commit
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        commit_interval: float = 0.05,
+        commit_batch: int = 256,
+        sync: bool = True,
+    ):
+        """Initialize storage."""
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_batch = max(1, commit_batch)
+        self.sync = sync
+        self._pending: list[tuple[str, str, str | None]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._io_lock = threading.RLock()
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _open_storages.add(self)
+
+    @abstractmethod
+    def load(self) -> list[str]:
+        """Load all records in insertion order."""
+        pass
+
+    def put(self, key: str, data: str) -> None:
+        """Queue an insert or update of a record."""
+        if "\t" in key or "\n" in key:
+            raise MemoryStorageError(f"Invalid record id: {key!r}")
+        self._enqueue(("put", key, data))
+
+    def delete(self, key: str) -> None:
+        """Queue deletion of a record."""
+        self._enqueue(("delete", key, None))
+
+    def flush(self) -> None:
+        """Commit all queued operations now."""
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except OSError as e:
+                    raise MemoryStorageError(f"Failed to write memory: {e}") from e
+
+    def compact(self) -> None:
+        """Reclaim space used by superseded records."""
+        self.flush()
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all records."""
+        pass
+
+    def close(self) -> None:
+        """Flush queued operations and release resources."""
+        with self._wakeup:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+        self.flush()
+        self._close()
+        _open_storages.discard(self)
+
+    @abstractmethod
+    def _write_batch(self, batch: list[tuple[str, str, str | None]]) -> None:
+        """Durably apply a batch of (op, key, data) operations."""
+        pass
+
+    @abstractmethod
+    def _maybe_compact(self) -> None:
+        """Compact in the background when worthwhile."""
+        pass
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Release engine resources."""
+        pass
+
+    def _enqueue(self, operation: tuple[str, str, str | None]) -> None:
+        """Queue an operation and make sure the commit thread is running."""
+        with self._wakeup:
+            if self._closed:
+                raise MemoryStorageError("Memory storage is closed")
+            self._pending.append(operation)
+            if len(self._pending) >= self.commit_batch:
+                self._wakeup.notify()
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run_worker,
+                    name=f"agenticraft-storage-{self.path.name}",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run_worker(self) -> None:
+        """Commit queued operations in groups until the queue drains."""
+        while True:
+            with self._wakeup:
+                if len(self._pending) < self.commit_batch and not self._closed:
+                    self._wakeup.wait(self.commit_interval)
+
+            try:
+                self.flush()
+                self._maybe_compact()
+            except Exception as e:
+                logger.error(f"Background memory commit failed: {e}")
+
+            with self._wakeup:
+                if not self._pending or self._closed:
+                    self._worker = None
+                    return
+
+
+class JSONLogStorage(KnowledgeStorage):
+    """Append-only log storage with snapshot compaction.
+
+    Records are appended to a write-ahead log segment
+    (``<path>.<generation>.wal``). Once the log holds more records than
+    ``compact_threshold`` and the number of live records, the background
+    thread writes a new snapshot to ``path`` and starts a new log
+    generation, so writes are never blocked by compaction.
+
+    Args:
+        path: Snapshot file
+        compact_threshold: Minimum log records before compacting
+        **kwargs: Options for KnowledgeStorage
+    """
+
+    def __init__(self, path: Path, compact_threshold: int = 10_000, **kwargs):
+        """Initialize JSON log storage."""
+        super().__init__(path, **kwargs)
+        self.compact_threshold = compact_threshold
+        self._live: dict[str, str] = {}
+        self._generation = 0
+        self._log_records = 0
+        self._log: IO[str] | None = None
+        self._compact_lock = threading.Lock()
+
+    def load(self) -> list[str]:
+        """Load the snapshot and replay the log."""
+        with self._io_lock:
+            self._live.clear()
+            first_generation = self._read_snapshot()
+
+            generations = [g for g in self._log_generations() if g >= first_generation]
+            self._log_records = 0
+            for generation in generations:
+                self._log_records += self._replay(self._log_path(generation))
+
+            self._generation = max([first_generation, *generations])
+            self._open_log()
+            return list(self._live.values())
+
+    def compact(self) -> None:
+        """Write a snapshot of all live records and drop old log segments."""
+        with self._compact_lock:
+            with self._io_lock:
+                self.flush()
+                lines = [f"{key}\t{data}\n" for key, data in self._live.items()]
+                sealed = self._generation
+                self._generation += 1
+                self._open_log()
+                self._log_records = 0
+
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(f"#wal\t{sealed + 1}\n")
+                f.writelines(lines)
+                f.flush()
+                if self.sync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            for generation in self._log_generations():
+                if generation <= sealed:
+                    self._log_path(generation).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Delete all records."""
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()
+            self._live.clear()
+        self.compact()
+
+    def _write_batch(self, batch: list[tuple[str, str, str | None]]) -> None:
+        """Append a batch to the log with a single flush."""
+        if self._log is None:
+            self._open_log()
+
+        lines = []
+        for op, key, data in batch:
+            if op == "put":
+                lines.append(f"P\t{key}\t{data}\n")
+                self._live[key] = data
+            else:
+                lines.append(f"D\t{key}\n")
+                self._live.pop(key, None)
+
+        self._log.write("".join(lines))
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+        self._log_records += len(lines)
+
+    def _maybe_compact(self) -> None:
+        """Compact once the log outgrows the live data."""
+        if self._log_records >= max(self.compact_threshold, len(self._live)):
+            self.compact()
+
+    def _close(self) -> None:
+        """Close the log file."""
+        with self._io_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _read_snapshot(self) -> int:
+        """Load snapshot records, returning the first log generation to replay."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return 0
+
+        first_generation = 0
+        with (
+            open(self.path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            for raw in iter(mapped.readline, b""):
+                line = raw.decode("utf-8").rstrip("\n")
+                key, _, data = line.partition("\t")
+                if key == "#wal":
+                    first_generation = int(data)
+                elif key:
+                    self._live[key] = data
+        return first_generation
+
+    def _replay(self, log_path: Path) -> int:
+        """Apply a log segment to the live records."""
+        count = 0
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    logger.warning(f"Ignoring incomplete record in {log_path}")
+                    break
+                op, key, *rest = line.rstrip("\n").split("\t", 2)
+                if op == "P":
+                    self._live[key] = rest[0]
+                elif op == "D":
+                    self._live.pop(key, None)
+                count += 1
+        return count
+
+    def _open_log(self) -> None:
+        """Open the current log generation for appending."""
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._log_path(self._generation), "a", encoding="utf-8")
+
+    def _log_path(self, generation: int) -> Path:
+        """Get the path of a log segment."""
+        return self.path.with_name(f"{self.path.name}.{generation:06d}.wal")
+
+    def _log_generations(self) -> list[int]:
+        """List existing log generations in order."""
+        generations = []
+        for log_path in self.path.parent.glob(f"{self.path.name}.*.wal"):
+            suffix = log_path.name[len(self.path.name) + 1 : -len(".wal")]
+            if suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+
+class SQLiteStorage(KnowledgeStorage):
+    """SQLite storage in WAL journal mode.
+
+    Each group of writes is committed in one transaction. The database is
+    memory-mapped for reads and ``compact`` checkpoints and truncates the
+    SQLite write-ahead log, which the background thread also does every
+    ``compact_threshold`` writes.
+
+    Args:
+        path: Database file
+        mmap_size: Bytes of the database to memory-map
+        compact_threshold: Writes between background checkpoints
+        **kwargs: Options for KnowledgeStorage
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mmap_size: int = 256 * 1024 * 1024,
+        compact_threshold: int = 10_000,
+        **kwargs,
+    ):
+        """Initialize SQLite storage."""
+        super().__init__(path, **kwargs)
+        self.compact_threshold = compact_threshold
+        self._writes_since_checkpoint = 0
+        try:
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"PRAGMA synchronous={'FULL' if self.sync else 'NORMAL'}"
+            )
+            self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS knowledge ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "id TEXT NOT NULL UNIQUE, "
+                "data TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise MemoryStorageError(f"Failed to open {path}: {e}") from e
+
+    def load(self) -> list[str]:
+        """Load all records in insertion order."""
+        with self._io_lock:
+            rows = self._conn.execute("SELECT data FROM knowledge ORDER BY seq")
+            return [row[0] for row in rows]
+
+    def compact(self) -> None:
+        """Checkpoint and truncate the SQLite write-ahead log."""
+        with self._io_lock:
+            self.flush()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._writes_since_checkpoint = 0
+
+    def clear(self) -> None:
+        """Delete all records."""
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()
+            self._conn.execute("DELETE FROM knowledge")
+            self._conn.commit()
+
+    def _write_batch(self, batch: list[tuple[str, str, str | None]]) -> None:
+        """Apply a batch in a single transaction."""
+        try:
+            with self._conn:
+                for op, key, data in batch:
+                    if op == "put":
+                        self._conn.execute(
+                            "INSERT INTO knowledge (id, data) VALUES (?, ?) "
+                            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+                            (key, data),
+                        )
+                    else:
+                        self._conn.execute("DELETE FROM knowledge WHERE id = ?", (key,))
+        except sqlite3.Error as e:
+            raise MemoryStorageError(f"Failed to write memory: {e}") from e
+        self._writes_since_checkpoint += len(batch)
+
+    def _maybe_compact(self) -> None:
+        """Checkpoint once enough writes have accumulated."""
+        if self._writes_since_checkpoint >= self.compact_threshold:
+            self.compact()
+
+    def _close(self) -> None:
+        """Close the database connection."""
+        with self._io_lock:
+            self._conn.close()
@@ -17,20 +17,33 @@ Example:
 from __future__ import annotations
 
 import asyncio
+import json
+import logging
+import re
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal
 from uuid import uuid4
 
 from .exceptions import AgentError
+from .types import ToolCall
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Characters that change the nesting state of a JSON document
+_JSON_STRUCTURE = re.compile(r'[\\"{}\[\]]')
+
+
+@dataclass(slots=True)
 class StreamChunk:
     """A single chunk in a streaming response.
 
+    Providers share one ``metadata`` dict between the token chunks of a
+    stream, so treat it as read-only.
+
     Attributes:
         content: The text content of this chunk
         token: Optional individual token (if available)
@@ -50,6 +63,25 @@ class StreamChunk:
         return self.content
 
 
+class _JoinedText:
+    """Dataclass field descriptor storing text as parts joined on read.
+
+    Appending to ``obj._parts`` is O(1) per chunk; the parts are joined the
+    first time the text is read, so accumulation stays linear.
+    """
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> str:
+        if obj is None:
+            return ""  # Field default
+        parts = obj.__dict__.setdefault("_parts", [])
+        if len(parts) > 1:
+            parts[:] = ["".join(parts)]
+        return parts[0] if parts else ""
+
+    def __set__(self, obj: Any, value: str) -> None:
+        obj.__dict__["_parts"] = [value] if value else []
+
+
 @dataclass
 class StreamingResponse:
     """Container for a complete streaming response with metadata.
@@ -67,7 +99,8 @@ class StreamingResponse:
     """
 
     chunks: list[StreamChunk] = field(default_factory=list)
-    complete_text: str = ""
+    # Text is joined on demand rather than concatenated per chunk
+    complete_text: str = _JoinedText()  # type: ignore[assignment]
     metadata: dict[str, Any] = field(default_factory=dict)
     start_time: float = field(default_factory=time.time)
     end_time: float | None = None
@@ -82,7 +115,7 @@ class StreamingResponse:
         """
         self.chunks.append(chunk)
         if chunk.content:
-            self.complete_text += chunk.content
+            self._parts.append(chunk.content)
 
         if chunk.is_final:
             self.end_time = time.time()
@@ -141,6 +174,57 @@ class StreamingProvider(ABC):
         pass
 
 
+async def stream_or_replay(
+    provider: Any, params: dict[str, Any]
+) -> AsyncIterator[StreamChunk]:
+    """Stream from a provider, replaying ``complete()`` if it cannot stream.
+
+    Used by provider wrappers that must offer ``stream()`` over providers
+    without streaming support. The completion is replayed as one content
+    chunk followed by a final chunk carrying the model, finish reason and
+    usage.
+
+    Args:
+        provider: The provider to call
+        params: Keyword arguments for ``stream()`` or ``complete()``
+
+    Yields:
+        StreamChunk: Chunks of the response
+    """
+    if hasattr(provider, "stream"):
+        async for chunk in provider.stream(**params):
+            yield chunk
+        return
+
+    response = await provider.complete(**params)
+    for chunk in replay_chunks(response):
+        yield chunk
+
+
+def replay_chunks(response: Any) -> list[StreamChunk]:
+    """Convert a completion into the chunks a stream would have produced.
+
+    Args:
+        response: CompletionResponse to replay
+
+    Returns:
+        One content chunk followed by a final chunk carrying the model,
+        finish reason and usage
+    """
+    return [
+        StreamChunk(content=response.content),
+        StreamChunk(
+            content="",
+            is_final=True,
+            metadata={
+                "model": response.model,
+                "finish_reason": response.finish_reason,
+                "usage": response.usage,
+            },
+        ),
+    ]
+
+
 class StreamInterruptedError(AgentError):
     """Raised when a stream is interrupted before completion."""
 
@@ -153,21 +237,752 @@ class StreamInterruptedError(AgentError):
         self.partial_response = partial_response
 
 
-class StreamingManager:
-    """Manages streaming operations with interruption handling.
+class StreamingJSONParser:
+    """Detects when a JSON object streamed in fragments is complete.
 
-    This class provides utilities for managing streaming operations,
-    including timeout handling, interruption, and progress tracking.
+    Only nesting and string state are tracked, so each fragment is scanned
+    once; the document itself is parsed when ``value()`` is called.
+
+    Example:
+        Feeding argument fragments::
+
+            parser = StreamingJSONParser()
+            parser.feed('{"city": "Par')  # False
+            parser.feed('is"}')  # True
+            parser.value()  # {"city": "Paris"}
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self.complete = False
+        self._parts: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, fragment: str) -> bool:
+        """Add a fragment.
+
+        Args:
+            fragment: The next piece of the document
+
+        Returns:
+            bool: True once the top-level object or array is closed
+        """
+        self._parts.append(fragment)
+        if self.complete:
+            return True
+
+        skip_to = 0
+        if self._escape:
+            # The previous fragment ended with a backslash in a string
+            self._escape = False
+            skip_to = 1
+        for match in _JSON_STRUCTURE.finditer(fragment, skip_to):
+            index = match.start()
+            if index < skip_to:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    skip_to = index + 2
+                    self._escape = skip_to > len(fragment)
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+                    break
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        """The fragments received so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def value(self) -> Any:
+        """Parse the document (an empty document is an empty object).
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON
+        """
+        text = self.text
+        return json.loads(text) if text.strip() else {}
+
+
+class ToolCallAccumulator:
+    """Assembles tool calls from streamed fragments.
+
+    Providers stream a tool call as its ID and name followed by fragments of
+    its JSON arguments. The accumulator reports each call as soon as its
+    arguments are complete, so callers can start the tool while the model
+    is still generating.
+
+    Example:
+        Assembling OpenAI deltas::
+
+            calls = ToolCallAccumulator()
+            calls.add(0, id="call_1", name="search", arguments='{"q": ')
+            calls.add(0, arguments='"cats"}')  # [ToolCall(id="call_1", ...)]
+            calls.finish()  # every call, in order
     """
 
-    def __init__(self, timeout: float | None = None):
-        """Initialize the streaming manager.
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self._calls: dict[Any, dict[str, Any]] = {}
+
+    def add(
+        self,
+        key: Any,
+        id: str | None = None,
+        name: str | None = None,
+        arguments: str | None = None,
+    ) -> list[ToolCall]:
+        """Add a fragment of a tool call.
 
         Args:
-            timeout: Optional timeout in seconds for streaming operations
+            key: Identifies the call within the response (e.g. its index)
+            id: Tool call ID, if this fragment carries it
+            name: Tool name, if this fragment carries it
+            arguments: Fragment of the JSON arguments
+
+        Returns:
+            Calls that became complete with this fragment
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = {
+                "id": None,
+                "name": "",
+                "parser": StreamingJSONParser(),
+                "emitted": False,
+                "tool_call": None,
+            }
+        if id:
+            call["id"] = id
+        if name:
+            call["name"] += name
+        if arguments and call["parser"].feed(arguments):
+            return self._emit(call)
+        return []
+
+    def close(self, key: Any) -> list[ToolCall]:
+        """Mark a call as complete (e.g. at the end of its content block).
+
+        Returns:
+            The call, if it had not been reported yet
+        """
+        call = self._calls.get(key)
+        return self._emit(call) if call is not None else []
+
+    def finish(self) -> list[ToolCall]:
+        """Get every valid call, in the order the calls started."""
+        calls = []
+        for call in self._calls.values():
+            if call["emitted"]:
+                if call["tool_call"] is not None:
+                    calls.append(call["tool_call"])
+            else:
+                calls.extend(self._emit(call))
+        return calls
+
+    @staticmethod
+    def _emit(call: dict[str, Any]) -> list[ToolCall]:
+        """Build a call once; malformed calls are dropped with a warning."""
+        if call["emitted"] or not call["id"] or not call["name"]:
+            return []
+        call["emitted"] = True
+        try:
+            arguments = call["parser"].value()
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse tool arguments for {call['name']}")
+            return []
+        call["tool_call"] = ToolCall(
+            id=call["id"], name=call["name"], arguments=arguments
+        )
+        return [call["tool_call"]]
+
+
+SlowConsumerPolicy = Literal["block", "drop_oldest", "coalesce"]
+
+
+class StreamSubscription:
+    """One consumer of a ``StreamBroadcaster``.
+
+    Iterate it to receive chunks. Leave with ``aclose()`` or by using it as
+    an async context manager; breaking out of ``async for`` alone does not
+    unsubscribe.
+
+    Attributes:
+        policy: What to do when the queue is full
+        max_queue: Maximum chunks waiting for this consumer
+        dropped: Chunks discarded by the ``drop_oldest`` policy
+        coalesced: Chunks merged into a queued one by the ``coalesce`` policy
+    """
+
+    def __init__(
+        self,
+        broadcaster: StreamBroadcaster,
+        max_queue: int,
+        policy: SlowConsumerPolicy,
+    ):
+        """Initialize a subscription (use ``StreamBroadcaster.subscribe``)."""
+        self.policy = policy
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.coalesced = 0
+        self._broadcaster = broadcaster
+        self._items: deque[StreamChunk] = deque()
+        self._changed = asyncio.Condition()
+        self._done = False
+        self._error: BaseException | None = None
+        self._closed = False
+
+    async def _put(self, chunk: StreamChunk) -> None:
+        """Queue a chunk according to the slow-consumer policy."""
+        async with self._changed:
+            if len(self._items) >= self.max_queue and not self._closed:
+                if self.policy == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == "coalesce" and _can_coalesce(
+                    self._items[-1], chunk
+                ):
+                    self._items[-1] = _coalesce(self._items[-1], chunk)
+                    self.coalesced += 1
+                    self._changed.notify_all()
+                    return
+                else:
+                    # Blocking also covers chunks that cannot be merged
+                    await self._changed.wait_for(
+                        lambda: len(self._items) < self.max_queue or self._closed
+                    )
+            if not self._closed:
+                self._items.append(chunk)
+                self._changed.notify_all()
+
+    async def _finish(self, error: BaseException | None = None) -> None:
+        """Mark the end of the stream."""
+        async with self._changed:
+            self._done = True
+            self._error = error
+            self._changed.notify_all()
+
+    def __aiter__(self) -> StreamSubscription:
+        """Return the subscription as its own iterator."""
+        return self
+
+    async def __anext__(self) -> StreamChunk:
+        """Get the next chunk.
+
+        Raises:
+            StopAsyncIteration: When the stream has ended or the
+                subscription was closed
+            Exception: Whatever the upstream stream raised
+        """
+        if self._closed:
+            raise StopAsyncIteration
+        self._broadcaster._start()
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self._items or self._done or self._closed
+            )
+            if self._items and not self._closed:
+                chunk = self._items.popleft()
+                self._changed.notify_all()
+                return chunk
+        if self._error is not None and not self._closed:
+            raise self._error
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        """Leave the broadcast.
+
+        The upstream stream is cancelled once every subscriber has left.
+        """
+        if self._closed:
+            return
+        async with self._changed:
+            self._closed = True
+            self._items.clear()
+            self._changed.notify_all()
+        await self._broadcaster._unsubscribe(self)
+
+    async def __aenter__(self) -> StreamSubscription:
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - leave the broadcast."""
+        await self.aclose()
+
+
+class StreamBroadcaster:
+    """Delivers one stream to several consumers.
+
+    The upstream stream is read once, when the first subscriber starts
+    iterating, and every chunk is queued for each subscriber. Each
+    subscriber's bounded queue has its own policy for slow consumers:
+
+    - ``"block"``: wait for the consumer, which pauses the upstream stream
+      (and every other subscriber) until it catches up
+    - ``"drop_oldest"``: discard the oldest queued chunk
+    - ``"coalesce"``: merge the chunk's text into the newest queued chunk,
+      blocking only for chunks that cannot be merged (tool calls and the
+      final chunk)
+
+    Subscribers that join late first receive the last ``replay`` chunks.
+    When every subscriber has left, the upstream stream is cancelled.
+
+    Args:
+        source: The stream to broadcast
+        replay: Number of recent chunks kept for late subscribers
+
+    Example:
+        Feeding a client and an audit log from one agent stream::
+
+            broadcaster = StreamBroadcaster(agent.stream("Tell me a story"))
+            client = broadcaster.subscribe(policy="coalesce")
+            audit = broadcaster.subscribe(max_queue=1000)
+
+            await asyncio.gather(send_to_client(client), write_log(audit))
+    """
+
+    def __init__(self, source: AsyncIterator[StreamChunk], replay: int = 0):
+        """Initialize the broadcaster."""
+        self.source = source
+        self.chunks = 0
+        self._replay: deque[StreamChunk] = deque(maxlen=replay)
+        self._subscribers: list[StreamSubscription] = []
+        self._task: asyncio.Task | None = None
+        self._finished = False
+        self._error: BaseException | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of current subscribers."""
+        return len(self._subscribers)
+
+    def subscribe(
+        self, max_queue: int = 64, policy: SlowConsumerPolicy = "block"
+    ) -> StreamSubscription:
+        """Add a consumer.
+
+        Args:
+            max_queue: Maximum chunks waiting for this consumer
+            policy: What to do when the queue is full
+
+        Returns:
+            StreamSubscription: Iterator over the broadcast chunks
+
+        Raises:
+            ValueError: If the policy is unknown or max_queue is below 1
+        """
+        if policy not in ("block", "drop_oldest", "coalesce"):
+            raise ValueError(f"Unknown slow-consumer policy: {policy}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+
+        subscription = StreamSubscription(self, max_queue, policy)
+        subscription._items.extend(self._replay)
+        if self._finished:
+            subscription._done = True
+            subscription._error = self._error
+        else:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _start(self) -> None:
+        """Start reading the upstream stream, if not already started."""
+        if self._task is None and not self._finished:
+            self._task = asyncio.create_task(self._pump())
+
+    async def _pump(self) -> None:
+        """Read the upstream stream and queue chunks for every subscriber."""
+        error = None
+        try:
+            async for chunk in self.source:
+                self.chunks += 1
+                self._replay.append(chunk)
+                for subscription in list(self._subscribers):
+                    await subscription._put(chunk)
+        except asyncio.CancelledError:
+            error = StreamInterruptedError("Broadcast stream was closed")
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            self._finished = True
+            self._error = error
+            for subscription in list(self._subscribers):
+                await subscription._finish(error)
+            aclose = getattr(self.source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _unsubscribe(self, subscription: StreamSubscription) -> None:
+        """Remove a subscriber, cancelling the stream after the last one."""
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+        if not self._subscribers and not self._finished:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cancel the upstream stream and end every subscription."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, StreamInterruptedError):
+                pass
+        elif not self._finished:
+            self._finished = True
+            self._error = StreamInterruptedError("Broadcast stream was closed")
+            for subscription in list(self._subscribers):
+                await subscription._finish(self._error)
+            aclose = getattr(self.source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def __aenter__(self) -> StreamBroadcaster:
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - cancel the upstream stream."""
+        await self.aclose()
+
+
+def _can_coalesce(queued: StreamChunk, chunk: StreamChunk) -> bool:
+    """Check whether a chunk can be merged into a queued one."""
+    return not (
+        queued.is_final
+        or chunk.is_final
+        or queued.metadata.get("type") == "tool_call"
+        or chunk.metadata.get("type") == "tool_call"
+    )
+
+
+def _coalesce(queued: StreamChunk, chunk: StreamChunk) -> StreamChunk:
+    """Merge two text chunks."""
+    return StreamChunk(
+        content=queued.content + chunk.content,
+        metadata={**queued.metadata, **chunk.metadata},
+        timestamp=chunk.timestamp,
+    )
+
+
+@dataclass
+class StreamStats:
+    """Live statistics of a supervised stream.
+
+    Times are ``time.monotonic()`` values.
+
+    Attributes:
+        stream_id: ID the stream is registered under
+        started_at: When supervision started
+        first_chunk_at: When the first chunk arrived
+        last_chunk_at: When the latest chunk arrived
+        chunks: Chunks received
+        characters: Characters of text received
+    """
+
+    stream_id: str
+    started_at: float = field(default_factory=time.monotonic)
+    first_chunk_at: float | None = None
+    last_chunk_at: float | None = None
+    chunks: int = 0
+    characters: int = 0
+
+    @property
+    def time_to_first_token(self) -> float | None:
+        """Seconds until the first chunk arrived."""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since supervision started."""
+        return time.monotonic() - self.started_at
+
+    @property
+    def chars_per_second(self) -> float:
+        """Text throughput since the first chunk."""
+        if self.first_chunk_at is None:
+            return 0.0
+        duration = time.monotonic() - self.first_chunk_at
+        return self.characters / duration if duration > 0 else 0.0
+
+
+def _cancelling(task: asyncio.Task | None) -> int:
+    """Get the pending cancellation count of a task (0 before Python 3.11)."""
+    cancelling = getattr(task, "cancelling", None)
+    return cancelling() if cancelling is not None else 0
+
+
+class _SupervisedStream:
+    """Deadlines and state of one registered stream."""
+
+    def __init__(
+        self,
+        stats: StreamStats,
+        timeout: float | None,
+        first_token_timeout: float | None,
+        inter_token_timeout: float | None,
+    ):
+        self.stats = stats
+        self.timeout = timeout
+        self.first_token_timeout = first_token_timeout
+        self.inter_token_timeout = inter_token_timeout
+        self.parts: list[str] = []
+        self.interrupted = False
+        self.reason = ""
+        # Task blocked on the read in progress and its deadline timer. The
+        # read is cancelled in place (like ``asyncio.timeout``, which needs
+        # Python 3.11) so no extra task is created per chunk.
+        self.expired = False
+        self._task: asyncio.Task | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._cancelling = 0
+
+    def next_deadline(self) -> float | None:
+        """Get the seconds left until the nearest deadline."""
+        stats = self.stats
+        deadlines = []
+        if self.timeout is not None:
+            deadlines.append(
+                (
+                    stats.started_at + self.timeout,
+                    f"Stream timeout after {self.timeout} seconds",
+                )
+            )
+        if stats.first_chunk_at is None:
+            if self.first_token_timeout is not None:
+                deadlines.append(
+                    (
+                        stats.started_at + self.first_token_timeout,
+                        f"No first token within {self.first_token_timeout} seconds",
+                    )
+                )
+        elif self.inter_token_timeout is not None:
+            deadlines.append(
+                (
+                    stats.last_chunk_at + self.inter_token_timeout,
+                    f"No token for {self.inter_token_timeout} seconds",
+                )
+            )
+        if not deadlines:
+            return None
+        deadline, self.reason = min(deadlines)
+        return deadline - time.monotonic()
+
+    def arm(self, remaining: float | None) -> None:
+        """Start guarding a read made by the current task."""
+        task = asyncio.current_task()
+        self._task = task
+        self._cancelling = _cancelling(task)
+        if remaining is not None:
+            self._timer = asyncio.get_running_loop().call_later(
+                max(remaining, 0.0), self.expire
+            )
+
+    def disarm(self) -> None:
+        """Stop guarding the read."""
+        self._task = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def expire(self) -> None:
+        """Cancel the read in progress, if any."""
+        if self._task is not None and not self.expired:
+            self.expired = True
+            self._task.cancel()
+
+    def consume_cancel(self) -> bool:
+        """Take back the cancellation sent by ``expire``.
+
+        Returns:
+            True if the task was cancelled by this stream only, so the
+            cancellation can be turned into a stream error
         """
+        uncancel = getattr(self._task, "uncancel", None)
+        if uncancel is None:
+            # Python 3.10 does not count cancellations
+            return True
+        return uncancel() <= self._cancelling
+
+    def add(self, chunk: StreamChunk) -> None:
+        """Record a received chunk."""
+        stats = self.stats
+        stats.last_chunk_at = time.monotonic()
+        if stats.first_chunk_at is None:
+            stats.first_chunk_at = stats.last_chunk_at
+        stats.chunks += 1
+        if chunk.content:
+            stats.characters += len(chunk.content)
+            self.parts.append(chunk.content)
+
+    def error(self) -> StreamInterruptedError:
+        """Build the error for an interrupted or timed out stream."""
+        reason = (
+            f"Stream {self.stats.stream_id} was interrupted"
+            if self.interrupted
+            else self.reason
+        )
+        return StreamInterruptedError(reason, partial_response="".join(self.parts))
+
+
+class StreamingManager:
+    """Supervises streams with deadlines and interruption.
+
+    Every stream passed through ``supervise`` is registered under an ID
+    until it ends, with three kinds of deadline:
+
+    - ``timeout``: total time for the whole stream
+    - ``first_token_timeout``: time until the first chunk arrives
+    - ``inter_token_timeout``: maximum gap between two chunks
+
+    When a deadline passes or ``interrupt_stream`` is called, the pending
+    read is cancelled, which cancels the upstream HTTP request, the stream
+    is closed and ``StreamInterruptedError`` is raised to the consumer.
+
+    Args:
+        timeout: Default total timeout in seconds
+        first_token_timeout: Default time-to-first-token timeout in seconds
+        inter_token_timeout: Default inter-token timeout in seconds
+
+    Example:
+        Interrupting a stream from another task::
+
+            manager = StreamingManager(first_token_timeout=10)
+
+            async def consume():
+                async for chunk in manager.supervise(
+                    provider.stream(messages), stream_id="request-1"
+                ):
+                    print(chunk.content, end="")
+
+            manager.interrupt_stream("request-1")
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        first_token_timeout: float | None = None,
+        inter_token_timeout: float | None = None,
+    ):
+        """Initialize the streaming manager."""
         self.timeout = timeout
-        self._active_streams: dict[str, asyncio.Task] = {}
+        self.first_token_timeout = first_token_timeout
+        self.inter_token_timeout = inter_token_timeout
+        self._active_streams: dict[str, _SupervisedStream] = {}
+
+    @property
+    def active_count(self) -> int:
+        """Number of streams currently supervised."""
+        return len(self._active_streams)
+
+    @property
+    def streams(self) -> list[StreamStats]:
+        """Statistics of the streams currently supervised."""
+        return [stream.stats for stream in self._active_streams.values()]
+
+    def get_stats(self, stream_id: str) -> StreamStats | None:
+        """Get the statistics of an active stream.
+
+        Args:
+            stream_id: The ID of the stream
+
+        Returns:
+            StreamStats or None if no such stream is active
+        """
+        stream = self._active_streams.get(stream_id)
+        return stream.stats if stream is not None else None
+
+    async def supervise(
+        self,
+        stream: AsyncIterator[StreamChunk],
+        stream_id: str | None = None,
+        timeout: float | None = None,
+        first_token_timeout: float | None = None,
+        inter_token_timeout: float | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Register a stream and enforce its deadlines.
+
+        Deadlines not given here default to the manager's.
+
+        Args:
+            stream: The stream to supervise
+            stream_id: ID to register the stream under (generated if omitted)
+            timeout: Total timeout in seconds
+            first_token_timeout: Time-to-first-token timeout in seconds
+            inter_token_timeout: Inter-token timeout in seconds
+
+        Yields:
+            StreamChunk: The stream's chunks
+
+        Raises:
+            StreamInterruptedError: If a deadline passes or the stream is
+                interrupted
+            ValueError: If a stream with the same ID is already active
+        """
+        stream_id = stream_id or str(uuid4())
+        if stream_id in self._active_streams:
+            raise ValueError(f"Stream {stream_id} is already active")
+
+        supervised = _SupervisedStream(
+            StreamStats(stream_id),
+            timeout if timeout is not None else self.timeout,
+            (
+                first_token_timeout
+                if first_token_timeout is not None
+                else self.first_token_timeout
+            ),
+            (
+                inter_token_timeout
+                if inter_token_timeout is not None
+                else self.inter_token_timeout
+            ),
+        )
+        self._active_streams[stream_id] = supervised
+        iterator = aiter(stream)
+        try:
+            while True:
+                if supervised.interrupted:
+                    raise supervised.error()
+                supervised.arm(supervised.next_deadline())
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+                except (asyncio.CancelledError, StreamInterruptedError) as e:
+                    # Providers may turn the cancelled read into their own error
+                    if supervised.expired and supervised.consume_cancel():
+                        raise supervised.error() from e
+                    raise
+                finally:
+                    supervised.disarm()
+                if supervised.expired:
+                    # The stream swallowed the cancellation and kept going
+                    supervised.consume_cancel()
+                    raise supervised.error()
+
+                supervised.add(chunk)
+                yield chunk
+        finally:
+            del self._active_streams[stream_id]
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
 
     async def stream_with_timeout(
         self, stream_coro: AsyncIterator[StreamChunk], timeout: float | None = None
@@ -182,46 +997,56 @@ class StreamingManager:
             StreamChunk: Individual chunks
 
         Raises:
-            asyncio.TimeoutError: If timeout is exceeded
+            StreamInterruptedError: If the timeout is exceeded
         """
-        timeout = timeout or self.timeout
-
-        if timeout:
-            try:
-                async with asyncio.timeout(timeout):
-                    async for chunk in stream_coro:
-                        yield chunk
-            except asyncio.TimeoutError:
-                raise StreamInterruptedError(f"Stream timeout after {timeout} seconds")
-        else:
-            async for chunk in stream_coro:
-                yield chunk
+        async for chunk in self.supervise(stream_coro, timeout=timeout):
+            yield chunk
 
     def interrupt_stream(self, stream_id: str) -> bool:
         """Interrupt an active stream.
 
+        Must be called from the event loop running the stream.
+
         Args:
             stream_id: The ID of the stream to interrupt
 
         Returns:
             bool: True if stream was interrupted, False if not found
         """
-        if stream_id in self._active_streams:
-            task = self._active_streams[stream_id]
-            task.cancel()
-            return True
-        return False
+        stream = self._active_streams.get(stream_id)
+        if stream is None:
+            return False
+        stream.interrupted = True
+        # Cancel the pending read now, which cancels the upstream request
+        stream.expire()
+        return True
 
     async def __aenter__(self):
         """Async context manager entry."""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - cancel all active streams."""
-        for task in self._active_streams.values():
-            if not task.done():
-                task.cancel()
-        self._active_streams.clear()
+        """Async context manager exit - interrupt all active streams."""
+        for stream_id in list(self._active_streams):
+            self.interrupt_stream(stream_id)
+
+
+_default_manager: StreamingManager | None = None
+
+
+def get_streaming_manager() -> StreamingManager:
+    """Get the process-wide streaming manager.
+
+    Agents register their streams here unless given another manager, so
+    any stream can be looked up or interrupted by ID.
+
+    Returns:
+        StreamingManager: The shared manager
+    """
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = StreamingManager()
+    return _default_manager
 
 
 # Utility functions for working with streams
@@ -253,10 +1078,133 @@ async def stream_to_string(stream: AsyncIterator[StreamChunk]) -> str:
     Returns:
         str: The complete text from the stream
     """
-    text = ""
-    async for chunk in stream:
-        text += chunk.content
-    return text
+    return "".join([chunk.content async for chunk in stream])
+
+
+async def coalesce_stream(
+    stream: AsyncIterator[StreamChunk],
+    max_chars: int = 256,
+    max_delay: float | None = 0.05,
+) -> AsyncIterator[StreamChunk]:
+    """Merge token chunks into larger frames for downstream transports.
+
+    A frame is sent once it holds ``max_chars`` characters or its first
+    token is ``max_delay`` seconds old, whichever comes first. Chunks
+    without text, tool call chunks and the final chunk are passed through
+    unchanged, after any pending frame.
+
+    Args:
+        stream: The stream to coalesce
+        max_chars: Frame size that triggers sending
+        max_delay: Maximum seconds a token waits in a frame (None to send
+            by size only)
+
+    Yields:
+        StreamChunk: Frames and pass-through chunks
+
+    Example:
+        Sending frames over a websocket::
+
+            async for frame in coalesce_stream(agent.stream(prompt)):
+                await websocket.send_text(frame.content)
+    """
+    loop = asyncio.get_running_loop()
+    parts: list[str] = []
+    size = 0
+    last: StreamChunk | None = None
+    first_at = 0.0
+    # Frames and pass-through chunks ready to send
+    ready: deque[StreamChunk] = deque()
+    wake = asyncio.Event()
+    sent = asyncio.Event()
+    error: BaseException | None = None
+    done = False
+
+    def flush() -> None:
+        nonlocal parts, size
+        if parts:
+            ready.append(
+                StreamChunk(
+                    content="".join(parts),
+                    metadata=last.metadata,
+                    timestamp=last.timestamp,
+                )
+            )
+            parts, size = [], 0
+
+    async def read() -> None:
+        # Tokens are appended here without waking the consumer, which only
+        # runs once per frame
+        nonlocal size, last, first_at, error, done
+        try:
+            async for chunk in stream:
+                if (
+                    not chunk.content
+                    or chunk.is_final
+                    or chunk.metadata.get("type") == "tool_call"
+                ):
+                    flush()
+                    ready.append(chunk)
+                    wake.set()
+                else:
+                    if not parts:
+                        first_at = loop.time()
+                        wake.set()  # starts the frame's time window
+                    parts.append(chunk.content)
+                    size += len(chunk.content)
+                    last = chunk
+                    if size >= max_chars:
+                        flush()
+                        wake.set()
+                while ready:
+                    # Wait for the consumer before reading further
+                    sent.clear()
+                    await sent.wait()
+        except Exception as e:
+            error = e
+        finally:
+            done = True
+            wake.set()
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            if ready:
+                chunk = ready.popleft()
+                if not ready:
+                    sent.set()
+                yield chunk
+                continue
+            if done:
+                flush()
+                if ready:
+                    continue
+                if error is not None:
+                    raise error
+                return
+
+            timeout = None
+            if parts and max_delay is not None:
+                timeout = first_at + max_delay - loop.time()
+            wake.clear()
+            if timeout is None:
+                await wake.wait()
+            elif timeout <= 0:
+                flush()
+            else:
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    flush()
+    finally:
+        reader.cancel()
+        try:
+            await reader
+        except asyncio.CancelledError:
+            pass
 
 
 def create_mock_stream(
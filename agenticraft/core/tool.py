@@ -309,6 +309,7 @@ class ToolRegistry:
     def __init__(self):
         """Initialize the registry."""
         self._tools: dict[str, BaseTool] = {}
+        self._schema: list[dict[str, Any]] | None = None
 
     def register(self, tool: BaseTool | Callable, name: str | None = None) -> None:
         """Register a tool.
@@ -327,6 +328,7 @@ class ToolRegistry:
         # Use provided name or tool's own name
         tool_name = name or tool.name
         self._tools[tool_name] = tool
+        self._schema = None
 
     def get(self, name: str) -> BaseTool:
         """Get a tool by name.
@@ -358,16 +360,20 @@ class ToolRegistry:
         return await tool.arun(**kwargs)
 
     def get_tools_schema(self) -> list[dict[str, Any]]:
-        """Get schema for all tools (for LLM providers)."""
+        """Get schema for all tools (for LLM providers).
+
+        The schema is built once and reused until a tool is registered or
+        the registry is cleared. Treat it as read-only.
+        """
         if not self._tools:
             return []
 
-        schemas = []
-        for tool in self._tools.values():
-            definition = tool.get_definition()
-            schemas.append(definition.to_openai_schema())
-
-        return schemas
+        if self._schema is None:
+            self._schema = [
+                tool.get_definition().to_openai_schema()
+                for tool in self._tools.values()
+            ]
+        return self._schema
 
     def list_tools(self) -> list[str]:
         """List all registered tool names."""
@@ -376,6 +382,7 @@ class ToolRegistry:
     def clear(self) -> None:
         """Clear all registered tools."""
         self._tools.clear()
+        self._schema = None
 
 
 # Built-in tools can be added here
@@ -10,7 +10,7 @@ from enum import Enum
 from typing import Any
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 
 class ToolCall(BaseModel):
@@ -74,8 +74,36 @@ class Message(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.now)
 
+    # Cached to_dict() result, with the field values (compared by identity)
+    # and wire-relevant state (compared by value) it was built from
+    _wire: tuple[tuple[Any, ...], tuple[Any, ...], dict[str, Any]] | None = PrivateAttr(
+        default=None
+    )
+    # Cached wire_key() result and the to_dict() result it was built from
+    _wire_key: tuple[dict[str, Any], str] | None = PrivateAttr(default=None)
+
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for LLM providers."""
+        """Convert to dictionary for LLM providers.
+
+        The result is cached, so repeated calls across turns do not
+        re-serialize the message. The cache is rebuilt when a field is
+        reassigned or when ``tool_calls`` or the ``tool_call_id`` metadata
+        change in place; the returned dict must not be modified.
+        """
+        source = (self.role, self.content, self.tool_calls)
+        state = (
+            len(self.tool_calls or ()),
+            self.metadata.get("tool_call_id")
+            if self.role == MessageRole.TOOL
+            else None,
+        )
+        if (
+            self._wire is not None
+            and all(a is b for a, b in zip(self._wire[0], source, strict=True))
+            and self._wire[1] == state
+        ):
+            return self._wire[2]
+
         data = {"role": str(self.role), "content": self.content}
 
         if self.tool_calls:
@@ -85,8 +113,23 @@ class Message(BaseModel):
         if self.role == MessageRole.TOOL and "tool_call_id" in self.metadata:
             data["tool_call_id"] = self.metadata["tool_call_id"]
 
+        self._wire = (source, state, data)
         return data
 
+    def wire_key(self) -> str:
+        """Get a string identifying the message by its full wire format.
+
+        Cached alongside ``to_dict()``, so it is only rebuilt when the
+        message changes. Messages with tool calls are keyed afresh on every
+        call, since the calls themselves may be edited in place.
+        """
+        data = self.to_dict()
+        if self.tool_calls:
+            return json.dumps(data, sort_keys=True, default=str)
+        if self._wire_key is None or self._wire_key[0] is not data:
+            self._wire_key = (data, json.dumps(data, sort_keys=True, default=str))
+        return self._wire_key[1]
+
 
 class CompletionResponse(BaseModel):
     """Response from an LLM completion."""
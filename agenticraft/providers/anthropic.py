@@ -1,7 +1,6 @@
 """Anthropic provider implementation for AgentiCraft."""
 
 import asyncio
-import json
 import os
 from collections.abc import AsyncIterator
 from typing import Any
@@ -9,15 +8,30 @@ from typing import Any
 from ..core.config import settings
 from ..core.exceptions import ProviderAuthError, ProviderError
 from ..core.provider import BaseProvider
-from ..core.streaming import StreamChunk, StreamingProvider, StreamInterruptedError
+from ..core.streaming import (
+    StreamChunk,
+    StreamingProvider,
+    StreamInterruptedError,
+    ToolCallAccumulator,
+)
 from ..core.types import CompletionResponse, Message, ToolCall, ToolDefinition
+from .pool import get_http_client
+from .prompt_cache import PromptCachePlanner
 
 
 class AnthropicProvider(BaseProvider, StreamingProvider):
     """Provider for Anthropic models (Claude) with streaming support."""
 
     def __init__(self, **kwargs):
-        """Initialize Anthropic provider."""
+        """Initialize Anthropic provider.
+
+        Args:
+            prompt_caching: Place prompt cache breakpoints automatically;
+                False (default), True, or a configured ``PromptCachePlanner``.
+                Cache writes are billed above normal input tokens, so this
+                is opt-in
+            **kwargs: Provider arguments (api_key, base_url, model, ...)
+        """
         # Get API key from kwargs, settings, or environment
         api_key = (
             kwargs.get("api_key")
@@ -33,14 +47,32 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
         # Store model if provided
         self.model = kwargs.pop("model", "claude-3-opus-20240229")
 
+        prompt_caching = kwargs.pop("prompt_caching", False)
+        if isinstance(prompt_caching, PromptCachePlanner):
+            self.prompt_cache: PromptCachePlanner | None = prompt_caching
+        else:
+            self.prompt_cache = PromptCachePlanner() if prompt_caching else None
+
         super().__init__(**kwargs)
 
         self._client = None
+        self._http_client = None
+        self._converted_tools: tuple[list[Any], list[dict[str, Any]]] | None = None
 
     @property
     def client(self):
-        """Get or create Anthropic client."""
-        if self._client is None:
+        """Get or create Anthropic client.
+
+        The client sends requests through a pooled HTTP client shared by all
+        providers with the same base URL and credentials. It is rebuilt when
+        the pool hands out a different HTTP client (e.g. in a new event loop).
+        """
+        if self._client is not None and self._http_client is None:
+            # Client supplied externally
+            return self._client
+
+        http_client = get_http_client("anthropic", self.base_url, api_key=self.api_key)
+        if self._client is None or http_client is not self._http_client:
             try:
                 from anthropic import AsyncAnthropic
 
@@ -49,7 +81,9 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                     base_url=self.base_url,
                     timeout=self.timeout,
                     max_retries=self.max_retries,
+                    http_client=http_client,
                 )
+                self._http_client = http_client
             except ImportError:
                 raise ProviderError("Anthropic provider requires 'anthropic' package")
         return self._client
@@ -96,6 +130,9 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                         tool_choice
                     )
 
+            if self.prompt_cache is not None:
+                self.prompt_cache.plan(request_params)
+
             # Make API call
             response = await self.client.messages.create(**request_params)
 
@@ -115,12 +152,9 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
             # Extract usage information
             usage_data = None
             if hasattr(response, "usage"):
-                usage_data = {
-                    "prompt_tokens": response.usage.input_tokens,
-                    "completion_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens
-                    + response.usage.output_tokens,
-                }
+                usage_data = self._usage(response.usage)
+                if self.prompt_cache is not None:
+                    self.prompt_cache.record_usage(usage_data)
 
             return CompletionResponse(
                 content=content,
@@ -137,6 +171,31 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
         except Exception as e:
             raise ProviderError(f"Anthropic completion failed: {e}") from e
 
+    @staticmethod
+    def _usage(usage: Any, output_tokens: int | None = None) -> dict[str, int]:
+        """Convert Anthropic usage to the common usage dictionary.
+
+        Anthropic reports cached input tokens separately from
+        ``input_tokens``; ``prompt_tokens`` counts all of them.
+        """
+
+        def count(name: str) -> int:
+            value = getattr(usage, name, None)
+            return value if isinstance(value, int) else 0
+
+        cache_write = count("cache_creation_input_tokens")
+        cache_read = count("cache_read_input_tokens")
+        prompt_tokens = usage.input_tokens + cache_write + cache_read
+        if output_tokens is None:
+            output_tokens = usage.output_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens,
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": cache_read,
+        }
+
     def _extract_system_message(
         self, messages: list[Message] | list[dict[str, Any]]
     ) -> tuple:
@@ -181,8 +240,13 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
     ) -> list[dict[str, Any]]:
         """Convert tools to Anthropic format.
 
-        Pattern from agentic-framework: Different tool schema format.
+        Pattern from agentic-framework: Different tool schema format. The
+        result for the last tools list is reused while the same list (such
+        as a ToolRegistry's cached schema) is passed again.
         """
+        if self._converted_tools is not None and self._converted_tools[0] is tools:
+            return self._converted_tools[1]
+
         anthropic_tools = []
 
         for tool in tools:
@@ -213,6 +277,7 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                     # Assume it's already in Anthropic format
                     anthropic_tools.append(tool)
 
+        self._converted_tools = (tools, anthropic_tools)
         return anthropic_tools
 
     def _format_tool_choice(self, tool_choice: Any) -> dict[str, Any]:
@@ -294,66 +359,78 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                         tool_choice
                     )
 
+            if self.prompt_cache is not None:
+                self.prompt_cache.plan(request_params)
+
             # Make streaming request
             stream = await self.client.messages.create(**request_params)
 
             # Process stream
-            accumulated_content = ""
-            accumulated_tool_calls = []
-            current_tool_call = None
+            parts: list[str] = []
+            # One metadata dict is shared by all token chunks of the stream
+            token_metadata = {"model": actual_model, "type": "text_delta"}
+            tool_call_parts = ToolCallAccumulator()
+            start_usage = None
+            output_tokens = 0
 
             try:
                 async for event in stream:
                     # Handle different event types
-                    if event.type == "content_block_start":
+                    if event.type == "message_start":
+                        # Input (and cache) token counts arrive up front
+                        start_usage = getattr(event.message, "usage", None)
+
+                    elif event.type == "message_delta":
+                        usage = getattr(event, "usage", None)
+                        if isinstance(getattr(usage, "output_tokens", None), int):
+                            output_tokens = usage.output_tokens
+
+                    elif event.type == "content_block_start":
                         if hasattr(event.content_block, "type"):
                             if event.content_block.type == "text":
                                 # Text content block starting
                                 pass
                             elif event.content_block.type == "tool_use":
                                 # Tool use block starting
-                                current_tool_call = {
-                                    "id": event.content_block.id,
-                                    "name": event.content_block.name,
-                                    "input": "",
-                                }
+                                tool_call_parts.add(
+                                    event.index,
+                                    id=event.content_block.id,
+                                    name=event.content_block.name,
+                                )
 
                     elif event.type == "content_block_delta":
+                        completed = []
                         if hasattr(event.delta, "text"):
                             # Text delta
                             content = event.delta.text
-                            accumulated_content += content
+                            parts.append(content)
 
                             yield StreamChunk(
-                                content=content,
-                                token=content,
-                                metadata={"model": actual_model, "type": "text_delta"},
+                                content=content, token=content, metadata=token_metadata
                             )
 
                         elif hasattr(event.delta, "partial_json"):
                             # Tool input delta
-                            if current_tool_call:
-                                current_tool_call["input"] += event.delta.partial_json
+                            completed = tool_call_parts.add(
+                                event.index, arguments=event.delta.partial_json
+                            )
+
+                        for tool_call in completed:
+                            yield self._tool_call_chunk(tool_call, actual_model)
 
                     elif event.type == "content_block_stop":
-                        # Content block finished
-                        if current_tool_call and current_tool_call.get("input"):
-                            # Parse the accumulated tool input
-                            try:
-                                input_data = json.loads(current_tool_call["input"])
-                                accumulated_tool_calls.append(
-                                    ToolCall(
-                                        id=current_tool_call["id"],
-                                        name=current_tool_call["name"],
-                                        arguments=input_data,
-                                    )
-                                )
-                            except json.JSONDecodeError:
-                                pass  # Skip malformed tool calls
-                            current_tool_call = None
+                        # A tool call without input is complete at its block end
+                        for tool_call in tool_call_parts.close(event.index):
+                            yield self._tool_call_chunk(tool_call, actual_model)
 
                     elif event.type == "message_stop":
                         # Message complete
+                        usage_data = None
+                        accumulated_tool_calls = tool_call_parts.finish()
+                        if start_usage is not None:
+                            usage_data = self._usage(start_usage, output_tokens)
+                            if self.prompt_cache is not None:
+                                self.prompt_cache.record_usage(usage_data)
                         yield StreamChunk(
                             content="",
                             is_final=True,
@@ -365,14 +442,15 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                                     if accumulated_tool_calls
                                     else None
                                 ),
-                                "total_content": accumulated_content,
+                                "total_content": "".join(parts),
+                                "usage": usage_data,
                             },
                         )
 
             except asyncio.CancelledError:
                 raise StreamInterruptedError(
                     "Anthropic stream was interrupted",
-                    partial_response=accumulated_content,
+                    partial_response="".join(parts),
                 )
 
         except Exception as e:
@@ -380,6 +458,18 @@ class AnthropicProvider(BaseProvider, StreamingProvider):
                 raise
             raise ProviderError(f"Anthropic streaming failed: {e}") from e
 
+    @staticmethod
+    def _tool_call_chunk(tool_call: ToolCall, model: str) -> StreamChunk:
+        """Build the chunk announcing a tool call whose input is complete."""
+        return StreamChunk(
+            content="",
+            metadata={
+                "model": model,
+                "type": "tool_call",
+                "tool_call": tool_call.model_dump(),
+            },
+        )
+
     def supports_streaming(self) -> bool:
         """Check if this provider supports streaming.
 
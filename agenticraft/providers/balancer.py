@@ -0,0 +1,415 @@
+"""Load balancing across API keys and endpoints of one provider.
+
+``LoadBalancedProvider`` spreads requests over a pool of credentials and
+deployment endpoints for the same vendor, so aggregate throughput is the
+sum of the individual quotas. Endpoints are picked by least outstanding
+requests or smooth weighted round-robin. An endpoint that is rate limited,
+rejects its credentials or keeps failing is taken out of rotation for a
+cooldown, and the request moves on to the next endpoint. Usage is tracked
+per endpoint.
+
+Example:
+    Balancing three OpenAI keys::
+
+        from agenticraft import Agent
+        from agenticraft.providers.balancer import LoadBalancedProvider
+
+        provider = LoadBalancedProvider(
+            "openai",
+            endpoints=[
+                {"api_key": "sk-a"},
+                {"api_key": "sk-b", "weight": 2},
+                {"api_key": "sk-c", "base_url": "https://eu.example.com/v1"},
+            ],
+            model="gpt-4o-mini",
+        )
+        agent = Agent(name="Balanced")
+        agent.set_provider(provider)
+"""
+
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from ..core.exceptions import ProviderError, ProviderRateLimitError
+from ..core.provider import BaseProvider, ProviderFactory
+from ..core.streaming import StreamChunk, StreamingProvider, stream_or_replay
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .errors import NON_RETRYABLE_STATUS, rate_limit_details, status_code
+from .pool import credentials_digest
+from .ratelimit import parse_reset
+
+logger = logging.getLogger(__name__)
+
+BalancingStrategy = Literal["least_outstanding", "round_robin"]
+
+_AUTH_STATUS = {401, 403}
+
+
+class EndpointConfig(BaseModel):
+    """Credentials and address of one endpoint.
+
+    Attributes:
+        api_key: API key for the endpoint
+        base_url: Endpoint URL (None for the vendor default)
+        weight: Relative share of traffic
+        name: Display name (defaults to the URL and a key fingerprint)
+    """
+
+    api_key: str | None = None
+    base_url: str | None = None
+    weight: int = 1
+    name: str | None = None
+
+
+class EndpointUsage(BaseModel):
+    """Usage accounting for one endpoint.
+
+    Attributes:
+        requests: Requests sent
+        failures: Requests that failed
+        rate_limited: Requests rejected by rate limits
+        outstanding: Requests currently in flight
+        prompt_tokens: Prompt tokens reported by the provider
+        completion_tokens: Completion tokens reported by the provider
+        total_tokens: Total tokens reported by the provider
+        available: Whether the endpoint is in rotation
+    """
+
+    requests: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    outstanding: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    available: bool = True
+
+
+class _Endpoint:
+    """Runtime state of a pooled endpoint."""
+
+    def __init__(self, config: EndpointConfig, provider: BaseProvider):
+        self.config = config
+        self.provider = provider
+        self.name = config.name or (
+            f"{config.base_url or 'default'}"
+            f"#{credentials_digest(config.api_key)[:8] or 'nokey'}"
+        )
+        self.usage = EndpointUsage()
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.current_weight = 0
+        self.last_used = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def cool_down(self, seconds: float) -> None:
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + seconds)
+
+
+class LoadBalancedProvider(BaseProvider, StreamingProvider):
+    """Provider that balances requests over several keys and endpoints.
+
+    Args:
+        provider: Provider name registered with ``ProviderFactory`` or a
+            provider class
+        endpoints: Endpoints as ``EndpointConfig`` objects, dicts or bare
+            API keys
+        model: Model used on every endpoint
+        strategy: "least_outstanding" or "round_robin" (smooth weighted)
+        cooldown: Seconds a failing endpoint stays out of rotation when the
+            provider gives no Retry-After
+        failure_threshold: Consecutive failures that take an endpoint out
+            of rotation
+        max_attempts: Endpoints tried per request (defaults to all)
+        **provider_kwargs: Extra arguments for every endpoint's provider
+    """
+
+    def __init__(
+        self,
+        provider: str | type[BaseProvider],
+        endpoints: Sequence[EndpointConfig | dict[str, Any] | str],
+        model: str | None = None,
+        strategy: BalancingStrategy = "least_outstanding",
+        cooldown: float = 30.0,
+        failure_threshold: int = 3,
+        max_attempts: int | None = None,
+        **provider_kwargs: Any,
+    ):
+        """Initialize the load balanced provider."""
+        if not endpoints:
+            raise ProviderError("LoadBalancedProvider needs at least one endpoint")
+        if strategy not in ("least_outstanding", "round_robin"):
+            raise ProviderError(f"Unknown balancing strategy: {strategy}")
+
+        self._endpoints: list[_Endpoint] = []
+        for spec in endpoints:
+            if isinstance(spec, str):
+                config = EndpointConfig(api_key=spec)
+            elif isinstance(spec, dict):
+                config = EndpointConfig(**spec)
+            else:
+                config = spec
+            self._endpoints.append(
+                _Endpoint(
+                    config, self._create(provider, config, model, provider_kwargs)
+                )
+            )
+
+        first = self._endpoints[0].provider
+        super().__init__(
+            api_key=first.api_key,
+            base_url=first.base_url,
+            timeout=first.timeout,
+            max_retries=first.max_retries,
+        )
+        self.model = model or getattr(first, "model", None)
+        self.name = getattr(first, "name", None) or type(first).__name__
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self.max_attempts = max_attempts or len(self._endpoints)
+        self._sequence = 0
+
+    @staticmethod
+    def _create(
+        provider: str | type[BaseProvider],
+        config: EndpointConfig,
+        model: str | None,
+        provider_kwargs: dict[str, Any],
+    ) -> BaseProvider:
+        """Create the provider for one endpoint."""
+        if isinstance(provider, str):
+            if not model:
+                raise ProviderError(
+                    f"A model is required to create '{provider}' endpoints by name"
+                )
+            return ProviderFactory.create(
+                model=model,
+                provider=provider,
+                api_key=config.api_key,
+                base_url=config.base_url,
+                **provider_kwargs,
+            )
+        if model:
+            provider_kwargs = {**provider_kwargs, "model": model}
+        return provider(
+            api_key=config.api_key, base_url=config.base_url, **provider_kwargs
+        )
+
+    def usage(self) -> dict[str, EndpointUsage]:
+        """Get usage accounting per endpoint name."""
+        for endpoint in self._endpoints:
+            endpoint.usage.available = endpoint.available
+        return {e.name: e.usage for e in self._endpoints}
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion from the least loaded available endpoint."""
+        params = {
+            "messages": messages,
+            "model": model,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        tried: set[int] = set()
+        last_error: Exception | None = None
+        while len(tried) < self.max_attempts:
+            endpoint = self._select(tried)
+            if endpoint is None:
+                break
+            tried.add(id(endpoint))
+
+            endpoint.usage.outstanding += 1
+            try:
+                response = await endpoint.provider.complete(**params)
+            except Exception as e:
+                last_error = e
+                if not self._record_failure(endpoint, e):
+                    raise
+                continue
+            finally:
+                endpoint.usage.outstanding -= 1
+
+            self._record_success(endpoint, response.usage)
+            response.metadata["endpoint"] = endpoint.name
+            return response
+
+        raise self._exhausted(last_error)
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream from the least loaded available endpoint.
+
+        Requests move to another endpoint only if they fail before the
+        first chunk.
+        """
+        params = {
+            "messages": messages,
+            "model": model,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        tried: set[int] = set()
+        last_error: Exception | None = None
+        while len(tried) < self.max_attempts:
+            endpoint = self._select(tried)
+            if endpoint is None:
+                break
+            tried.add(id(endpoint))
+
+            endpoint.usage.outstanding += 1
+            started = False
+            usage = None
+            try:
+                async for chunk in stream_or_replay(endpoint.provider, params):
+                    started = True
+                    if chunk.is_final:
+                        usage = chunk.metadata.get("usage")
+                    yield chunk
+            except Exception as e:
+                last_error = e
+                if not self._record_failure(endpoint, e) or started:
+                    raise
+                continue
+            finally:
+                endpoint.usage.outstanding -= 1
+
+            self._record_success(endpoint, usage)
+            return
+
+        raise self._exhausted(last_error)
+
+    def _select(self, exclude: set[int]) -> _Endpoint | None:
+        """Pick the next endpoint to use."""
+        candidates = [
+            e for e in self._endpoints if e.available and id(e) not in exclude
+        ]
+        if not candidates:
+            return None
+
+        if self.strategy == "round_robin":
+            # Smooth weighted round-robin spreads heavier endpoints evenly
+            total = sum(e.config.weight for e in candidates)
+            for endpoint in candidates:
+                endpoint.current_weight += endpoint.config.weight
+            chosen = max(candidates, key=lambda e: e.current_weight)
+            chosen.current_weight -= total
+        else:
+            chosen = min(
+                candidates,
+                key=lambda e: (e.usage.outstanding / e.config.weight, e.last_used),
+            )
+
+        self._sequence += 1
+        chosen.last_used = self._sequence
+        return chosen
+
+    def _record_success(self, endpoint: _Endpoint, usage: dict | None) -> None:
+        """Account a successful request."""
+        endpoint.consecutive_failures = 0
+        endpoint.usage.requests += 1
+        if usage:
+            endpoint.usage.prompt_tokens += usage.get("prompt_tokens", 0) or 0
+            endpoint.usage.completion_tokens += usage.get("completion_tokens", 0) or 0
+            endpoint.usage.total_tokens += usage.get("total_tokens", 0) or 0
+
+    def _record_failure(self, endpoint: _Endpoint, error: Exception) -> bool:
+        """Account a failed request and rotate the endpoint out if needed.
+
+        Returns:
+            True if the request may be retried on another endpoint
+        """
+        endpoint.usage.requests += 1
+        endpoint.usage.failures += 1
+        rate_limited, retry_after, headers = rate_limit_details(error)
+        status = status_code(error)
+        if status in NON_RETRYABLE_STATUS:
+            # The request itself is bad; the endpoint is fine
+            return False
+
+        endpoint.consecutive_failures += 1
+        if rate_limited:
+            endpoint.usage.rate_limited += 1
+            if retry_after is None and headers and "retry-after" in headers:
+                retry_after = parse_reset(headers["retry-after"])
+            endpoint.cool_down(
+                retry_after if retry_after is not None else self.cooldown
+            )
+            logger.info(f"Endpoint {endpoint.name} rate limited; rotating out")
+            return True
+        if status in _AUTH_STATUS:
+            endpoint.cool_down(self.cooldown * 10)
+            logger.warning(f"Endpoint {endpoint.name} rejected its credentials")
+            return True
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.cool_down(self.cooldown)
+            logger.warning(
+                f"Endpoint {endpoint.name} failed {endpoint.consecutive_failures} "
+                f"times; out of rotation for {self.cooldown:.0f}s"
+            )
+        return True
+
+    def _exhausted(self, last_error: Exception | None) -> ProviderError:
+        """Build the error raised when no endpoint could serve a request."""
+        if last_error is None:
+            retry_after = min(e.cooldown_until for e in self._endpoints)
+            return ProviderRateLimitError(
+                self.name, retry_after=max(retry_after - time.monotonic(), 0.0)
+            )
+        if isinstance(last_error, ProviderError):
+            return last_error
+        error = ProviderError(f"All endpoints failed: {last_error}")
+        error.__cause__ = last_error
+        return error
+
+    def validate_auth(self) -> None:
+        """Validate that at least one endpoint has usable credentials.
+
+        Raises:
+            ProviderError: If no endpoint passes validation
+        """
+        errors = []
+        for endpoint in self._endpoints:
+            try:
+                endpoint.provider.validate_auth()
+                return
+            except Exception as e:
+                errors.append(f"{endpoint.name}: {e}")
+        raise ProviderError(f"No usable endpoint: {'; '.join(errors)}")
+
+    def supports_streaming(self) -> bool:
+        """Check if this provider supports streaming.
+
+        Returns:
+            bool: True (non-streaming providers are replayed as one chunk)
+        """
+        return True
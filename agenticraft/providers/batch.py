@@ -0,0 +1,821 @@
+"""Batch submission for offline provider workloads.
+
+OpenAI and Anthropic run asynchronous batch jobs at half the price of
+interactive requests, under separate rate limits, with results delivered
+within 24 hours. ``BatchProvider`` turns ordinary ``complete()`` calls
+into batch jobs:
+
+- Requests are queued and submitted together once ``max_batch_size``
+  requests are waiting or ``max_wait`` seconds have passed
+- Submitted batches are polled until they end
+- Results resolve the awaiting ``complete()`` calls and are appended to an
+  optional JSONL results file
+
+Every request and batch is recorded in a SQLite store. A process that
+restarts with the same store calls ``resume()`` to submit requests that
+were still queued and to collect the results of batches that were in
+flight. Requests submitted with a ``custom_id`` are only sent once, so a
+backfill script can simply be run again. When submitting a batch fails
+(e.g. a network error), its requests stay queued and submission is retried
+with exponential backoff; only errors the batch API reports for individual
+requests mark them as failed.
+
+Example:
+    Running a backfill through an agent::
+
+        import asyncio
+
+        from agenticraft import Agent
+        from agenticraft.providers.batch import BatchProvider
+
+        agent = Agent(model="gpt-4o-mini")
+        batch = BatchProvider(agent.provider, store="backfill.db")
+        agent.set_provider(batch)
+
+        await batch.resume()  # pick up work from an earlier run
+        answers = await asyncio.gather(*(agent.arun(doc) for doc in documents))
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+from pydantic import BaseModel
+
+from ..core.exceptions import ProviderError
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk, replay_chunks
+from ..core.types import CompletionResponse, Message, ToolCall, ToolDefinition
+from .pool import get_http_client
+from .wrapper import ProviderWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class BatchStats(BaseModel):
+    """Statistics for batch submission.
+
+    Attributes:
+        requests: Requests queued
+        batches: Batch jobs submitted
+        completed: Requests with a result
+        failed: Requests that failed
+    """
+
+    requests: int = 0
+    batches: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class BatchBackend(ABC):
+    """A provider's batch API.
+
+    Args:
+        provider: Provider whose credentials and request format are used
+        client: HTTP client for the batch API (defaults to the shared pool)
+    """
+
+    name: str = ""
+    # Largest number of requests a single batch job accepts
+    max_requests: int = 10000
+
+    def __init__(self, provider: BaseProvider, client: httpx.AsyncClient | None = None):
+        """Initialize the backend."""
+        self.provider = provider
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for the batch API."""
+        if self._client is not None:
+            return self._client
+        return get_http_client(
+            self.name, self.provider.base_url, api_key=self.provider.api_key
+        )
+
+    @abstractmethod
+    def format_request(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Convert ``complete()`` arguments to a provider request body."""
+
+    @abstractmethod
+    async def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Submit request bodies by custom ID and return the batch ID."""
+
+    @abstractmethod
+    async def poll(self, batch_id: str) -> str | None:
+        """Get the final status of a batch, or None while it is running."""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> dict[str, CompletionResponse | str]:
+        """Get the results of an ended batch (responses or error messages)."""
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request to the batch API."""
+        try:
+            response = await self.client.request(
+                method, url, headers=self._headers(), **kwargs
+            )
+            response.raise_for_status()
+            return response
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.name} batch request failed: {e}") from e
+
+    @abstractmethod
+    def _headers(self) -> dict[str, str]:
+        """Get the authentication headers."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API (``/files`` and ``/batches``)."""
+
+    name = "openai"
+    max_requests = 50000
+    _ENDED = {"completed", "failed", "expired", "cancelled"}
+
+    def format_request(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Convert ``complete()`` arguments to a chat completions body."""
+        body = {
+            "model": params["model"] or self.provider.model,
+            "messages": self.provider._format_messages(params["messages"]),
+            "temperature": params["temperature"],
+            **params["kwargs"],
+        }
+        if params["max_tokens"]:
+            body["max_tokens"] = params["max_tokens"]
+        tools = params["tools"]
+        if tools:
+            body["tools"] = [
+                tool if isinstance(tool, dict) else tool.to_openai_schema()
+                for tool in tools
+            ]
+            tool_choice = params["tool_choice"]
+            body["tool_choice"] = tool_choice if tool_choice is not None else "auto"
+        return body
+
+    async def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Upload the requests as a JSONL file and create a batch."""
+        lines = "".join(
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                }
+            )
+            + "\n"
+            for custom_id, body in requests.items()
+        )
+        upload = await self._request(
+            "POST",
+            "/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", lines.encode(), "application/jsonl")},
+        )
+        batch = await self._request(
+            "POST",
+            "/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return batch.json()["id"]
+
+    async def poll(self, batch_id: str) -> str | None:
+        """Get the final status of a batch."""
+        status = (await self._request("GET", f"/batches/{batch_id}")).json()["status"]
+        return status if status in self._ENDED else None
+
+    async def results(self, batch_id: str) -> dict[str, CompletionResponse | str]:
+        """Download the output and error files of a batch."""
+        batch = (await self._request("GET", f"/batches/{batch_id}")).json()
+        results: dict[str, CompletionResponse | str] = {}
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            content = await self._request("GET", f"/files/{file_id}/content")
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code", 200) >= 400:
+                    error = record.get("error") or response.get("body", {}).get(
+                        "error", {}
+                    )
+                    results[record["custom_id"]] = error.get("message", str(error))
+                else:
+                    results[record["custom_id"]] = _openai_response(response["body"])
+        return results
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.provider.api_key}"}
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API (``/v1/messages/batches``)."""
+
+    name = "anthropic"
+    max_requests = 100000
+
+    def format_request(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Convert ``complete()`` arguments to a Messages API body."""
+        provider = self.provider
+        system_prompt, chat_messages = provider._extract_system_message(
+            params["messages"]
+        )
+        body = {
+            "model": params["model"] or provider.model,
+            "messages": provider._format_messages(chat_messages),
+            "max_tokens": params["max_tokens"] or 4096,
+            "temperature": params["temperature"],
+            **params["kwargs"],
+        }
+        if system_prompt:
+            body["system"] = system_prompt
+        if params["tools"]:
+            body["tools"] = provider._convert_tools(params["tools"])
+            if params["tool_choice"] is not None:
+                body["tool_choice"] = provider._format_tool_choice(
+                    params["tool_choice"]
+                )
+        if getattr(provider, "prompt_cache", None) is not None:
+            provider.prompt_cache.plan(body)
+        return body
+
+    async def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Create a message batch."""
+        batch = await self._request(
+            "POST",
+            "/v1/messages/batches",
+            json={
+                "requests": [
+                    {"custom_id": custom_id, "params": body}
+                    for custom_id, body in requests.items()
+                ]
+            },
+        )
+        return batch.json()["id"]
+
+    async def poll(self, batch_id: str) -> str | None:
+        """Get the final status of a batch."""
+        batch = (await self._request("GET", f"/v1/messages/batches/{batch_id}")).json()
+        return (
+            batch["processing_status"]
+            if batch["processing_status"] == "ended"
+            else None
+        )
+
+    async def results(self, batch_id: str) -> dict[str, CompletionResponse | str]:
+        """Download the results of a batch."""
+        batch = (await self._request("GET", f"/v1/messages/batches/{batch_id}")).json()
+        if not batch.get("results_url"):
+            return {}
+        content = await self._request("GET", batch["results_url"])
+        results: dict[str, CompletionResponse | str] = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            result = record["result"]
+            if result["type"] == "succeeded":
+                results[record["custom_id"]] = _anthropic_response(result["message"])
+            elif result["type"] == "errored":
+                error = result.get("error", {})
+                results[record["custom_id"]] = error.get("error", error).get(
+                    "message", "request errored"
+                )
+            else:
+                results[record["custom_id"]] = f"request {result['type']}"
+        return results
+
+    def _headers(self) -> dict[str, str]:
+        return {"x-api-key": self.provider.api_key, "anthropic-version": "2023-06-01"}
+
+
+def batch_backend_for(
+    provider: BaseProvider, client: httpx.AsyncClient | None = None
+) -> BatchBackend:
+    """Get the batch backend for a provider.
+
+    Args:
+        provider: OpenAI or Anthropic provider
+        client: Optional HTTP client for the batch API
+
+    Returns:
+        The matching batch backend
+
+    Raises:
+        ProviderError: If the provider has no batch API
+    """
+    from .anthropic import AnthropicProvider
+    from .openai import OpenAIProvider
+
+    if isinstance(provider, OpenAIProvider):
+        return OpenAIBatchBackend(provider, client)
+    if isinstance(provider, AnthropicProvider):
+        return AnthropicBatchBackend(provider, client)
+    raise ProviderError(f"{type(provider).__name__} does not support batch jobs")
+
+
+def _openai_response(body: dict[str, Any]) -> CompletionResponse:
+    """Convert a chat completion body to a CompletionResponse."""
+    choice = body["choices"][0]
+    message = choice["message"]
+    tool_calls = []
+    for tc in message.get("tool_calls") or []:
+        args = tc["function"]["arguments"]
+        try:
+            args = json.loads(args) if isinstance(args, str) else args
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse tool arguments: {e}")
+            continue
+        tool_calls.append(
+            ToolCall(id=tc["id"], name=tc["function"]["name"], arguments=args)
+        )
+    usage = body.get("usage")
+    return CompletionResponse(
+        content=message.get("content") or "",
+        tool_calls=tool_calls,
+        finish_reason=choice.get("finish_reason"),
+        usage=(
+            {
+                "prompt_tokens": usage["prompt_tokens"],
+                "completion_tokens": usage["completion_tokens"],
+                "total_tokens": usage["total_tokens"],
+            }
+            if usage
+            else None
+        ),
+        metadata={"model": body.get("model"), "batch": True},
+        model=body.get("model"),
+    )
+
+
+def _anthropic_response(message: dict[str, Any]) -> CompletionResponse:
+    """Convert a Messages API message to a CompletionResponse."""
+    content = ""
+    tool_calls = []
+    for block in message.get("content", []):
+        if block["type"] == "text":
+            content += block["text"]
+        elif block["type"] == "tool_use":
+            tool_calls.append(
+                ToolCall(id=block["id"], name=block["name"], arguments=block["input"])
+            )
+    usage = message.get("usage") or {}
+    cache_write = usage.get("cache_creation_input_tokens") or 0
+    cache_read = usage.get("cache_read_input_tokens") or 0
+    prompt_tokens = usage.get("input_tokens", 0) + cache_write + cache_read
+    return CompletionResponse(
+        content=content,
+        tool_calls=tool_calls,
+        finish_reason=message.get("stop_reason"),
+        usage={
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": usage.get("output_tokens", 0),
+            "total_tokens": prompt_tokens + usage.get("output_tokens", 0),
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": cache_read,
+        },
+        metadata={"model": message.get("model"), "batch": True},
+        model=message.get("model"),
+    )
+
+
+class BatchStore:
+    """SQLite record of batch requests and jobs.
+
+    Args:
+        path: Database file (None keeps the record in memory, which
+            disables resuming)
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """Initialize the store."""
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", check_same_thread=False
+        )
+        with self._lock:
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS batch_requests ("
+                "custom_id TEXT PRIMARY KEY, body TEXT NOT NULL, "
+                "status TEXT NOT NULL, batch_id TEXT, result TEXT, "
+                "created_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS batch_jobs ("
+                "batch_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "submitted_at REAL NOT NULL);"
+            )
+            self._conn.commit()
+
+    def add(self, custom_id: str, body: dict[str, Any]) -> bool:
+        """Queue a request; returns False if the ID is already known."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO batch_requests "
+                "VALUES (?, ?, 'queued', NULL, NULL, ?)",
+                (custom_id, json.dumps(body), time.time()),
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def bodies(self, custom_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Get request bodies by custom ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT custom_id, body FROM batch_requests WHERE custom_id IN "
+                f"({','.join('?' * len(custom_ids))})",
+                custom_ids,
+            ).fetchall()
+        bodies = {custom_id: json.loads(body) for custom_id, body in rows}
+        return {custom_id: bodies[custom_id] for custom_id in custom_ids}
+
+    def assign(self, batch_id: str, custom_ids: list[str]) -> None:
+        """Record that requests were submitted in a batch."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO batch_jobs VALUES (?, 'running', ?)",
+                (batch_id, time.time()),
+            )
+            self._conn.executemany(
+                "UPDATE batch_requests SET status = 'submitted', batch_id = ? "
+                "WHERE custom_id = ?",
+                [(batch_id, custom_id) for custom_id in custom_ids],
+            )
+            self._conn.commit()
+
+    def finish(self, custom_id: str, status: str, result: str) -> None:
+        """Record a request's result ('done') or error message ('failed')."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE batch_requests SET status = ?, result = ? WHERE custom_id = ?",
+                (status, result, custom_id),
+            )
+            self._conn.commit()
+
+    def end_batch(self, batch_id: str, status: str) -> None:
+        """Record that a batch ended."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE batch_jobs SET status = ? WHERE batch_id = ?",
+                (status, batch_id),
+            )
+            self._conn.commit()
+
+    def get(self, custom_id: str) -> tuple[str, str | None] | None:
+        """Get a request's status and result."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT status, result FROM batch_requests WHERE custom_id = ?",
+                (custom_id,),
+            ).fetchone()
+
+    def requests_in(self, batch_id: str) -> list[str]:
+        """Get the unfinished requests of a batch."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT custom_id FROM batch_requests "
+                "WHERE batch_id = ? AND status = 'submitted'",
+                (batch_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def queued(self) -> list[str]:
+        """Get requests that were never submitted, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT custom_id FROM batch_requests WHERE status = 'queued' "
+                "ORDER BY created_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def running(self) -> list[str]:
+        """Get batches that have not ended."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id FROM batch_jobs WHERE status = 'running' "
+                "ORDER BY submitted_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class BatchProvider(ProviderWrapper):
+    """Provider that sends completions through a batch API.
+
+    ``complete()`` waits until the request's batch has ended, which can
+    take hours; use it for offline workloads only.
+
+    Args:
+        provider: OpenAI or Anthropic provider
+        backend: Batch backend (defaults to the provider's batch API)
+        max_batch_size: Requests per batch job
+        max_wait: Seconds a queued request waits for more requests before
+            its batch is submitted anyway
+        poll_interval: Seconds between batch status checks, and the longest
+            wait before retrying a failed batch submission
+        store: SQLite file recording requests and batches, so work can be
+            resumed after a restart (None keeps the record in memory)
+        results_path: Optional JSONL file that results are appended to
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        backend: BatchBackend | None = None,
+        max_batch_size: int = 1000,
+        max_wait: float = 5.0,
+        poll_interval: float = 30.0,
+        store: str | Path | None = None,
+        results_path: str | Path | None = None,
+    ):
+        """Initialize the batch provider."""
+        super().__init__(provider)
+        self.backend = backend or batch_backend_for(provider)
+        self.max_batch_size = min(max_batch_size, self.backend.max_requests)
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.store = BatchStore(store)
+        self.results_path = Path(results_path) if results_path else None
+        self.stats = BatchStats()
+        self._queued: list[str] = []
+        self._futures: dict[str, asyncio.Future] = {}
+        self._flush_timer: asyncio.Task | None = None
+        self._pollers: dict[str, asyncio.Task] = {}
+        self._submit_failures = 0
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Queue a completion and wait for its batch result."""
+        custom_id = await self.submit(
+            messages,
+            model=model,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        return await self.result(custom_id)
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Queue a completion and replay its batch result as chunks.
+
+        Batch results arrive whole, so nothing is yielded until the
+        request's batch has ended.
+        """
+        response = await self.complete(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+        for chunk in replay_chunks(response):
+            yield chunk
+
+    async def submit(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        custom_id: str | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Queue a completion without waiting for it.
+
+        Args:
+            messages: Conversation messages
+            model: Model to use (defaults to the provider model)
+            tools: Available tools
+            tool_choice: Tool choice strategy
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            custom_id: Stable request ID; a request whose ID is already in
+                the store is not queued again
+            **kwargs: Additional provider arguments
+
+        Returns:
+            The request's custom ID, for ``result()``
+        """
+        custom_id = custom_id or uuid.uuid4().hex
+        body = self.backend.format_request(
+            {
+                "messages": messages,
+                "model": model,
+                "tools": tools,
+                "tool_choice": tool_choice,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "kwargs": kwargs,
+            }
+        )
+        if not self.store.add(custom_id, body):
+            return custom_id
+
+        self.stats.requests += 1
+        self._queued.append(custom_id)
+        if len(self._queued) >= self.max_batch_size:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_later())
+        return custom_id
+
+    async def result(self, custom_id: str) -> CompletionResponse:
+        """Wait for a request's result.
+
+        Raises:
+            ProviderError: If the request failed or is unknown
+        """
+        record = self.store.get(custom_id)
+        if record is None:
+            raise ProviderError(f"Unknown batch request '{custom_id}'")
+        status, result = record
+        if status == "done":
+            return CompletionResponse.model_validate_json(result)
+        if status == "failed":
+            raise ProviderError(f"Batch request '{custom_id}' failed: {result}")
+
+        future = self._futures.get(custom_id)
+        if future is None:
+            future = self._futures[custom_id] = (
+                asyncio.get_running_loop().create_future()
+            )
+        return await asyncio.shield(future)
+
+    async def flush(self) -> list[str]:
+        """Submit all queued requests now.
+
+        If submitting a batch fails, it and the requests after it stay
+        queued and are retried after a backoff.
+
+        Returns:
+            IDs of the submitted batches
+        """
+        if self._flush_timer is not None and self._flush_timer is not (
+            asyncio.current_task()
+        ):
+            self._flush_timer.cancel()
+        self._flush_timer = None
+
+        batch_ids = []
+        while self._queued:
+            custom_ids = self._queued[: self.max_batch_size]
+            del self._queued[: self.max_batch_size]
+            try:
+                batch_id = await self.backend.submit(self.store.bodies(custom_ids))
+            except Exception as e:
+                # Keep the requests queued (in the store too) so a retry or a
+                # later resume() submits them
+                self._queued[:0] = custom_ids
+                self._submit_failures += 1
+                delay = min(
+                    self.max_wait * 2 ** (self._submit_failures - 1),
+                    self.poll_interval,
+                )
+                logger.error(
+                    f"Failed to submit batch of {len(custom_ids)}: {e}; "
+                    f"retrying in {delay:.1f}s"
+                )
+                self._flush_timer = asyncio.create_task(self._flush_later(delay))
+                break
+            self._submit_failures = 0
+            self.store.assign(batch_id, custom_ids)
+            self.stats.batches += 1
+            batch_ids.append(batch_id)
+            self._watch(batch_id)
+        return batch_ids
+
+    async def resume(self) -> None:
+        """Continue work recorded in the store by an earlier process.
+
+        Requests that were queued but never submitted are queued again, and
+        batches that had not ended are polled for their results.
+        """
+        for batch_id in self.store.running():
+            self._watch(batch_id)
+        queued = [c for c in self.store.queued() if c not in self._queued]
+        if queued:
+            self._queued.extend(queued)
+            await self.flush()
+
+    async def join(self) -> None:
+        """Submit queued requests and wait until every batch has ended."""
+        await self.flush()
+        while self._pollers or self._queued:
+            if self._queued and self._flush_timer is None:
+                await self.flush()
+            tasks = list(self._pollers.values())
+            if self._flush_timer is not None:
+                tasks.append(self._flush_timer)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Stop polling and close the store.
+
+        Batches keep running at the provider; ``resume()`` picks them up.
+        """
+        tasks = list(self._pollers.values())
+        if self._flush_timer is not None:
+            tasks.append(self._flush_timer)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.store.close()
+
+    async def _flush_later(self, delay: float | None = None) -> None:
+        """Submit queued requests after ``delay`` (defaults to ``max_wait``)."""
+        await asyncio.sleep(self.max_wait if delay is None else delay)
+        await self.flush()
+
+    def _watch(self, batch_id: str) -> None:
+        """Start polling a batch."""
+        if batch_id not in self._pollers:
+            task = asyncio.create_task(self._poll(batch_id))
+            task.add_done_callback(lambda _: self._pollers.pop(batch_id, None))
+            self._pollers[batch_id] = task
+
+    async def _poll(self, batch_id: str) -> None:
+        """Poll a batch until it ends, then hand out its results."""
+        while True:
+            try:
+                status = await self.backend.poll(batch_id)
+                if status is not None:
+                    results = await self.backend.results(batch_id)
+                    break
+            except Exception as e:
+                logger.warning(f"Polling batch {batch_id} failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+        records = []
+        for custom_id in self.store.requests_in(batch_id):
+            result = results.get(custom_id)
+            if isinstance(result, CompletionResponse):
+                self.store.finish(custom_id, "done", result.model_dump_json())
+                self.stats.completed += 1
+                future = self._futures.pop(custom_id, None)
+                if future is not None and not future.done():
+                    future.set_result(result)
+                records.append(
+                    {"custom_id": custom_id, "response": result.model_dump()}
+                )
+            else:
+                error = result or f"no result (batch {status})"
+                self._fail(custom_id, error)
+                records.append({"custom_id": custom_id, "error": error})
+        self.store.end_batch(batch_id, status)
+        if self.results_path is not None and records:
+            await asyncio.to_thread(self._append_results, records)
+
+    def _fail(self, custom_id: str, error: str) -> None:
+        """Record a failed request and fail its waiter."""
+        self.store.finish(custom_id, "failed", error)
+        self.stats.failed += 1
+        future = self._futures.pop(custom_id, None)
+        if future is not None and not future.done():
+            future.set_exception(
+                ProviderError(f"Batch request '{custom_id}' failed: {error}")
+            )
+
+    def _append_results(self, records: list[dict[str, Any]]) -> None:
+        """Append results to the results file."""
+        self.results_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.results_path.open("a") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
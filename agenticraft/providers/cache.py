@@ -0,0 +1,637 @@
+"""Completion caching for AgentiCraft providers.
+
+``CachedProvider`` wraps any provider and serves repeated, byte-identical
+requests (retries, workflow re-runs, templated pipelines) from a cache
+instead of calling the LLM again. Requests are identified by a canonical
+hash of messages, tools and sampling parameters.
+
+Two backends are included: ``InMemoryCache`` (LRU with TTL and size-based
+eviction) and ``SQLiteCache`` (on-disk, shared across processes).
+
+``SemanticCachedProvider`` goes further and serves paraphrased prompts
+from a ``SemanticCache`` using embedding similarity.
+
+Example:
+    Caching deterministic completions::
+
+        from agenticraft import Agent
+        from agenticraft.providers.cache import CachedProvider, InMemoryCache
+
+        agent = Agent(model="gpt-4", temperature=0)
+        agent.set_provider(CachedProvider(agent.provider, InMemoryCache()))
+
+        await agent.arun("Classify: ...")  # calls the LLM
+        await agent.arun("Classify: ...")  # served from cache
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..core.config import settings
+from ..core.memory import SemanticCache
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk
+from ..core.types import CompletionResponse, Message, ToolCall, ToolDefinition
+from .wrapper import ProviderWrapper
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends."""
+    return " ".join(text.split())
+
+
+def request_key(
+    messages: list[Message] | list[dict[str, Any]],
+    model: str | None = None,
+    tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+    tool_choice: Any | None = None,
+    temperature: float | None = None,
+    max_tokens: int | None = None,
+    normalize: bool = False,
+    **kwargs: Any,
+) -> str:
+    """Compute a canonical hash for a completion request.
+
+    Args:
+        messages: Conversation messages
+        model: Model name
+        tools: Available tools
+        tool_choice: Tool choice strategy
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        normalize: Collapse whitespace in message content so requests that
+            differ only in formatting share a key
+        **kwargs: Additional provider arguments that affect the output
+
+    Returns:
+        Hex digest identifying the request
+    """
+    canonical_messages = []
+    for msg in messages:
+        # Copy, since Message.to_dict() returns its cached dict
+        data = dict(msg.to_dict()) if isinstance(msg, Message) else dict(msg)
+        if normalize and isinstance(data.get("content"), str):
+            data["content"] = _normalize_text(data["content"])
+        canonical_messages.append(data)
+
+    canonical_tools = None
+    if tools:
+        canonical_tools = [
+            tool.to_openai_schema() if isinstance(tool, ToolDefinition) else tool
+            for tool in tools
+        ]
+
+    payload = {
+        "messages": canonical_messages,
+        "model": model,
+        "tools": canonical_tools,
+        "tool_choice": tool_choice,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "params": kwargs,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CacheStats(BaseModel):
+    """Hit/miss statistics for a completion cache.
+
+    Attributes:
+        hits: Requests served from the cache
+        misses: Cacheable requests that went to the provider
+        skipped: Requests that were not cacheable (e.g. temperature > 0)
+    """
+
+    hits: int = 0
+    misses: int = 0
+    skipped: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cacheable requests served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(ABC):
+    """Base class for completion cache storage."""
+
+    @abstractmethod
+    async def get(self, key: str) -> CompletionResponse | None:
+        """Get a cached response, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def set(
+        self, key: str, response: CompletionResponse, ttl: float | None = None
+    ) -> None:
+        """Store a response.
+
+        Args:
+            key: Request key
+            response: Response to cache
+            ttl: Time to live in seconds (None uses the backend default)
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a cached response."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        """Get the number of cached responses."""
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """In-process LRU cache with TTL and size-based eviction.
+
+    Args:
+        max_entries: Maximum number of cached responses
+        max_bytes: Optional limit on the total serialized size of responses
+        default_ttl: Default time to live in seconds (None means no expiry)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+        default_ttl: float | None = None,
+    ):
+        """Initialize the in-memory cache."""
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # key -> (expires_at, serialized response)
+        self._entries: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> CompletionResponse | None:
+        """Get a cached response and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return CompletionResponse.model_validate_json(data)
+
+    async def set(
+        self, key: str, response: CompletionResponse, ttl: float | None = None
+    ) -> None:
+        """Store a response, evicting least recently used entries."""
+        data = response.model_dump_json()
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (expires_at, data)
+        self._bytes += len(data)
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    async def delete(self, key: str) -> None:
+        """Remove a cached response."""
+        if key in self._entries:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._bytes = 0
+
+    async def size(self) -> int:
+        """Get the number of cached responses."""
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and update the byte count."""
+        _, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk completion cache backed by SQLite.
+
+    Args:
+        path: Database file (defaults to ``completions.db`` in
+            ``settings.memory_path``)
+        default_ttl: Default time to live in seconds (None means no expiry)
+        max_entries: Optional limit; least recently used rows are evicted
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        default_ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """Initialize the SQLite cache."""
+        self.path = Path(path) if path else settings.memory_path / "completions.db"
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> CompletionResponse | None:
+        """Get a cached response."""
+        data = await asyncio.to_thread(self._get, key)
+        if data is None:
+            return None
+        return CompletionResponse.model_validate_json(data)
+
+    async def set(
+        self, key: str, response: CompletionResponse, ttl: float | None = None
+    ) -> None:
+        """Store a response."""
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        await asyncio.to_thread(self._set, key, response.model_dump_json(), expires_at)
+
+    async def delete(self, key: str) -> None:
+        """Remove a cached response."""
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM completions WHERE key = ?", (key,)
+        )
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        await asyncio.to_thread(self._execute, "DELETE FROM completions", ())
+
+    async def size(self) -> int:
+        """Get the number of cached responses."""
+        return await asyncio.to_thread(self._count)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def _set(self, key: str, data: str, expires_at: float | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                (key, data, expires_at, time.time()),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM completions WHERE key IN ("
+                    "SELECT key FROM completions ORDER BY accessed_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+
+class CachedProvider(ProviderWrapper):
+    """Provider wrapper that caches completions.
+
+    Only deterministic requests (temperature 0) are cached unless
+    ``cache_sampled`` is set. Cached completions are replayed as chunks
+    when requested through ``stream()``.
+
+    Args:
+        provider: The provider to wrap
+        cache: Cache backend (defaults to an InMemoryCache)
+        ttl: Time to live for new entries (None uses the backend default)
+        normalize: Use whitespace-normalized request keys
+        cache_sampled: Also cache requests with temperature > 0
+        replay_chunk_size: Characters per chunk when replaying a stream
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        cache: CacheBackend | None = None,
+        ttl: float | None = None,
+        normalize: bool = False,
+        cache_sampled: bool = False,
+        replay_chunk_size: int = 20,
+    ):
+        """Initialize the cached provider."""
+        super().__init__(provider)
+        self.cache = cache or InMemoryCache()
+        self.ttl = ttl
+        self.normalize = normalize
+        self.cache_sampled = cache_sampled
+        self.replay_chunk_size = replay_chunk_size
+        self.stats = CacheStats()
+
+    def _key(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None,
+        tools: Any,
+        tool_choice: Any,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> str | None:
+        """Get the cache key, or None if the request should not be cached."""
+        if temperature > 0 and not self.cache_sampled:
+            self.stats.skipped += 1
+            return None
+        return request_key(
+            messages,
+            model=model or getattr(self.provider, "model", None),
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            normalize=self.normalize,
+            **kwargs,
+        )
+
+    async def _get_cached(self, key: Any) -> CompletionResponse | None:
+        """Look up a cached response for a key returned by ``_key``."""
+        return await self.cache.get(key)
+
+    async def _set_cached(self, key: Any, response: CompletionResponse) -> None:
+        """Cache a response under a key returned by ``_key``."""
+        await self.cache.set(key, response, ttl=self.ttl)
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion, serving it from the cache when possible."""
+        key = self._key(
+            messages, model, tools, tool_choice, temperature, max_tokens, kwargs
+        )
+        if key is not None:
+            cached = await self._get_cached(key)
+            if cached is not None:
+                self.stats.hits += 1
+                cached.metadata["cache_hit"] = True
+                return cached
+            self.stats.misses += 1
+
+        response = await self.provider.complete(
+            messages=messages,
+            model=model,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+        if key is not None:
+            await self._set_cached(key, response)
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a completion, replaying cached completions as chunks."""
+        key = self._key(
+            messages, model, tools, tool_choice, temperature, max_tokens, kwargs
+        )
+        if key is not None:
+            cached = await self._get_cached(key)
+            if cached is not None:
+                self.stats.hits += 1
+                async for chunk in self._replay(cached):
+                    yield chunk
+                return
+            self.stats.misses += 1
+
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+
+        if not hasattr(self.provider, "stream"):
+            # Non-streaming provider: complete and replay as chunks
+            response = await self.provider.complete(**params)
+            if key is not None:
+                await self._set_cached(key, response)
+            async for chunk in self._replay(response, cache_hit=False):
+                yield chunk
+            return
+
+        parts: list[str] = []
+        async for chunk in self.provider.stream(**params):
+            if chunk.content:
+                parts.append(chunk.content)
+            if chunk.is_final and key is not None:
+                await self._set_cached(key, self._response_from_stream(parts, chunk))
+            yield chunk
+
+    async def _replay(
+        self, response: CompletionResponse, cache_hit: bool = True
+    ) -> AsyncIterator[StreamChunk]:
+        """Replay a completion as a sequence of stream chunks."""
+        content = response.content
+        size = max(1, self.replay_chunk_size)
+        for i in range(0, len(content), size):
+            piece = content[i : i + size]
+            yield StreamChunk(
+                content=piece,
+                token=piece,
+                metadata={"model": response.model, "cache_hit": cache_hit},
+            )
+
+        yield StreamChunk(
+            content="",
+            is_final=True,
+            metadata={
+                "model": response.model,
+                "finish_reason": response.finish_reason,
+                "tool_calls": (
+                    [tc.model_dump() for tc in response.tool_calls]
+                    if response.tool_calls
+                    else None
+                ),
+                "total_content": content,
+                "cache_hit": cache_hit,
+            },
+        )
+
+    @staticmethod
+    def _response_from_stream(
+        parts: list[str], final_chunk: StreamChunk
+    ) -> CompletionResponse:
+        """Build a CompletionResponse from a finished stream."""
+        metadata = final_chunk.metadata
+        return CompletionResponse(
+            content="".join(parts),
+            tool_calls=[ToolCall(**tc) for tc in metadata.get("tool_calls") or []],
+            finish_reason=metadata.get("finish_reason") or metadata.get("stop_reason"),
+            metadata={"model": metadata.get("model")},
+            model=metadata.get("model"),
+        )
+
+
+class SemanticCachedProvider(CachedProvider):
+    """Provider wrapper that serves completions for similar prompts.
+
+    The final user message is embedded and looked up in a ``SemanticCache``;
+    a stored completion is returned when a previous prompt is similar
+    enough. Everything else that shapes the answer (the preceding
+    conversation including system, assistant and tool turns, model, tools
+    and generation parameters) must match exactly, so it is hashed into the
+    cache namespace. A follow-up such as "tell me more" therefore only hits
+    within the same conversation. Requests that do not end with a user message
+    (e.g. tool result follow-ups) are never cached.
+
+    Args:
+        provider: The provider to wrap
+        cache: Semantic cache (defaults to a new SemanticCache)
+        namespace: Cache namespace, e.g. the agent name
+        cache_sampled: Also cache requests with temperature > 0
+        replay_chunk_size: Characters per chunk when replaying a stream
+
+    Example:
+        Sharing a semantic cache between agents::
+
+            cache = SemanticCache(threshold=0.9, metrics=get_metrics_collector())
+            agent.set_provider(
+                SemanticCachedProvider(agent.provider, cache, namespace=agent.name)
+            )
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        cache: SemanticCache | None = None,
+        namespace: str = "default",
+        cache_sampled: bool = True,
+        replay_chunk_size: int = 20,
+    ):
+        """Initialize the semantic cached provider."""
+        super().__init__(
+            provider,
+            cache_sampled=cache_sampled,
+            replay_chunk_size=replay_chunk_size,
+        )
+        self.cache = cache or SemanticCache()
+        self.namespace = namespace
+
+    def _key(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None,
+        tools: Any,
+        tool_choice: Any,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, str] | None:
+        """Get the (namespace, prompt) key, or None if not cacheable."""
+        if temperature > 0 and not self.cache_sampled:
+            self.stats.skipped += 1
+            return None
+
+        canonical = [
+            msg.to_dict() if isinstance(msg, Message) else dict(msg) for msg in messages
+        ]
+        if not canonical or canonical[-1].get("role") != "user":
+            self.stats.skipped += 1
+            return None
+
+        scope = request_key(
+            canonical[:-1],
+            model=model or getattr(self.provider, "model", None),
+            tools=tools,
+            tool_choice=tool_choice,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        return f"{self.namespace}:{scope}", str(canonical[-1].get("content") or "")
+
+    async def _get_cached(self, key: tuple[str, str]) -> CompletionResponse | None:
+        """Look up a completion for a similar prompt."""
+        namespace, prompt = key
+        return await self.cache.lookup(prompt, namespace=namespace)
+
+    async def _set_cached(
+        self, key: tuple[str, str], response: CompletionResponse
+    ) -> None:
+        """Cache a completion for a prompt."""
+        namespace, prompt = key
+        await self.cache.store(prompt, response, namespace=namespace)
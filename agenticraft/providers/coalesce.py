@@ -0,0 +1,271 @@
+"""Single-flight coalescing of identical in-flight provider requests.
+
+When many concurrent callers send the same request (for example a fan-out
+workflow classifying the same input), ``CoalescingProvider`` sends it
+upstream once and hands every caller the result. Streaming callers all
+receive every chunk, including callers that join after the stream started.
+
+Unlike ``CachedProvider`` nothing is kept once the request finishes: only
+requests that overlap in time share work.
+
+Example:
+    Coalescing a burst of identical requests::
+
+        import asyncio
+
+        from agenticraft import Agent
+        from agenticraft.providers.coalesce import CoalescingProvider
+
+        agent = Agent(model="gpt-4o-mini", temperature=0)
+        agent.set_provider(CoalescingProvider(agent.provider))
+        await asyncio.gather(*(agent.arun("Classify: ...") for _ in range(20)))
+"""
+
+import asyncio
+import logging
+import weakref
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk, stream_or_replay
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .cache import request_key
+from .wrapper import ProviderWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class CoalesceStats(BaseModel):
+    """Statistics for request coalescing.
+
+    Attributes:
+        requests: Requests received
+        upstream: Requests sent to the wrapped provider
+        coalesced: Requests that joined an in-flight request
+        skipped: Requests not eligible for coalescing
+    """
+
+    requests: int = 0
+    upstream: int = 0
+    coalesced: int = 0
+    skipped: int = 0
+
+
+class _Flight:
+    """An upstream request shared by several callers."""
+
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+        self.callers = 0
+        # Streams only: chunks so far, and a condition signalling new ones
+        self.chunks: list[StreamChunk] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.changed = asyncio.Condition()
+
+    def join(self) -> None:
+        """Add a caller."""
+        self.waiters += 1
+        self.callers += 1
+
+    def leave(self) -> bool:
+        """Drop a caller, cancelling the request if nobody is left.
+
+        Returns:
+            True if the request was cancelled
+        """
+        self.waiters -= 1
+        if self.waiters == 0 and self.task is not None and not self.task.done():
+            self.task.cancel()
+            return True
+        return False
+
+
+class CoalescingProvider(ProviderWrapper):
+    """Provider wrapper that shares identical concurrent requests.
+
+    Requests are identical when their canonical hash (messages, model,
+    tools and sampling parameters) matches. Only deterministic requests
+    (temperature 0) are shared by default; sampled requests go upstream
+    independently unless ``coalesce_sampled`` is set.
+
+    Args:
+        provider: The provider to wrap
+        coalesce_sampled: Also share requests with temperature > 0. Off by
+            default, since callers would then all receive the same sample
+            instead of independent ones
+        normalize: Ignore whitespace differences in message content
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        coalesce_sampled: bool = False,
+        normalize: bool = False,
+    ):
+        """Initialize the coalescing provider."""
+        super().__init__(provider)
+        self.coalesce_sampled = coalesce_sampled
+        self.normalize = normalize
+        self.stats = CoalesceStats()
+        # In-flight requests per event loop
+        self._flights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, _Flight]
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct upstream requests in flight on this loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        return len(self._flights.get(loop, {}))
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion, sharing it with identical in-flight requests."""
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+        self.stats.requests += 1
+        key = self._key("complete", params)
+        if key is None:
+            self.stats.upstream += 1
+            return await self.provider.complete(**params)
+
+        flights = self._loop_flights()
+        flight = flights.get(key)
+        if flight is None:
+            flight = flights[key] = _Flight()
+            self.stats.upstream += 1
+            flight.task = asyncio.create_task(self.provider.complete(**params))
+            flight.task.add_done_callback(lambda _: self._land(flights, key, flight))
+        else:
+            self.stats.coalesced += 1
+
+        flight.join()
+        try:
+            response = await asyncio.shield(flight.task)
+        finally:
+            self._leave(flights, key, flight)
+        # Each caller gets its own copy to annotate
+        response = response.model_copy(deep=True)
+        response.metadata["coalesced"] = flight.callers > 1
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a completion, sharing chunks with identical streams."""
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+        self.stats.requests += 1
+        key = self._key("stream", params)
+        if key is None:
+            self.stats.upstream += 1
+            async for chunk in stream_or_replay(self.provider, params):
+                yield chunk
+            return
+
+        flights = self._loop_flights()
+        flight = flights.get(key)
+        if flight is None:
+            flight = flights[key] = _Flight()
+            self.stats.upstream += 1
+            flight.task = asyncio.create_task(self._pump(flight, params))
+            flight.task.add_done_callback(lambda _: self._land(flights, key, flight))
+        else:
+            self.stats.coalesced += 1
+
+        flight.join()
+        try:
+            index = 0
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(
+                        lambda index=index: len(flight.chunks) > index or flight.done
+                    )
+                    pending = flight.chunks[index:]
+                    finished = flight.done
+                for chunk in pending:
+                    yield chunk
+                index += len(pending)
+                if finished and index == len(flight.chunks):
+                    break
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            self._leave(flights, key, flight)
+
+    def _key(self, kind: str, params: dict[str, Any]) -> str | None:
+        """Get the flight key, or None if the request should not be shared."""
+        if params["temperature"] > 0 and not self.coalesce_sampled:
+            self.stats.skipped += 1
+            return None
+        params = dict(params)
+        params["model"] = params["model"] or getattr(self.provider, "model", None)
+        return f"{kind}:{request_key(normalize=self.normalize, **params)}"
+
+    def _loop_flights(self) -> dict[str, _Flight]:
+        """Get the in-flight requests of the running event loop."""
+        loop = asyncio.get_running_loop()
+        flights = self._flights.get(loop)
+        if flights is None:
+            flights = self._flights[loop] = {}
+        return flights
+
+    @staticmethod
+    def _leave(flights: dict[str, _Flight], key: str, flight: _Flight) -> None:
+        """Drop a caller from a flight.
+
+        A flight cancelled because its last caller left is forgotten at
+        once, so an identical request arriving before the cancellation
+        completes starts a new flight instead of joining the dying one.
+        """
+        if flight.leave() and flights.get(key) is flight:
+            del flights[key]
+
+    @staticmethod
+    def _land(flights: dict[str, _Flight], key: str, flight: _Flight) -> None:
+        """Forget a finished flight so later requests go upstream again."""
+        if flights.get(key) is flight:
+            del flights[key]
+        task = flight.task
+        if task is not None and not task.cancelled():
+            # Mark the error as retrieved; waiters re-raise it themselves
+            task.exception()
+
+    async def _pump(self, flight: _Flight, params: dict[str, Any]) -> None:
+        """Read the upstream stream into a flight's chunk buffer."""
+        try:
+            async for chunk in stream_or_replay(self.provider, params):
+                async with flight.changed:
+                    flight.chunks.append(chunk)
+                    flight.changed.notify_all()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            async with flight.changed:
+                flight.changed.notify_all()
@@ -0,0 +1,54 @@
+"""Error classification shared by the provider wrappers.
+
+``LoadBalancedProvider``, ``RoutingProvider`` and ``RateLimitedProvider``
+decide whether a failed request is worth retrying, elsewhere or later.
+Errors are inspected by the HTTP status found anywhere in their exception
+chain, since provider SDKs wrap the underlying HTTP errors differently.
+"""
+
+from collections.abc import Mapping
+
+from ..core.exceptions import ProviderRateLimitError
+
+# Client errors that would fail on every endpoint (bad request, not found)
+NON_RETRYABLE_STATUS = frozenset({400, 404, 413, 422})
+
+
+def status_code(error: BaseException) -> int | None:
+    """Find the HTTP status code in an exception chain."""
+    seen = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = getattr(current, "response", None)
+        status = getattr(current, "status_code", None) or getattr(
+            response, "status_code", None
+        )
+        if isinstance(status, int):
+            return status
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def rate_limit_details(
+    error: BaseException,
+) -> tuple[bool, float | None, Mapping[str, str] | None]:
+    """Find a rate-limit response in an exception chain.
+
+    Returns:
+        (is_rate_limited, retry_after, response headers)
+    """
+    seen = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = getattr(current, "response", None)
+        headers = getattr(response, "headers", None)
+        status = getattr(current, "status_code", None) or getattr(
+            response, "status_code", None
+        )
+        if isinstance(current, ProviderRateLimitError) or status == 429:
+            retry_after = getattr(current, "retry_after", None)
+            return True, retry_after, headers
+        current = current.__cause__ or current.__context__
+    return False, None, None
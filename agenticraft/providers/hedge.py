@@ -0,0 +1,320 @@
+"""Hedged requests for AgentiCraft providers.
+
+``HedgedProvider`` cuts tail latency by racing a duplicate request when
+the first one is slow. If no response (or, when streaming, no first
+chunk) has arrived by a percentile of recent latency, a second request is
+sent, optionally to another provider such as a different region or base
+URL, and whichever answers first wins; the other request is cancelled.
+
+The trigger delay comes from the latency histogram kept by
+``agenticraft.telemetry.metrics``, and a hedge budget caps the extra
+requests as a fraction of all requests.
+
+Example:
+    Hedging slow completions to a second endpoint::
+
+        from agenticraft import Agent
+        from agenticraft.providers.hedge import HedgedProvider
+        from agenticraft.providers.openai import OpenAIProvider
+
+        agent = Agent(model="gpt-4o-mini")
+        backup = OpenAIProvider(base_url="https://backup.example.com/v1")
+        agent.set_provider(
+            HedgedProvider(agent.provider, hedge_provider=backup, percentile=0.95)
+        )
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk, stream_or_replay
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .wrapper import ProviderWrapper
+
+# Latency histograms need the telemetry extra
+try:
+    from ..telemetry.metrics import MetricsCollector, get_metrics_collector
+
+    HAS_TELEMETRY = True
+except ImportError:
+    HAS_TELEMETRY = False
+    MetricsCollector = Any
+    get_metrics_collector = None
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeStats(BaseModel):
+    """Statistics for hedged requests.
+
+    Attributes:
+        requests: Requests handled
+        hedges: Duplicate requests sent
+        hedge_wins: Hedges that answered before the original request
+        over_budget: Hedges skipped because the budget was spent
+    """
+
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    over_budget: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of requests that were hedged."""
+        return self.hedges / self.requests if self.requests else 0.0
+
+
+class HedgedProvider(ProviderWrapper):
+    """Provider wrapper that races a duplicate request against slow ones.
+
+    Args:
+        provider: The provider to wrap
+        hedge_provider: Provider for duplicate requests (defaults to
+            ``provider``)
+        percentile: Latency percentile after which a request is hedged
+        hedge_budget: Maximum fraction of requests that may be hedged
+        min_samples: Latency measurements needed before hedging starts
+        initial_delay: Hedge delay in seconds until enough measurements
+            exist (None disables hedging until then)
+        metrics: Metrics collector holding the latency histogram (defaults
+            to the global collector)
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        hedge_provider: BaseProvider | None = None,
+        percentile: float = 0.95,
+        hedge_budget: float = 0.05,
+        min_samples: int = 20,
+        initial_delay: float | None = None,
+        metrics: MetricsCollector | None = None,
+    ):
+        """Initialize the hedged provider."""
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        super().__init__(provider)
+        self.hedge_provider = hedge_provider or provider
+        self.percentile = percentile
+        self.hedge_budget = hedge_budget
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.stats = HedgeStats()
+        if metrics is None and HAS_TELEMETRY:
+            metrics = get_metrics_collector()
+        self.metrics = metrics
+
+    def hedge_delay(self, kind: str = "complete") -> float | None:
+        """Get the seconds to wait before hedging a request.
+
+        Args:
+            kind: "complete" for full responses, "first_token" for streams
+
+        Returns:
+            Delay in seconds, or None if the request should not be hedged
+        """
+        latency_ms = None
+        if self.metrics is not None:
+            latency_ms = self.metrics.latency_percentile(
+                self._operation(self.provider, kind), self.percentile, self.min_samples
+            )
+        if latency_ms is None:
+            return self.initial_delay
+        return latency_ms / 1000
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion, hedging it if it is slow."""
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+        self.stats.requests += 1
+        primary = asyncio.create_task(self._timed_complete(self.provider, params))
+        tasks = {primary}
+        try:
+            delay = self.hedge_delay("complete")
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._spend_budget():
+                    hedge = asyncio.create_task(
+                        self._timed_complete(self.hedge_provider, params)
+                    )
+                    tasks.add(hedge)
+            winner = await self._first_success(tasks, primary)
+            return winner.result()
+        finally:
+            for task in tasks:
+                await self._discard(task)
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a completion, hedging it if the first chunk is slow.
+
+        Once a stream has produced its first chunk, the other stream is
+        cancelled and the rest of the response comes from the winner.
+        """
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+        self.stats.requests += 1
+        streams: dict[asyncio.Task, AsyncIterator[StreamChunk]] = {}
+
+        def start(provider: BaseProvider) -> asyncio.Task:
+            stream = stream_or_replay(provider, params)
+            task = asyncio.create_task(self._timed_first_chunk(provider, stream))
+            streams[task] = stream
+            return task
+
+        primary = start(self.provider)
+        try:
+            delay = self.hedge_delay("first_token")
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._spend_budget():
+                    start(self.hedge_provider)
+
+            winner = await self._first_success(set(streams), primary)
+            for task, other in streams.items():
+                if task is not winner:
+                    await self._discard(task, other)
+
+            first = winner.result()
+            if first is None:
+                return
+            yield first
+            async for chunk in streams[winner]:
+                yield chunk
+        finally:
+            for task, other in streams.items():
+                await self._discard(task, other)
+
+    async def _first_success(
+        self, tasks: set[asyncio.Task], primary: asyncio.Task
+    ) -> asyncio.Task:
+        """Wait for the first task to succeed.
+
+        If every task fails, the original request's error is raised.
+        """
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        self.stats.hedge_wins += 1
+                    return task
+                if pending:
+                    logger.debug(f"Hedged request failed: {task.exception()}")
+        # Every request failed; surface the original error
+        raise primary.exception()
+
+    def _spend_budget(self) -> bool:
+        """Reserve a hedge if the budget allows it."""
+        if self.stats.hedges + 1 > self.hedge_budget * self.stats.requests:
+            self.stats.over_budget += 1
+            return False
+        self.stats.hedges += 1
+        return True
+
+    async def _timed_complete(
+        self, provider: BaseProvider, params: dict[str, Any]
+    ) -> CompletionResponse:
+        """Run a completion and record its latency."""
+        start = time.perf_counter()
+        try:
+            response = await provider.complete(**params)
+        except asyncio.CancelledError:
+            self._record_cancelled(provider, "complete", start)
+            raise
+        self._record(provider, "complete", start)
+        return response
+
+    async def _timed_first_chunk(
+        self, provider: BaseProvider, stream: AsyncIterator[StreamChunk]
+    ) -> StreamChunk | None:
+        """Wait for the first chunk of a stream and record the latency."""
+        start = time.perf_counter()
+        try:
+            chunk = await anext(stream, None)
+        except asyncio.CancelledError:
+            self._record_cancelled(provider, "first_token", start)
+            raise
+        self._record(provider, "first_token", start)
+        return chunk
+
+    def _record(self, provider: BaseProvider, kind: str, start: float) -> None:
+        """Record a latency measurement."""
+        if self.metrics is not None:
+            self.metrics.record_latency(
+                self._operation(provider, kind),
+                (time.perf_counter() - start) * 1000,
+            )
+
+    def _record_cancelled(
+        self, provider: BaseProvider, kind: str, start: float
+    ) -> None:
+        """Record a cancelled request if it was slower than the hedge delay.
+
+        A slow loser still tells the histogram that requests can take that
+        long. A loser cancelled sooner (typically a hedge beaten by the
+        original) says nothing about latency and would drag the percentile
+        down, causing ever more hedging, so it is not recorded.
+        """
+        delay = self.hedge_delay(kind)
+        if delay is not None and time.perf_counter() - start > delay:
+            self._record(provider, kind, start)
+
+    @staticmethod
+    def _operation(provider: BaseProvider, kind: str) -> str:
+        """Get the latency histogram operation name for a provider."""
+        name = getattr(provider, "name", None) or type(provider).__name__
+        return f"llm.{name}.{kind}"
+
+    @staticmethod
+    async def _discard(
+        task: asyncio.Task, stream: AsyncIterator[StreamChunk] | None = None
+    ) -> None:
+        """Cancel a losing request and close its stream."""
+        if not task.done():
+            task.cancel()
+        # Unlike awaiting the task, wait() does not raise the loser's outcome,
+        # so a cancellation of the caller still propagates
+        await asyncio.wait([task])
+        if not task.cancelled():
+            task.exception()  # Mark the loser's error as retrieved
+        if stream is not None:
+            try:
+                await stream.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing hedged stream: {e}")
+
+    def validate_auth(self) -> None:
+        """Validate authentication of the wrapped providers."""
+        super().validate_auth()
+        if self.hedge_provider is not self.provider:
+            self.hedge_provider.validate_auth()
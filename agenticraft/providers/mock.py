@@ -0,0 +1,869 @@
+"""Deterministic stand-in LLM for tests and benchmarks.
+
+``MockLLM`` produces scripted or templated responses with configurable
+latency (time-to-first-token, inter-token gaps and jitter), tool calls and
+injected rate limit or server errors. It is served two ways:
+
+- ``MockProvider``: an in-process provider, for agents and workflows
+- ``MockLLMServer``: a local HTTP server speaking the OpenAI, Anthropic and
+  Ollama wire formats, so the real providers (and their HTTP stacks) can
+  be load-tested by pointing ``base_url`` at it
+
+Responses are reproducible: the same seed and requests give the same
+content, latencies and errors.
+
+Example:
+    Load-testing the OpenAI provider without network access::
+
+        from agenticraft.providers.mock import LatencyProfile, MockLLM, MockLLMServer
+        from agenticraft.providers.openai import OpenAIProvider
+
+        llm = MockLLM(
+            responses=["Echo: {last_message}"],
+            latency=LatencyProfile(ttft=0.3, inter_token=0.02, jitter=0.2),
+            rate_limit_rate=0.05,
+        )
+        async with MockLLMServer(llm) as server:
+            provider = OpenAIProvider(api_key="sk-mock", base_url=server.openai_url)
+            await provider.complete([{"role": "user", "content": "Hi"}])
+
+    The server also runs standalone::
+
+        python -m agenticraft.providers.mock --port 8000 --ttft 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from ..core.context import MESSAGE_OVERHEAD_TOKENS, estimate_tokens
+from ..core.exceptions import ProviderError, ProviderRateLimitError
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk, StreamingProvider
+from ..core.types import CompletionResponse, Message, ToolCall, ToolDefinition
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\s*\S+|\s+")
+
+
+class LatencyProfile(BaseModel):
+    """Latency of generated responses.
+
+    Attributes:
+        ttft: Mean time to first token in seconds
+        inter_token: Mean gap between tokens in seconds
+        jitter: Coefficient of variation of both delays (0 is constant)
+        distribution: Shape of the jittered delays; lognormal has the long
+            tail seen from real APIs
+    """
+
+    ttft: float = Field(default=0.0, ge=0)
+    inter_token: float = Field(default=0.0, ge=0)
+    jitter: float = Field(default=0.0, ge=0)
+    distribution: Literal["lognormal", "normal"] = "lognormal"
+
+    def sample(self, mean: float, rng: random.Random) -> float:
+        """Draw a delay with the given mean."""
+        if mean <= 0 or self.jitter <= 0:
+            return mean
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(mean, mean * self.jitter))
+        sigma = math.sqrt(math.log(1 + self.jitter**2))
+        return rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+
+
+class MockResponse(BaseModel):
+    """A scripted response.
+
+    ``content`` may contain the placeholders ``{last_message}``, ``{model}``
+    and ``{turn}``.
+
+    Attributes:
+        content: Response text
+        tool_calls: Tool calls to emit
+    """
+
+    content: str = ""
+    tool_calls: list[ToolCall] = Field(default_factory=list)
+
+
+class MockStats(BaseModel):
+    """Requests served by a mock LLM.
+
+    Attributes:
+        requests: Requests received
+        rate_limited: Requests answered with a rate limit error
+        server_errors: Requests answered with a server error
+        tokens: Tokens generated
+    """
+
+    requests: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    tokens: int = 0
+
+
+class MockReply(BaseModel):
+    """A generated reply, before it is encoded for a wire format."""
+
+    model: str
+    content: str = ""
+    tokens: list[str] = Field(default_factory=list)
+    tool_calls: list[ToolCall] = Field(default_factory=list)
+    finish_reason: str = "stop"
+    prompt_tokens: int = 0
+
+    @property
+    def usage(self) -> dict[str, int]:
+        """Token usage of the reply."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": len(self.tokens),
+            "total_tokens": self.prompt_tokens + len(self.tokens),
+        }
+
+
+class MockLLM:
+    """Scripted, latency-shaped response generator.
+
+    Args:
+        responses: Responses cycled through in order, or a function from the
+            request's messages to a response (defaults to echoing the last
+            message)
+        latency: Latency profile (defaults to no delay)
+        call_tools: Call the first offered tool (with empty arguments) until
+            the conversation contains a tool result
+        rate_limit_rate: Fraction of requests answered with a 429
+        server_error_rate: Fraction of requests answered with a 500
+        retry_after: Retry-After seconds sent with 429 errors
+        seed: Random seed for latencies and injected errors
+    """
+
+    def __init__(
+        self,
+        responses: (
+            list[str | MockResponse]
+            | Callable[[list[dict[str, Any]]], str | MockResponse]
+            | None
+        ) = None,
+        latency: LatencyProfile | None = None,
+        call_tools: bool = False,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        """Initialize the mock LLM."""
+        self.responses = responses
+        self.latency = latency or LatencyProfile()
+        self.call_tools = call_tools
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.retry_after = retry_after
+        self.stats = MockStats()
+        self._rng = random.Random(seed)
+        self._turn = 0
+
+    def error(self) -> int | None:
+        """Decide whether the next request fails.
+
+        Returns:
+            HTTP status to answer with, or None to answer normally
+        """
+        self.stats.requests += 1
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            self.stats.rate_limited += 1
+            return 429
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            self.stats.server_errors += 1
+            return 500
+        return None
+
+    def reply(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str,
+        tools: list[Any] | None = None,
+        max_tokens: int | None = None,
+    ) -> MockReply:
+        """Generate the reply to a request."""
+        self._turn += 1
+        messages = [m.to_dict() if isinstance(m, Message) else m for m in messages]
+        tool_names = [_tool_name(tool) for tool in tools or []]
+
+        if (
+            self.call_tools
+            and tool_names
+            and not any(
+                m.get("role") == "tool" or _has_tool_result(m) for m in messages
+            )
+        ):
+            response = MockResponse(
+                tool_calls=[
+                    ToolCall(id=f"call_{self._turn}", name=tool_names[0], arguments={})
+                ]
+            )
+        elif callable(self.responses):
+            response = self.responses(messages)
+        elif self.responses:
+            response = self.responses[(self._turn - 1) % len(self.responses)]
+        else:
+            response = "Mock response to: {last_message}"
+        if isinstance(response, str):
+            response = MockResponse(content=response)
+
+        content = (
+            response.content.replace("{last_message}", _last_text(messages))
+            .replace("{model}", model)
+            .replace("{turn}", str(self._turn))
+        )
+        tokens = _TOKEN.findall(content)
+        finish_reason = "tool_calls" if response.tool_calls else "stop"
+        if max_tokens is not None and len(tokens) > max_tokens:
+            tokens = tokens[:max_tokens]
+            content = "".join(tokens)
+            finish_reason = "length"
+        self.stats.tokens += len(tokens)
+
+        prompt_tokens = sum(
+            MESSAGE_OVERHEAD_TOKENS + estimate_tokens(_text(m.get("content")))
+            for m in messages
+        )
+        return MockReply(
+            model=model,
+            content=content,
+            tokens=tokens,
+            tool_calls=response.tool_calls,
+            finish_reason=finish_reason,
+            prompt_tokens=prompt_tokens,
+        )
+
+    async def generate(self, reply: MockReply) -> AsyncIterator[str]:
+        """Yield a reply's tokens with the configured latency."""
+        await asyncio.sleep(self.latency.sample(self.latency.ttft, self._rng))
+        for index, token in enumerate(reply.tokens):
+            if index:
+                await self.token_gap()
+            yield token
+
+    async def token_gap(self) -> None:
+        """Wait the time between two generated tokens."""
+        await asyncio.sleep(self.latency.sample(self.latency.inter_token, self._rng))
+
+
+class MockProvider(BaseProvider, StreamingProvider):
+    """In-process provider backed by a ``MockLLM``.
+
+    Args:
+        llm: Response generator (defaults to an echoing, zero-latency one)
+        model: Model name reported in responses
+        **kwargs: ``MockLLM`` arguments when no ``llm`` is given
+    """
+
+    def __init__(self, llm: MockLLM | None = None, model: str = "mock", **kwargs: Any):
+        """Initialize the mock provider."""
+        super().__init__(api_key="mock")
+        self.llm = llm or MockLLM(**kwargs)
+        self.model = model
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a mock completion after the full generation time."""
+        reply = self._reply(messages, model, tools, max_tokens)
+        async for _ in self.llm.generate(reply):
+            pass
+        return CompletionResponse(
+            content=reply.content,
+            tool_calls=reply.tool_calls,
+            finish_reason=reply.finish_reason,
+            usage=reply.usage,
+            metadata={"model": reply.model},
+            model=reply.model,
+        )
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a mock completion token by token."""
+        reply = self._reply(messages, model, tools, max_tokens)
+        metadata = {"model": reply.model}
+        async for token in self.llm.generate(reply):
+            yield StreamChunk(content=token, token=token, metadata=metadata)
+        for tool_call in reply.tool_calls:
+            # Each call's arguments take a token's time to generate
+            await self.llm.token_gap()
+            yield StreamChunk(
+                content="",
+                metadata={
+                    "model": reply.model,
+                    "type": "tool_call",
+                    "tool_call": tool_call.model_dump(),
+                },
+            )
+        yield StreamChunk(
+            content="",
+            is_final=True,
+            metadata={
+                "model": reply.model,
+                "finish_reason": reply.finish_reason,
+                "tool_calls": (
+                    [tc.model_dump() for tc in reply.tool_calls]
+                    if reply.tool_calls
+                    else None
+                ),
+                "usage": reply.usage,
+            },
+        )
+
+    def _reply(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None,
+        tools: list[Any] | None,
+        max_tokens: int | None,
+    ) -> MockReply:
+        """Generate a reply, raising the injected error if any."""
+        status = self.llm.error()
+        if status == 429:
+            raise ProviderRateLimitError("mock", retry_after=self.llm.retry_after)
+        if status is not None:
+            raise ProviderError(f"Mock server error ({status})")
+        return self.llm.reply(messages, model or self.model, tools, max_tokens)
+
+    def validate_auth(self) -> None:
+        """Mock providers need no credentials."""
+
+    def supports_streaming(self) -> bool:
+        """Check if this provider supports streaming.
+
+        Returns:
+            bool: True
+        """
+        return True
+
+
+class _HTTPRequest:
+    """A parsed HTTP request."""
+
+    def __init__(self, method: str, path: str, headers: dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> dict[str, Any]:
+        return json.loads(self.body) if self.body else {}
+
+
+class MockLLMServer:
+    """Local HTTP server speaking the OpenAI, Anthropic and Ollama APIs.
+
+    Endpoints: ``POST /v1/chat/completions`` (OpenAI), ``POST /v1/messages``
+    (Anthropic), and ``POST /api/chat``, ``POST /api/generate``,
+    ``GET /api/tags`` and ``GET /api/ps`` (Ollama). Streaming responses
+    use the formats of the real APIs and honour the latency profile.
+
+    Args:
+        llm: Response generator (defaults to an echoing, zero-latency one)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(
+        self, llm: MockLLM | None = None, host: str = "127.0.0.1", port: int = 0
+    ):
+        """Initialize the server."""
+        self.llm = llm or MockLLM()
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> "MockLLMServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server (Anthropic and Ollama ``base_url``)."""
+        if self._server is None:
+            raise RuntimeError("Mock server is not running")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_url(self) -> str:
+        """OpenAI ``base_url`` of the server."""
+        return f"{self.url}/v1"
+
+    async def start(self) -> None:
+        """Start accepting connections."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        logger.info(f"Mock LLM server listening on {self.url}")
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Run until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle requests on a keep-alive connection."""
+        try:
+            while (request := await _read_request(reader)) is not None:
+                await self._dispatch(request, writer)
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: _HTTPRequest, writer: asyncio.StreamWriter):
+        """Route a request to its wire format."""
+        path = request.path.split("?")[0]
+        if request.method == "GET" and path == "/api/tags":
+            return await _send_json(writer, 200, {"models": [{"name": "mock:latest"}]})
+        if request.method == "GET" and path == "/api/ps":
+            return await _send_json(writer, 200, {"models": []})
+
+        handlers = {
+            "/v1/chat/completions": self._openai,
+            "/chat/completions": self._openai,
+            "/v1/messages": self._anthropic,
+            "/api/chat": self._ollama,
+            "/api/generate": self._ollama_generate,
+        }
+        handler = handlers.get(path)
+        if request.method != "POST" or handler is None:
+            return await _send_json(writer, 404, {"error": f"Unknown path {path}"})
+        body = request.json()
+        status = self.llm.error()
+        if status is not None:
+            return await self._send_error(writer, path, status)
+        await handler(body, writer)
+
+    async def _send_error(
+        self, writer: asyncio.StreamWriter, path: str, status: int
+    ) -> None:
+        """Answer with an injected error in the path's wire format."""
+        kind = "rate_limit_error" if status == 429 else "api_error"
+        message = "Rate limit exceeded" if status == 429 else "Internal server error"
+        if path.startswith("/api/"):
+            payload: dict[str, Any] = {"error": message}
+        elif path == "/v1/messages":
+            payload = {"type": "error", "error": {"type": kind, "message": message}}
+        else:
+            payload = {"error": {"message": message, "type": kind, "code": None}}
+        headers = {"Retry-After": f"{self.llm.retry_after:g}"} if status == 429 else {}
+        await _send_json(writer, status, payload, headers)
+
+    async def _openai(self, body: dict[str, Any], writer: asyncio.StreamWriter):
+        """Serve ``/v1/chat/completions``."""
+        reply = self.llm.reply(
+            body.get("messages", []),
+            body.get("model", "mock"),
+            body.get("tools"),
+            body.get("max_tokens") or body.get("max_completion_tokens"),
+        )
+        response_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        tool_calls = [
+            {
+                "id": tc.id,
+                "type": "function",
+                "function": {"name": tc.name, "arguments": json.dumps(tc.arguments)},
+            }
+            for tc in reply.tool_calls
+        ]
+
+        if not body.get("stream"):
+            content = "".join([t async for t in self.llm.generate(reply)])
+            message: dict[str, Any] = {"role": "assistant", "content": content}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return await _send_json(
+                writer,
+                200,
+                {
+                    "id": response_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": reply.model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": message,
+                            "finish_reason": reply.finish_reason,
+                        }
+                    ],
+                    "usage": reply.usage,
+                },
+            )
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> bytes:
+            data = {
+                "id": response_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": reply.model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        await _start_stream(writer, "text/event-stream")
+        await _send_chunk(writer, chunk({"role": "assistant", "content": ""}))
+        async for token in self.llm.generate(reply):
+            await _send_chunk(writer, chunk({"content": token}))
+        if tool_calls:
+            await _send_chunk(
+                writer,
+                chunk(
+                    {
+                        "tool_calls": [
+                            {"index": i, **tc} for i, tc in enumerate(tool_calls)
+                        ]
+                    }
+                ),
+            )
+        await _send_chunk(writer, chunk({}, reply.finish_reason))
+        await _send_chunk(writer, b"data: [DONE]\n\n")
+        await _end_stream(writer)
+
+    async def _anthropic(self, body: dict[str, Any], writer: asyncio.StreamWriter):
+        """Serve ``/v1/messages``."""
+        messages = list(body.get("messages", []))
+        if body.get("system"):
+            messages.insert(0, {"role": "system", "content": body["system"]})
+        reply = self.llm.reply(
+            messages,
+            body.get("model", "mock"),
+            body.get("tools"),
+            body.get("max_tokens"),
+        )
+        stop_reason = {"stop": "end_turn", "length": "max_tokens"}.get(
+            reply.finish_reason, "tool_use"
+        )
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "model": reply.model,
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": {"input_tokens": reply.prompt_tokens, "output_tokens": 0},
+        }
+        tool_blocks = [
+            {"type": "tool_use", "id": tc.id, "name": tc.name, "input": tc.arguments}
+            for tc in reply.tool_calls
+        ]
+
+        if not body.get("stream"):
+            content = "".join([t async for t in self.llm.generate(reply)])
+            blocks = [{"type": "text", "text": content}] if content else []
+            message.update(
+                content=blocks + tool_blocks,
+                stop_reason=stop_reason,
+                usage={
+                    "input_tokens": reply.prompt_tokens,
+                    "output_tokens": len(reply.tokens),
+                },
+            )
+            return await _send_json(writer, 200, message)
+
+        async def event(data: dict[str, Any]) -> None:
+            await _send_chunk(
+                writer, f"event: {data['type']}\ndata: {json.dumps(data)}\n\n".encode()
+            )
+
+        await _start_stream(writer, "text/event-stream")
+        await event({"type": "message_start", "message": message})
+        index = 0
+        started = False
+        async for token in self.llm.generate(reply):
+            if not started:
+                await event(
+                    {
+                        "type": "content_block_start",
+                        "index": 0,
+                        "content_block": {"type": "text", "text": ""},
+                    }
+                )
+                started = True
+            await event(
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": token},
+                }
+            )
+        if started:
+            await event({"type": "content_block_stop", "index": 0})
+            index = 1
+        for offset, block in enumerate(tool_blocks):
+            await event(
+                {
+                    "type": "content_block_start",
+                    "index": index + offset,
+                    "content_block": {**block, "input": {}},
+                }
+            )
+            await event(
+                {
+                    "type": "content_block_delta",
+                    "index": index + offset,
+                    "delta": {
+                        "type": "input_json_delta",
+                        "partial_json": json.dumps(block["input"]),
+                    },
+                }
+            )
+            await event({"type": "content_block_stop", "index": index + offset})
+        await event(
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                "usage": {"output_tokens": len(reply.tokens)},
+            }
+        )
+        await event({"type": "message_stop"})
+        await _end_stream(writer)
+
+    async def _ollama(self, body: dict[str, Any], writer: asyncio.StreamWriter):
+        """Serve ``/api/chat``."""
+        started = time.perf_counter_ns()
+        reply = self.llm.reply(
+            body.get("messages", []),
+            body.get("model", "mock"),
+            body.get("tools"),
+            body.get("options", {}).get("num_predict"),
+        )
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        def final(content: str) -> dict[str, Any]:
+            message: dict[str, Any] = {"role": "assistant", "content": content}
+            if reply.tool_calls:
+                message["tool_calls"] = [
+                    {"function": {"name": tc.name, "arguments": tc.arguments}}
+                    for tc in reply.tool_calls
+                ]
+            return {
+                "model": reply.model,
+                "created_at": created_at,
+                "message": message,
+                "done": True,
+                "done_reason": "length" if reply.finish_reason == "length" else "stop",
+                "total_duration": time.perf_counter_ns() - started,
+                "load_duration": 0,
+                "prompt_eval_count": reply.prompt_tokens,
+                "eval_count": len(reply.tokens),
+            }
+
+        if body.get("stream") is False:
+            content = "".join([t async for t in self.llm.generate(reply)])
+            return await _send_json(writer, 200, final(content))
+
+        await _start_stream(writer, "application/x-ndjson")
+        async for token in self.llm.generate(reply):
+            line = {
+                "model": reply.model,
+                "created_at": created_at,
+                "message": {"role": "assistant", "content": token},
+                "done": False,
+            }
+            await _send_chunk(writer, (json.dumps(line) + "\n").encode())
+        await _send_chunk(writer, (json.dumps(final("")) + "\n").encode())
+        await _end_stream(writer)
+
+    async def _ollama_generate(
+        self, body: dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve ``/api/generate`` model loads (empty prompts)."""
+        await _send_json(
+            writer,
+            200,
+            {
+                "model": body.get("model", "mock"),
+                "response": "",
+                "done": True,
+                "load_duration": 0,
+            },
+        )
+
+
+async def _read_request(reader: asyncio.StreamReader) -> _HTTPRequest | None:
+    """Read one HTTP/1.1 request, or None when the connection closes."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, path, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        parts = []
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+        await reader.readline()
+        body = b"".join(parts)
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return _HTTPRequest(method, path, headers, body)
+
+
+async def _send_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None = None,
+) -> None:
+    """Send a complete JSON response."""
+    body = json.dumps(payload).encode()
+    head = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        *(f"{name}: {value}" for name, value in (headers or {}).items()),
+    ]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+
+async def _start_stream(writer: asyncio.StreamWriter, content_type: str) -> None:
+    """Send the headers of a chunked streaming response."""
+    writer.write(
+        (
+            "HTTP/1.1 200 OK\r\n"
+            f"Content-Type: {content_type}\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Transfer-Encoding: chunked\r\n\r\n"
+        ).encode()
+    )
+    await writer.drain()
+
+
+async def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+    """Send one chunk of a streaming response."""
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+    await writer.drain()
+
+
+async def _end_stream(writer: asyncio.StreamWriter) -> None:
+    """Finish a chunked streaming response."""
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Error"}
+
+
+def _tool_name(tool: Any) -> str:
+    """Get the name of a tool in any supported format."""
+    if isinstance(tool, ToolDefinition):
+        return tool.name
+    if "function" in tool:
+        return tool["function"]["name"]
+    return tool["name"]
+
+
+def _text(content: Any) -> str:
+    """Get the text of message content (a string or content blocks)."""
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") for block in content if isinstance(block, dict)
+        )
+    return str(content or "")
+
+
+def _has_tool_result(message: dict[str, Any]) -> bool:
+    """Check for Anthropic-style tool result blocks."""
+    content = message.get("content")
+    return isinstance(content, list) and any(
+        isinstance(block, dict) and block.get("type") == "tool_result"
+        for block in content
+    )
+
+
+def _last_text(messages: list[dict[str, Any]]) -> str:
+    """Get the text of the last message."""
+    return _text(messages[-1].get("content")) if messages else ""
+
+
+def main() -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description="Run a local mock LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--response", action="append", help="Scripted response")
+    parser.add_argument("--ttft", type=float, default=0.0)
+    parser.add_argument("--inter-token", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--call-tools", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    llm = MockLLM(
+        responses=args.response,
+        latency=LatencyProfile(
+            ttft=args.ttft, inter_token=args.inter_token, jitter=args.jitter
+        ),
+        call_tools=args.call_tools,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        seed=args.seed,
+    )
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(MockLLMServer(llm, args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,43 @@ from ..core.exceptions import ProviderError
 from ..core.provider import BaseProvider
 from ..core.streaming import StreamChunk, StreamingProvider, StreamInterruptedError
 from ..core.types import CompletionResponse, Message, ToolDefinition
+from .pool import get_http_client
+
+# Optional fast JSON decoding for streamed responses
+try:
+    import orjson
+
+    HAS_ORJSON = True
+    _json_loads = orjson.loads
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+    _json_loads = json.loads
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[bytes]]:
+    """Split a byte stream into newline-delimited JSON records.
+
+    Records are framed on raw bytes and yielded in batches, one batch per
+    network read, so a burst of tokens costs a single iteration step.
+
+    Args:
+        chunks: Raw response body chunks
+
+    Yields:
+        Non-empty records received in one read
+    """
+    buffer = b""
+    async for data in chunks:
+        if buffer:
+            data = buffer + data
+        lines = data.split(b"\n")
+        buffer = lines.pop()
+        records = [line for line in lines if line.strip()]
+        if records:
+            yield records
+    if buffer.strip():
+        yield [buffer]
 
 
 class OllamaProvider(BaseProvider, StreamingProvider):
@@ -50,6 +87,12 @@ class OllamaProvider(BaseProvider, StreamingProvider):
             base_url: Ollama server URL (default: http://localhost:11434)
             model: Model name (default: llama2)
             timeout: Request timeout in seconds (default: 300 for long generations)
+            stream_frame_tokens: Maximum tokens merged into one streamed chunk;
+                only tokens that arrived in the same network read are merged,
+                so framing never delays output (default: 1, no merging)
+            keep_alive: How long the server keeps the model loaded after a
+                request, e.g. "30m", seconds, or -1 for always (default:
+                server setting)
             **kwargs: Additional provider arguments
         """
         # Set defaults for Ollama
@@ -62,6 +105,8 @@ class OllamaProvider(BaseProvider, StreamingProvider):
 
         kwargs.setdefault("timeout", 300)  # Ollama can be slow for first run
         kwargs["api_key"] = "ollama"  # Ollama doesn't need API key
+        self.stream_frame_tokens = max(1, kwargs.pop("stream_frame_tokens", 1))
+        self.keep_alive = kwargs.pop("keep_alive", None)
 
         # Extract and store model
         self.model = kwargs.pop("model", "llama2")
@@ -71,8 +116,23 @@ class OllamaProvider(BaseProvider, StreamingProvider):
 
         super().__init__(**kwargs)
 
-        # Create HTTP client
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+        # HTTP client is borrowed lazily from the shared connection pool
+        self._client: httpx.AsyncClient | None = None
+        self._pooled = False
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client for the Ollama server.
+
+        Uses a pooled client shared by all Ollama providers with the same
+        base URL and timeout, unless a client was supplied explicitly.
+        """
+        if self._client is not None and not self._pooled:
+            return self._client
+
+        self._client = get_http_client("ollama", self.base_url, timeout=self.timeout)
+        self._pooled = True
+        return self._client
 
     async def complete(
         self,
@@ -126,9 +186,13 @@ class OllamaProvider(BaseProvider, StreamingProvider):
 
             # Add any additional options
             for key, value in kwargs.items():
-                if key not in ["model", "messages", "stream"]:
+                if key not in ["model", "messages", "stream", "keep_alive"]:
                     request_body["options"][key] = value
 
+            keep_alive = kwargs.get("keep_alive", self.keep_alive)
+            if keep_alive is not None:
+                request_body["keep_alive"] = keep_alive
+
             # Note: Ollama's tool support is model-dependent
             # For now, we'll include tools in the system prompt if provided
             if tools:
@@ -142,7 +206,7 @@ class OllamaProvider(BaseProvider, StreamingProvider):
                     )
 
             # Make request to Ollama
-            response = await self._client.post("/api/chat", json=request_body)
+            response = await self.client.post("/api/chat", json=request_body)
             response.raise_for_status()
 
             # Parse response
@@ -214,7 +278,7 @@ class OllamaProvider(BaseProvider, StreamingProvider):
             ProviderError: If request fails
         """
         try:
-            response = await self._client.get("/api/tags")
+            response = await self.client.get("/api/tags")
             response.raise_for_status()
             data = response.json()
             return data.get("models", [])
@@ -231,7 +295,7 @@ class OllamaProvider(BaseProvider, StreamingProvider):
             ProviderError: If pull fails
         """
         try:
-            response = await self._client.post(
+            response = await self.client.post(
                 "/api/pull",
                 json={"name": model_name},
                 timeout=None,  # Pulling can take a long time
@@ -240,6 +304,61 @@ class OllamaProvider(BaseProvider, StreamingProvider):
         except Exception as e:
             raise ProviderError(f"Failed to pull model '{model_name}': {e}") from e
 
+    async def load_model(
+        self, model_name: str | None = None, keep_alive: str | int | None = None
+    ) -> dict[str, Any]:
+        """Load a model into memory without generating anything.
+
+        Args:
+            model_name: Model to load (defaults to the instance model)
+            keep_alive: How long to keep the model loaded (defaults to the
+                instance setting)
+
+        Returns:
+            Server response, including ``load_duration`` in nanoseconds
+
+        Raises:
+            ProviderError: If loading fails
+        """
+        model_name = model_name or self.model
+        body: dict[str, Any] = {"model": model_name, "stream": False}
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        try:
+            response = await self.client.post("/api/generate", json=body)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            raise ProviderError(f"Failed to load model '{model_name}': {e}") from e
+
+    async def unload_model(self, model_name: str | None = None) -> None:
+        """Unload a model from memory.
+
+        Args:
+            model_name: Model to unload (defaults to the instance model)
+
+        Raises:
+            ProviderError: If unloading fails
+        """
+        await self.load_model(model_name, keep_alive=0)
+
+    async def list_running_models(self) -> list[dict[str, Any]]:
+        """List models currently loaded in memory.
+
+        Returns:
+            List of loaded model information dictionaries
+
+        Raises:
+            ProviderError: If request fails
+        """
+        try:
+            response = await self.client.get("/api/ps")
+            response.raise_for_status()
+            return response.json().get("models", [])
+        except Exception as e:
+            raise ProviderError(f"Failed to list running Ollama models: {e}") from e
+
     def validate_auth(self) -> None:
         """Validate connection to Ollama.
 
@@ -373,9 +492,13 @@ class OllamaProvider(BaseProvider, StreamingProvider):
 
             # Add any additional options
             for key, value in kwargs.items():
-                if key not in ["model", "messages", "stream"]:
+                if key not in ["model", "messages", "stream", "keep_alive"]:
                     request_body["options"][key] = value
 
+            keep_alive = kwargs.get("keep_alive", self.keep_alive)
+            if keep_alive is not None:
+                request_body["keep_alive"] = keep_alive
+
             # Include tools in system prompt if provided
             if tools:
                 tool_description = self._format_tools_as_text(tools)
@@ -387,67 +510,65 @@ class OllamaProvider(BaseProvider, StreamingProvider):
                     )
 
             # Make streaming request
-            accumulated_content = ""
+            parts: list[str] = []
+            # One metadata dict is shared by all token chunks of the stream
+            token_metadata = {"model": actual_model}
+            frame_tokens = self.stream_frame_tokens
 
             try:
-                async with self._client.stream(
+                async with self.client.stream(
                     "POST", "/api/chat", json=request_body
                 ) as response:
                     response.raise_for_status()
 
-                    # Process stream
-                    async for line in response.aiter_lines():
-                        if not line:
-                            continue
-
-                        try:
-                            # Parse JSON response
-                            data = json.loads(line)
-
-                            # Extract message content
-                            message = data.get("message", {})
-                            content = message.get("content", "")
-
+                    final = None
+                    async for records in iter_ndjson(response.aiter_bytes()):
+                        tokens = []
+                        for record in records:
+                            try:
+                                data = _json_loads(record)
+                            except ValueError:
+                                # Skip malformed JSON lines
+                                continue
+
+                            message = data.get("message")
+                            content = message.get("content") if message else None
                             if content:
-                                accumulated_content += content
-
-                                # Yield content chunk
-                                yield StreamChunk(
-                                    content=content,
-                                    token=content,
-                                    metadata={
-                                        "model": actual_model,
-                                        "eval_count": data.get("eval_count"),
-                                    },
-                                )
-
-                            # Check if this is the final message
+                                tokens.append(content)
+
                             if data.get("done", False):
-                                # Extract final metadata
-                                metadata = {
-                                    "model": actual_model,
-                                    "total_duration": data.get("total_duration"),
-                                    "load_duration": data.get("load_duration"),
-                                    "eval_duration": data.get("eval_duration"),
-                                    "eval_count": data.get("eval_count"),
-                                    "prompt_eval_count": data.get("prompt_eval_count"),
-                                    "total_content": accumulated_content,
-                                }
-
-                                # Yield final chunk
-                                yield StreamChunk(
-                                    content="", is_final=True, metadata=metadata
-                                )
+                                final = data
                                 break
 
-                        except json.JSONDecodeError:
-                            # Skip malformed JSON lines
-                            continue
+                        parts.extend(tokens)
+                        for i in range(0, len(tokens), frame_tokens):
+                            frame = "".join(tokens[i : i + frame_tokens])
+                            yield StreamChunk(
+                                content=frame, token=frame, metadata=token_metadata
+                            )
+
+                        if final is not None:
+                            break
+
+                    if final is not None:
+                        yield StreamChunk(
+                            content="",
+                            is_final=True,
+                            metadata={
+                                "model": actual_model,
+                                "total_duration": final.get("total_duration"),
+                                "load_duration": final.get("load_duration"),
+                                "eval_duration": final.get("eval_duration"),
+                                "eval_count": final.get("eval_count"),
+                                "prompt_eval_count": final.get("prompt_eval_count"),
+                                "total_content": "".join(parts),
+                            },
+                        )
 
             except asyncio.CancelledError:
                 raise StreamInterruptedError(
                     "Ollama stream was interrupted",
-                    partial_response=accumulated_content,
+                    partial_response="".join(parts),
                 )
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
@@ -478,8 +599,14 @@ class OllamaProvider(BaseProvider, StreamingProvider):
 
     async def __aenter__(self):
         """Async context manager entry."""
+        _ = self.client  # Borrow the HTTP client up front
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - close HTTP client."""
-        await self._client.aclose()
+        """Async context manager exit - close HTTP client.
+
+        Pooled clients are shared with other providers and stay open; close
+        them through the pool registry instead.
+        """
+        if self._client is not None and not self._pooled:
+            await self._client.aclose()
@@ -10,8 +10,14 @@ from typing import Any
 from ..core.config import settings
 from ..core.exceptions import ProviderAuthError, ProviderError
 from ..core.provider import BaseProvider
-from ..core.streaming import StreamChunk, StreamingProvider, StreamInterruptedError
+from ..core.streaming import (
+    StreamChunk,
+    StreamingProvider,
+    StreamInterruptedError,
+    ToolCallAccumulator,
+)
 from ..core.types import CompletionResponse, Message, ToolCall, ToolDefinition
+from .pool import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +45,22 @@ class OpenAIProvider(BaseProvider, StreamingProvider):
         super().__init__(**kwargs)
 
         self._client = None
+        self._http_client = None
 
     @property
     def client(self):
-        """Get or create OpenAI client."""
-        if self._client is None:
+        """Get or create OpenAI client.
+
+        The client sends requests through a pooled HTTP client shared by all
+        providers with the same base URL and credentials. It is rebuilt when
+        the pool hands out a different HTTP client (e.g. in a new event loop).
+        """
+        if self._client is not None and self._http_client is None:
+            # Client supplied externally
+            return self._client
+
+        http_client = get_http_client("openai", self.base_url, api_key=self.api_key)
+        if self._client is None or http_client is not self._http_client:
             try:
                 from openai import AsyncOpenAI
 
@@ -52,7 +69,9 @@ class OpenAIProvider(BaseProvider, StreamingProvider):
                     base_url=self.base_url,
                     timeout=self.timeout,
                     max_retries=self.max_retries,
+                    http_client=http_client,
                 )
+                self._http_client = http_client
             except ImportError:
                 raise ProviderError("OpenAI provider requires 'openai' package")
         return self._client
@@ -240,8 +259,10 @@ class OpenAIProvider(BaseProvider, StreamingProvider):
             stream = await self.client.chat.completions.create(**request_params)
 
             # Process stream
-            accumulated_content = ""
-            accumulated_tool_calls = {}
+            parts: list[str] = []
+            # One metadata dict per choice is shared by its token chunks
+            token_metadata: dict[int, dict[str, Any]] = {}
+            tool_call_parts = ToolCallAccumulator()
 
             try:
                 async for chunk in stream:
@@ -253,70 +274,47 @@ class OpenAIProvider(BaseProvider, StreamingProvider):
                     # Handle content chunks
                     if choice.delta and choice.delta.content:
                         content = choice.delta.content
-                        accumulated_content += content
+                        parts.append(content)
 
+                        metadata = token_metadata.get(choice.index)
+                        if metadata is None:
+                            metadata = token_metadata[choice.index] = {
+                                "model": actual_model,
+                                "index": choice.index,
+                            }
                         yield StreamChunk(
                             content=content,
                             token=content,  # For OpenAI, content is the token
-                            metadata={"model": actual_model, "index": choice.index},
+                            metadata=metadata,
                         )
 
-                    # Handle tool call chunks
+                    # Handle tool call chunks. Only the first delta of a call
+                    # carries its ID and name; later ones are keyed by index.
                     if hasattr(choice.delta, "tool_calls") and choice.delta.tool_calls:
                         for tc in choice.delta.tool_calls:
-                            # Skip if no ID
-                            if not hasattr(tc, "id") or tc.id is None:
-                                continue
-
-                            if tc.id not in accumulated_tool_calls:
-                                accumulated_tool_calls[tc.id] = {
-                                    "id": tc.id,
-                                    "name": (
-                                        tc.function.name
-                                        if hasattr(tc, "function")
-                                        and tc.function
-                                        and hasattr(tc.function, "name")
-                                        else ""
-                                    ),
-                                    "arguments": "",
-                                }
-
-                            if (
-                                hasattr(tc, "function")
-                                and tc.function
-                                and hasattr(tc.function, "arguments")
-                                and tc.function.arguments
-                            ):
-                                accumulated_tool_calls[tc.id][
-                                    "arguments"
-                                ] += tc.function.arguments
+                            function = getattr(tc, "function", None)
+                            key = getattr(tc, "index", None)
+                            completed = tool_call_parts.add(
+                                key if key is not None else tc.id,
+                                id=getattr(tc, "id", None),
+                                name=getattr(function, "name", None),
+                                arguments=getattr(function, "arguments", None),
+                            )
+                            for tool_call in completed:
+                                # Lets callers start the tool before the
+                                # model finishes the response
+                                yield StreamChunk(
+                                    content="",
+                                    metadata={
+                                        "model": actual_model,
+                                        "type": "tool_call",
+                                        "tool_call": tool_call.model_dump(),
+                                    },
+                                )
 
                     # Check if this is the final chunk
                     if choice.finish_reason:
-                        # Parse accumulated tool calls
-                        tool_calls = []
-                        for tc_data in accumulated_tool_calls.values():
-                            try:
-                                # Skip if missing required fields
-                                if not tc_data.get("id") or not tc_data.get("name"):
-                                    continue
-
-                                args = (
-                                    json.loads(tc_data["arguments"])
-                                    if tc_data["arguments"]
-                                    else {}
-                                )
-                                tool_calls.append(
-                                    ToolCall(
-                                        id=tc_data["id"],
-                                        name=tc_data["name"],
-                                        arguments=args,
-                                    )
-                                )
-                            except json.JSONDecodeError:
-                                logger.warning(
-                                    f"Failed to parse tool arguments for {tc_data.get('name', 'unknown')}"
-                                )
+                        tool_calls = tool_call_parts.finish()
 
                         # Yield final chunk with metadata
                         yield StreamChunk(
@@ -330,14 +328,14 @@ class OpenAIProvider(BaseProvider, StreamingProvider):
                                     if tool_calls
                                     else None
                                 ),
-                                "total_content": accumulated_content,
+                                "total_content": "".join(parts),
                             },
                         )
 
             except asyncio.CancelledError:
                 raise StreamInterruptedError(
                     "OpenAI stream was interrupted",
-                    partial_response=accumulated_content,
+                    partial_response="".join(parts),
                 )
 
         except Exception as e:
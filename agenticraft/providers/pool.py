@@ -0,0 +1,310 @@
+"""Shared HTTP connection pools for AgentiCraft providers.
+
+Provider instances are created frequently (``Agent.set_provider``,
+``ProviderFactory.create``, short-lived agents in workers). Instead of each
+instance opening its own ``httpx.AsyncClient``, providers borrow a pooled
+client from a process-wide registry keyed by provider, base URL and
+credentials, so keep-alive connections are reused across instances.
+
+Clients are bound to the event loop they were created in, because httpx
+connections cannot be shared between loops. Each loop therefore gets its
+own set of pools, which are dropped automatically when the loop is garbage
+collected. Clients requested outside a running loop (e.g. when a provider
+builds its SDK client at construction time) are kept in a separate detached
+pool, so repeated access does not allocate a new client every time.
+
+Pooled clients also record rate-limit response headers for callers that
+ask for them with ``capture_response_headers()``, so wrappers such as
+``RateLimitedProvider`` can learn quotas from successful responses even
+though the provider SDKs only return parsed bodies.
+
+Example:
+    Closing pooled connections on application shutdown::
+
+        from agenticraft.providers.pool import get_pool_registry
+
+        async with get_pool_registry().lifespan():
+            await agent.arun("Hello")
+        # All pooled clients for this loop are closed here
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+from pydantic import BaseModel, Field
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, str, str, float | None]
+
+# Response headers worth passing on to rate limiters
+RATE_LIMIT_HEADER_PREFIXES = ("x-ratelimit-", "anthropic-ratelimit-", "retry-after")
+
+_captured_headers: ContextVar[dict[str, str] | None] = ContextVar(
+    "agenticraft_captured_headers", default=None
+)
+
+
+class PoolConfig(BaseModel):
+    """Configuration for pooled HTTP clients.
+
+    Attributes:
+        max_connections: Maximum concurrent connections per pool
+        max_keepalive_connections: Maximum idle connections kept alive
+        keepalive_expiry: Seconds an idle connection is kept alive
+        http2: Use HTTP/2 when the ``h2`` package is installed
+    """
+
+    max_connections: int = Field(
+        default_factory=lambda: settings.http_max_connections, gt=0
+    )
+    max_keepalive_connections: int = Field(
+        default_factory=lambda: settings.http_max_keepalive_connections, ge=0
+    )
+    keepalive_expiry: float = Field(
+        default_factory=lambda: settings.http_keepalive_expiry, gt=0
+    )
+    http2: bool = Field(default_factory=lambda: settings.http2_enabled)
+
+    def to_limits(self) -> httpx.Limits:
+        """Convert to httpx connection limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def _http2_available() -> bool:
+    """Check whether httpx can negotiate HTTP/2."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def credentials_digest(api_key: str | None) -> str:
+    """Hash credentials so raw API keys are never used as dictionary keys."""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+async def record_response_headers(response: httpx.Response) -> None:
+    """httpx response hook recording rate-limit headers for the current task.
+
+    Pooled clients install this hook automatically; add it to the
+    ``event_hooks`` of a custom client to get the same behavior. Only the
+    last response carrying such headers is kept, so SDK retries report the
+    final attempt.
+    """
+    captured = _captured_headers.get()
+    if captured is None:
+        return
+    headers = {
+        name.lower(): value
+        for name, value in response.headers.items()
+        if name.lower().startswith(RATE_LIMIT_HEADER_PREFIXES)
+    }
+    if headers:
+        captured.clear()
+        captured.update(headers)
+
+
+@contextmanager
+def capture_response_headers() -> Iterator[dict[str, str]]:
+    """Collect rate-limit headers of HTTP responses received in this block.
+
+    Yields:
+        Dictionary filled with the lower-cased rate-limit headers of the
+        last response received by the current task
+    """
+    captured: dict[str, str] = {}
+    token = _captured_headers.set(captured)
+    try:
+        yield captured
+    finally:
+        try:
+            _captured_headers.reset(token)
+        except ValueError:
+            # Exited from another context, e.g. a stream closed elsewhere
+            pass
+
+
+class ConnectionPoolRegistry:
+    """Process-wide registry of pooled ``httpx.AsyncClient`` instances."""
+
+    def __init__(self, config: PoolConfig | None = None):
+        """Initialize the registry.
+
+        Args:
+            config: Pool configuration (defaults to values from settings)
+        """
+        self.config = config or PoolConfig()
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[PoolKey, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+        self._detached: dict[PoolKey, httpx.AsyncClient] = {}
+
+    def configure(self, **kwargs: Any) -> None:
+        """Update the pool configuration.
+
+        Only clients created after this call use the new configuration.
+
+        Args:
+            **kwargs: PoolConfig fields to update
+        """
+        self.config = self.config.model_copy(update=kwargs)
+
+    def get_client(
+        self,
+        provider: str,
+        base_url: str | None,
+        api_key: str | None = None,
+        timeout: float | None = None,
+    ) -> httpx.AsyncClient:
+        """Get the pooled client for a provider endpoint.
+
+        Args:
+            provider: Provider name (e.g. "openai")
+            base_url: Base URL of the endpoint
+            api_key: Credentials the client is used with
+            timeout: Default request timeout baked into the client
+
+        Returns:
+            The client pooled for the running event loop, or the detached
+            client for this endpoint when called outside a loop
+        """
+        key = (provider, base_url or "", credentials_digest(api_key), timeout)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pools = self._detached
+        else:
+            pools = self._pools.setdefault(loop, {})
+
+        client = pools.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(base_url, timeout)
+            pools[key] = client
+            logger.debug(f"Created pooled HTTP client for {provider} at {base_url}")
+        return client
+
+    def _create_client(
+        self, base_url: str | None, timeout: float | None
+    ) -> httpx.AsyncClient:
+        """Create a new client using the registry configuration."""
+        kwargs: dict[str, Any] = {
+            "limits": self.config.to_limits(),
+            "timeout": timeout,
+            "event_hooks": {"response": [record_response_headers]},
+        }
+        if base_url:
+            kwargs["base_url"] = base_url
+        if self.config.http2 and _http2_available():
+            kwargs["http2"] = True
+        return httpx.AsyncClient(**kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        """Get statistics about the pooled clients.
+
+        Returns:
+            Dictionary with the number of event loops, pooled clients and
+            clients created outside a running loop
+        """
+        clients = [c for pools in self._pools.values() for c in pools.values()]
+        return {
+            "event_loops": len(self._pools),
+            "clients": len(clients),
+            "open_clients": sum(1 for c in clients if not c.is_closed),
+            "detached_clients": len(self._detached),
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled clients.
+
+        Clients owned by the running loop and detached clients are closed
+        gracefully; clients of other loops are released since they cannot be
+        closed from here.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        pools = list(self._pools.items())
+        detached = list(self._detached.values())
+        self._pools = weakref.WeakKeyDictionary()
+        self._detached = {}
+
+        closing = [c for owner, cs in pools if owner is loop for c in cs.values()]
+        for client in closing + detached:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close pooled HTTP client: {e}")
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator["ConnectionPoolRegistry"]:
+        """Context manager that closes all pooled clients on exit."""
+        try:
+            yield self
+        finally:
+            await self.aclose()
+
+
+# Global registry instance
+_registry = ConnectionPoolRegistry()
+
+
+def get_pool_registry() -> ConnectionPoolRegistry:
+    """Get the global connection pool registry.
+
+    Returns:
+        The ConnectionPoolRegistry instance
+    """
+    return _registry
+
+
+def get_http_client(
+    provider: str,
+    base_url: str | None,
+    api_key: str | None = None,
+    timeout: float | None = None,
+) -> httpx.AsyncClient:
+    """Get a pooled HTTP client from the global registry.
+
+    Args:
+        provider: Provider name
+        base_url: Base URL of the endpoint
+        api_key: Credentials the client is used with
+        timeout: Default request timeout baked into the client
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    return _registry.get_client(provider, base_url, api_key=api_key, timeout=timeout)
+
+
+async def aclose_http_clients() -> None:
+    """Close all clients in the global registry."""
+    await _registry.aclose()
+
+
+__all__ = [
+    "PoolConfig",
+    "ConnectionPoolRegistry",
+    "get_pool_registry",
+    "get_http_client",
+    "aclose_http_clients",
+    "capture_response_headers",
+    "credentials_digest",
+    "record_response_headers",
+]
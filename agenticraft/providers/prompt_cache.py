@@ -0,0 +1,262 @@
+"""Automatic prompt prefix caching for Anthropic requests.
+
+Anthropic caches a request prefix (tools, then system prompt, then
+messages) up to each ``cache_control`` breakpoint. Later requests that
+start with the same prefix read it from the cache, which lowers
+time-to-first-token and bills the cached input tokens at a fraction of
+the normal price. Writing a cache entry costs more than a normal input
+token, so breakpoints only pay off on prefixes that are sent again.
+
+``PromptCachePlanner`` places up to four breakpoints per request. It
+remembers the prefixes of earlier requests and marks:
+
+- The tool definitions and the system prompt, once they have been sent
+  before
+- The longest conversation prefix that was sent before, so it is read
+  from the cache
+- The last message, once the conversation has been seen before, so the
+  next turn can read everything up to it
+
+Prefixes shorter than the model's minimum cacheable length are skipped.
+Breakpoints are left to the caller when the request already has some.
+
+Planning is opt-in, because cache writes change the cost of requests:
+pass ``prompt_caching=True`` (or a configured planner) to
+``AnthropicProvider``.
+
+Example:
+    Tuning the planner::
+
+        from agenticraft.providers.anthropic import AnthropicProvider
+        from agenticraft.providers.prompt_cache import PromptCachePlanner
+
+        provider = AnthropicProvider(
+            prompt_caching=PromptCachePlanner(min_tokens=2048, stable_after=0)
+        )
+        response = await provider.complete(messages)
+        print(response.usage["cache_read_input_tokens"])
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import BaseModel
+
+EPHEMERAL = {"type": "ephemeral"}
+
+# Anthropic accepts at most four cache breakpoints per request
+MAX_BREAKPOINTS = 4
+
+
+class PromptCacheStats(BaseModel):
+    """Prompt cache statistics.
+
+    Attributes:
+        requests: Requests planned
+        breakpoints: Breakpoints placed
+        cache_read_tokens: Input tokens read from the cache
+        cache_write_tokens: Input tokens written to the cache
+        uncached_tokens: Input tokens processed without the cache
+    """
+
+    requests: int = 0
+    breakpoints: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    uncached_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of input tokens read from the cache."""
+        total = self.cache_read_tokens + self.cache_write_tokens + self.uncached_tokens
+        return self.cache_read_tokens / total if total else 0.0
+
+
+class _Segment:
+    """A cacheable prefix ending at a tools, system or message block."""
+
+    __slots__ = ("kind", "index", "tokens", "digest", "seen")
+
+    def __init__(self, kind: str, index: int, tokens: int, digest: str, seen: int):
+        self.kind = kind
+        self.index = index
+        self.tokens = tokens
+        self.digest = digest
+        self.seen = seen
+
+
+class PromptCachePlanner:
+    """Places cache breakpoints from observed prefix stability.
+
+    Args:
+        min_tokens: Estimated prefix length below which no breakpoint is
+            placed (Anthropic ignores shorter prefixes)
+        stable_after: Times a prefix must have been sent before it is
+            marked; 0 marks prefixes on first use
+        max_breakpoints: Breakpoints per request
+        max_tracked: Prefix hashes remembered (least recently used are
+            forgotten first)
+    """
+
+    def __init__(
+        self,
+        min_tokens: int = 1024,
+        stable_after: int = 1,
+        max_breakpoints: int = MAX_BREAKPOINTS,
+        max_tracked: int = 10000,
+    ):
+        """Initialize the planner."""
+        self.min_tokens = min_tokens
+        self.stable_after = stable_after
+        self.max_breakpoints = min(max_breakpoints, MAX_BREAKPOINTS)
+        self.max_tracked = max_tracked
+        self.stats = PromptCacheStats()
+        self._seen: OrderedDict[str, int] = OrderedDict()
+
+    def plan(self, request: dict[str, Any]) -> list[str]:
+        """Add cache breakpoints to Anthropic request parameters.
+
+        Blocks that get a breakpoint are copied before being changed, so
+        shared message and tool dictionaries are left untouched.
+
+        Args:
+            request: Request parameters (``model``, ``tools``, ``system``
+                and ``messages``); updated in place
+
+        Returns:
+            Labels of the marked blocks, e.g. ``["system", "messages[4]"]``
+        """
+        self.stats.requests += 1
+        if _has_breakpoints(request):
+            return []
+
+        segments = self._segments(request)
+        chosen = self._choose(segments)
+        self._remember(segments)
+
+        labels = []
+        for segment in chosen:
+            if self._mark(request, segment):
+                labels.append(
+                    segment.kind
+                    if segment.kind != "messages"
+                    else f"messages[{segment.index}]"
+                )
+        self.stats.breakpoints += len(labels)
+        return labels
+
+    def record_usage(self, usage: dict[str, int] | None) -> None:
+        """Account a response's cache usage.
+
+        Args:
+            usage: Usage dictionary as returned by ``AnthropicProvider``
+        """
+        if not usage:
+            return
+        read = usage.get("cache_read_input_tokens", 0)
+        write = usage.get("cache_creation_input_tokens", 0)
+        self.stats.cache_read_tokens += read
+        self.stats.cache_write_tokens += write
+        self.stats.uncached_tokens += usage.get("prompt_tokens", 0) - read - write
+
+    def _segments(self, request: dict[str, Any]) -> list[_Segment]:
+        """Hash every cacheable prefix of a request."""
+        digest = hashlib.sha256(str(request.get("model")).encode())
+        chars = 0
+        segments = []
+
+        def add(kind: str, index: int, block: Any) -> None:
+            nonlocal chars
+            encoded = json.dumps(block, sort_keys=True, default=str).encode()
+            chars += len(encoded)
+            digest.update(encoded)
+            key = digest.hexdigest()
+            segments.append(
+                _Segment(kind, index, chars // 4, key, self._seen.get(key, 0))
+            )
+
+        if request.get("tools"):
+            add("tools", 0, request["tools"])
+        if request.get("system"):
+            add("system", 0, request["system"])
+        for index, message in enumerate(request.get("messages", [])):
+            add("messages", index, message)
+        return segments
+
+    def _choose(self, segments: list[_Segment]) -> list[_Segment]:
+        """Pick breakpoints, most valuable first."""
+        long_enough = [s for s in segments if s.tokens >= self.min_tokens]
+        stable = [s for s in long_enough if s.seen >= self.stable_after]
+        messages = [s for s in long_enough if s.kind == "messages"]
+        last_message = messages[-1] if messages else None
+
+        chosen = []
+        # The longest conversation prefix sent before is read from the cache
+        prefix = next(
+            (s for s in reversed(stable) if s.kind == "messages"),
+            None,
+        )
+        # Once the conversation repeats, the tail becomes the next prefix
+        if last_message is not None and prefix is not None:
+            chosen.append(last_message)
+        if prefix is not None and prefix is not last_message:
+            chosen.append(prefix)
+        for kind in ("system", "tools"):
+            chosen.extend(s for s in stable if s.kind == kind)
+        return chosen[: self.max_breakpoints]
+
+    def _remember(self, segments: list[_Segment]) -> None:
+        """Record the prefixes of a request."""
+        for segment in segments:
+            self._seen[segment.digest] = segment.seen + 1
+            self._seen.move_to_end(segment.digest)
+        while len(self._seen) > self.max_tracked:
+            self._seen.popitem(last=False)
+
+    @staticmethod
+    def _mark(request: dict[str, Any], segment: _Segment) -> bool:
+        """Put a breakpoint on the last block of a segment."""
+        if segment.kind == "tools":
+            tools = request["tools"]
+            request["tools"] = [*tools[:-1], {**tools[-1], "cache_control": EPHEMERAL}]
+            return True
+        if segment.kind == "system":
+            marked = _mark_content(request["system"])
+            if marked is None:
+                return False
+            request["system"] = marked
+            return True
+
+        message = request["messages"][segment.index]
+        marked = _mark_content(message.get("content"))
+        if marked is None:
+            return False
+        messages = list(request["messages"])
+        messages[segment.index] = {**message, "content": marked}
+        request["messages"] = messages
+        return True
+
+
+def _mark_content(content: Any) -> list[dict[str, Any]] | None:
+    """Get content blocks with a breakpoint on the last block."""
+    if isinstance(content, str):
+        if not content:
+            return None
+        return [{"type": "text", "text": content, "cache_control": EPHEMERAL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return [*content[:-1], {**content[-1], "cache_control": EPHEMERAL}]
+    return None
+
+
+def _has_breakpoints(request: dict[str, Any]) -> bool:
+    """Check whether the caller already placed breakpoints."""
+    blocks: list[Any] = list(request.get("tools") or [])
+    if isinstance(request.get("system"), list):
+        blocks.extend(request["system"])
+    for message in request.get("messages", []):
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, list):
+            blocks.extend(content)
+    return any(isinstance(b, dict) and "cache_control" in b for b in blocks)
@@ -0,0 +1,460 @@
+"""Client-side rate limiting for AgentiCraft providers.
+
+``RateLimitedProvider`` wraps any provider and paces requests with token
+buckets for requests per minute (RPM) and tokens per minute (TPM). Buckets
+are shared per (provider, model, api key) through a global registry, so
+every agent using the same quota draws from the same budget.
+
+Limits can be configured up front or learned at runtime: rate-limit
+response headers resize the buckets, ``Retry-After`` pauses all callers,
+and each 429 halves the pacing rate, which then recovers gradually on
+success (additive increase, multiplicative decrease). Headers of successful
+responses are read from the pooled HTTP clients (see
+``capture_response_headers``), so limits are learned before the first 429.
+Waiting callers are served in arrival order.
+
+Example:
+    Staying under an OpenAI quota::
+
+        from agenticraft import Agent
+        from agenticraft.providers.ratelimit import RateLimitedProvider
+
+        agent = Agent(model="gpt-4o-mini")
+        agent.set_provider(
+            RateLimitedProvider(agent.provider, rpm=500, tpm=200_000)
+        )
+"""
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..core.context import MESSAGE_OVERHEAD_TOKENS, estimate_tokens
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamChunk, stream_or_replay
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .errors import rate_limit_details
+from .pool import capture_response_headers, credentials_digest
+from .wrapper import ProviderWrapper
+
+logger = logging.getLogger(__name__)
+
+# Completion tokens assumed when a request does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 1024
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str) -> float | None:
+    """Parse a reset header value into seconds from now.
+
+    Accepts plain seconds ("1.5"), OpenAI durations ("6m0s", "20ms") and
+    timestamps (RFC 3339 or HTTP dates).
+    """
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def estimate_request_tokens(
+    messages: list[Message] | list[dict[str, Any]], max_tokens: int | None = None
+) -> int:
+    """Estimate the tokens a request counts against a TPM quota.
+
+    Providers count the prompt plus the requested completion size.
+    """
+    prompt = 0
+    for msg in messages:
+        content = msg.content if isinstance(msg, Message) else msg.get("content")
+        prompt += MESSAGE_OVERHEAD_TOKENS + estimate_tokens(str(content or ""))
+    return prompt + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity per minute.
+
+    Args:
+        per_minute: Capacity, refilled over one minute (None means unlimited)
+    """
+
+    def __init__(self, per_minute: float | None = None):
+        """Initialize the bucket full."""
+        self.capacity = per_minute
+        self.tokens = per_minute or 0.0
+        self._updated = time.monotonic()
+
+    @property
+    def limited(self) -> bool:
+        """Check whether the bucket enforces a limit."""
+        return self.capacity is not None
+
+    def set_capacity(self, per_minute: float) -> None:
+        """Resize the bucket, keeping the current fill level."""
+        self._refill()
+        if self.capacity is None:
+            self.tokens = per_minute
+        self.capacity = per_minute
+        self.tokens = min(self.tokens, per_minute)
+
+    def wait_time(self, amount: float, rate_scale: float = 1.0) -> float:
+        """Get seconds until ``amount`` tokens are available."""
+        if self.capacity is None:
+            return 0.0
+        self._refill(rate_scale)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / (self.capacity * rate_scale / 60.0)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens (the level may go negative to record debt)."""
+        if self.capacity is not None:
+            self.tokens -= min(amount, self.capacity)
+
+    def credit(self, amount: float) -> None:
+        """Return tokens (or charge more, if negative)."""
+        if self.capacity is not None:
+            self.tokens = min(self.tokens + amount, self.capacity)
+
+    def _refill(self, rate_scale: float = 1.0) -> None:
+        now = time.monotonic()
+        if self.capacity is not None:
+            rate = self.capacity * rate_scale / 60.0
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+
+class RateLimiterStats(BaseModel):
+    """Statistics for a rate limiter.
+
+    Attributes:
+        requests: Requests admitted
+        throttled: Requests that had to wait
+        rate_limited: 429 responses seen
+        wait_seconds: Total time callers spent waiting
+        rate_scale: Current fraction of the configured rate used for pacing
+    """
+
+    requests: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+    wait_seconds: float = 0.0
+    rate_scale: float = 1.0
+
+
+class RateLimiter:
+    """RPM and TPM governor for one quota.
+
+    Args:
+        rpm: Requests per minute (None until learned from headers)
+        tpm: Tokens per minute (None until learned from headers)
+        min_rate_scale: Lowest fraction of the rate after repeated 429s
+        recovery_step: Rate fraction regained per successful request
+    """
+
+    def __init__(
+        self,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        min_rate_scale: float = 0.1,
+        recovery_step: float = 0.05,
+    ):
+        """Initialize the rate limiter."""
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.min_rate_scale = min_rate_scale
+        self.recovery_step = recovery_step
+        self.stats = RateLimiterStats()
+        self._blocked_until = 0.0
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait for capacity for one request using ``tokens`` tokens.
+
+        Callers are admitted in arrival order.
+        """
+        waited = 0.0
+        async with self._lock():
+            while True:
+                delay = max(
+                    self._blocked_until - time.monotonic(),
+                    self.requests.wait_time(1, self.stats.rate_scale),
+                    self.tokens.wait_time(tokens, self.stats.rate_scale),
+                )
+                if delay <= 0:
+                    break
+                waited += delay
+                await asyncio.sleep(delay)
+
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+
+        self.stats.requests += 1
+        if waited:
+            self.stats.throttled += 1
+            self.stats.wait_seconds += waited
+
+    def record_usage(self, estimated: int, actual: int | None) -> None:
+        """Reconcile the estimated token cost with the reported usage."""
+        if actual is not None:
+            self.tokens.credit(estimated - actual)
+
+    def record_success(self, headers: Mapping[str, str] | None = None) -> None:
+        """Recover pacing rate after a successful request."""
+        self.stats.rate_scale = min(1.0, self.stats.rate_scale + self.recovery_step)
+        if headers:
+            self.update_from_headers(headers)
+
+    def record_rate_limited(
+        self,
+        retry_after: float | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> float:
+        """Back off after a 429 response.
+
+        Returns:
+            Seconds all callers will pause
+        """
+        self.stats.rate_limited += 1
+        self.stats.rate_scale = max(self.min_rate_scale, self.stats.rate_scale / 2)
+        if headers:
+            self.update_from_headers(headers)
+            if retry_after is None and "retry-after" in headers:
+                retry_after = parse_reset(headers["retry-after"])
+
+        pause = retry_after if retry_after is not None else 1.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        return pause
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Learn limits from OpenAI or Anthropic rate-limit headers."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = headers.get(f"x-ratelimit-limit-{kind}") or headers.get(
+                f"anthropic-ratelimit-{kind}-limit"
+            )
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}") or headers.get(
+                f"anthropic-ratelimit-{kind}-remaining"
+            )
+            try:
+                if limit is not None:
+                    bucket.set_capacity(float(limit))
+                if remaining is not None and bucket.limited:
+                    bucket.tokens = min(bucket.tokens, float(remaining))
+            except ValueError:
+                logger.debug(f"Ignoring malformed rate limit header: {limit}")
+
+    def _lock(self) -> asyncio.Lock:
+        """Get the FIFO admission lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+
+class RateLimiterRegistry:
+    """Shares rate limiters per (provider, model, api key)."""
+
+    def __init__(self):
+        """Initialize the registry."""
+        self._limiters: dict[tuple[str, str, str], RateLimiter] = {}
+
+    def get(
+        self,
+        provider: str,
+        model: str | None,
+        api_key: str | None = None,
+        rpm: float | None = None,
+        tpm: float | None = None,
+    ) -> RateLimiter:
+        """Get the limiter for a quota, creating it on first use.
+
+        Explicit ``rpm``/``tpm`` values override the current limits.
+        """
+        key = (provider, model or "", credentials_digest(api_key))
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = RateLimiter(rpm=rpm, tpm=tpm)
+        else:
+            if rpm is not None:
+                limiter.requests.set_capacity(rpm)
+            if tpm is not None:
+                limiter.tokens.set_capacity(tpm)
+        return limiter
+
+    def clear(self) -> None:
+        """Forget all limiters."""
+        self._limiters.clear()
+
+
+_registry = RateLimiterRegistry()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """Get the global rate limiter registry."""
+    return _registry
+
+
+class RateLimitedProvider(ProviderWrapper):
+    """Provider wrapper that paces requests within RPM/TPM quotas.
+
+    Rate-limited requests are retried after the advertised delay, so
+    consider creating the wrapped provider with ``max_retries=0`` to
+    disable the SDK's own retries.
+
+    Args:
+        provider: The provider to wrap
+        rpm: Requests per minute for this quota
+        tpm: Tokens per minute for this quota
+        max_retries: Retries after 429 responses
+        registry: Limiter registry (defaults to the global registry)
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        max_retries: int = 3,
+        registry: RateLimiterRegistry | None = None,
+    ):
+        """Initialize the rate limited provider."""
+        super().__init__(provider, max_retries=max_retries)
+        self.registry = registry or get_rate_limiter_registry()
+        self.rpm = rpm
+        self.tpm = tpm
+        # Apply explicit limits to the default model's quota right away
+        self.limiter_for(None)
+
+    def limiter_for(self, model: str | None) -> RateLimiter:
+        """Get the shared limiter for a model of the wrapped provider."""
+        return self.registry.get(
+            getattr(self.provider, "name", None) or type(self.provider).__name__,
+            model or getattr(self.provider, "model", None),
+            self.provider.api_key,
+            rpm=self.rpm,
+            tpm=self.tpm,
+        )
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion once the quota allows it."""
+        limiter = self.limiter_for(model)
+        estimated = estimate_request_tokens(messages, max_tokens)
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(estimated)
+            try:
+                with capture_response_headers() as headers:
+                    response = await self.provider.complete(**params)
+            except Exception as e:
+                if not self._handle_error(limiter, e, attempt):
+                    raise
+                continue
+
+            limiter.record_success(headers)
+            usage = response.usage or {}
+            limiter.record_usage(estimated, usage.get("total_tokens"))
+            return response
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a completion once the quota allows it.
+
+        Requests are only retried if the rate limit is hit before the
+        first chunk arrives.
+        """
+        limiter = self.limiter_for(model)
+        estimated = estimate_request_tokens(messages, max_tokens)
+        params = self.request_params(
+            messages, model, tools, tool_choice, temperature, max_tokens, **kwargs
+        )
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(estimated)
+            started = False
+            try:
+                with capture_response_headers() as headers:
+                    usage = None
+                    async for chunk in stream_or_replay(self.provider, params):
+                        started = True
+                        if chunk.is_final:
+                            usage = chunk.metadata.get("usage")
+                        yield chunk
+            except Exception as e:
+                if started or not self._handle_error(limiter, e, attempt):
+                    raise
+                continue
+
+            limiter.record_success(headers)
+            limiter.record_usage(estimated, (usage or {}).get("total_tokens"))
+            return
+
+    def _handle_error(
+        self, limiter: RateLimiter, error: Exception, attempt: int
+    ) -> bool:
+        """Record a failed attempt.
+
+        Returns:
+            True if the request should be retried
+        """
+        rate_limited, retry_after, headers = rate_limit_details(error)
+        if not rate_limited:
+            return False
+
+        pause = limiter.record_rate_limited(retry_after, headers)
+        if attempt >= self.max_retries:
+            return False
+        logger.warning(
+            f"Rate limited by {type(self.provider).__name__}; "
+            f"retrying in {pause:.2f}s (attempt {attempt + 1}/{self.max_retries})"
+        )
+        return True
@@ -0,0 +1,381 @@
+"""Model residency management for self-hosted Ollama servers.
+
+Loading a model into GPU memory takes seconds, and Ollama unloads idle
+models after a few minutes. ``OllamaResidencyManager`` keeps configured
+models warm and routes requests so they do not thrash model swaps:
+
+- Configured models are preloaded at startup
+- Every request carries a ``keep_alive`` so the server keeps the model
+  loaded
+- Warm models are tracked from request results and ``/api/ps``
+- Requests queue per model, up to the server's parallelism
+- Optionally, only ``max_loaded_models`` distinct models run at once, so
+  requests for another model wait instead of evicting a busy one
+- Load times and cold starts are recorded per model
+
+The manager implements the provider interface, so it can be installed on
+an agent directly.
+
+Example:
+    Keeping two models warm::
+
+        from agenticraft import Agent
+        from agenticraft.providers.ollama import OllamaProvider
+        from agenticraft.providers.residency import OllamaResidencyManager
+
+        manager = OllamaResidencyManager(
+            OllamaProvider(model="llama3"),
+            models=["llama3", "codellama"],
+            keep_alive="1h",
+            max_parallel=4,
+        )
+        async with manager:  # preloads both models
+            agent = Agent(name="Local")
+            agent.set_provider(manager)
+            await agent.arun("Hello")
+            print(manager.stats()["llama3"].cold_starts)
+"""
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..core.streaming import StreamChunk
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .ollama import OllamaProvider
+from .wrapper import ProviderWrapper
+
+logger = logging.getLogger(__name__)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _keep_alive_seconds(keep_alive: str | int | float | None) -> float | None:
+    """Convert an Ollama keep_alive value to seconds (None means forever)."""
+    if keep_alive is None:
+        return 300.0  # Ollama's default
+    if isinstance(keep_alive, (int, float)):
+        return None if keep_alive < 0 else float(keep_alive)
+    keep_alive = keep_alive.strip()
+    if keep_alive.startswith("-"):
+        return None
+    try:
+        return float(keep_alive)  # Unit-less strings are seconds
+    except ValueError:
+        pass
+    parts = _DURATION.findall(keep_alive)
+    if not parts:
+        return 300.0
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+class ModelResidencyStats(BaseModel):
+    """Residency statistics for one model.
+
+    Attributes:
+        requests: Requests served
+        waiting: Requests currently queued for the model
+        active: Requests currently running on the model
+        cold_starts: Requests or preloads whose load took longer than the
+            cold load threshold
+        loads: Load durations reported (including preloads and warm
+            requests)
+        total_load_ms: Total reported load time
+        last_load_ms: Most recent load time
+        total_queue_ms: Total time requests spent queued
+        warm: Whether the model is believed to be loaded
+    """
+
+    requests: int = 0
+    waiting: int = 0
+    active: int = 0
+    cold_starts: int = 0
+    loads: int = 0
+    total_load_ms: float = 0.0
+    last_load_ms: float | None = None
+    total_queue_ms: float = 0.0
+    warm: bool = False
+
+    @property
+    def average_load_ms(self) -> float:
+        """Average model load time."""
+        return self.total_load_ms / self.loads if self.loads else 0.0
+
+
+class OllamaResidencyManager(ProviderWrapper):
+    """Keeps Ollama models warm and queues requests per model.
+
+    Args:
+        provider: Ollama provider used for requests
+        models: Models to preload at startup (defaults to the provider model)
+        keep_alive: How long the server keeps models loaded after a request
+        max_parallel: Concurrent requests per model (match the server's
+            ``OLLAMA_NUM_PARALLEL``)
+        max_loaded_models: Distinct models allowed to run at once (match
+            ``OLLAMA_MAX_LOADED_MODELS``; None for no limit)
+        cold_load_threshold: Load time in seconds above which a request
+            counts as a cold start
+    """
+
+    def __init__(
+        self,
+        provider: OllamaProvider,
+        models: list[str] | None = None,
+        keep_alive: str | int = "30m",
+        max_parallel: int = 1,
+        max_loaded_models: int | None = None,
+        cold_load_threshold: float = 0.5,
+    ):
+        """Initialize the residency manager."""
+        super().__init__(provider)
+        self.models = list(models) if models else [provider.model]
+        self.keep_alive = keep_alive
+        self.max_parallel = max_parallel
+        self.max_loaded_models = max_loaded_models
+        self.cold_load_threshold = cold_load_threshold
+        self._stats: dict[str, ModelResidencyStats] = defaultdict(ModelResidencyStats)
+        self._warm_until: dict[str, float] = {}
+        # Queues are asyncio primitives, so they are kept per event loop
+        self._gates: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _ModelGate
+        ] = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self) -> "OllamaResidencyManager":
+        """Preload the configured models."""
+        await self.preload()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Leave models loaded; they expire with their keep_alive."""
+
+    async def preload(self, models: list[str] | None = None) -> None:
+        """Load models into memory concurrently.
+
+        Failures are logged rather than raised, so one missing model does
+        not block startup.
+
+        Args:
+            models: Models to load (defaults to the configured models)
+        """
+        results = await asyncio.gather(
+            *(self._preload_one(m) for m in models or self.models),
+            return_exceptions=True,
+        )
+        for model, result in zip(models or self.models, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not preload Ollama model '{model}': {result}")
+
+    async def unload(self, model: str) -> None:
+        """Unload a model from server memory."""
+        await self.provider.unload_model(model)
+        self._warm_until.pop(model, None)
+
+    async def refresh(self) -> set[str]:
+        """Sync warm models with the server's loaded models (``/api/ps``).
+
+        Returns:
+            Names of the loaded models
+        """
+        loaded = set()
+        self._warm_until.clear()
+        for info in await self.provider.list_running_models():
+            name = info.get("name") or info.get("model")
+            if not name:
+                continue
+            loaded.add(name)
+            self._warm_until[name] = _parse_expiry(info.get("expires_at"))
+            # Ollama reports tagged names; track the untagged alias too
+            if name.endswith(":latest"):
+                self._warm_until[name[: -len(":latest")]] = self._warm_until[name]
+        return loaded
+
+    def is_warm(self, model: str) -> bool:
+        """Check whether a model is believed to be loaded."""
+        until = self._warm_until.get(model)
+        return until is not None and time.monotonic() < until
+
+    def stats(self) -> dict[str, ModelResidencyStats]:
+        """Get residency statistics per model."""
+        for model, stats in self._stats.items():
+            stats.warm = self.is_warm(model)
+        return dict(self._stats)
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion once the model has capacity."""
+        model = self._model_name(model)
+        kwargs.setdefault("keep_alive", self.keep_alive)
+        async with self._slot(model):
+            response = await self.provider.complete(
+                messages=messages,
+                model=model,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+        self._record_load(model, response.metadata.get("load_duration"), request=True)
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a completion once the model has capacity."""
+        model = self._model_name(model)
+        kwargs.setdefault("keep_alive", self.keep_alive)
+        async with self._slot(model):
+            async for chunk in self.provider.stream(
+                messages=messages,
+                model=model,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            ):
+                if chunk.is_final:
+                    self._record_load(
+                        model, chunk.metadata.get("load_duration"), request=True
+                    )
+                yield chunk
+
+    def _model_name(self, model: str | None) -> str:
+        """Resolve the model a request runs on."""
+        model = model or self.provider.model
+        return model[len("ollama/") :] if model.startswith("ollama/") else model
+
+    def _slot(self, model: str) -> "_ModelSlot":
+        """Get a context manager that holds a request slot for a model."""
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(loop)
+        if gate is None:
+            gate = self._gates[loop] = _ModelGate(
+                self.max_parallel, self.max_loaded_models
+            )
+        return _ModelSlot(gate, model, self._stats[model])
+
+    async def _preload_one(self, model: str) -> None:
+        """Load one model and record its load time."""
+        async with self._slot(model):
+            data = await self.provider.load_model(model, keep_alive=self.keep_alive)
+        self._record_load(model, data.get("load_duration"), request=False)
+
+    def _record_load(
+        self, model: str, load_duration_ns: int | None, request: bool
+    ) -> None:
+        """Record a request result and mark the model warm."""
+        stats = self._stats[model]
+        if request:
+            stats.requests += 1
+        if load_duration_ns:
+            load_ms = load_duration_ns / 1e6
+            stats.loads += 1
+            stats.total_load_ms += load_ms
+            stats.last_load_ms = load_ms
+            if load_ms >= self.cold_load_threshold * 1000:
+                stats.cold_starts += 1
+                logger.info(f"Ollama model '{model}' loaded in {load_ms:.0f}ms")
+
+        ttl = _keep_alive_seconds(self.keep_alive)
+        self._warm_until[model] = (
+            float("inf") if ttl is None else time.monotonic() + ttl
+        )
+
+
+def _parse_expiry(expires_at: str | None) -> float:
+    """Convert an ``/api/ps`` expiry timestamp to a monotonic deadline."""
+    if not expires_at:
+        return float("inf")
+    try:
+        # Ollama uses RFC 3339 with nanoseconds; keep microsecond precision
+        trimmed = re.sub(r"(\.\d{6})\d+", r"\1", expires_at.replace("Z", "+00:00"))
+        remaining = datetime.fromisoformat(trimmed).timestamp() - time.time()
+    except ValueError:
+        return float("inf")
+    return time.monotonic() + remaining
+
+
+class _ModelGate:
+    """Per-model concurrency limits and the loaded-model budget."""
+
+    def __init__(self, max_parallel: int, max_loaded_models: int | None):
+        self.max_parallel = max_parallel
+        self.max_loaded_models = max_loaded_models
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.active: dict[str, int] = defaultdict(int)
+        self.changed = asyncio.Condition()
+
+    def semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphore = self.semaphores.get(model)
+        if semaphore is None:
+            semaphore = self.semaphores[model] = asyncio.Semaphore(self.max_parallel)
+        return semaphore
+
+    def can_run(self, model: str) -> bool:
+        """Check whether a model may run without evicting a busy one."""
+        if self.max_loaded_models is None or self.active.get(model):
+            return True
+        busy = sum(1 for count in self.active.values() if count)
+        return busy < self.max_loaded_models
+
+
+class _ModelSlot:
+    """Holds one request slot on a model for the duration of a request."""
+
+    def __init__(self, gate: _ModelGate, model: str, stats: ModelResidencyStats):
+        self.gate = gate
+        self.model = model
+        self.stats = stats
+
+    async def __aenter__(self) -> None:
+        gate, model = self.gate, self.model
+        queued_at = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            await gate.semaphore(model).acquire()
+            try:
+                async with gate.changed:
+                    await gate.changed.wait_for(lambda: gate.can_run(model))
+                    gate.active[model] += 1
+            except BaseException:
+                gate.semaphore(model).release()
+                raise
+        finally:
+            self.stats.waiting -= 1
+        self.stats.active += 1
+        self.stats.total_queue_ms += (time.perf_counter() - queued_at) * 1000
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        gate, model = self.gate, self.model
+        self.stats.active -= 1
+        async with gate.changed:
+            gate.active[model] -= 1
+            if not gate.active[model]:
+                del gate.active[model]
+            gate.changed.notify_all()
+        gate.semaphore(model).release()
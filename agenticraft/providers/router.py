@@ -0,0 +1,463 @@
+"""Health-aware routing across several providers.
+
+``RoutingProvider`` spreads requests over an ordered or weighted set of
+backends and fails over automatically. Each backend tracks exponentially
+weighted moving averages (EWMA) of latency, time to first token and error
+rate, and has a circuit breaker that opens after repeated failures. Open
+circuits are skipped without a network round trip, and per-attempt
+deadlines turn a hanging backend into a fast reroute.
+
+Example:
+    Routing between OpenAI, Anthropic and a local model::
+
+        from agenticraft import Agent
+        from agenticraft.providers.router import RoutingProvider
+
+        router = RoutingProvider(
+            [
+                ("openai", "gpt-4o-mini"),
+                ("anthropic", "claude-3-haiku-20240307"),
+                ("ollama", "llama3"),
+            ],
+            strategy="health",
+            attempt_timeout=20.0,
+            first_token_timeout=3.0,
+        )
+        agent = Agent(name="Resilient")
+        agent.set_provider(router)
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from ..core.exceptions import ProviderError
+from ..core.provider import BaseProvider, ProviderFactory
+from ..core.streaming import StreamChunk, StreamingProvider, stream_or_replay
+from ..core.types import CompletionResponse, Message, ToolDefinition
+from .errors import NON_RETRYABLE_STATUS, status_code
+
+logger = logging.getLogger(__name__)
+
+RoutingStrategy = Literal["priority", "weighted", "health"]
+
+
+class CircuitBreaker:
+    """Circuit breaker for one backend.
+
+    The circuit opens after ``failure_threshold`` consecutive failures.
+    Once ``recovery_timeout`` has passed it is half-open: a single probe
+    request is let through, and its outcome closes or re-opens the circuit.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        recovery_timeout: Seconds before an open circuit allows a probe
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        """Initialize the circuit breaker closed."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Get the circuit state: "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent (claims the probe if half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """Give up a claimed probe without an outcome (e.g. on cancellation).
+
+        The circuit stays half-open, so the next request becomes the probe.
+        """
+        self._probing = False
+
+
+class BackendHealth(BaseModel):
+    """Health statistics of a backend.
+
+    Attributes:
+        requests: Requests sent
+        failures: Requests that failed or timed out
+        latency_ms: EWMA of successful request latency
+        ttft_ms: EWMA of time to first streamed chunk
+        error_rate: EWMA of the failure indicator
+        circuit: Circuit breaker state
+    """
+
+    requests: int = 0
+    failures: int = 0
+    latency_ms: float | None = None
+    ttft_ms: float | None = None
+    error_rate: float = 0.0
+    circuit: str = "closed"
+
+
+class RouteBackend:
+    """A provider in a routing pool with its health state.
+
+    Args:
+        provider: The backend provider
+        weight: Relative traffic share for the weighted strategy
+        name: Display name (defaults to provider name and model)
+        failure_threshold: Consecutive failures that open the circuit
+        recovery_timeout: Seconds before an open circuit is probed
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        weight: float = 1.0,
+        name: str | None = None,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+    ):
+        """Initialize the backend."""
+        self.provider = provider
+        self.weight = weight
+        model = getattr(provider, "model", None)
+        provider_name = getattr(provider, "name", None) or type(provider).__name__
+        self.name = name or (f"{provider_name}/{model}" if model else provider_name)
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self.health = BackendHealth()
+
+    def score(self, error_penalty_ms: float = 10_000.0) -> float:
+        """Get the routing cost of the backend in milliseconds (lower is better).
+
+        The cost is the EWMA latency (time to first token when streaming)
+        plus a penalty proportional to the error rate. Backends without
+        latency data count as instant, so each is tried.
+        """
+        latency = self.health.ttft_ms or self.health.latency_ms or 0.0
+        return latency + error_penalty_ms * self.health.error_rate
+
+    def record(self, alpha: float, success: bool, latency_ms: float) -> None:
+        """Update health after a request."""
+        health = self.health
+        health.requests += 1
+        health.error_rate += alpha * ((0.0 if success else 1.0) - health.error_rate)
+        if success:
+            self.breaker.record_success()
+            health.latency_ms = _ewma(health.latency_ms, latency_ms, alpha)
+        else:
+            health.failures += 1
+            self.breaker.record_failure()
+        health.circuit = self.breaker.state
+
+    def record_ttft(self, alpha: float, ttft_ms: float) -> None:
+        """Update the time-to-first-token average."""
+        self.health.ttft_ms = _ewma(self.health.ttft_ms, ttft_ms, alpha)
+
+
+def _ewma(current: float | None, value: float, alpha: float) -> float:
+    """Update an exponentially weighted moving average."""
+    return value if current is None else current + alpha * (value - current)
+
+
+class RoutingProvider(BaseProvider, StreamingProvider):
+    """Provider that routes requests to the healthiest of several backends.
+
+    Each request tries the backends in routing order, skipping those with
+    an open circuit, until one succeeds. Invalid requests (HTTP 400, 404,
+    413 or 422) are raised right away without affecting backend health.
+    Backends use their own configured model, so the ``model`` argument of a
+    request is ignored.
+
+    Args:
+        backends: Backends as provider instances, ``(provider_name, model)``
+            pairs for ``ProviderFactory`` (including registered custom
+            providers) or ``RouteBackend`` objects
+        strategy: "priority" (listed order), "weighted" (random by weight,
+            scaled by success rate) or "health" (lowest EWMA latency,
+            penalized by error rate)
+        attempt_timeout: Deadline in seconds for each completion attempt
+        first_token_timeout: Deadline in seconds for the first chunk of
+            each streaming attempt
+        alpha: EWMA smoothing factor
+        failure_threshold: Consecutive failures that open a circuit
+        recovery_timeout: Seconds before an open circuit is probed
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[BaseProvider | tuple[str, str] | RouteBackend],
+        strategy: RoutingStrategy = "health",
+        attempt_timeout: float | None = None,
+        first_token_timeout: float | None = None,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+    ):
+        """Initialize the routing provider."""
+        if not backends:
+            raise ProviderError("RoutingProvider needs at least one backend")
+        if strategy not in ("priority", "weighted", "health"):
+            raise ProviderError(f"Unknown routing strategy: {strategy}")
+
+        self.backends: list[RouteBackend] = []
+        for backend in backends:
+            if isinstance(backend, tuple):
+                provider_name, model = backend
+                backend = ProviderFactory.create(model=model, provider=provider_name)
+            if not isinstance(backend, RouteBackend):
+                backend = RouteBackend(
+                    backend,
+                    failure_threshold=failure_threshold,
+                    recovery_timeout=recovery_timeout,
+                )
+            self.backends.append(backend)
+
+        primary = self.backends[0].provider
+        super().__init__(
+            api_key=primary.api_key,
+            base_url=primary.base_url,
+            timeout=primary.timeout,
+            max_retries=primary.max_retries,
+        )
+        self.strategy = strategy
+        self.attempt_timeout = attempt_timeout
+        self.first_token_timeout = first_token_timeout
+        self.alpha = alpha
+
+    @property
+    def model(self) -> str | None:
+        """Get the model of the first listed backend."""
+        return getattr(self.backends[0].provider, "model", None)
+
+    def route(self) -> list[RouteBackend]:
+        """Get the backends in the order the next request would try them.
+
+        Backends with an open circuit are left out.
+        """
+        available = [b for b in self.backends if b.breaker.state != "open"]
+        if self.strategy == "health":
+            return sorted(available, key=lambda b: b.score())
+        if self.strategy == "weighted":
+            return self._weighted_order(available)
+        return available
+
+    def health(self) -> dict[str, BackendHealth]:
+        """Get the health of every backend by name."""
+        for backend in self.backends:
+            backend.health.circuit = backend.breaker.state
+        return {b.name: b.health for b in self.backends}
+
+    async def complete(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Get a completion from the first healthy backend that answers."""
+        params = {
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        errors = []
+        for backend in self.route():
+            probing = backend.breaker.state == "half_open"
+            if not backend.breaker.allow():
+                continue
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    backend.provider.complete(**params), self.attempt_timeout
+                )
+            except Exception as e:
+                if not self._record_failure(backend, start, e, probing):
+                    raise
+                errors.append(f"{backend.name}: {_describe(e)}")
+                continue
+            except BaseException:
+                # Cancelled: the attempt says nothing about the backend
+                if probing:
+                    backend.breaker.release()
+                raise
+
+            backend.record(self.alpha, True, _elapsed_ms(start))
+            response.metadata["backend"] = backend.name
+            return response
+
+        raise self._exhausted(errors)
+
+    async def stream(
+        self,
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream from the first healthy backend that produces a chunk.
+
+        A backend that fails before its first chunk is failed over; errors
+        after the first chunk are raised, since output was already sent.
+        """
+        params = {
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        errors = []
+        for backend in self.route():
+            probing = backend.breaker.state == "half_open"
+            if not backend.breaker.allow():
+                continue
+            start = time.perf_counter()
+            stream = stream_or_replay(backend.provider, params)
+            settled = False
+            try:
+                try:
+                    first = await asyncio.wait_for(
+                        anext(stream, None), self.first_token_timeout
+                    )
+                except Exception as e:
+                    settled = True
+                    if not self._record_failure(backend, start, e, probing):
+                        raise
+                    errors.append(f"{backend.name}: {_describe(e)}")
+                    continue
+
+                backend.record_ttft(self.alpha, _elapsed_ms(start))
+                try:
+                    if first is not None:
+                        yield first
+                    async for chunk in stream:
+                        yield chunk
+                except Exception as e:
+                    settled = True
+                    self._record_failure(backend, start, e, probing)
+                    raise
+                settled = True
+                backend.record(self.alpha, True, _elapsed_ms(start))
+                return
+            finally:
+                if probing and not settled:
+                    # Cancelled or closed by the consumer mid-attempt
+                    backend.breaker.release()
+                await stream.aclose()
+
+        raise self._exhausted(errors)
+
+    def _weighted_order(self, backends: list[RouteBackend]) -> list[RouteBackend]:
+        """Order backends randomly by weight scaled by success rate."""
+        remaining = list(backends)
+        ordered = []
+        while remaining:
+            weights = [
+                b.weight * max(1.0 - b.health.error_rate, 0.01) for b in remaining
+            ]
+            choice = random.choices(range(len(remaining)), weights=weights)[0]
+            ordered.append(remaining.pop(choice))
+        return ordered
+
+    def _record_failure(
+        self, backend: RouteBackend, start: float, error: Exception, probing: bool
+    ) -> bool:
+        """Record a failed attempt.
+
+        Client errors such as 400 or 422 are not the backend's fault, so
+        they are neither counted against its circuit nor failed over.
+
+        Returns:
+            True if the request may be retried on another backend
+        """
+        if status_code(error) in NON_RETRYABLE_STATUS:
+            if probing:
+                backend.breaker.release()
+            return False
+
+        backend.record(self.alpha, False, _elapsed_ms(start))
+        logger.warning(
+            f"Backend {backend.name} failed ({_describe(error)}); "
+            f"circuit {backend.breaker.state}"
+        )
+        return True
+
+    def _exhausted(self, errors: list[str]) -> ProviderError:
+        """Build the error raised when no backend could answer."""
+        if not errors:
+            return ProviderError("All backends are unavailable (circuits open)")
+        return ProviderError(f"All backends failed: {'; '.join(errors)}")
+
+    def validate_auth(self) -> None:
+        """Validate that at least one backend is usable.
+
+        Raises:
+            ProviderError: If no backend passes validation
+        """
+        errors = []
+        for backend in self.backends:
+            try:
+                backend.provider.validate_auth()
+                return
+            except Exception as e:
+                errors.append(f"{backend.name}: {e}")
+        raise ProviderError(f"No usable backend: {'; '.join(errors)}")
+
+    def supports_streaming(self) -> bool:
+        """Check if this provider supports streaming.
+
+        Returns:
+            bool: True (non-streaming backends are replayed as one chunk)
+        """
+        return True
+
+
+def _elapsed_ms(start: float) -> float:
+    """Get milliseconds since a perf_counter timestamp."""
+    return (time.perf_counter() - start) * 1000
+
+
+def _describe(error: BaseException) -> str:
+    """Describe an error, naming timeouts explicitly."""
+    if isinstance(error, asyncio.TimeoutError):
+        return "timed out"
+    return str(error) or type(error).__name__
@@ -0,0 +1,76 @@
+"""Base class for providers that wrap another provider.
+
+Caching, rate limiting, hedging, coalescing, batching and residency
+management are all implemented as wrappers: they take the provider they
+wrap, add behaviour around ``complete()`` and ``stream()``, and otherwise
+look like the wrapped provider to the agent.
+"""
+
+from typing import Any
+
+from ..core.provider import BaseProvider
+from ..core.streaming import StreamingProvider
+from ..core.types import Message, ToolDefinition
+
+
+class ProviderWrapper(BaseProvider, StreamingProvider):
+    """Provider that adds behaviour around a wrapped provider.
+
+    Connection settings are copied from the wrapped provider, and unknown
+    attributes (e.g. ``model``) are delegated to it. Subclasses implement
+    ``complete()`` and ``stream()``.
+
+    Args:
+        provider: The provider to wrap
+        max_retries: Retry setting of the wrapper (defaults to the wrapped
+            provider's)
+    """
+
+    def __init__(self, provider: BaseProvider, max_retries: int | None = None):
+        """Initialize the provider wrapper."""
+        super().__init__(
+            api_key=provider.api_key,
+            base_url=provider.base_url,
+            timeout=provider.timeout,
+            max_retries=provider.max_retries if max_retries is None else max_retries,
+        )
+        self.provider = provider
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate unknown attributes (e.g. ``model``) to the wrapped provider."""
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    @staticmethod
+    def request_params(
+        messages: list[Message] | list[dict[str, Any]],
+        model: str | None = None,
+        tools: list[ToolDefinition] | list[dict[str, Any]] | None = None,
+        tool_choice: Any | None = None,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Collect request arguments into keyword arguments for the wrapped provider."""
+        return {
+            "messages": messages,
+            "model": model,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+
+    def validate_auth(self) -> None:
+        """Validate authentication of the wrapped provider."""
+        self.provider.validate_auth()
+
+    def supports_streaming(self) -> bool:
+        """Check if this provider supports streaming.
+
+        Returns:
+            bool: True (non-streaming providers are replayed as chunks)
+        """
+        return True
@@ -20,6 +20,7 @@ from .metrics import (
     LatencyTimer,
     MetricsCollector,
     MetricsConfig,
+    get_latency_percentile,
     get_meter,
     initialize_metrics,
     record_error,
@@ -56,6 +57,7 @@ __all__ = [
     "record_latency",
     "record_error",
     "record_memory_operation",
+    "get_latency_percentile",
     "LatencyTimer",
     "initialize_metrics",
     "shutdown_metrics",
@@ -309,6 +309,26 @@ class MetricsCollector:
 
         self.latency_histogram.record(duration_ms, attrs)
 
+    def latency_percentile(
+        self, operation: str, percentile: float, min_samples: int = 1
+    ) -> float | None:
+        """Get a percentile of recent latencies for an operation.
+
+        Args:
+            operation: Operation name
+            percentile: Percentile as a fraction (e.g. 0.95)
+            min_samples: Measurements required before a value is reported
+
+        Returns:
+            Latency in milliseconds, or None if there are too few measurements
+        """
+        latencies = self._latencies.get(operation)
+        if not latencies or len(latencies) < min_samples:
+            return None
+        sorted_latencies = sorted(latencies)
+        index = min(int(len(sorted_latencies) * percentile), len(latencies) - 1)
+        return sorted_latencies[index]
+
     def record_error(
         self,
         error_type: str,
@@ -515,6 +535,25 @@ def record_latency(operation: str, duration_ms: float, **attributes) -> None:
         collector.record_latency(operation, duration_ms, attributes)
 
 
+def get_latency_percentile(
+    operation: str, percentile: float, min_samples: int = 1
+) -> float | None:
+    """Get a percentile of recent latencies for an operation.
+
+    Args:
+        operation: Operation name
+        percentile: Percentile as a fraction (e.g. 0.95)
+        min_samples: Measurements required before a value is reported
+
+    Returns:
+        Latency in milliseconds, or None if not enough data
+    """
+    collector = get_metrics_collector()
+    if collector:
+        return collector.latency_percentile(operation, percentile, min_samples)
+    return None
+
+
 def record_error(error_type: str, operation: str, **attributes) -> None:
     """Record an error.
 
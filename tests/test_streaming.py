@@ -72,6 +72,20 @@ async def test_streaming_response():
     assert str(response) == "Hello world!"
 
 
+def test_streaming_response_complete_text_is_settable():
+    """Test complete_text can be passed in, assigned and extended."""
+    response = StreamingResponse(complete_text="Hello ")
+    response.add_chunk(StreamChunk(content="world"))
+
+    assert response.complete_text == "Hello world"
+    assert "complete_text='Hello world'" in repr(response)
+
+    response.complete_text = "Replaced"
+    response.add_chunk(StreamChunk(content="!"))
+    assert response.complete_text == "Replaced!"
+    assert StreamingResponse().complete_text == ""
+
+
 @pytest.mark.asyncio
 async def test_create_mock_stream():
     """Test mock stream creation."""
@@ -208,26 +208,28 @@ class TestAgent:
         assert "new_tool" in agent._tool_registry.list_tools()
         assert new_tool in agent.config.tools
 
-    def test_agent_clear_memory(self):
+    @pytest.mark.asyncio
+    async def test_agent_clear_memory(self):
         """Test clearing agent memory."""
         agent = Agent(name="MemoryAgent", memory=[ConversationMemory()])
 
         # Add some messages
         agent._messages.append(Message(role=MessageRole.USER, content="Test"))
 
-        # Add to memory store
+        # Add a turn to the memory store
         conv_memory = agent._memory_store.get_memory("conversation")
-        if conv_memory:
-            conv_memory.entries.append(MagicMock())
+        await conv_memory.store(
+            Message(role=MessageRole.USER, content="Test"),
+            Message(role=MessageRole.ASSISTANT, content="Reply"),
+        )
+        assert len(conv_memory.entries) == 2
 
         # Clear memory
         agent.clear_memory()
 
         assert len(agent._messages) == 0
-        # Check that memory entries are cleared (not the memory objects themselves)
-        conv_memory = agent._memory_store.get_memory("conversation")
-        if conv_memory:
-            assert len(conv_memory.entries) == 0
+        # Check that the memory's own entries were cleared
+        assert len(conv_memory.entries) == 0
 
     @pytest.mark.asyncio
     async def test_agent_run_simple(self):
@@ -529,3 +531,355 @@ class TestAgent:
 
         result = await agent._tool_registry.execute("counter")
         assert result == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_parallel_tool_execution(self):
+        """Test concurrent tool execution preserves result order."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        @tool
+        async def slow_echo(value: str, delay: float) -> str:
+            """Echo a value after a delay."""
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            return value
+
+        agent = Agent(
+            name="ParallelAgent",
+            tools=[slow_echo],
+            parallel_tool_calls=True,
+            max_concurrent_tools=2,
+        )
+        calls = [
+            ToolCall(
+                id=f"call_{i}",
+                name="slow_echo",
+                arguments={"value": str(i), "delay": d},
+            )
+            for i, d in enumerate([0.05, 0.01, 0.03, 0.0])
+        ]
+        trace = agent._reasoning.start_trace("parallel")
+
+        results = await agent._execute_tools(calls, trace)
+
+        assert [r.tool_call_id for r in results] == [c.id for c in calls]
+        assert [r.result for r in results] == ["0", "1", "2", "3"]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_tool_timeout(self):
+        """Test per-tool timeout is reported as a tool error."""
+        import asyncio
+
+        @tool
+        async def hang() -> str:
+            """Never finishes in time."""
+            await asyncio.sleep(1)
+            return "late"
+
+        @tool
+        def quick() -> str:
+            """Returns immediately."""
+            return "ok"
+
+        agent = Agent(
+            name="TimeoutAgent",
+            tools=[hang, quick],
+            parallel_tool_calls=True,
+            tool_timeout=0.05,
+        )
+        calls = [
+            ToolCall(id="call_1", name="hang", arguments={}),
+            ToolCall(id="call_2", name="quick", arguments={}),
+        ]
+        trace = agent._reasoning.start_trace("timeout")
+
+        results = await agent._execute_tools(calls, trace)
+
+        assert not results[0].success
+        assert "timed out" in results[0].error
+        assert results[1].success
+        assert results[1].result == "ok"
+
+    @staticmethod
+    def _streaming_tool_agent(events, **config):
+        """Create an agent whose provider streams two tool calls."""
+        import asyncio
+
+        from agenticraft.providers.mock import (
+            LatencyProfile,
+            MockProvider,
+            MockResponse,
+        )
+
+        class RecordingProvider(MockProvider):
+            async def stream(self, *args, **kwargs):
+                async for chunk in super().stream(*args, **kwargs):
+                    if chunk.is_final:
+                        events.append("final")
+                    yield chunk
+
+        @tool
+        async def slow_echo(value: str) -> str:
+            """Echo a value after a delay."""
+            events.append(f"start {value}")
+            await asyncio.sleep(0.02)
+            events.append(f"end {value}")
+            return value
+
+        calls = [
+            ToolCall(id=f"call_{value}", name="slow_echo", arguments={"value": value})
+            for value in ("a", "b")
+        ]
+        agent = Agent(name="StreamToolAgent", tools=[slow_echo], **config)
+        agent._provider = RecordingProvider(
+            responses=[MockResponse(tool_calls=calls), MockResponse(content="done")],
+            latency=LatencyProfile(inter_token=0.05),
+        )
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_starts_tools_early(self):
+        """Test streamed tool calls start before the response completes."""
+        events = []
+        agent = self._streaming_tool_agent(events, stream_tool_execution=True)
+
+        chunks = [chunk async for chunk in agent.stream("go")]
+
+        # The first tool runs while the model streams the second call
+        assert events == ["start a", "end a", "final", "start b", "end b", "final"]
+        assert "".join(c.content for c in chunks) == "done"
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_tool_execution_disabled(self):
+        """Test tools wait for the final chunk by default."""
+        events = []
+        agent = self._streaming_tool_agent(events)
+
+        [chunk async for chunk in agent.stream("go")]
+
+        assert events == ["final", "start a", "end a", "start b", "end b", "final"]
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_first_token_timeout(self):
+        """Test a slow first token interrupts the stream."""
+        from agenticraft.core.streaming import StreamingManager, StreamInterruptedError
+        from agenticraft.providers.mock import LatencyProfile, MockProvider
+
+        agent = Agent(name="DeadlineAgent", first_token_timeout=0.02)
+        agent.streaming_manager = StreamingManager()
+        agent._provider = MockProvider(latency=LatencyProfile(ttft=10))
+
+        with pytest.raises(StreamInterruptedError, match="No first token"):
+            [chunk async for chunk in agent.stream("go", stream_id="req-1")]
+
+        assert agent.streaming_manager.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_interrupt_by_id(self):
+        """Test agent streams and their LLM calls are registered by ID."""
+        import asyncio
+
+        from agenticraft.core.streaming import StreamingManager, StreamInterruptedError
+        from agenticraft.providers.mock import LatencyProfile, MockProvider
+
+        agent = Agent(name="InterruptAgent")
+        agent.streaming_manager = StreamingManager()
+        agent._provider = MockProvider(
+            responses=["one two three"], latency=LatencyProfile(inter_token=10)
+        )
+        stream = agent.stream("go", stream_id="req-1")
+
+        assert (await stream.__anext__()).content == "one"
+        registered = {s.stream_id for s in agent.streaming_manager.streams}
+        reader = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.01)
+        agent.streaming_manager.interrupt_stream("req-1")
+
+        with pytest.raises(StreamInterruptedError, match="req-1 was interrupted"):
+            await reader
+        assert registered == {"req-1", "req-1:llm-1"}
+        assert agent.streaming_manager.active_count == 0
+
+
+class TestAgentToolLoop:
+    """Test multi-round tool execution and its budgets."""
+
+    @staticmethod
+    def _agent(responses, **config):
+        """Create an agent whose provider replays scripted responses."""
+        from agenticraft.providers.mock import MockProvider, MockResponse
+
+        requests = []
+
+        class RecordingProvider(MockProvider):
+            async def complete(self, messages, tools=None, **kwargs):
+                requests.append({"messages": len(messages), "tools": tools})
+                return await super().complete(messages, tools=tools, **kwargs)
+
+        @tool
+        def lookup(key: str) -> str:
+            """Look up a value."""
+            return key.upper()
+
+        agent = Agent(name="LoopAgent", tools=[lookup], **config)
+        agent._provider = RecordingProvider(
+            responses=[
+                (
+                    MockResponse(
+                        tool_calls=[
+                            ToolCall(
+                                id=f"call_{i}", name="lookup", arguments={"key": r}
+                            )
+                        ]
+                    )
+                    if r != "answer"
+                    else MockResponse(content="the answer")
+                )
+                for i, r in enumerate(responses)
+            ]
+        )
+        return agent, requests
+
+    @pytest.mark.asyncio
+    async def test_tools_are_chained_across_rounds(self):
+        """Test the agent keeps calling tools until the model answers."""
+        agent, requests = self._agent(["a", "b", "answer"])
+
+        response = await agent.arun("go")
+
+        assert response.content == "the answer"
+        assert [tc["arguments"] for tc in response.tool_calls] == [
+            {"key": "a"},
+            {"key": "b"},
+        ]
+        # Each round adds its assistant message and one tool result
+        assert [r["messages"] for r in requests] == [2, 4, 6]
+        assert all(r["tools"] for r in requests)
+        assert response.metadata["tool_loop"]["rounds"] == 2
+        assert response.metadata["tool_loop"]["stopped"] is None
+        assert "Completed tool round 2" in response.reasoning
+
+    @pytest.mark.asyncio
+    async def test_max_tool_rounds(self):
+        """Test further tool calls are withheld once the rounds are used."""
+        agent, requests = self._agent(["a", "b", "answer"], max_tool_rounds=1)
+
+        response = await agent.arun("go")
+
+        assert response.content == "the answer"
+        assert len(response.tool_calls) == 1
+        assert requests[-2]["tools"] and requests[-1]["tools"] is None
+        # The withheld call is not added to the conversation
+        assert requests[-1]["messages"] == requests[-2]["messages"]
+        assert response.metadata["tool_loop"]["stopped"] == "max_tool_rounds"
+        assert "Tool budget reached" in response.reasoning
+
+    @pytest.mark.asyncio
+    async def test_budget_not_reported_when_model_answers(self):
+        """Test using up a budget only counts when tools were withheld."""
+        agent, requests = self._agent(["a", "answer"], max_tool_rounds=1)
+
+        response = await agent.arun("go")
+
+        assert response.content == "the answer"
+        assert len(requests) == 2
+        assert response.metadata["tool_loop"]["stopped"] is None
+
+    def test_max_tool_rounds_must_allow_a_round(self):
+        """Test a loop that could never run tools is rejected."""
+        with pytest.raises(ValueError, match="max_tool_rounds"):
+            AgentConfig(name="NoRounds", max_tool_rounds=0)
+
+    @pytest.mark.asyncio
+    async def test_token_budget(self):
+        """Test the loop winds down once the token budget is used."""
+        agent, requests = self._agent(["a", "answer"], tool_loop_token_budget=1)
+
+        response = await agent.arun("go")
+
+        assert response.content == "the answer"
+        assert len(response.tool_calls) == 0
+        assert [r["tools"] is None for r in requests] == [False, True]
+        assert response.metadata["tool_loop"]["stopped"] == "token_budget"
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test the loop winds down once the time budget is used."""
+        agent, requests = self._agent(["a", "answer"], tool_loop_timeout=1e-9)
+
+        response = await agent.arun("go")
+
+        assert response.content == "the answer"
+        assert response.tool_calls == []
+        assert response.metadata["tool_loop"]["stopped"] == "timeout"
+
+
+class TestAgentBatch:
+    """Test batch execution APIs."""
+
+    @staticmethod
+    def _echo_provider():
+        """Provider that echoes the last user message after a short delay."""
+        import asyncio
+
+        async def complete(messages, **kwargs):
+            prompt = [m for m in messages if m["role"] == "user"][-1]["content"]
+            if prompt == "boom":
+                raise RuntimeError("provider exploded")
+            await asyncio.sleep(0.01 if prompt.endswith("slow") else 0)
+            response = MagicMock()
+            response.content = f"echo: {prompt}"
+            response.tool_calls = []
+            response.metadata = {"history": len(messages)}
+            return response
+
+        provider = AsyncMock()
+        provider.complete = AsyncMock(side_effect=complete)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_abatch_preserves_order_and_isolates_history(self):
+        """Test abatch returns ordered results without sharing messages."""
+        agent = Agent(name="BatchAgent", memory=[ConversationMemory()])
+        agent._provider = self._echo_provider()
+
+        prompts = ["one slow", "two", "three slow", "four"]
+        results = await agent.abatch(prompts, max_concurrency=2)
+
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.response.content for r in results] == [f"echo: {p}" for p in prompts]
+        # Each item saw only the system prompt and its own user message
+        assert all(r.response.metadata["history"] == 2 for r in results)
+        # The parent agent's state is untouched
+        assert agent._messages == []
+        assert not agent._memory_store.get_memory("conversation").entries
+
+    @pytest.mark.asyncio
+    async def test_arun_many_reports_failures_per_item(self):
+        """Test a failing prompt does not abort the batch."""
+        agent = Agent(name="BatchAgent")
+        agent._provider = self._echo_provider()
+
+        results = [r async for r in agent.arun_many(["ok", "boom", "fine"])]
+
+        assert len(results) == 3
+        by_index = {r.index: r for r in results}
+        assert by_index[0].success
+        assert not by_index[1].success
+        assert "provider exploded" in by_index[1].error
+        assert by_index[2].response.content == "echo: fine"
+
+    @pytest.mark.asyncio
+    async def test_arun_many_rejects_invalid_concurrency(self):
+        """Test max_concurrency must be positive."""
+        agent = Agent(name="BatchAgent")
+
+        with pytest.raises(ValueError, match="max_concurrency"):
+            await agent.abatch(["hi"], max_concurrency=0)
@@ -0,0 +1,194 @@
+"""Unit tests for token-budget context assembly."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agenticraft.core.agent import Agent
+from agenticraft.core.context import (
+    ContextBuilder,
+    context_window_for,
+    estimate_tokens,
+)
+from agenticraft.core.types import CompletionResponse, Message, MessageRole
+
+
+def word_count(text: str) -> int:
+    """Count whitespace separated words."""
+    return len(text.split())
+
+
+def turns(count: int) -> list[Message]:
+    """Create alternating user/assistant messages."""
+    return [
+        Message(
+            role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+            content=f"message {i} " + "word " * 8,
+        )
+        for i in range(count)
+    ]
+
+
+class TestContextBuilder:
+    """Test ContextBuilder packing."""
+
+    def test_unlimited_budget_keeps_everything_in_order(self):
+        """Test all messages are sent in chronological order."""
+        history = turns(4) + [Message(role=MessageRole.USER, content="now")]
+        memory = [Message(role=MessageRole.ASSISTANT, content="remembered")]
+
+        messages, stats = ContextBuilder(word_count).build(
+            "Be helpful", history, memory, user_context={"user": "Ann"}
+        )
+
+        assert messages[0]["role"] == "system"
+        assert "user: Ann" in messages[0]["content"]
+        assert messages[1]["content"] == "remembered"
+        assert [m["content"] for m in messages[2:6]] == [m.content for m in history[:4]]
+        assert messages[-1]["content"] == "now"
+        assert stats.tokens_saved == 0
+        assert stats.budget is None
+
+    def test_budget_drops_oldest_turns_first(self):
+        """Test older turns are dropped but the prompt is always kept."""
+        history = turns(10) + [Message(role=MessageRole.USER, content="now")]
+        builder = ContextBuilder(word_count)
+        per_turn = builder.count_message(history[0])
+        required = builder.count_message(history[-1]) * 2  # "sys" and "now"
+
+        messages, stats = builder.build("sys", history, budget=required + per_turn * 3)
+
+        assert [m["content"] for m in messages[1:-1]] == [
+            m.content for m in history[7:10]
+        ]
+        assert messages[-1]["content"] == "now"
+        assert stats.dropped_messages == 7
+        assert stats.tokens_saved == per_turn * 7
+        assert stats.used_tokens <= stats.budget
+
+    def test_priorities_and_deduplication(self):
+        """Test memory can take precedence and duplicates are sent once."""
+        history = turns(4) + [Message(role=MessageRole.USER, content="now")]
+        memory = [history[3], Message(role=MessageRole.USER, content="fact")]
+        builder = ContextBuilder(word_count, priorities=("memory", "recent"))
+        per_turn = builder.count_message(history[0])
+
+        messages, stats = builder.build(
+            "sys", history, memory, budget=20 + per_turn + 5
+        )
+
+        contents = [m["content"] for m in messages]
+        assert contents.count(history[3].content) == 1
+        assert "fact" in contents
+        assert history[0].content not in contents
+        assert stats.tokens_saved > 0
+
+    def test_repeated_turns_and_tool_calls_are_kept(self):
+        """Test only memory is de-duplicated, never the history itself."""
+
+        def call(call_id):
+            return Message(
+                role=MessageRole.ASSISTANT,
+                content="",
+                tool_calls=[{"id": call_id, "type": "function"}],
+            )
+
+        def result(call_id):
+            return Message(
+                role=MessageRole.TOOL,
+                content="done",
+                metadata={"tool_call_id": call_id},
+            )
+
+        history = [
+            Message(role=MessageRole.USER, content="continue"),
+            Message(role=MessageRole.ASSISTANT, content="ok"),
+            Message(role=MessageRole.USER, content="continue"),
+            Message(role=MessageRole.ASSISTANT, content="ok"),
+            call("a"),
+            result("a"),
+            call("b"),
+            result("b"),
+            Message(role=MessageRole.USER, content="continue"),
+        ]
+        memory = [history[4], Message(role=MessageRole.ASSISTANT, content="ok")]
+
+        messages, _ = ContextBuilder(word_count).build("sys", history, memory)
+
+        assert messages[1:] == [m.to_dict() for m in history]
+
+    def test_over_budget_required_messages(self):
+        """Test required messages are kept even if they exceed the budget."""
+        history = [Message(role=MessageRole.USER, content="a long prompt " * 10)]
+
+        messages, stats = ContextBuilder(word_count).build("sys", history, budget=5)
+
+        assert len(messages) == 2
+        assert stats.over_budget
+
+    def test_counts_are_cached(self):
+        """Test each text is tokenized once."""
+        tokenizer = MagicMock(side_effect=word_count)
+        builder = ContextBuilder(tokenizer)
+        history = turns(3)
+
+        builder.build("sys", history)
+        calls = tokenizer.call_count
+        builder.build("sys", history)
+
+        assert tokenizer.call_count == calls
+
+    def test_model_windows(self):
+        """Test context windows resolve by longest prefix."""
+        assert context_window_for("gpt-4") == 8_192
+        assert context_window_for("gpt-4o-mini") == 128_000
+        assert context_window_for("claude-3-opus-20240229") == 200_000
+        assert context_window_for("ollama/llama2") == 4_096
+        assert context_window_for("unknown-model") == 8_192
+        assert estimate_tokens("abcdefgh") == 2
+
+
+class TestAgentContextBudget:
+    """Test agents assemble context within their budget."""
+
+    @pytest.mark.asyncio
+    async def test_agent_reports_context_stats(self):
+        """Test the response reports tokens saved by the budget."""
+        agent = Agent(name="Budget", max_context_tokens=60, tokenizer=word_count)
+        provider = MagicMock()
+        provider.complete = AsyncMock(
+            return_value=CompletionResponse(content="ok " * 10, model="m")
+        )
+        agent._provider = provider
+
+        for i in range(5):
+            response = await agent.arun(f"question {i} " + "padding " * 10)
+
+        sent = provider.complete.call_args.kwargs["messages"]
+        context = response.metadata["context"]
+        assert context["budget"] == 60
+        assert context["used_tokens"] <= 60
+        assert context["tokens_saved"] > 0
+        assert sent[-1]["content"].startswith("question 4")
+        assert not any(m["content"].startswith("question 0") for m in sent)
+
+    @pytest.mark.asyncio
+    async def test_history_is_capped_by_default(self):
+        """Test only the most recent messages are sent unless opted out."""
+        agent = Agent(name="Capped", tokenizer=word_count)
+        provider = MagicMock()
+        provider.complete = AsyncMock(
+            return_value=CompletionResponse(content="ok", model="m")
+        )
+        agent._provider = provider
+
+        for i in range(8):
+            await agent.arun(f"question {i}")
+        sent = provider.complete.call_args.kwargs["messages"]
+        assert len(sent) == 1 + 10
+        assert sent[2]["content"] == "question 3"
+
+        agent.config.max_history_messages = None
+        await agent.arun("question 8")
+        sent = provider.complete.call_args.kwargs["messages"]
+        assert len(sent) == 1 + 17
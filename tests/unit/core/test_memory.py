@@ -10,18 +10,22 @@ This module tests the memory functionality including:
 
 import asyncio
 from datetime import datetime
+from unittest.mock import MagicMock
 
 import pytest
 
+from agenticraft.core import memory as memory_module
 from agenticraft.core.memory import (
     BaseMemory,
     ConversationMemory,
+    EmbeddingIndex,
     KnowledgeMemory,
     MemoryEntry,
     MemoryStore,
     MemoryType,
+    SemanticCache,
 )
-from agenticraft.core.types import Message, MessageRole
+from agenticraft.core.types import CompletionResponse, Message, MessageRole
 
 
 class TestMemoryEntry:
@@ -165,6 +169,38 @@ class TestConversationMemory:
         assert "A4" in recent[0].content  # Most recent is assistant response
         assert "Q4" in recent[1].content  # Then user question
 
+    @pytest.mark.asyncio
+    async def test_entries_are_materialized_lazily(self):
+        """Test stored turns keep the original messages without copies."""
+        memory = ConversationMemory(max_entries=4)
+        user_msg = Message(role=MessageRole.USER, content="Hi")
+        assistant_msg = Message(role=MessageRole.ASSISTANT, content="Hello")
+
+        entry_id = await memory.store(user_msg, assistant_msg)
+
+        assert memory.get_messages()[0] is user_msg
+        assert memory.entries[1].id == entry_id
+        assert memory.entries[1].id == memory.entries[1].id
+        assert memory.entries[1].metadata["original_message"]["content"] == "Hello"
+        assert await memory.size() == 2
+
+        with pytest.raises(AttributeError):
+            memory.entries.append(memory.entries[0])
+
+    @pytest.mark.asyncio
+    async def test_resize_keeps_newest(self):
+        """Test shrinking capacity keeps the newest entries."""
+        memory = ConversationMemory(max_entries=6)
+        for i in range(3):
+            await memory.store(
+                Message(role=MessageRole.USER, content=f"Q{i}"),
+                Message(role=MessageRole.ASSISTANT, content=f"A{i}"),
+            )
+
+        memory.max_entries = 2
+
+        assert [e.content for e in memory.entries] == ["User: Q2", "Assistant: A2"]
+
     def test_clear_memory(self):
         """Test clearing conversation memory."""
         memory = ConversationMemory()
@@ -185,7 +221,7 @@ class TestKnowledgeMemory:
         """Test creating knowledge memory."""
         memory = KnowledgeMemory()
 
-        assert memory.entries == []
+        assert memory.entries == ()
         assert memory.embeddings is None
 
     @pytest.mark.asyncio
@@ -282,6 +318,208 @@ class TestKnowledgeMemory:
         assert all(isinstance(x, float) for x in memory.entries[0].embedding)
 
 
+def axis_embedding(text: str) -> list[float]:
+    """Deterministic embedding on three topic axes."""
+    words = text.lower().split()
+    return [
+        float("paris" in words or "france" in words),
+        float("london" in words or "england" in words),
+        float("python" in words) + 0.05,
+    ]
+
+
+class TestKnowledgeMemorySimilarity:
+    """Test embedding-based KnowledgeMemory search."""
+
+    FACTS = [
+        "Paris is the capital of France",
+        "London is the capital of England",
+        "Python is a programming language",
+        "The Eiffel Tower is in Paris",
+    ]
+
+    @pytest.fixture
+    async def memory(self):
+        """Create a knowledge memory with deterministic embeddings."""
+        memory = KnowledgeMemory(use_embeddings=True, embedding_fn=axis_embedding)
+        for fact in self.FACTS:
+            await memory.store_knowledge(fact)
+        return memory
+
+    @pytest.mark.asyncio
+    async def test_ranks_by_similarity(self, memory):
+        """Test results are ordered by embedding similarity."""
+        results = await memory.search("tell me about france", max_results=2)
+
+        assert {r.content for r in results} == {self.FACTS[0], self.FACTS[3]}
+
+    @pytest.mark.asyncio
+    async def test_hybrid_scoring_prefers_keyword_matches(self):
+        """Test keyword overlap breaks ties between similar entries."""
+        memory = KnowledgeMemory(
+            use_embeddings=True, embedding_fn=axis_embedding, keyword_weight=0.5
+        )
+        for fact in self.FACTS:
+            await memory.store_knowledge(fact)
+
+        results = await memory.search("Eiffel Tower in France", max_results=1)
+
+        assert results[0].content == "The Eiffel Tower is in Paris"
+
+    @pytest.mark.asyncio
+    async def test_search_many_matches_single_queries(self, memory):
+        """Test batch search returns the same results as individual searches."""
+        queries = ["france", "england", "python"]
+
+        batch = await memory.search_many(queries, max_results=1)
+
+        for query, results in zip(queries, batch, strict=True):
+            assert results == await memory.search(query, max_results=1)
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete_keep_index_in_sync(self, memory):
+        """Test modifications are reflected without rebuilding."""
+        paris, london, _, eiffel = (entry.id for entry in memory.entries)
+
+        await memory.delete_knowledge(paris)
+        await memory.update_knowledge(london, "France has great food")
+
+        results = await memory.search("france", max_results=2)
+        assert {r.id for r in results} == {london, eiffel}
+        assert paris not in memory.embeddings
+        assert len(memory.embeddings) == 3
+        assert [e.id for e in memory.entries] == [
+            london,
+            memory.entries[1].id,
+            eiffel,
+        ]
+        assert (await memory.get_recent(1))[0].id == eiffel
+
+    @pytest.mark.asyncio
+    async def test_min_score_drops_unrelated_entries(self, memory):
+        """Test results below the similarity floor are not returned."""
+        results = await memory.search("london")
+
+        assert [r.content for r in results] == [self.FACTS[1]]
+
+        memory.min_score = 0.0
+        assert len(await memory.search("london")) == 4
+
+    @pytest.mark.asyncio
+    async def test_placeholder_embeddings_use_substring_search(self):
+        """Test search without an embedding_fn keeps substring matching."""
+        memory = KnowledgeMemory(use_embeddings=True)
+        for fact in self.FACTS:
+            await memory.store_knowledge(fact)
+
+        results = await memory.search("Paris")
+
+        assert [r.content for r in results] == [self.FACTS[0], self.FACTS[3]]
+        assert await memory.search("zzz unrelated query") == []
+
+
+class TestEmbeddingIndex:
+    """Test the EmbeddingIndex."""
+
+    def test_grows_and_swaps_on_delete(self):
+        """Test capacity grows geometrically and deletes reuse rows."""
+        index = EmbeddingIndex(min_capacity=2)
+        for i in range(5):
+            index.add(f"k{i}", [float(i), 1.0])
+
+        assert len(index) == 5
+        assert index.capacity >= 5
+        assert index.remove("k1")
+        assert not index.remove("k1")
+        assert index.search([4.0, 1.0], k=1)[0][0] == "k4"
+        assert [key for key, _ in index.search([0.0, 1.0], k=4)][0] == "k0"
+
+    def test_dimension_mismatch_raises(self):
+        """Test vectors must share a dimension."""
+        index = EmbeddingIndex()
+        index.add("a", [1.0, 0.0])
+
+        with pytest.raises(ValueError, match="dimension"):
+            index.add("b", [1.0, 0.0, 0.0])
+
+    def test_pure_python_fallback(self, monkeypatch):
+        """Test the index works without NumPy."""
+        monkeypatch.setattr(memory_module, "HAS_NUMPY", False)
+        index = EmbeddingIndex()
+        index.add("x", [1.0, 0.0])
+        index.add("y", [0.0, 1.0])
+        index.add("xy", [1.0, 1.0])
+        index.remove("y")
+
+        assert [key for key, _ in index.search([1.0, 0.1], k=2)] == ["x", "xy"]
+        assert index.search_batch([[0.0, 1.0]], k=1) == [
+            [("xy", pytest.approx(2**-0.5))]
+        ]
+
+
+def topic_embedding(text: str) -> list[float]:
+    """Deterministic embedding: one axis per known topic word."""
+    words = text.lower().split()
+    return [float("weather" in words), float("capital" in words), 0.1]
+
+
+class TestSemanticCache:
+    """Test SemanticCache functionality."""
+
+    @pytest.mark.asyncio
+    async def test_similar_prompt_hits(self):
+        """Test a similar prompt is served from the cache."""
+        cache = SemanticCache(threshold=0.9, embedding_fn=topic_embedding)
+        await cache.store("what is the weather", CompletionResponse(content="sunny"))
+
+        hit = await cache.lookup("weather today please")
+        miss = await cache.lookup("what is the capital")
+
+        assert hit.content == "sunny"
+        assert hit.metadata["semantic_cache_hit"] is True
+        assert hit.metadata["similarity"] >= 0.9
+        assert miss is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_namespaces_are_isolated(self):
+        """Test entries are only visible within their namespace."""
+        cache = SemanticCache(embedding_fn=topic_embedding)
+        await cache.store("weather", CompletionResponse(content="a"), namespace="a")
+
+        assert await cache.lookup("weather", namespace="b") is None
+        assert (await cache.lookup("weather", namespace="a")).content == "a"
+
+        cache.clear("a")
+        assert await cache.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test the least recently used entry is evicted at capacity."""
+        cache = SemanticCache(threshold=0.99, max_entries=2)
+        await cache.store("first prompt", CompletionResponse(content="1"))
+        await cache.store("second prompt", CompletionResponse(content="2"))
+        await cache.lookup("first prompt")
+        await cache.store("third prompt", CompletionResponse(content="3"))
+
+        assert await cache.size() == 2
+        assert await cache.lookup("second prompt") is None
+        assert (await cache.lookup("first prompt")).content == "1"
+
+    @pytest.mark.asyncio
+    async def test_reports_metrics(self):
+        """Test lookups are reported to a metrics collector."""
+        metrics = MagicMock()
+        cache = SemanticCache(embedding_fn=topic_embedding, metrics=metrics)
+        await cache.lookup("weather")
+
+        metrics.record_memory_operation.assert_called_once_with(
+            operation="get", memory_type="semantic_cache", hit=False
+        )
+
+
 class TestMemoryStore:
     """Test MemoryStore management."""
 
@@ -455,6 +693,20 @@ class TestMemoryIntegration:
         know_memory = store.get_memory("knowledge")
         assert len(know_memory.entries) > 0
 
+    @pytest.mark.asyncio
+    async def test_context_reuses_conversation_messages(self):
+        """Test conversation context returns the stored messages."""
+        store = MemoryStore()
+        store.add_memory(ConversationMemory())
+        user_msg = Message(role=MessageRole.USER, content="Tell me about cats")
+        assistant_msg = Message(role=MessageRole.ASSISTANT, content="Cats purr")
+        await store.store(user_msg, assistant_msg)
+
+        context = await store.get_context("cats", max_items=4)
+
+        assert context == [user_msg, assistant_msg]
+        assert context[0] is user_msg
+
     @pytest.mark.asyncio
     async def test_memory_with_agent_context(self):
         """Test memory with agent-specific context."""
@@ -0,0 +1,186 @@
+"""Unit tests for AgentiCraft memory storage engines."""
+
+import pytest
+
+from agenticraft.core.config import settings
+from agenticraft.core.exceptions import MemoryStorageError
+from agenticraft.core.memory import KnowledgeMemory
+from agenticraft.core.storage import (
+    JSONLogStorage,
+    SQLiteStorage,
+    create_storage,
+)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request):
+    """Run a test against each backend."""
+    return request.param
+
+
+def open_storage(backend, tmp_path, **kwargs):
+    """Open a storage engine and load existing records."""
+    storage = create_storage(tmp_path / f"knowledge.{backend}", backend, **kwargs)
+    records = storage.load()
+    return storage, records
+
+
+class TestStorageEngines:
+    """Behaviour shared by all storage engines."""
+
+    def test_roundtrip(self, backend, tmp_path):
+        """Test puts, updates and deletes survive reopening."""
+        storage, records = open_storage(backend, tmp_path)
+        assert records == []
+
+        storage.put("a", '{"v": 1}')
+        storage.put("b", '{"v": 2}')
+        storage.put("c", '{"v": 3}')
+        storage.put("a", '{"v": 4}')
+        storage.delete("b")
+        storage.close()
+
+        _, records = open_storage(backend, tmp_path)
+        assert records == ['{"v": 4}', '{"v": 3}']
+
+    def test_group_commit(self, backend, tmp_path, monkeypatch):
+        """Test queued writes are committed in groups."""
+        storage, _ = open_storage(
+            backend, tmp_path, commit_interval=60, commit_batch=50
+        )
+        batches = []
+        write_batch = storage._write_batch
+        monkeypatch.setattr(
+            storage,
+            "_write_batch",
+            lambda batch: batches.append(len(batch)) or write_batch(batch),
+        )
+
+        for i in range(120):
+            storage.put(f"k{i}", "{}")
+        storage.close()
+
+        assert sum(batches) == 120
+        assert len(batches) <= 4
+
+    def test_clear(self, backend, tmp_path):
+        """Test clear removes persisted records."""
+        storage, _ = open_storage(backend, tmp_path)
+        storage.put("a", "{}")
+        storage.flush()
+        storage.clear()
+        storage.close()
+
+        _, records = open_storage(backend, tmp_path)
+        assert records == []
+
+    def test_closed_storage_rejects_writes(self, backend, tmp_path):
+        """Test writing after close raises."""
+        storage, _ = open_storage(backend, tmp_path)
+        storage.close()
+
+        with pytest.raises(MemoryStorageError):
+            storage.put("a", "{}")
+
+
+class TestJSONLogStorage:
+    """Test the append-only log engine."""
+
+    def test_compaction_rotates_log(self, tmp_path):
+        """Test compaction writes a snapshot and drops old segments."""
+        path = tmp_path / "knowledge.json"
+        storage = JSONLogStorage(path)
+        storage.load()
+        for i in range(5):
+            storage.put(f"k{i}", str(i))
+        storage.delete("k0")
+        storage.compact()
+        storage.put("k5", "5")
+        storage.close()
+
+        assert path.exists()
+        assert [p.name for p in tmp_path.glob("*.wal")] == ["knowledge.json.000001.wal"]
+
+        reopened = JSONLogStorage(path)
+        assert reopened.load() == ["1", "2", "3", "4", "5"]
+        reopened.close()
+
+    def test_background_compaction(self, tmp_path):
+        """Test the log is compacted once it outgrows the threshold."""
+        path = tmp_path / "knowledge.json"
+        storage = JSONLogStorage(path, compact_threshold=10, commit_batch=5)
+        storage.load()
+        for i in range(20):
+            storage.put("same", str(i))
+        storage.close()
+
+        reopened = JSONLogStorage(path)
+        assert reopened.load() == ["19"]
+        assert reopened._log_records < 10
+        reopened.close()
+
+    def test_torn_write_is_ignored(self, tmp_path):
+        """Test an incomplete trailing log record is skipped on load."""
+        path = tmp_path / "knowledge.json"
+        storage = JSONLogStorage(path)
+        storage.load()
+        storage.put("a", "1")
+        storage.close()
+        with open(tmp_path / "knowledge.json.000000.wal", "a") as f:
+            f.write("P\tb\t{")
+
+        reopened = JSONLogStorage(path)
+        assert reopened.load() == ["1"]
+        reopened.close()
+
+
+class TestCreateStorage:
+    """Test storage selection from settings."""
+
+    def test_uses_settings(self, tmp_path, monkeypatch):
+        """Test backend and path default to settings."""
+        monkeypatch.setattr(settings, "memory_path", tmp_path)
+        monkeypatch.setattr(settings, "memory_backend", "json")
+        storage = create_storage()
+
+        assert isinstance(storage, JSONLogStorage)
+        assert storage.path == tmp_path / "knowledge.json"
+        storage.close()
+
+        monkeypatch.setattr(settings, "memory_backend", "sqlite")
+        storage = create_storage()
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.path == tmp_path / "knowledge.db"
+        storage.close()
+
+    def test_unsupported_backend(self, tmp_path):
+        """Test unsupported backends raise."""
+        with pytest.raises(MemoryStorageError, match="redis"):
+            create_storage(tmp_path / "x", "redis")
+
+
+class TestPersistentKnowledgeMemory:
+    """Test KnowledgeMemory persistence."""
+
+    @pytest.mark.asyncio
+    async def test_reload(self, backend, tmp_path):
+        """Test entries, updates and deletes are restored on startup."""
+        path = str(tmp_path / "knowledge")
+        memory = KnowledgeMemory(
+            persist=True, storage_path=path, backend=backend, use_embeddings=True
+        )
+        keep = await memory.store_knowledge("Paris is in France", {"topic": "geo"})
+        drop = await memory.store_knowledge("Temporary fact")
+        await memory.update_knowledge(keep, "Paris is the capital of France")
+        await memory.delete_knowledge(drop)
+        memory.close()
+
+        reloaded = KnowledgeMemory(
+            persist=True, storage_path=path, backend=backend, use_embeddings=True
+        )
+        assert [e.id for e in reloaded.entries] == [keep]
+        assert reloaded.entries[0].content == "Paris is the capital of France"
+        assert reloaded.entries[0].metadata == {"topic": "geo"}
+        results = await reloaded.search("Paris is the capital of France", 1)
+        assert results[0].id == keep
+        reloaded.close()
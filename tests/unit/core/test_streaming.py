@@ -0,0 +1,572 @@
+"""Unit tests for streaming helpers."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+
+from agenticraft.core.streaming import (
+    StreamBroadcaster,
+    StreamChunk,
+    StreamingJSONParser,
+    StreamingManager,
+    StreamingResponse,
+    StreamInterruptedError,
+    ToolCallAccumulator,
+    coalesce_stream,
+)
+
+
+class TestStreamingJSONParser:
+    """Test completion detection for streamed JSON."""
+
+    def test_detects_end_of_object(self):
+        """Test the document is complete when the top-level object closes."""
+        parser = StreamingJSONParser()
+        fragments = ['{"a": [1, {"b"', ": 2}]", ', "c": {}', "}"]
+
+        assert [parser.feed(f) for f in fragments] == [False, False, False, True]
+        assert parser.value() == {"a": [1, {"b": 2}], "c": {}}
+
+    def test_ignores_braces_in_strings(self):
+        """Test brackets and escaped quotes inside strings are not structure."""
+        parser = StreamingJSONParser()
+
+        assert not parser.feed('{"text": "} ] \\" {')
+        assert not parser.feed('\\\\"')  # escaped backslash ends the string
+        assert parser.feed("}")
+        assert parser.value() == {"text": '} ] " {\\'}
+
+    def test_escape_split_across_fragments(self):
+        """Test an escape at the end of a fragment applies to the next one."""
+        parser = StreamingJSONParser()
+
+        assert not parser.feed('{"q": "say \\')
+        assert not parser.feed('"hi\\"')
+        assert parser.feed('"}')
+        assert parser.value() == {"q": 'say "hi"'}
+
+    def test_empty_document(self):
+        """Test an empty document parses as an empty object."""
+        assert StreamingJSONParser().value() == {}
+
+
+class TestToolCallAccumulator:
+    """Test assembling streamed tool calls."""
+
+    def test_reports_calls_when_arguments_complete(self):
+        """Test each call is reported once, when its arguments close."""
+        calls = ToolCallAccumulator()
+
+        assert calls.add(0, id="call_1", name="search", arguments='{"q": ') == []
+        assert calls.add(1, id="call_2", name="fetch", arguments="{") == []
+        (first,) = calls.add(0, arguments='"cats"}')
+        (second,) = calls.add(1, arguments="}")
+
+        assert (first.id, first.arguments) == ("call_1", {"q": "cats"})
+        assert (second.name, second.arguments) == ("fetch", {})
+        assert calls.finish() == [first, second]
+
+    def test_close_and_finish_complete_remaining_calls(self):
+        """Test calls without arguments are reported when they end."""
+        calls = ToolCallAccumulator()
+        calls.add(0, id="call_1", name="now")
+        calls.add(1, id="call_2", name="later")
+
+        (closed,) = calls.close(0)
+
+        assert closed.arguments == {}
+        assert calls.close(0) == []
+        assert [c.id for c in calls.finish()] == ["call_1", "call_2"]
+
+    def test_malformed_arguments_are_dropped(self, caplog):
+        """Test calls with invalid JSON are skipped with a warning."""
+        calls = ToolCallAccumulator()
+        calls.add(0, id="call_1", name="broken", arguments='{"a": 1]}')
+
+        assert calls.finish() == []
+        assert "broken" in caplog.text
+
+    @pytest.mark.parametrize("missing", ["id", "name"])
+    def test_incomplete_calls_are_dropped(self, missing):
+        """Test calls without an ID or name are never reported."""
+        fields = {"id": "call_1", "name": "search", missing: None}
+        calls = ToolCallAccumulator()
+
+        assert calls.add(0, arguments="{}", **fields) == []
+        assert calls.finish() == []
+
+
+async def numbered(count, produced, fail=False):
+    """Stream numbered chunks, recording what was produced."""
+    try:
+        for i in range(count):
+            produced.append(i)
+            yield StreamChunk(content=f"{i} ", is_final=i == count - 1)
+            await asyncio.sleep(0)
+        if fail:
+            raise RuntimeError("upstream failed")
+    finally:
+        produced.append("closed")
+
+
+async def drain(subscription):
+    """Collect a subscription's text."""
+    return "".join([chunk.content async for chunk in subscription])
+
+
+class TestStreamBroadcaster:
+    """Test fan-out of one stream to several consumers."""
+
+    @pytest.mark.asyncio
+    async def test_every_subscriber_gets_every_chunk(self):
+        """Test the upstream stream is read once for all subscribers."""
+        produced = []
+        broadcaster = StreamBroadcaster(numbered(5, produced))
+        subscribers = [broadcaster.subscribe(max_queue=1) for _ in range(3)]
+
+        texts = await asyncio.gather(*(drain(s) for s in subscribers))
+
+        assert texts == ["0 1 2 3 4 "] * 3
+        assert produced == [0, 1, 2, 3, 4, "closed"]
+        assert broadcaster.chunks == 5
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self):
+        """Test a blocking subscriber bounds how far the stream runs ahead."""
+        produced = []
+        broadcaster = StreamBroadcaster(numbered(100, produced))
+        subscription = broadcaster.subscribe(max_queue=2)
+
+        await subscription.__anext__()
+        await asyncio.sleep(0.01)
+
+        assert len(produced) <= 4
+        await subscription.aclose()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        """Test a slow subscriber keeps only the newest chunks."""
+        broadcaster = StreamBroadcaster(numbered(10, []))
+        fast = broadcaster.subscribe(max_queue=1)
+        slow = broadcaster.subscribe(max_queue=2, policy="drop_oldest")
+
+        assert await drain(fast) == "0 1 2 3 4 5 6 7 8 9 "
+        assert await drain(slow) == "8 9 "
+        assert slow.dropped == 8
+
+    @pytest.mark.asyncio
+    async def test_coalesce(self):
+        """Test a slow subscriber receives merged text without losing any."""
+        broadcaster = StreamBroadcaster(numbered(10, []))
+        fast = broadcaster.subscribe(max_queue=1)
+        slow = broadcaster.subscribe(max_queue=2, policy="coalesce")
+
+        fast_task = asyncio.create_task(drain(fast))
+        await asyncio.sleep(0.01)
+        chunks = [chunk async for chunk in slow]
+
+        assert await fast_task == "0 1 2 3 4 5 6 7 8 9 "
+        assert "".join(c.content for c in chunks) == "0 1 2 3 4 5 6 7 8 9 "
+        assert len(chunks) < 10
+        assert chunks[-1].is_final
+        assert slow.coalesced == 10 - len(chunks)
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_replay(self):
+        """Test late subscribers start from the replay buffer."""
+        broadcaster = StreamBroadcaster(numbered(6, []), replay=2)
+        first = broadcaster.subscribe(max_queue=1)
+        for _ in range(3):
+            await first.__anext__()
+
+        late = broadcaster.subscribe()
+        texts = await asyncio.gather(drain(first), drain(late))
+
+        # The late subscriber replays two chunks, then continues live
+        assert texts == ["3 4 5 ", "1 2 3 4 5 "]
+        assert await drain(broadcaster.subscribe()) == "4 5 "
+
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_when_all_leave(self):
+        """Test the upstream stream is closed once every subscriber left."""
+        produced = []
+        broadcaster = StreamBroadcaster(numbered(100, produced))
+        first = broadcaster.subscribe(max_queue=1)
+        second = broadcaster.subscribe(max_queue=1)
+
+        async with first:
+            await first.__anext__()
+        assert "closed" not in produced
+
+        await second.__anext__()
+        await second.aclose()
+
+        assert produced[-1] == "closed"
+        assert len(produced) < 10
+        assert broadcaster.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_subscriber(self):
+        """Test upstream failures are raised to all subscribers."""
+        broadcaster = StreamBroadcaster(numbered(2, [], fail=True))
+        subscribers = [broadcaster.subscribe(), broadcaster.subscribe()]
+
+        results = await asyncio.gather(
+            *(drain(s) for s in subscribers), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_close_interrupts_subscribers(self):
+        """Test closing the broadcaster ends remaining subscriptions."""
+        broadcaster = StreamBroadcaster(numbered(100, []))
+        subscription = broadcaster.subscribe(max_queue=1)
+        await subscription.__anext__()
+
+        await broadcaster.aclose()
+
+        with pytest.raises(StreamInterruptedError):
+            await drain(subscription)
+
+    def test_invalid_policy(self):
+        """Test unknown policies are rejected."""
+        with pytest.raises(ValueError, match="policy"):
+            StreamBroadcaster(numbered(1, [])).subscribe(policy="spill")
+
+
+async def tokens(texts, delay=0.0, produced=None, fail=False):
+    """Stream text chunks followed by a final chunk."""
+    metadata = {"model": "test"}
+    try:
+        for text in texts:
+            if produced is not None:
+                produced.append(text)
+            yield StreamChunk(content=text, token=text, metadata=metadata)
+            await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("upstream failed")
+        yield StreamChunk(content="", is_final=True)
+    finally:
+        if produced is not None:
+            produced.append("closed")
+
+
+class TestCoalesceStream:
+    """Test merging tokens into frames."""
+
+    @pytest.mark.asyncio
+    async def test_frames_by_size(self):
+        """Test frames are sent once they reach max_chars."""
+        frames = [
+            c
+            async for c in coalesce_stream(
+                tokens(["ab"] * 5), max_chars=4, max_delay=None
+            )
+        ]
+
+        assert [c.content for c in frames] == ["abab", "abab", "ab", ""]
+        assert frames[0].metadata == {"model": "test"}
+        assert frames[-1].is_final
+
+    @pytest.mark.asyncio
+    async def test_frames_by_time_window(self):
+        """Test slow tokens are sent when the window closes."""
+        frames = [
+            c.content
+            async for c in coalesce_stream(
+                tokens(list("abcdef"), delay=0.02), max_chars=100, max_delay=0.05
+            )
+        ]
+
+        assert "".join(frames) == "abcdef"
+        assert 2 < len(frames) < 7
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_pass_through(self):
+        """Test tool call chunks flush the pending frame and are not merged."""
+
+        async def stream():
+            yield StreamChunk(content="a")
+            yield StreamChunk(content="", metadata={"type": "tool_call"})
+            yield StreamChunk(content="b")
+
+        frames = [c async for c in coalesce_stream(stream(), max_delay=None)]
+
+        assert [c.content for c in frames] == ["a", "", "b"]
+        assert frames[1].metadata["type"] == "tool_call"
+
+    @pytest.mark.asyncio
+    async def test_errors_follow_pending_text(self):
+        """Test an upstream error is raised after the buffered text."""
+        received = []
+
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            async for chunk in coalesce_stream(tokens(["a", "b"], fail=True)):
+                received.append(chunk.content)
+
+        assert received == ["ab"]
+
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_upstream(self):
+        """Test leaving the coalesced stream closes the upstream stream."""
+        produced = []
+        frames = coalesce_stream(
+            tokens(["ab"] * 100, produced=produced), max_chars=2, max_delay=None
+        )
+
+        await frames.__anext__()
+        await frames.aclose()
+
+        assert produced[-1] == "closed"
+        assert len(produced) < 10
+
+
+async def paced(delays, events):
+    """Stream one chunk after each delay, recording cancellation."""
+    try:
+        for i, delay in enumerate(delays):
+            await asyncio.sleep(delay)
+            yield StreamChunk(content=f"t{i} ")
+    except asyncio.CancelledError:
+        events.append("cancelled")
+        raise
+    finally:
+        events.append("closed")
+
+
+class TestStreamingManager:
+    """Test stream registration, deadlines and interruption."""
+
+    @pytest.mark.asyncio
+    async def test_streams_are_registered_while_active(self):
+        """Test live counts and per-stream statistics."""
+        manager = StreamingManager()
+        seen = []
+
+        async for _chunk in manager.supervise(paced([0, 0.01], []), stream_id="s1"):
+            stats = manager.get_stats("s1")
+            seen.append((manager.active_count, stats.chunks, stats.characters))
+
+        assert seen == [(1, 1, 3), (1, 2, 6)]
+        assert stats.time_to_first_token < stats.elapsed
+        assert stats.chars_per_second > 0
+        assert manager.active_count == 0
+        assert manager.get_stats("s1") is None
+
+    @pytest.mark.asyncio
+    async def test_first_token_timeout(self):
+        """Test a stream with no first token is cancelled."""
+        manager = StreamingManager(first_token_timeout=0.02)
+        events = []
+
+        with pytest.raises(StreamInterruptedError, match="No first token"):
+            async for _chunk in manager.supervise(paced([10], events)):
+                pass
+
+        assert events == ["cancelled", "closed"]
+        assert manager.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_inter_token_timeout(self):
+        """Test a stalled stream is cancelled with its partial text."""
+        manager = StreamingManager(first_token_timeout=1, inter_token_timeout=0.02)
+        events = []
+
+        with pytest.raises(StreamInterruptedError, match="No token for") as exc_info:
+            async for _chunk in manager.supervise(paced([0, 0, 10], events)):
+                pass
+
+        assert exc_info.value.partial_response == "t0 t1 "
+        assert "cancelled" in events
+
+    @pytest.mark.asyncio
+    async def test_total_timeout(self):
+        """Test the total deadline applies even to a steady stream."""
+        manager = StreamingManager(timeout=10)
+
+        with pytest.raises(StreamInterruptedError, match="Stream timeout after"):
+            async for _chunk in manager.stream_with_timeout(
+                paced([0.01] * 100, []), timeout=0.05
+            ):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_interrupt_pending_read(self):
+        """Test interrupting cancels the upstream read in progress."""
+        manager = StreamingManager()
+        events = []
+
+        async def consume():
+            async for _chunk in manager.supervise(
+                paced([0, 10], events), stream_id="s1"
+            ):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+
+        assert manager.interrupt_stream("s1")
+        with pytest.raises(StreamInterruptedError, match="s1 was interrupted"):
+            await task
+        assert events == ["cancelled", "closed"]
+        assert not manager.interrupt_stream("s1")
+
+    @pytest.mark.asyncio
+    async def test_interrupt_between_reads(self):
+        """Test a stream interrupted while its consumer is busy stops next."""
+        manager = StreamingManager()
+        events = []
+        stream = manager.supervise(paced([0, 0], events), stream_id="s1")
+
+        await stream.__anext__()
+        manager.interrupt_stream("s1")
+
+        with pytest.raises(StreamInterruptedError):
+            await stream.__anext__()
+        assert events == ["closed"]
+
+    @pytest.mark.asyncio
+    async def test_outside_cancellation_is_not_converted(self):
+        """Test cancelling the consumer raises CancelledError, not a timeout."""
+        manager = StreamingManager(first_token_timeout=10)
+        events = []
+
+        async def consume():
+            async for _chunk in manager.supervise(paced([10], events)):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert events == ["cancelled", "closed"]
+
+    @pytest.mark.asyncio
+    async def test_deadlines_without_asyncio_timeout(self, monkeypatch):
+        """Test deadlines and interrupts work on Python 3.10 asyncio."""
+
+        class LegacyTask(asyncio.tasks._PyTask):
+            """Task without cancellation counting, as on Python 3.10."""
+
+            cancelling = None
+            uncancel = None
+
+        monkeypatch.delattr(asyncio, "timeout", raising=False)
+        loop = asyncio.get_running_loop()
+        factory = loop.get_task_factory()
+        loop.set_task_factory(lambda loop, coro, **kw: LegacyTask(coro, loop=loop))
+        manager = StreamingManager(first_token_timeout=0.02)
+
+        async def consume(delays, stream_id):
+            async for _chunk in manager.supervise(paced(delays, []), stream_id):
+                pass
+
+        try:
+            timed_out = asyncio.create_task(consume([10], "slow"))
+            interrupted = asyncio.create_task(consume([0, 10], "stopped"))
+        finally:
+            loop.set_task_factory(factory)
+        await asyncio.sleep(0.01)
+        manager.interrupt_stream("stopped")
+
+        with pytest.raises(StreamInterruptedError, match="No first token"):
+            await timed_out
+        with pytest.raises(StreamInterruptedError, match="stopped was interrupted"):
+            await interrupted
+        assert isinstance(timed_out, LegacyTask)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_are_rejected(self):
+        """Test two active streams cannot share an ID."""
+        manager = StreamingManager()
+        first = manager.supervise(paced([0, 0], []), stream_id="s1")
+        await first.__anext__()
+
+        with pytest.raises(ValueError, match="already active"):
+            await manager.supervise(paced([0], []), stream_id="s1").__anext__()
+        await first.aclose()
+
+
+@dataclass
+class LegacyStreamChunk:
+    """The previous chunk layout (no slots), for comparison."""
+
+    content: str
+    token: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    is_final: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@pytest.mark.benchmark
+class TestStreamingBenchmark:
+    """Per-chunk overhead of stream accumulation and coalescing."""
+
+    TOKENS = [f"tok{i} " for i in range(50_000)]
+
+    def best_of(self, run):
+        """Best per-chunk time of a few runs, in microseconds."""
+        samples = []
+        for _ in range(3):
+            start = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - start)
+        return min(samples) / len(self.TOKENS) * 1e6
+
+    def test_accumulation_overhead(self):
+        """Compare per-chunk cost of the legacy and current accumulation."""
+
+        def legacy():
+            text = ""
+            chunks = []
+            for token in self.TOKENS:
+                chunk = LegacyStreamChunk(
+                    content=token, token=token, metadata={"model": "m", "index": 0}
+                )
+                chunks.append(chunk)
+                text += chunk.content
+            return text
+
+        def current():
+            response = StreamingResponse()
+            metadata = {"model": "m", "index": 0}
+            for token in self.TOKENS:
+                response.add_chunk(
+                    StreamChunk(content=token, token=token, metadata=metadata)
+                )
+            return response.complete_text
+
+        assert legacy() == current()
+        legacy_us, current_us = self.best_of(legacy), self.best_of(current)
+        print(
+            f"\nStream accumulation per-chunk overhead: legacy {legacy_us:.2f}us, "
+            f"current {current_us:.2f}us"
+        )
+        assert current_us < legacy_us
+
+    def test_coalescing_overhead(self):
+        """Report the per-chunk cost added by the coalescing stage."""
+
+        async def consume(coalesce):
+            stream = tokens(self.TOKENS)
+            if coalesce:
+                stream = coalesce_stream(stream, max_chars=256, max_delay=0.05)
+            return [chunk async for chunk in stream]
+
+        raw_us = self.best_of(lambda: asyncio.run(consume(False)))
+        coalesced_us = self.best_of(lambda: asyncio.run(consume(True)))
+        frames = asyncio.run(consume(True))
+
+        print(
+            f"\nStream coalescing per-chunk overhead: "
+            f"{coalesced_us - raw_us:.2f}us ({len(self.TOKENS)} tokens into "
+            f"{len(frames)} frames)"
+        )
+        assert "".join(c.content for c in frames) == "".join(self.TOKENS)
+        assert len(frames) < len(self.TOKENS) / 10
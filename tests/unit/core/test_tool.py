@@ -487,6 +487,32 @@ class TestToolRegistry:
             assert "description" in schema["function"]
             assert "parameters" in schema["function"]
 
+    def test_tools_schema_is_memoized(self):
+        """Test the schema is rebuilt only after register or clear."""
+        registry = ToolRegistry()
+
+        @tool
+        def first() -> str:
+            """First tool."""
+            return "1"
+
+        @tool
+        def second() -> str:
+            """Second tool."""
+            return "2"
+
+        registry.register(first)
+        schema = registry.get_tools_schema()
+        assert registry.get_tools_schema() is schema
+
+        registry.register(second)
+        updated = registry.get_tools_schema()
+        assert updated is not schema
+        assert [s["function"]["name"] for s in updated] == ["first", "second"]
+
+        registry.clear()
+        assert registry.get_tools_schema() == []
+
     def test_clear_registry(self):
         """Test clearing the registry."""
         registry = ToolRegistry()
@@ -116,6 +116,48 @@ class TestMessage:
         assert "tool_calls" in msg_dict
         assert len(msg_dict["tool_calls"]) == 1
 
+    def test_message_to_dict_is_cached(self):
+        """Test to_dict is reused until a field is reassigned."""
+        msg = Message(role=MessageRole.USER, content="Hello")
+
+        first = msg.to_dict()
+        assert msg.to_dict() is first
+
+        msg.content = "Changed"
+        assert msg.to_dict() is not first
+        assert msg.to_dict()["content"] == "Changed"
+
+        copy = msg.model_copy(update={"content": "Copied"})
+        assert copy.to_dict()["content"] == "Copied"
+
+    def test_message_to_dict_sees_in_place_changes(self):
+        """Test mutating metadata or tool_calls in place updates to_dict."""
+        tool_msg = Message(role=MessageRole.TOOL, content="x", metadata={})
+        assert "tool_call_id" not in tool_msg.to_dict()
+        tool_msg.metadata["tool_call_id"] = "call_1"
+        assert tool_msg.to_dict()["tool_call_id"] == "call_1"
+
+        msg = Message(role=MessageRole.ASSISTANT, content="", tool_calls=[])
+        assert "tool_calls" not in msg.to_dict()
+        key = msg.wire_key()
+        msg.tool_calls.append({"id": "call_1", "name": "search", "arguments": {}})
+        assert msg.to_dict()["tool_calls"][0]["id"] == "call_1"
+        msg.tool_calls[0]["arguments"]["query"] = "weather"
+        assert msg.to_dict()["tool_calls"][0]["arguments"] == {"query": "weather"}
+        assert msg.wire_key() != key
+        assert "weather" in msg.wire_key()
+
+    def test_message_wire_key_is_cached(self):
+        """Test wire_key is reused until the message changes."""
+        msg = Message(role=MessageRole.USER, content="Hello")
+
+        key = msg.wire_key()
+        assert msg.wire_key() is key
+        assert Message(role=MessageRole.USER, content="Hello").wire_key() == key
+
+        msg.content = "Changed"
+        assert msg.wire_key() != key
+
     def test_message_validation(self):
         """Test message validation."""
         # Invalid role
@@ -0,0 +1,194 @@
+"""Unit tests for the multi-key load balancing provider."""
+
+import asyncio
+
+import pytest
+
+from agenticraft.core.exceptions import ProviderError, ProviderRateLimitError
+from agenticraft.core.provider import BaseProvider
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse
+from agenticraft.providers.balancer import EndpointConfig, LoadBalancedProvider
+
+
+class HTTPError(Exception):
+    """SDK-style error with a status code."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class KeyedProvider(BaseProvider):
+    """Provider whose behaviour depends on its API key."""
+
+    behaviour: dict[str, str] = {}
+    calls: list[str] = []
+
+    def __init__(self, api_key=None, base_url=None, model="test-model", **kwargs):
+        super().__init__(api_key=api_key, base_url=base_url)
+        self.model = model
+
+    async def complete(self, messages, **kwargs):
+        self.calls.append(self.api_key)
+        await asyncio.sleep(0.01)
+        mode = self.behaviour.get(self.api_key)
+        if mode == "429":
+            raise ProviderRateLimitError("test", retry_after=60)
+        if mode == "401":
+            raise ProviderError("auth failed") from HTTPError(401)
+        if mode == "400":
+            raise ProviderError("bad request") from HTTPError(400)
+        if mode == "500":
+            raise ProviderError("server error") from HTTPError(500)
+        return CompletionResponse(
+            content=self.api_key,
+            model=self.model,
+            usage={"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+        )
+
+    async def stream(self, messages, **kwargs):
+        self.calls.append(self.api_key)
+        if self.behaviour.get(self.api_key) == "429":
+            raise ProviderRateLimitError("test", retry_after=60)
+        yield StreamChunk(content=self.api_key)
+        yield StreamChunk(
+            content="", is_final=True, metadata={"usage": {"total_tokens": 7}}
+        )
+
+    def validate_auth(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_keyed_provider():
+    """Reset shared fake provider state."""
+    KeyedProvider.behaviour = {}
+    KeyedProvider.calls = []
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def balanced(keys, **kwargs):
+    """Create a balancer over fake keys."""
+    return LoadBalancedProvider(KeyedProvider, endpoints=keys, **kwargs)
+
+
+class TestLoadBalancedProvider:
+    """Test load balancing and failover."""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding_spreads_concurrent_requests(self):
+        """Test concurrent requests go to idle keys."""
+        provider = balanced(["a", "b", "c"])
+
+        await asyncio.gather(*(provider.complete(MESSAGES) for _ in range(6)))
+
+        assert sorted(KeyedProvider.calls) == ["a", "a", "b", "b", "c", "c"]
+
+    @pytest.mark.asyncio
+    async def test_weighted_round_robin(self):
+        """Test traffic follows endpoint weights."""
+        provider = balanced(
+            [EndpointConfig(api_key="a", weight=3), {"api_key": "b"}],
+            strategy="round_robin",
+        )
+
+        for _ in range(8):
+            await provider.complete(MESSAGES)
+
+        assert KeyedProvider.calls.count("a") == 6
+        assert KeyedProvider.calls.count("b") == 2
+        assert KeyedProvider.calls[:4] != ["a", "a", "a", "b"]  # interleaved
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_key_leaves_rotation(self):
+        """Test a 429 moves the request on and benches the key."""
+        KeyedProvider.behaviour = {"a": "429"}
+        provider = balanced(["a", "b"])
+
+        for _ in range(3):
+            response = await provider.complete(MESSAGES)
+            assert response.content == "b"
+
+        usage = provider.usage()
+        name_a = next(name for name in usage if name.startswith("default#"))
+        assert KeyedProvider.calls.count("a") == 1
+        assert usage[name_a].rate_limited == 1
+        assert not usage[name_a].available
+
+    @pytest.mark.asyncio
+    async def test_auth_failure_leaves_rotation(self):
+        """Test rejected credentials are taken out of rotation."""
+        KeyedProvider.behaviour = {"a": "401"}
+        provider = balanced(["a", "b"])
+
+        await provider.complete(MESSAGES)
+        await provider.complete(MESSAGES)
+
+        assert KeyedProvider.calls.count("a") == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_failures_leave_rotation(self):
+        """Test keys are benched after consecutive server errors."""
+        KeyedProvider.behaviour = {"a": "500"}
+        provider = balanced(["a", "b"], failure_threshold=2)
+
+        for _ in range(5):
+            await provider.complete(MESSAGES)
+
+        assert KeyedProvider.calls.count("a") == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_request_is_not_retried(self):
+        """Test client errors are raised without trying other keys."""
+        KeyedProvider.behaviour = {"a": "400", "b": "400"}
+        provider = balanced(["a", "b"])
+
+        with pytest.raises(ProviderError, match="bad request"):
+            await provider.complete(MESSAGES)
+        assert len(KeyedProvider.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_all_keys_rate_limited(self):
+        """Test a rate limit error is raised once every key is benched."""
+        KeyedProvider.behaviour = {"a": "429", "b": "429"}
+        provider = balanced(["a", "b"])
+
+        with pytest.raises(ProviderRateLimitError):
+            await provider.complete(MESSAGES)
+        with pytest.raises(ProviderRateLimitError) as exc_info:
+            await provider.complete(MESSAGES)
+
+        assert len(KeyedProvider.calls) == 2
+        assert exc_info.value.retry_after > 0
+
+    @pytest.mark.asyncio
+    async def test_usage_accounting(self):
+        """Test token usage is accounted per key."""
+        provider = balanced(["a", "b"], strategy="round_robin")
+
+        for _ in range(4):
+            await provider.complete(MESSAGES)
+        [chunk async for chunk in provider.stream(MESSAGES)]
+
+        usage = list(provider.usage().values())
+        assert [u.requests for u in usage] == [3, 2]
+        assert sum(u.total_tokens for u in usage) == 4 * 5 + 7
+        assert all(u.outstanding == 0 for u in usage)
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over(self):
+        """Test streams move to another key when rate limited up front."""
+        KeyedProvider.behaviour = {"a": "429"}
+        provider = balanced(["a", "b"])
+
+        chunks = [chunk async for chunk in provider.stream(MESSAGES)]
+
+        assert chunks[0].content == "b"
+
+    def test_named_provider_requires_model(self):
+        """Test providers created by name need a model."""
+        with pytest.raises(ProviderError, match="model is required"):
+            LoadBalancedProvider("openai", endpoints=["a"])
@@ -0,0 +1,375 @@
+"""Unit tests for batch submission."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agenticraft.core.exceptions import ProviderError
+from agenticraft.providers.anthropic import AnthropicProvider
+from agenticraft.providers.batch import (
+    AnthropicBatchBackend,
+    BatchProvider,
+    OpenAIBatchBackend,
+    batch_backend_for,
+)
+from agenticraft.providers.ollama import OllamaProvider
+from agenticraft.providers.openai import OpenAIProvider
+
+
+def reply_to(body):
+    """Answer a request with its last message, or None to fail it."""
+    text = body["messages"][-1]["content"]
+    return None if "FAIL" in text else f"echo: {text}"
+
+
+class StandInOpenAIBatches:
+    """In-process OpenAI Batch API."""
+
+    def __init__(self, polls_until_done=1):
+        self.polls_until_done = polls_until_done
+        self.files: dict[str, str] = {}
+        self.batches: dict[str, dict] = {}
+
+    def client(self):
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle),
+            base_url="http://openai.test/v1",
+        )
+
+    def handle(self, request):
+        path = request.url.path.removeprefix("/v1")
+        if path == "/files":
+            lines = [
+                line
+                for line in request.content.decode().splitlines()
+                if line.startswith('{"custom_id"')
+            ]
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = "\n".join(lines)
+            return httpx.Response(200, json={"id": file_id})
+        if path == "/batches":
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {
+                "input": json.loads(request.content)["input_file_id"],
+                "polls": 0,
+            }
+            return httpx.Response(200, json={"id": batch_id, "status": "validating"})
+        if path.startswith("/batches/"):
+            return httpx.Response(200, json=self.status(path.split("/")[-1]))
+        if path.startswith("/files/"):
+            return httpx.Response(200, text=self.files[path.split("/")[2]])
+        return httpx.Response(404)
+
+    def status(self, batch_id):
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        if batch["polls"] < self.polls_until_done:
+            return {"id": batch_id, "status": "in_progress"}
+        if "output" not in batch:
+            output, errors = [], []
+            for line in self.files[batch["input"]].splitlines():
+                record = json.loads(line)
+                reply = reply_to(record["body"])
+                if reply is None:
+                    errors.append(
+                        {
+                            "custom_id": record["custom_id"],
+                            "response": {
+                                "status_code": 400,
+                                "body": {"error": {"message": "invalid request"}},
+                            },
+                        }
+                    )
+                    continue
+                output.append(
+                    {
+                        "custom_id": record["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {
+                                "model": record["body"]["model"],
+                                "choices": [
+                                    {
+                                        "message": {"content": reply},
+                                        "finish_reason": "stop",
+                                    }
+                                ],
+                                "usage": {
+                                    "prompt_tokens": 3,
+                                    "completion_tokens": 2,
+                                    "total_tokens": 5,
+                                },
+                            },
+                        },
+                    }
+                )
+            batch["output"] = f"file-out-{batch_id}"
+            batch["errors"] = f"file-err-{batch_id}"
+            self.files[batch["output"]] = "\n".join(map(json.dumps, output))
+            self.files[batch["errors"]] = "\n".join(map(json.dumps, errors))
+        return {
+            "id": batch_id,
+            "status": "completed",
+            "output_file_id": batch["output"],
+            "error_file_id": batch["errors"],
+        }
+
+
+class StandInAnthropicBatches:
+    """In-process Anthropic Message Batches API."""
+
+    def __init__(self):
+        self.batches: dict[str, list] = {}
+
+    def client(self):
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle),
+            base_url="http://anthropic.test",
+        )
+
+    def handle(self, request):
+        path = request.url.path
+        if path == "/v1/messages/batches":
+            batch_id = f"msgbatch-{len(self.batches)}"
+            self.batches[batch_id] = json.loads(request.content)["requests"]
+            return httpx.Response(200, json={"id": batch_id})
+        batch_id = path.split("/")[4]
+        if path.endswith("/results"):
+            lines = []
+            for item in self.batches[batch_id]:
+                reply = reply_to(item["params"])
+                result = (
+                    {
+                        "type": "succeeded",
+                        "message": {
+                            "model": item["params"]["model"],
+                            "content": [{"type": "text", "text": reply}],
+                            "stop_reason": "end_turn",
+                            "usage": {"input_tokens": 4, "output_tokens": 2},
+                        },
+                    }
+                    if reply
+                    else {
+                        "type": "errored",
+                        "error": {"error": {"message": "invalid request"}},
+                    }
+                )
+                lines.append(
+                    json.dumps({"custom_id": item["custom_id"], "result": result})
+                )
+            return httpx.Response(200, text="\n".join(lines))
+        return httpx.Response(
+            200,
+            json={
+                "id": batch_id,
+                "processing_status": "ended",
+                "results_url": f"http://anthropic.test{path}/results",
+            },
+        )
+
+
+def openai_batch(server, **kwargs):
+    """Create a batch provider for a stand-in OpenAI server."""
+    provider = OpenAIProvider(api_key="sk-test", model="gpt-test")
+    kwargs.setdefault("poll_interval", 0.001)
+    return BatchProvider(
+        provider, backend=OpenAIBatchBackend(provider, server.client()), **kwargs
+    )
+
+
+def ask(text):
+    """Build a single user message."""
+    return [{"role": "user", "content": text}]
+
+
+class TestBatchProvider:
+    """Test batching, result mapping and resuming."""
+
+    @pytest.mark.asyncio
+    async def test_requests_share_one_batch(self):
+        """Test concurrent completions are submitted as one job."""
+        server = StandInOpenAIBatches(polls_until_done=3)
+        batch = openai_batch(server, max_batch_size=3)
+
+        responses = await asyncio.gather(
+            *(batch.complete(ask(f"q{i}")) for i in range(3))
+        )
+
+        assert [r.content for r in responses] == ["echo: q0", "echo: q1", "echo: q2"]
+        assert responses[0].metadata["batch"]
+        assert len(server.batches) == 1
+        assert batch.stats.completed == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_goes_through_the_batch(self):
+        """Test streamed requests are batched and replayed as chunks."""
+        server = StandInOpenAIBatches()
+        batch = openai_batch(server, max_batch_size=2)
+
+        async def collect(text):
+            return [chunk async for chunk in batch.stream(ask(text))]
+
+        streams = await asyncio.gather(collect("a"), collect("b"))
+
+        assert ["".join(c.content for c in chunks) for chunks in streams] == [
+            "echo: a",
+            "echo: b",
+        ]
+        assert all(chunks[-1].is_final for chunks in streams)
+        assert len(server.batches) == 1
+        assert batch.supports_streaming()
+
+    @pytest.mark.asyncio
+    async def test_max_wait_submits_partial_batch(self):
+        """Test queued requests are submitted after max_wait."""
+        server = StandInOpenAIBatches()
+        batch = openai_batch(server, max_batch_size=100, max_wait=0.01)
+
+        responses = await asyncio.gather(
+            batch.complete(ask("a")), batch.complete(ask("b"))
+        )
+
+        assert {r.content for r in responses} == {"echo: a", "echo: b"}
+        assert len(server.batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_large_queues_are_split(self):
+        """Test no batch exceeds max_batch_size."""
+        server = StandInOpenAIBatches()
+        batch = openai_batch(server, max_batch_size=2, max_wait=0.01)
+
+        await asyncio.gather(*(batch.complete(ask(str(i))) for i in range(5)))
+
+        assert len(server.batches) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_requests_fail_their_caller(self):
+        """Test a failed item only fails its own caller."""
+        server = StandInOpenAIBatches()
+        batch = openai_batch(server, max_batch_size=2)
+
+        ok, failed = await asyncio.gather(
+            batch.complete(ask("fine")),
+            batch.complete(ask("FAIL")),
+            return_exceptions=True,
+        )
+
+        assert ok.content == "echo: fine"
+        assert isinstance(failed, ProviderError)
+        assert "invalid request" in str(failed)
+        assert batch.stats.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_submission_is_retried(self, tmp_path):
+        """Test requests stay queued when submitting their batch fails."""
+        server = StandInOpenAIBatches()
+        handle = server.handle
+        outages = 2
+
+        def flaky_handle(request):
+            nonlocal outages
+            if outages and request.url.path == "/v1/files":
+                outages -= 1
+                return httpx.Response(503)
+            return handle(request)
+
+        server.handle = flaky_handle
+        batch = openai_batch(server, store=tmp_path / "batch.db", max_wait=0.001)
+
+        await batch.submit(ask("retry me"), custom_id="retry")
+        await batch.join()
+
+        assert (await batch.result("retry")).content == "echo: retry me"
+        assert batch.stats.failed == 0
+        assert len(server.batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_collects_running_batches(self, tmp_path):
+        """Test a restarted process collects results of submitted batches."""
+        server = StandInOpenAIBatches(polls_until_done=1000)
+        store = tmp_path / "batch.db"
+        results = tmp_path / "results.jsonl"
+
+        first = openai_batch(server, store=store, max_batch_size=10)
+        for i in range(2):
+            await first.submit(ask(f"doc {i}"), custom_id=f"doc-{i}")
+        await first.flush()
+        await first.aclose()
+
+        server.polls_until_done = 0
+        second = openai_batch(server, store=store, results_path=results)
+        await second.submit(ask("doc 0"), custom_id="doc-0")  # already recorded
+        await second.resume()
+        await second.join()
+
+        assert (await second.result("doc-1")).content == "echo: doc 1"
+        assert second.stats.requests == 0
+        assert len(server.batches) == 1
+        lines = [json.loads(line) for line in results.read_text().splitlines()]
+        assert {line["custom_id"] for line in lines} == {"doc-0", "doc-1"}
+
+    @pytest.mark.asyncio
+    async def test_resume_submits_queued_requests(self, tmp_path):
+        """Test requests queued before a restart are submitted on resume."""
+        server = StandInOpenAIBatches()
+        store = tmp_path / "batch.db"
+
+        first = openai_batch(server, store=store, max_wait=3600)
+        await first.submit(ask("later"), custom_id="later")
+        await first.aclose()
+        assert not server.batches
+
+        second = openai_batch(server, store=store)
+        await second.resume()
+
+        assert (await second.result("later")).content == "echo: later"
+
+    @pytest.mark.asyncio
+    async def test_unknown_request(self):
+        """Test results of unknown IDs raise."""
+        batch = openai_batch(StandInOpenAIBatches())
+
+        with pytest.raises(ProviderError, match="Unknown batch request"):
+            await batch.result("missing")
+
+
+class TestBatchBackends:
+    """Test provider-specific request and result formats."""
+
+    @pytest.mark.asyncio
+    async def test_anthropic_batches(self):
+        """Test Anthropic requests separate the system prompt."""
+        server = StandInAnthropicBatches()
+        provider = AnthropicProvider(
+            api_key="test", model="claude-test", prompt_caching=False
+        )
+        batch = BatchProvider(
+            provider,
+            backend=AnthropicBatchBackend(provider, server.client()),
+            max_batch_size=2,
+            poll_interval=0.001,
+        )
+        messages = [{"role": "system", "content": "Be brief."}, *ask("hi")]
+
+        ok, failed = await asyncio.gather(
+            batch.complete(messages, max_tokens=100),
+            batch.complete(ask("FAIL")),
+            return_exceptions=True,
+        )
+
+        params = next(iter(server.batches.values()))[0]["params"]
+        assert params["system"] == "Be brief."
+        assert params["max_tokens"] == 100
+        assert ok.content == "echo: hi"
+        assert ok.usage["total_tokens"] == 6
+        assert isinstance(failed, ProviderError)
+
+    def test_backend_selection(self):
+        """Test providers without a batch API are rejected."""
+        openai = OpenAIProvider(api_key="sk-test")
+        assert isinstance(batch_backend_for(openai), OpenAIBatchBackend)
+
+        with pytest.raises(ProviderError, match="does not support batch"):
+            batch_backend_for(OllamaProvider())
@@ -0,0 +1,311 @@
+"""Unit tests for the completion cache provider wrapper."""
+
+import asyncio
+
+import pytest
+
+from agenticraft.core.agent import Agent
+from agenticraft.core.memory import SemanticCache
+from agenticraft.core.provider import BaseProvider
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse, Message, MessageRole
+from agenticraft.providers.cache import (
+    CachedProvider,
+    InMemoryCache,
+    SemanticCachedProvider,
+    SQLiteCache,
+    request_key,
+)
+
+
+class CountingProvider(BaseProvider):
+    """Provider that echoes the last message and counts calls."""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.model = "test-model"
+        self.complete_calls = 0
+        self.stream_calls = 0
+
+    async def complete(self, messages, **kwargs):
+        self.complete_calls += 1
+        content = f"reply to {messages[-1]['content']}"
+        return CompletionResponse(content=content, model=self.model)
+
+    async def stream(self, messages, **kwargs):
+        self.stream_calls += 1
+        for token in ["streamed ", "reply"]:
+            yield StreamChunk(content=token)
+        yield StreamChunk(
+            content="",
+            is_final=True,
+            metadata={"model": self.model, "finish_reason": "stop"},
+        )
+
+    def validate_auth(self):
+        pass
+
+
+MESSAGES = [{"role": "user", "content": "hello   world"}]
+
+
+class TestRequestKey:
+    """Test canonical request hashing."""
+
+    def test_equivalent_messages_share_key(self):
+        """Test Message objects and dicts hash identically."""
+        as_dict = request_key(MESSAGES, model="m", temperature=0)
+        as_message = request_key(
+            [Message(role=MessageRole.USER, content="hello   world")],
+            model="m",
+            temperature=0,
+        )
+        assert as_dict == as_message
+
+    def test_parameters_change_key(self):
+        """Test sampling parameters are part of the key."""
+        base = request_key(MESSAGES, model="m", temperature=0)
+        assert base != request_key(MESSAGES, model="m", temperature=0.5)
+        assert base != request_key(MESSAGES, model="other", temperature=0)
+        assert base != request_key(MESSAGES, model="m", temperature=0, top_p=0.1)
+
+    def test_normalized_mode_ignores_whitespace(self):
+        """Test normalized keys ignore whitespace differences."""
+        compact = [{"role": "user", "content": "hello world "}]
+        assert request_key(MESSAGES) != request_key(compact)
+        assert request_key(MESSAGES, normalize=True) == request_key(
+            compact, normalize=True
+        )
+
+    def test_normalized_mode_leaves_messages_untouched(self):
+        """Test normalizing does not rewrite a Message's wire format."""
+        message = Message(role=MessageRole.USER, content="hello   world ")
+
+        request_key([message], normalize=True)
+
+        assert message.to_dict()["content"] == "hello   world "
+
+
+class TestInMemoryCache:
+    """Test the in-memory LRU backend."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("a", CompletionResponse(content="a"))
+        await cache.set("b", CompletionResponse(content="b"))
+        await cache.get("a")
+        await cache.set("c", CompletionResponse(content="c"))
+
+        assert await cache.get("b") is None
+        assert (await cache.get("a")).content == "a"
+        assert await cache.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = InMemoryCache(default_ttl=0.01)
+        await cache.set("a", CompletionResponse(content="a"))
+        await asyncio.sleep(0.02)
+
+        assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_size_based_eviction(self):
+        """Test total serialized size is bounded."""
+        entry_size = len(CompletionResponse(content="x" * 100).model_dump_json())
+        cache = InMemoryCache(max_bytes=entry_size * 2)
+        for key in "abc":
+            await cache.set(key, CompletionResponse(content="x" * 100))
+
+        assert await cache.size() == 2
+        assert await cache.get("a") is None
+
+
+class TestSQLiteCache:
+    """Test the SQLite backend."""
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """Test cached responses survive reopening the database."""
+        path = tmp_path / "cache.db"
+        cache = SQLiteCache(path)
+        await cache.set("k", CompletionResponse(content="stored", model="m"))
+        cache.close()
+
+        reopened = SQLiteCache(path)
+        cached = await reopened.get("k")
+        assert cached.content == "stored"
+        assert cached.model == "m"
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_max_entries_and_ttl(self, tmp_path):
+        """Test row limit and expiry."""
+        cache = SQLiteCache(tmp_path / "cache.db", max_entries=2)
+        for key in "abc":
+            await cache.set(key, CompletionResponse(content=key))
+            await asyncio.sleep(0.001)
+        assert await cache.size() == 2
+        assert await cache.get("a") is None
+
+        await cache.set("ttl", CompletionResponse(content="t"), ttl=-1)
+        assert await cache.get("ttl") is None
+        cache.close()
+
+
+class TestCachedProvider:
+    """Test the CachedProvider wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_requests_are_cached(self):
+        """Test a repeated temperature-0 request hits the cache."""
+        inner = CountingProvider()
+        provider = CachedProvider(inner)
+
+        first = await provider.complete(MESSAGES, temperature=0)
+        second = await provider.complete(MESSAGES, temperature=0)
+
+        assert inner.complete_calls == 1
+        assert second.content == first.content
+        assert second.metadata["cache_hit"] is True
+        assert provider.stats.hits == 1
+        assert provider.stats.misses == 1
+        assert provider.stats.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_skip_cache_unless_forced(self):
+        """Test temperature > 0 bypasses the cache by default."""
+        inner = CountingProvider()
+        provider = CachedProvider(inner)
+        await provider.complete(MESSAGES, temperature=0.7)
+        await provider.complete(MESSAGES, temperature=0.7)
+        assert inner.complete_calls == 2
+        assert provider.stats.skipped == 2
+
+        forced = CachedProvider(inner, cache_sampled=True)
+        await forced.complete(MESSAGES, temperature=0.7)
+        await forced.complete(MESSAGES, temperature=0.7)
+        assert inner.complete_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_populates_and_replays(self):
+        """Test streamed completions are cached and replayed as chunks."""
+        inner = CountingProvider()
+        provider = CachedProvider(inner, replay_chunk_size=4)
+
+        first = [c async for c in provider.stream(MESSAGES, temperature=0)]
+        replay = [c async for c in provider.stream(MESSAGES, temperature=0)]
+
+        assert inner.stream_calls == 1
+        assert "".join(c.content for c in first) == "streamed reply"
+        assert "".join(c.content for c in replay) == "streamed reply"
+        assert len(replay) == 5  # 4 content chunks + final
+        assert replay[-1].is_final
+        assert replay[-1].metadata["cache_hit"] is True
+
+        # The streamed completion also serves complete()
+        response = await provider.complete(MESSAGES, temperature=0)
+        assert response.content == "streamed reply"
+        assert inner.complete_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_agent_uses_cached_provider(self):
+        """Test an agent can run through a cached provider instance."""
+        inner = CountingProvider()
+        agent = Agent(name="Cached", temperature=0)
+        agent.set_provider(CachedProvider(inner))
+
+        assert agent.config.model == "test-model"
+        await agent.abatch(["same", "same"], max_concurrency=1)
+
+        assert inner.complete_calls == 1
+
+
+def keyword_embedding(text: str) -> list[float]:
+    """Deterministic embedding keyed on a couple of words."""
+    words = text.lower().replace("?", "").split()
+    return [float("weather" in words), float("capital" in words), 0.1]
+
+
+class TestSemanticCachedProvider:
+    """Test the SemanticCachedProvider wrapper."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a semantic cache with a deterministic embedding."""
+        return SemanticCache(threshold=0.9, embedding_fn=keyword_embedding)
+
+    @pytest.mark.asyncio
+    async def test_paraphrase_hits(self, cache):
+        """Test a paraphrased prompt is served from the cache."""
+        inner = CountingProvider()
+        provider = SemanticCachedProvider(inner, cache)
+
+        await provider.complete([{"role": "user", "content": "weather?"}])
+        hit = await provider.complete(
+            [{"role": "user", "content": "how is the weather"}]
+        )
+
+        assert inner.complete_calls == 1
+        assert hit.content == "reply to weather?"
+        assert hit.metadata["cache_hit"] is True
+        assert provider.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_scope_and_namespace_partition(self, cache):
+        """Test system prompt, model and namespace must match exactly."""
+        inner = CountingProvider()
+        provider = SemanticCachedProvider(inner, cache, namespace="one")
+        other_agent = SemanticCachedProvider(inner, cache, namespace="two")
+        user = {"role": "user", "content": "weather"}
+
+        await provider.complete([user])
+        await other_agent.complete([user])
+        await provider.complete([{"role": "system", "content": "Be terse"}, user])
+        await provider.complete([user], model="other-model")
+
+        assert inner.complete_calls == 4
+        assert provider.stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_conversation_history_partitions(self, cache):
+        """Test the same follow-up in different conversations does not hit."""
+        inner = CountingProvider()
+        provider = SemanticCachedProvider(inner, cache)
+        follow_up = {"role": "user", "content": "tell me more"}
+        first = [
+            {"role": "user", "content": "weather"},
+            {"role": "assistant", "content": "Sunny"},
+            follow_up,
+        ]
+        second = [
+            {"role": "user", "content": "stocks"},
+            {"role": "assistant", "content": "Up 2%"},
+            follow_up,
+        ]
+
+        await provider.complete(first)
+        await provider.complete(second)
+        repeat = await provider.complete(first)
+
+        assert inner.complete_calls == 2
+        assert provider.stats.hits == 1
+        assert repeat.metadata["cache_hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_non_user_turns_are_skipped(self, cache):
+        """Test requests ending in a tool result are never cached."""
+        inner = CountingProvider()
+        provider = SemanticCachedProvider(inner, cache)
+        messages = [
+            {"role": "user", "content": "weather"},
+            {"role": "tool", "content": "72F", "tool_call_id": "1"},
+        ]
+
+        await provider.complete(messages)
+        await provider.complete(messages)
+
+        assert inner.complete_calls == 2
+        assert provider.stats.skipped == 2
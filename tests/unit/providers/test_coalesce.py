@@ -0,0 +1,232 @@
+"""Unit tests for the single-flight coalescing provider wrapper."""
+
+import asyncio
+
+import pytest
+
+from agenticraft.core.exceptions import ProviderError
+from agenticraft.core.provider import BaseProvider
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse
+from agenticraft.providers.coalesce import CoalescingProvider
+
+
+class GatedProvider(BaseProvider):
+    """Provider that holds responses until released."""
+
+    def __init__(self, fail=False):
+        super().__init__(api_key="test")
+        self.model = "test-model"
+        self.fail = fail
+        self.release = asyncio.Event()
+        self.tokens = asyncio.Semaphore(0)
+        self.complete_calls = 0
+        self.stream_calls = 0
+        self.cancelled = 0
+
+    async def complete(self, messages, **kwargs):
+        self.complete_calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ProviderError("upstream failed")
+        return CompletionResponse(
+            content=f"reply to {messages[-1]['content']}", model=self.model
+        )
+
+    async def stream(self, messages, **kwargs):
+        self.stream_calls += 1
+        for token in ["one ", "two ", "three"]:
+            await self.tokens.acquire()
+            yield StreamChunk(content=token)
+        yield StreamChunk(content="", is_final=True)
+
+    def validate_auth(self):
+        pass
+
+
+def messages(text="hello"):
+    """Build a single user message."""
+    return [{"role": "user", "content": text}]
+
+
+async def settle():
+    """Let pending tasks reach their first await."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestCoalescingComplete:
+    """Test coalesced completions."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(self):
+        """Test concurrent identical requests hit the provider once."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        tasks = [asyncio.create_task(provider.complete(messages())) for _ in range(5)]
+        await settle()
+        inner.release.set()
+        responses = await asyncio.gather(*tasks)
+
+        assert inner.complete_calls == 1
+        assert {r.content for r in responses} == {"reply to hello"}
+        assert all(r.metadata["coalesced"] for r in responses)
+        assert responses[0] is not responses[1]
+        assert provider.stats.coalesced == 4
+        assert provider.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_shared(self):
+        """Test requests with different content or parameters go upstream."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        tasks = [
+            asyncio.create_task(provider.complete(messages("a"))),
+            asyncio.create_task(provider.complete(messages("b"))),
+            asyncio.create_task(provider.complete(messages("a"), temperature=0)),
+        ]
+        await settle()
+        inner.release.set()
+        await asyncio.gather(*tasks)
+
+        assert inner.complete_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_are_not_cached(self):
+        """Test finished requests are not reused."""
+        inner = GatedProvider()
+        inner.release.set()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        first = await provider.complete(messages())
+        second = await provider.complete(messages())
+
+        assert inner.complete_calls == 2
+        assert not first.metadata["coalesced"]
+        assert not second.metadata["coalesced"]
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_are_independent_by_default(self):
+        """Test only deterministic requests are shared unless opted in."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner)
+
+        tasks = [
+            asyncio.create_task(provider.complete(messages(), temperature=t))
+            for t in (0.7, 0.7, 0, 0)
+        ]
+        await settle()
+        inner.release.set()
+        await asyncio.gather(*tasks)
+
+        assert inner.complete_calls == 3
+        assert provider.stats.skipped == 2
+        assert provider.stats.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test a failed upstream call fails all callers."""
+        inner = GatedProvider(fail=True)
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        tasks = [asyncio.create_task(provider.complete(messages())) for _ in range(3)]
+        await settle()
+        inner.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert inner.complete_calls == 1
+        assert all(isinstance(r, ProviderError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test the upstream call survives until its last caller leaves."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        first = asyncio.create_task(provider.complete(messages()))
+        second = asyncio.create_task(provider.complete(messages()))
+        await settle()
+        first.cancel()
+        await settle()
+        assert inner.cancelled == 0
+
+        inner.release.set()
+        assert (await second).content == "reply to hello"
+
+        inner.release.clear()
+        lone = asyncio.create_task(provider.complete(messages("x")))
+        await settle()
+        lone.cancel()
+        await settle()
+        assert inner.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_request_after_last_caller_left_starts_new_flight(self):
+        """Test a caller arriving while a flight is cancelled is not cancelled."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        first = asyncio.create_task(provider.complete(messages()))
+        await settle()
+        first.cancel()
+        await asyncio.sleep(0)
+        second = asyncio.create_task(provider.complete(messages()))
+        await settle()
+        inner.release.set()
+
+        assert (await second).content == "reply to hello"
+        assert inner.complete_calls == 2
+
+
+class TestCoalescingStream:
+    """Test coalesced streams."""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_receive_all_chunks(self):
+        """Test every subscriber, including late joiners, gets every chunk."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        async def collect():
+            return [chunk.content async for chunk in provider.stream(messages())]
+
+        early = asyncio.create_task(collect())
+        await settle()
+        inner.tokens.release()
+        await settle()
+        late = asyncio.create_task(collect())
+        await settle()
+        for _ in range(2):
+            inner.tokens.release()
+
+        results = await asyncio.gather(early, late)
+
+        assert inner.stream_calls == 1
+        assert results[0] == results[1] == ["one ", "two ", "three", ""]
+
+    @pytest.mark.asyncio
+    async def test_stream_after_last_subscriber_left_starts_new_flight(self):
+        """Test a stream arriving while a flight is cancelled is not cancelled."""
+        inner = GatedProvider()
+        provider = CoalescingProvider(inner, coalesce_sampled=True)
+
+        async def collect():
+            return [chunk.content async for chunk in provider.stream(messages())]
+
+        first = asyncio.create_task(collect())
+        await settle()
+        first.cancel()
+        await asyncio.sleep(0)
+        second = asyncio.create_task(collect())
+        await settle()
+        for _ in range(3):
+            inner.tokens.release()
+
+        assert await second == ["one ", "two ", "three", ""]
+        assert inner.stream_calls == 2
@@ -0,0 +1,35 @@
+"""Unit tests for provider error classification."""
+
+import httpx
+
+from agenticraft.core.exceptions import ProviderError
+from agenticraft.providers.errors import NON_RETRYABLE_STATUS, status_code
+
+
+def http_error(status):
+    """Build an httpx error carrying a response status."""
+    request = httpx.Request("POST", "http://test/v1/chat")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestStatusCode:
+    """Test finding HTTP statuses in exception chains."""
+
+    def test_status_from_response(self):
+        """Test the status is read from an attached response."""
+        assert status_code(http_error(422)) == 422
+
+    def test_status_from_wrapped_error(self):
+        """Test the status is found through raise-from chains."""
+        try:
+            try:
+                raise http_error(400)
+            except httpx.HTTPStatusError as e:
+                raise ProviderError("request failed") from e
+        except ProviderError as wrapped:
+            assert status_code(wrapped) in NON_RETRYABLE_STATUS
+
+    def test_no_status(self):
+        """Test errors without an HTTP status return None."""
+        assert status_code(ProviderError("boom")) is None
@@ -0,0 +1,248 @@
+"""Unit tests for the hedged request provider wrapper."""
+
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+from agenticraft.core.exceptions import ProviderError
+from agenticraft.core.provider import BaseProvider
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse
+from agenticraft.providers.hedge import HAS_TELEMETRY, HedgedProvider
+
+
+class SlowProvider(BaseProvider):
+    """Provider that answers after a fixed delay."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__(api_key="test")
+        self.name = name
+        self.model = "test-model"
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+        self.closed = 0
+
+    async def complete(self, messages, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ProviderError(f"{self.name} failed")
+        return CompletionResponse(content=self.name, model=self.model)
+
+    async def stream(self, messages, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            yield StreamChunk(content=self.name)
+            yield StreamChunk(content="", is_final=True)
+        finally:
+            self.closed += 1
+
+    def validate_auth(self):
+        pass
+
+
+class SlowCleanupProvider(SlowProvider):
+    """Provider that takes a while to unwind after being cancelled."""
+
+    async def complete(self, messages, **kwargs):
+        try:
+            return await super().complete(messages, **kwargs)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.1)
+            raise
+
+
+class LatencyRecorder:
+    """Minimal latency store with the MetricsCollector interface."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+
+    def record_latency(self, operation, duration_ms, attributes=None):
+        self.latencies[operation].append(duration_ms)
+
+    def latency_percentile(self, operation, percentile, min_samples=1):
+        values = sorted(self.latencies.get(operation, []))
+        if len(values) < min_samples:
+            return None
+        return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def hedged(primary, backup=None, **kwargs):
+    """Create a hedged provider with a private latency store."""
+    kwargs.setdefault("hedge_budget", 1.0)
+    kwargs.setdefault("metrics", LatencyRecorder())
+    return HedgedProvider(primary, hedge_provider=backup, **kwargs)
+
+
+class TestHedgedComplete:
+    """Test hedged completions."""
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_data(self):
+        """Test requests are not hedged before the histogram warms up."""
+        primary = SlowProvider("primary", delay=0.05)
+        backup = SlowProvider("backup")
+        provider = hedged(primary, backup)
+
+        response = await provider.complete(MESSAGES)
+
+        assert response.content == "primary"
+        assert backup.calls == 0
+        assert provider.metrics.latencies["llm.primary.complete"]
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_hedged(self):
+        """Test the hedge wins and the slow request is cancelled."""
+        primary = SlowProvider("primary", delay=1.0)
+        backup = SlowProvider("backup")
+        provider = hedged(primary, backup, initial_delay=0.01)
+
+        response = await provider.complete(MESSAGES)
+
+        assert response.content == "backup"
+        assert primary.cancelled == 1
+        assert provider.stats.hedges == 1
+        assert provider.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_request_is_not_hedged(self):
+        """Test requests faster than the percentile are not duplicated."""
+        primary = SlowProvider("primary")
+        backup = SlowProvider("backup")
+        provider = hedged(primary, backup, initial_delay=0.5)
+
+        await provider.complete(MESSAGES)
+
+        assert backup.calls == 0
+        assert provider.stats.hedges == 0
+
+    @pytest.mark.asyncio
+    async def test_delay_follows_latency_percentile(self):
+        """Test the hedge delay comes from the latency histogram."""
+        primary = SlowProvider("primary")
+        provider = hedged(primary, percentile=0.9, min_samples=10)
+        for ms in range(1, 11):
+            provider.metrics.record_latency("llm.primary.complete", ms * 100)
+
+        assert provider.hedge_delay("complete") == pytest.approx(1.0)
+        assert provider.hedge_delay("first_token") is None
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_hedges(self):
+        """Test no more than the budgeted fraction of requests is hedged."""
+        primary = SlowProvider("primary", delay=0.02)
+        provider = hedged(primary, initial_delay=0.001, hedge_budget=0.25)
+
+        for _ in range(8):
+            await provider.complete(MESSAGES)
+
+        assert provider.stats.hedges == 2
+        assert provider.stats.over_budget == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_original(self):
+        """Test a failing hedge does not fail the request."""
+        primary = SlowProvider("primary", delay=0.05)
+        backup = SlowProvider("backup", fail=True)
+        provider = hedged(primary, backup, initial_delay=0.01)
+
+        response = await provider.complete(MESSAGES)
+
+        assert response.content == "primary"
+        assert provider.stats.hedge_wins == 0
+
+    @pytest.mark.asyncio
+    async def test_all_failures_raise_original_error(self):
+        """Test the original error is raised when every request fails."""
+        primary = SlowProvider("primary", delay=0.05, fail=True)
+        backup = SlowProvider("backup", fail=True)
+        provider = hedged(primary, backup, initial_delay=0.01)
+
+        with pytest.raises(ProviderError, match="primary failed"):
+            await provider.complete(MESSAGES)
+
+    @pytest.mark.asyncio
+    async def test_only_slow_losers_are_recorded(self):
+        """Test cancelled requests count only if slower than the hedge delay."""
+        # Same name, so both requests share one latency histogram
+        primary = SlowProvider("shared", delay=0.05)
+        backup = SlowProvider("shared", delay=1.0)
+        provider = hedged(primary, backup, initial_delay=0.03)
+
+        await provider.complete(MESSAGES)
+
+        # The hedge was cancelled about 20ms in; only the winner is recorded
+        samples = provider.metrics.latencies["llm.shared.complete"]
+        assert provider.stats.hedges == 1
+        assert len(samples) == 1
+        assert samples[0] >= 50
+
+        slow = SlowProvider("slow", delay=1.0)
+        provider = hedged(slow, SlowProvider("fast"), initial_delay=0.01)
+        await provider.complete(MESSAGES)
+
+        # The original outlived the hedge delay, so its latency still counts
+        assert len(provider.metrics.latencies["llm.slow.complete"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_while_discarding_loser(self):
+        """Test cancelling the caller is not swallowed while the loser unwinds."""
+        primary = SlowCleanupProvider("primary", delay=1.0)
+        backup = SlowProvider("backup")
+        provider = hedged(primary, backup, initial_delay=0.01)
+
+        task = asyncio.create_task(provider.complete(MESSAGES))
+        await asyncio.sleep(0.05)
+        assert primary.cancelled == 1
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+class TestHedgedStream:
+    """Test hedged streams."""
+
+    @pytest.mark.asyncio
+    async def test_slow_first_chunk_is_hedged(self):
+        """Test the stream with the first chunk wins and the other closes."""
+        primary = SlowProvider("primary", delay=1.0)
+        backup = SlowProvider("backup")
+        provider = hedged(primary, backup, initial_delay=0.01)
+
+        chunks = [chunk async for chunk in provider.stream(MESSAGES)]
+
+        assert chunks[0].content == "backup"
+        assert chunks[-1].is_final
+        assert primary.closed == 1
+        assert backup.closed == 1
+        assert provider.stats.hedge_wins == 1
+        assert provider.metrics.latencies["llm.backup.first_token"]
+
+
+@pytest.mark.skipif(not HAS_TELEMETRY, reason="telemetry extra not installed")
+def test_metrics_collector_percentile():
+    """Test percentiles from the telemetry latency histogram."""
+    from opentelemetry.metrics import NoOpMeterProvider
+
+    from agenticraft.telemetry.metrics import MetricsCollector, MetricsConfig
+
+    collector = MetricsCollector(NoOpMeterProvider().get_meter("test"), MetricsConfig())
+    for ms in range(1, 101):
+        collector.record_latency("llm.test.complete", float(ms))
+
+    assert collector.latency_percentile("llm.test.complete", 0.95) == 96.0
+    assert collector.latency_percentile("llm.other.complete", 0.95) is None
+    assert collector.latency_percentile("llm.test.complete", 0.5, 1000) is None
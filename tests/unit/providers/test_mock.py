@@ -0,0 +1,237 @@
+"""Unit tests for the mock LLM provider and server."""
+
+import inspect
+import random
+import time
+
+import httpx
+import pytest
+
+from agenticraft.core.exceptions import ProviderError, ProviderRateLimitError
+from agenticraft.core.types import ToolCall
+from agenticraft.providers.mock import (
+    LatencyProfile,
+    MockLLM,
+    MockLLMServer,
+    MockProvider,
+    MockResponse,
+)
+from agenticraft.providers.ollama import OllamaProvider
+from agenticraft.providers.openai import OpenAIProvider
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {"name": "lookup", "description": "Look up", "parameters": {}},
+    }
+]
+
+
+def ask(text):
+    """Build a single user message."""
+    return [{"role": "user", "content": text}]
+
+
+def anthropic_sdk_compatible():
+    """Check the installed SDK accepts the parameters the provider sends."""
+    try:
+        from anthropic.resources.messages import AsyncMessages
+    except ImportError:
+        return False
+    return "temperature" in inspect.signature(AsyncMessages.create).parameters
+
+
+class TestMockProvider:
+    """Test the in-process mock provider."""
+
+    @pytest.mark.asyncio
+    async def test_echo_and_stream(self):
+        """Test the default reply echoes the last message."""
+        provider = MockProvider()
+
+        response = await provider.complete(ask("hello there"))
+        chunks = [chunk async for chunk in provider.stream(ask("hello there"))]
+
+        assert response.content == "Mock response to: hello there"
+        assert "".join(c.content for c in chunks) == response.content
+        assert chunks[-1].is_final
+        assert chunks[-1].metadata["usage"]["completion_tokens"] == 5
+
+    @pytest.mark.asyncio
+    async def test_scripted_responses(self):
+        """Test scripted responses cycle and fill in placeholders."""
+        provider = MockProvider(
+            responses=["first {turn}", "{model} says {last_message}"]
+        )
+
+        contents = [(await provider.complete(ask("hi"))).content for _ in range(3)]
+
+        assert contents == ["first 1", "mock says hi", "first 3"]
+
+    @pytest.mark.asyncio
+    async def test_tool_calls(self):
+        """Test tools are called until a tool result arrives."""
+        provider = MockProvider(call_tools=True, responses=["done"])
+        scripted = MockProvider(
+            responses=[
+                MockResponse(tool_calls=[ToolCall(id="1", name="x", arguments={})])
+            ]
+        )
+
+        first = await provider.complete(ask("go"), tools=TOOLS)
+        second = await provider.complete(
+            ask("go") + [{"role": "tool", "content": "42", "tool_call_id": "1"}],
+            tools=TOOLS,
+        )
+
+        assert first.tool_calls[0].name == "lookup"
+        assert first.finish_reason == "tool_calls"
+        assert second.content == "done"
+        assert (await scripted.complete(ask("go"))).tool_calls[0].name == "x"
+
+    @pytest.mark.asyncio
+    async def test_max_tokens_truncates(self):
+        """Test replies stop at max_tokens."""
+        provider = MockProvider(responses=["one two three four"])
+
+        response = await provider.complete(ask("x"), max_tokens=2)
+
+        assert response.content == "one two"
+        assert response.finish_reason == "length"
+
+    @pytest.mark.asyncio
+    async def test_latency_profile(self):
+        """Test responses take the configured generation time."""
+        provider = MockProvider(
+            responses=["a b c"], latency=LatencyProfile(ttft=0.05, inter_token=0.01)
+        )
+
+        start = time.perf_counter()
+        chunks = provider.stream(ask("x"))
+        await chunks.__anext__()
+        ttft = time.perf_counter() - start
+        [chunk async for chunk in chunks]
+        total = time.perf_counter() - start
+
+        assert ttft >= 0.05
+        assert total >= 0.07
+
+    def test_jitter_is_reproducible(self):
+        """Test jittered delays are deterministic per seed."""
+        for distribution in ("lognormal", "normal"):
+            profile = LatencyProfile(jitter=0.5, distribution=distribution)
+            first = [profile.sample(0.1, random.Random(1)) for _ in range(3)]
+            second = [profile.sample(0.1, random.Random(1)) for _ in range(3)]
+            assert first == second
+            assert all(delay >= 0 for delay in first)
+        samples = [
+            LatencyProfile(jitter=0.5).sample(0.1, rng)
+            for rng in [random.Random(0)]
+            for _ in range(2000)
+        ]
+        assert sum(samples) / len(samples) == pytest.approx(0.1, rel=0.1)
+
+    @pytest.mark.asyncio
+    async def test_injected_errors(self):
+        """Test injected errors raise provider exceptions."""
+        with pytest.raises(ProviderRateLimitError):
+            await MockProvider(rate_limit_rate=1.0).complete(ask("x"))
+        with pytest.raises(ProviderError, match="500"):
+            await MockProvider(server_error_rate=1.0).complete(ask("x"))
+
+
+class TestMockLLMServer:
+    """Test the wire formats of the mock server."""
+
+    @pytest.mark.asyncio
+    async def test_openai_provider(self):
+        """Test the OpenAI provider completes and streams via the server."""
+        pytest.importorskip("openai")
+        async with MockLLMServer(MockLLM(call_tools=True)) as server:
+            provider = OpenAIProvider(
+                api_key="sk-mock", base_url=server.openai_url, model="gpt-mock"
+            )
+            response = await provider.complete(ask("hi"))
+            tool_response = await provider.complete(ask("hi"), tools=TOOLS)
+            chunks = [chunk async for chunk in provider.stream(ask("hi"))]
+
+        assert response.content == "Mock response to: hi"
+        assert response.usage["completion_tokens"] == 4
+        assert tool_response.tool_calls[0].name == "lookup"
+        assert "".join(c.content for c in chunks) == "Mock response to: hi"
+
+    @pytest.mark.asyncio
+    async def test_ollama_provider(self):
+        """Test the Ollama provider completes and streams via the server."""
+        async with MockLLMServer() as server:
+            provider = OllamaProvider(base_url=server.url, model="mock")
+            response = await provider.complete(ask("hi"))
+            chunks = [chunk async for chunk in provider.stream(ask("hi"))]
+
+        assert response.content == "Mock response to: hi"
+        assert "".join(c.content for c in chunks) == "Mock response to: hi"
+        assert chunks[-1].is_final
+
+    @pytest.mark.asyncio
+    async def test_anthropic_wire_format(self):
+        """Test Anthropic messages and streaming events."""
+        async with (
+            MockLLMServer() as server,
+            httpx.AsyncClient(base_url=server.url) as client,
+        ):
+            body = {
+                "model": "claude-mock",
+                "max_tokens": 100,
+                "system": "Be brief.",
+                "messages": [
+                    {"role": "user", "content": [{"type": "text", "text": "hi"}]}
+                ],
+            }
+            message = (await client.post("/v1/messages", json=body)).json()
+            stream = await client.post("/v1/messages", json={**body, "stream": True})
+
+        assert message["content"] == [{"type": "text", "text": "Mock response to: hi"}]
+        assert message["stop_reason"] == "end_turn"
+        events = [
+            line.split(": ", 1)[1]
+            for line in stream.text.splitlines()
+            if line.startswith("event: ")
+        ]
+        assert events[0] == "message_start"
+        assert events[-1] == "message_stop"
+        assert events.count("content_block_delta") == 4
+
+    @pytest.mark.skipif(
+        not anthropic_sdk_compatible(), reason="requires a compatible anthropic SDK"
+    )
+    @pytest.mark.asyncio
+    async def test_anthropic_provider(self):
+        """Test the Anthropic provider completes via the server."""
+        from agenticraft.providers.anthropic import AnthropicProvider
+
+        async with MockLLMServer() as server:
+            provider = AnthropicProvider(api_key="mock", base_url=server.url)
+            response = await provider.complete(ask("hi"))
+
+        assert response.content == "Mock response to: hi"
+
+    @pytest.mark.asyncio
+    async def test_injected_rate_limits(self):
+        """Test 429s carry Retry-After in the provider's error format."""
+        llm = MockLLM(rate_limit_rate=1.0, retry_after=7)
+        async with (
+            MockLLMServer(llm) as server,
+            httpx.AsyncClient(base_url=server.url) as client,
+        ):
+            openai = await client.post(
+                "/v1/chat/completions", json={"model": "m", "messages": ask("x")}
+            )
+            ollama = await client.post(
+                "/api/chat", json={"model": "m", "messages": ask("x")}
+            )
+
+        assert openai.status_code == 429
+        assert openai.headers["retry-after"] == "7"
+        assert openai.json()["error"]["type"] == "rate_limit_error"
+        assert ollama.json() == {"error": "Rate limit exceeded"}
+        assert llm.stats.rate_limited == 2
@@ -3,14 +3,17 @@
 Tests the Ollama provider implementation with mocked API responses.
 """
 
+import json
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from agenticraft.core.exceptions import ProviderError
+from agenticraft.core.streaming import StreamChunk
 from agenticraft.core.types import Message, MessageRole, ToolDefinition, ToolParameter
-from agenticraft.providers.ollama import OllamaProvider
+from agenticraft.providers.ollama import HAS_ORJSON, OllamaProvider, iter_ndjson
 
 
 class TestOllamaProvider:
@@ -456,3 +459,176 @@ class TestOllamaProvider:
 
         assert response.content == "Response without token data"
         assert response.usage is None  # No usage data available
+
+
+def ndjson_stream(tokens, split=None, model="llama2"):
+    """Encode tokens as an Ollama /api/chat NDJSON response body.
+
+    Args:
+        tokens: Token strings to stream
+        split: Bytes per network read (None sends one record per read)
+        model: Model name in each record
+    """
+    records = [
+        json.dumps(
+            {
+                "model": model,
+                "message": {"role": "assistant", "content": token},
+                "done": False,
+            }
+        ).encode()
+        + b"\n"
+        for token in tokens
+    ]
+    records.append(
+        json.dumps(
+            {
+                "model": model,
+                "message": {"role": "assistant", "content": ""},
+                "done": True,
+                "eval_count": len(tokens),
+                "prompt_eval_count": 5,
+            }
+        ).encode()
+        + b"\n"
+    )
+    if split is None:
+        return records
+    body = b"".join(records)
+    return [body[i : i + split] for i in range(0, len(body), split)]
+
+
+class ByteStream(httpx.AsyncByteStream):
+    """Response body that yields pre-split byte chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def stand_in_server(chunks):
+    """Create an HTTP client backed by an in-process Ollama stand-in."""
+
+    def handler(request):
+        assert request.url.path == "/api/chat"
+        return httpx.Response(200, stream=ByteStream(chunks))
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://ollama.test"
+    )
+
+
+class TestOllamaStreaming:
+    """Test the NDJSON streaming pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_iter_ndjson_reframes_split_records(self):
+        """Test records split across reads are reassembled."""
+
+        async def reads():
+            for chunk in [b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}']:
+                yield chunk
+
+        batches = [batch async for batch in iter_ndjson(reads())]
+
+        assert batches == [[b'{"a": 1}'], [b'{"b": 2}'], [b'{"c": 3}']]
+
+    @pytest.mark.asyncio
+    async def test_stream_tokens_and_final_metadata(self):
+        """Test tokens stream in order and the final chunk has stats."""
+        tokens = ["Hel", "lo", " wor", "ld"]
+        provider = OllamaProvider()
+        provider._client = stand_in_server(ndjson_stream(tokens, split=7))
+
+        chunks = [c async for c in provider.stream([{"role": "user", "content": "hi"}])]
+
+        assert "".join(c.content for c in chunks) == "Hello world"
+        final = chunks[-1]
+        assert final.is_final
+        assert final.metadata["total_content"] == "Hello world"
+        assert final.metadata["eval_count"] == 4
+        assert chunks[0].metadata is chunks[1].metadata
+
+    @pytest.mark.asyncio
+    async def test_frame_coalescing(self):
+        """Test tokens from one read are merged up to the frame size."""
+        tokens = [f"t{i} " for i in range(10)]
+        provider = OllamaProvider(stream_frame_tokens=4)
+        provider._client = stand_in_server([b"".join(ndjson_stream(tokens))])
+
+        chunks = [c async for c in provider.stream([{"role": "user", "content": "hi"}])]
+
+        assert [len(c.content.split()) for c in chunks[:-1]] == [4, 4, 2]
+        assert chunks[-1].metadata["total_content"] == "".join(tokens)
+
+    @pytest.mark.asyncio
+    async def test_malformed_records_are_skipped(self):
+        """Test a corrupt record does not end the stream."""
+        records = ndjson_stream(["a", "b"])
+        records.insert(1, b"{not json}\n")
+        provider = OllamaProvider()
+        provider._client = stand_in_server(records)
+
+        chunks = [c async for c in provider.stream([{"role": "user", "content": "hi"}])]
+
+        assert chunks[-1].metadata["total_content"] == "ab"
+
+
+@pytest.mark.benchmark
+class TestOllamaStreamingBenchmark:
+    """Per-token overhead of the streaming pipeline."""
+
+    TOKENS = [f"tok{i} " for i in range(20_000)]
+
+    @staticmethod
+    async def legacy_stream(client):
+        """The previous line-based parser, for comparison."""
+        accumulated = ""
+        async with client.stream("POST", "/api/chat", json={}) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                content = data.get("message", {}).get("content", "")
+                if content:
+                    accumulated += content
+                    yield StreamChunk(
+                        content=content,
+                        token=content,
+                        metadata={"model": "llama2", "eval_count": None},
+                    )
+                if data.get("done", False):
+                    break
+
+    @pytest.mark.asyncio
+    async def test_per_token_overhead(self):
+        """Compare per-token cost of the legacy and current parsers."""
+        body = ndjson_stream(self.TOKENS, split=4096)
+        messages = [{"role": "user", "content": "hi"}]
+
+        def best_of(samples):
+            return min(samples) / len(self.TOKENS) * 1e6
+
+        legacy, current = [], []
+        for _ in range(3):
+            start = time.perf_counter()
+            async for _chunk in self.legacy_stream(stand_in_server(body)):
+                pass
+            legacy.append(time.perf_counter() - start)
+
+            provider = OllamaProvider()
+            provider._client = stand_in_server(body)
+            start = time.perf_counter()
+            async for _chunk in provider.stream(messages):
+                pass
+            current.append(time.perf_counter() - start)
+
+        print(
+            f"\nOllama stream per-token overhead: legacy {best_of(legacy):.2f}us, "
+            f"current {best_of(current):.2f}us "
+            f"({'orjson' if HAS_ORJSON else 'json'})"
+        )
+        assert best_of(current) < best_of(legacy)
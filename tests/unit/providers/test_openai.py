@@ -10,6 +10,7 @@ import pytest
 from agenticraft.core.exceptions import ProviderAuthError, ProviderError
 from agenticraft.core.types import Message, MessageRole, ToolDefinition, ToolParameter
 from agenticraft.providers.openai import OpenAIProvider
+from agenticraft.providers.pool import get_http_client
 
 
 class TestOpenAIProvider:
@@ -394,6 +395,42 @@ class TestOpenAIProvider:
 
             assert "OpenAI completion failed" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_stream_tool_call_deltas(self, provider, mock_client):
+        """Test tool calls are announced as soon as their arguments complete."""
+
+        def delta(index, id=None, name=None, arguments=None, finish_reason=None):
+            function = MagicMock(arguments=arguments)
+            function.name = name
+            tool_call = MagicMock(index=index, id=id, function=function)
+            choice = MagicMock(index=0, finish_reason=finish_reason)
+            choice.delta = MagicMock(content=None, tool_calls=[tool_call])
+            return MagicMock(choices=[choice])
+
+        async def events():
+            # Only the first delta of each call carries its ID and name
+            yield delta(0, id="call_1", name="search", arguments='{"q": "ca')
+            yield delta(0, arguments='ts"}')
+            yield delta(1, id="call_2", name="fetch", arguments='{"url": "x"}')
+            yield delta(1, arguments="", finish_reason="tool_calls")
+
+        mock_client.chat.completions.create.return_value = events()
+
+        with patch.object(provider, "_client", mock_client):
+            chunks = [
+                chunk
+                async for chunk in provider.stream(
+                    [{"role": "user", "content": "Test"}]
+                )
+            ]
+
+        announced = [c.metadata["tool_call"] for c in chunks if not c.is_final]
+        assert announced == [
+            {"id": "call_1", "name": "search", "arguments": {"q": "cats"}},
+            {"id": "call_2", "name": "fetch", "arguments": {"url": "x"}},
+        ]
+        assert chunks[-1].metadata["tool_calls"] == announced
+
     def test_format_messages(self, provider):
         """Test message formatting."""
         messages = [
@@ -442,10 +479,27 @@ class TestOpenAIProvider:
                 base_url=provider.base_url,
                 timeout=provider.timeout,
                 max_retries=provider.max_retries,
+                http_client=get_http_client(
+                    "openai", provider.base_url, api_key=provider.api_key
+                ),
             )
             assert client is mock_client_instance
             assert provider._client is mock_client_instance
 
+            # Cached client is reused while the pooled HTTP client is unchanged
+            assert provider.client is mock_client_instance
+            mock_client_class.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_clients_share_http_pool(self):
+        """Test providers with the same endpoint share one HTTP client."""
+        first = OpenAIProvider(api_key="sk-test-key")
+        second = OpenAIProvider(api_key="sk-test-key")
+        other_key = OpenAIProvider(api_key="sk-other-key")
+
+        assert first.client._client is second.client._client
+        assert first.client._client is not other_key.client._client
+
     @pytest.mark.asyncio
     async def test_import_error_handling(self):
         """Test handling of missing openai package."""
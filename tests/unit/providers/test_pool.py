@@ -0,0 +1,130 @@
+"""Unit tests for the shared HTTP connection pool registry."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from agenticraft.providers.ollama import OllamaProvider
+from agenticraft.providers.pool import (
+    ConnectionPoolRegistry,
+    PoolConfig,
+    get_pool_registry,
+)
+
+
+class TestConnectionPoolRegistry:
+    """Test suite for ConnectionPoolRegistry."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create an isolated registry."""
+        return ConnectionPoolRegistry(PoolConfig(max_connections=5))
+
+    @pytest.mark.asyncio
+    async def test_same_key_shares_client(self, registry):
+        """Test identical endpoints and credentials share a client."""
+        first = registry.get_client("openai", "https://api.example.com", "sk-1")
+        second = registry.get_client("openai", "https://api.example.com", "sk-1")
+
+        assert first is second
+        assert isinstance(first, httpx.AsyncClient)
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_keys_get_separate_clients(self, registry):
+        """Test provider, URL, credentials and timeout all partition pools."""
+        base = registry.get_client("openai", "https://a.example.com", "sk-1")
+
+        assert base is not registry.get_client(
+            "anthropic", "https://a.example.com", "sk-1"
+        )
+        assert base is not registry.get_client(
+            "openai", "https://b.example.com", "sk-1"
+        )
+        assert base is not registry.get_client(
+            "openai", "https://a.example.com", "sk-2"
+        )
+        assert base is not registry.get_client(
+            "openai", "https://a.example.com", "sk-1", timeout=5
+        )
+        assert registry.stats()["clients"] == 5
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self, registry):
+        """Test a client closed elsewhere is transparently recreated."""
+        client = registry.get_client("ollama", "http://localhost:11434")
+        await client.aclose()
+
+        replacement = registry.get_client("ollama", "http://localhost:11434")
+
+        assert replacement is not client
+        assert not replacement.is_closed
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_and_lifespan(self, registry):
+        """Test aclose closes clients of the running loop."""
+        async with registry.lifespan():
+            client = registry.get_client("ollama", "http://localhost:11434")
+            assert registry.stats()["open_clients"] == 1
+
+        assert client.is_closed
+        assert registry.stats()["clients"] == 0
+
+    def test_clients_are_scoped_to_event_loop(self, registry):
+        """Test each event loop gets its own clients."""
+
+        async def fetch():
+            return registry.get_client("openai", "https://api.example.com", "sk-1")
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+
+        assert first is not second
+
+    def test_no_running_loop_reuses_detached_client(self, registry):
+        """Test clients requested outside a loop are cached, not reallocated."""
+        client = registry.get_client("openai", "https://api.example.com")
+
+        assert isinstance(client, httpx.AsyncClient)
+        assert registry.get_client("openai", "https://api.example.com") is client
+        assert registry.stats()["clients"] == 0
+        assert registry.stats()["detached_clients"] == 1
+
+        asyncio.run(registry.aclose())
+        assert client.is_closed
+        assert registry.stats()["detached_clients"] == 0
+
+    def test_configure_updates_limits(self, registry):
+        """Test configure replaces pool settings."""
+        registry.configure(max_connections=42, keepalive_expiry=5.0)
+
+        limits = registry.config.to_limits()
+        assert limits.max_connections == 42
+        assert limits.keepalive_expiry == 5.0
+
+
+class TestProviderPooling:
+    """Test providers borrow clients from the global registry."""
+
+    @pytest.mark.asyncio
+    async def test_ollama_providers_share_client(self):
+        """Test Ollama providers with the same server share a client."""
+        first = OllamaProvider(base_url="http://pool-test:11434")
+        second = OllamaProvider(base_url="http://pool-test:11434")
+
+        shared = first.client
+        assert second.client is shared
+
+        # Leaving the context manager does not close the shared client
+        async with first:
+            pass
+        assert not shared.is_closed
+
+        # Closing the registry closes it, and providers borrow a fresh one
+        await get_pool_registry().aclose()
+        assert shared.is_closed
+        assert first.client is not shared
+        assert not first.client.is_closed
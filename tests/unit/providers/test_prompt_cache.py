@@ -0,0 +1,368 @@
+"""Unit tests for automatic Anthropic prompt prefix caching."""
+
+import asyncio
+import inspect
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agenticraft.providers.prompt_cache import EPHEMERAL, PromptCachePlanner
+
+SYSTEM = "You are a meticulous assistant. " * 40
+TOOLS = [
+    {"name": "search", "description": "Search the web", "input_schema": {}},
+    {"name": "fetch", "description": "Fetch a page", "input_schema": {}},
+]
+
+
+def request(turns, **extra):
+    """Build request parameters for a conversation with some turns."""
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"question {turn} " * 20})
+        if turn < turns - 1:
+            messages.append({"role": "assistant", "content": f"answer {turn} " * 20})
+    return {
+        "model": "claude-test",
+        "system": SYSTEM,
+        "tools": TOOLS,
+        "messages": messages,
+        **extra,
+    }
+
+
+def breakpoints(params):
+    """List the blocks that carry a breakpoint."""
+    marked = []
+    if "cache_control" in params["tools"][-1]:
+        marked.append("tools")
+    if isinstance(params["system"], list):
+        marked.append("system")
+    for index, message in enumerate(params["messages"]):
+        if isinstance(message["content"], list):
+            assert message["content"][-1]["cache_control"] == EPHEMERAL
+            marked.append(f"messages[{index}]")
+    return marked
+
+
+class TestPromptCachePlanner:
+    """Test breakpoint placement."""
+
+    def test_first_request_is_not_marked(self):
+        """Test prefixes are only marked once they have been sent before."""
+        planner = PromptCachePlanner(min_tokens=30)
+        params = request(1)
+
+        assert planner.plan(params) == []
+        assert params["system"] == SYSTEM
+
+    def test_stable_prefixes_are_marked(self):
+        """Test later turns mark tools, system and the conversation."""
+        planner = PromptCachePlanner(min_tokens=30)
+        planner.plan(request(1))
+        planner.plan(request(2))
+
+        params = request(3)
+        labels = planner.plan(params)
+
+        # messages[2] ended the previous request; messages[4] is the new tail
+        assert labels == ["messages[4]", "messages[2]", "system", "tools"]
+        assert breakpoints(params) == labels[::-1]
+        assert planner.stats.breakpoints == 8
+
+    def test_new_conversation_reuses_system_and_tools(self):
+        """Test a new conversation only marks the shared prefix."""
+        planner = PromptCachePlanner(min_tokens=30)
+        planner.plan(request(1))
+
+        params = request(1)
+        params["messages"] = [{"role": "user", "content": "something else"}]
+
+        assert planner.plan(params) == ["system", "tools"]
+
+    def test_short_prefixes_are_skipped(self):
+        """Test prefixes below the minimum length get no breakpoint."""
+        planner = PromptCachePlanner(min_tokens=100_000)
+        planner.plan(request(2))
+
+        assert planner.plan(request(2)) == []
+
+    def test_shared_blocks_are_not_mutated(self):
+        """Test marking copies blocks instead of changing them."""
+        planner = PromptCachePlanner(min_tokens=30, stable_after=0)
+        params = request(2)
+        messages = params["messages"]
+        originals = json.dumps([TOOLS, messages])
+
+        planner.plan(params)
+
+        assert params["messages"] is not messages
+        assert json.dumps([TOOLS, messages]) == originals
+
+    def test_caller_breakpoints_are_respected(self):
+        """Test requests with explicit breakpoints are left alone."""
+        planner = PromptCachePlanner(min_tokens=30, stable_after=0)
+        params = request(1)
+        params["system"] = [
+            {"type": "text", "text": SYSTEM, "cache_control": EPHEMERAL}
+        ]
+
+        assert planner.plan(params) == []
+        assert "cache_control" not in params["tools"][-1]
+
+    def test_breakpoint_limit(self):
+        """Test no more than the allowed number of breakpoints are placed."""
+        planner = PromptCachePlanner(min_tokens=30, max_breakpoints=2)
+        planner.plan(request(1))
+        planner.plan(request(2))
+
+        assert planner.plan(request(3)) == ["messages[4]", "messages[2]"]
+
+    def test_record_usage(self):
+        """Test cache usage is accounted."""
+        planner = PromptCachePlanner()
+        planner.record_usage(
+            {
+                "prompt_tokens": 1000,
+                "cache_read_input_tokens": 600,
+                "cache_creation_input_tokens": 300,
+            }
+        )
+
+        assert planner.stats.uncached_tokens == 100
+        assert planner.stats.hit_rate == 0.6
+
+
+class StandInAnthropic:
+    """Local Messages API server that records requests."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def serve(self, reader, writer):
+        headers = {}
+        await reader.readline()  # request line
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = json.loads(await reader.readexactly(int(headers["content-length"])))
+        self.requests.append(body)
+
+        content_type, payload = self.respond(body)
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+            + payload
+        )
+        await writer.drain()
+        writer.close()
+
+    def respond(self, body):
+        usage = {
+            "input_tokens": 20,
+            "output_tokens": 5,
+            "cache_creation_input_tokens": 300,
+            "cache_read_input_tokens": 1200,
+        }
+        message = {
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": "ok"}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+        if not body.get("stream"):
+            return "application/json", json.dumps(message).encode()
+
+        start = {**message, "content": [], "stop_reason": None}
+        events = [
+            {"type": "message_start", "message": start},
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            },
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": "ok"},
+            },
+            {"type": "content_block_stop", "index": 0},
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": 5},
+            },
+            {"type": "message_stop"},
+        ]
+        sse = "".join(
+            f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events
+        )
+        return "text/event-stream", sse.encode()
+
+
+def sdk_accepts_sampling():
+    """Check the installed SDK accepts the parameters the provider sends."""
+    try:
+        from anthropic.resources.messages import AsyncMessages
+    except ImportError:
+        return False
+    return "temperature" in inspect.signature(AsyncMessages.create).parameters
+
+
+def anthropic_provider(server, **kwargs):
+    """Create an Anthropic provider backed by a stand-in server."""
+    anthropic = pytest.importorskip("anthropic")
+    from agenticraft.providers.anthropic import AnthropicProvider
+
+    provider = AnthropicProvider(api_key="test", model="claude-test", **kwargs)
+    provider._client = anthropic.AsyncAnthropic(
+        api_key="test", base_url=server.url, max_retries=0
+    )
+    return provider
+
+
+def conversation(turns):
+    """Build agent-style messages with a system prompt."""
+    return [{"role": "system", "content": SYSTEM}] + request(turns)["messages"]
+
+
+class TestAnthropicUsage:
+    """Test breakpoints and usage with a recording client."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create an Anthropic provider with a recording client."""
+        from agenticraft.providers.anthropic import AnthropicProvider
+
+        provider = AnthropicProvider(
+            api_key="test",
+            model="claude-test",
+            prompt_caching=PromptCachePlanner(min_tokens=30),
+        )
+        usage = SimpleNamespace(
+            input_tokens=20,
+            output_tokens=5,
+            cache_creation_input_tokens=300,
+            cache_read_input_tokens=1200,
+        )
+        provider._client = SimpleNamespace(
+            messages=SimpleNamespace(
+                create=AsyncMock(
+                    return_value=SimpleNamespace(
+                        content=[SimpleNamespace(text="ok")],
+                        stop_reason="end_turn",
+                        usage=usage,
+                    )
+                )
+            )
+        )
+        return provider
+
+    def test_caching_defaults(self):
+        """Test planning is off by default and enabled with True."""
+        from agenticraft.providers.anthropic import AnthropicProvider
+
+        assert AnthropicProvider(api_key="test").prompt_cache is None
+        planner = AnthropicProvider(api_key="test", prompt_caching=True).prompt_cache
+        assert isinstance(planner, PromptCachePlanner)
+
+    @pytest.mark.asyncio
+    async def test_breakpoints_and_cache_usage(self, provider):
+        """Test breakpoints are sent and cache tokens reported."""
+        await provider.complete(conversation(1), tools=TOOLS)
+        response = await provider.complete(conversation(2), tools=TOOLS)
+
+        sent = provider.client.messages.create.call_args.kwargs
+        assert sent["system"][0]["cache_control"] == EPHEMERAL
+        assert sent["tools"][-1]["cache_control"] == EPHEMERAL
+        assert "cache_control" not in TOOLS[-1]
+        assert response.usage == {
+            "prompt_tokens": 1520,
+            "completion_tokens": 5,
+            "total_tokens": 1525,
+            "cache_creation_input_tokens": 300,
+            "cache_read_input_tokens": 1200,
+        }
+        assert provider.prompt_cache.stats.cache_read_tokens == 2400
+
+
+@pytest.mark.skipif(
+    not sdk_accepts_sampling(), reason="requires a compatible anthropic SDK"
+)
+class TestAnthropicPromptCaching:
+    """Test prompt caching against a local stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_breakpoints_reach_the_request(self):
+        """Test repeated turns send breakpoints and report cache usage."""
+        async with StandInAnthropic() as server:
+            provider = anthropic_provider(
+                server, prompt_caching=PromptCachePlanner(min_tokens=30)
+            )
+
+            await provider.complete(conversation(1), tools=TOOLS)
+            response = await provider.complete(conversation(2), tools=TOOLS)
+
+        sent = server.requests[-1]
+        assert sent["system"][0]["cache_control"] == EPHEMERAL
+        assert sent["tools"][-1]["cache_control"] == EPHEMERAL
+        assert sent["messages"][0]["content"][0]["cache_control"] == EPHEMERAL
+        assert "cache_control" not in server.requests[0]["tools"][-1]
+        assert response.usage == {
+            "prompt_tokens": 1520,
+            "completion_tokens": 5,
+            "total_tokens": 1525,
+            "cache_creation_input_tokens": 300,
+            "cache_read_input_tokens": 1200,
+        }
+        assert provider.prompt_cache.stats.cache_read_tokens == 2400
+
+    @pytest.mark.asyncio
+    async def test_stream_reports_cache_usage(self):
+        """Test the final stream chunk carries usage with cache counts."""
+        async with StandInAnthropic() as server:
+            provider = anthropic_provider(
+                server, prompt_caching=PromptCachePlanner(min_tokens=30, stable_after=0)
+            )
+
+            chunks = [chunk async for chunk in provider.stream(conversation(1))]
+
+        assert chunks[0].content == "ok"
+        assert chunks[-1].metadata["usage"]["cache_read_input_tokens"] == 1200
+        assert server.requests[0]["system"][0]["cache_control"] == EPHEMERAL
+
+    @pytest.mark.asyncio
+    async def test_caching_is_opt_in(self):
+        """Test no breakpoints are sent unless caching is enabled."""
+        async with StandInAnthropic() as server:
+            provider = anthropic_provider(server)
+
+            for _ in range(3):
+                await provider.complete(conversation(2), tools=TOOLS)
+
+        assert provider.prompt_cache is None
+        assert server.requests[-1]["system"] == SYSTEM
@@ -0,0 +1,280 @@
+"""Unit tests for the rate limiting provider wrapper."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from agenticraft.core.exceptions import ProviderError, ProviderRateLimitError
+from agenticraft.core.provider import BaseProvider
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse
+from agenticraft.providers.pool import record_response_headers
+from agenticraft.providers.ratelimit import (
+    RateLimitedProvider,
+    RateLimiter,
+    RateLimiterRegistry,
+    TokenBucket,
+    parse_reset,
+)
+
+
+class FakeResponse:
+    """HTTP response carrying headers."""
+
+    def __init__(self, headers):
+        self.headers = headers
+        self.status_code = 429
+
+
+class FakeRateLimitError(Exception):
+    """SDK-style 429 error."""
+
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = FakeResponse(headers)
+
+
+class FlakyProvider(BaseProvider):
+    """Provider that fails with 429s before succeeding."""
+
+    def __init__(self, failures=0, headers=None, total_tokens=10):
+        super().__init__(api_key="test")
+        self.model = "test-model"
+        self.failures = failures
+        self.headers = headers or {"retry-after": "0"}
+        self.total_tokens = total_tokens
+        self.calls = 0
+
+    async def complete(self, messages, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            try:
+                raise FakeRateLimitError(self.headers)
+            except FakeRateLimitError as e:
+                raise ProviderError(f"completion failed: {e}") from e
+        return CompletionResponse(
+            content="ok",
+            model=self.model,
+            usage={"total_tokens": self.total_tokens},
+        )
+
+    async def stream(self, messages, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ProviderRateLimitError("fake", retry_after=0)
+        yield StreamChunk(content="ok")
+        yield StreamChunk(
+            content="",
+            is_final=True,
+            metadata={"usage": {"total_tokens": self.total_tokens}},
+        )
+
+    def validate_auth(self):
+        pass
+
+
+class HTTPProvider(BaseProvider):
+    """Provider that makes a real HTTP call against a mock transport."""
+
+    def __init__(self, headers):
+        super().__init__(api_key="test")
+        self.model = "test-model"
+        self.client = httpx.AsyncClient(
+            base_url="http://llm.test",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, headers=headers, json={})
+            ),
+            event_hooks={"response": [record_response_headers]},
+        )
+
+    async def complete(self, messages, **kwargs):
+        await self.client.post("/chat")
+        return CompletionResponse(content="ok", model=self.model)
+
+    def validate_auth(self):
+        pass
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+class TestTokenBucket:
+    """Test token bucket accounting."""
+
+    def test_unlimited_by_default(self):
+        """Test a bucket without capacity never waits."""
+        bucket = TokenBucket()
+        bucket.consume(1_000_000)
+        assert bucket.wait_time(1_000_000) == 0.0
+
+    def test_wait_time_after_drain(self):
+        """Test a drained bucket waits for refill at the per-minute rate."""
+        bucket = TokenBucket(60)
+        bucket.consume(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+        assert bucket.wait_time(1, rate_scale=0.5) == pytest.approx(2.0, abs=0.1)
+
+    def test_credit_reconciles(self):
+        """Test unused tokens are returned and overuse is charged."""
+        bucket = TokenBucket(1000)
+        bucket.consume(500)
+        bucket.credit(400)
+        assert bucket.tokens == pytest.approx(900, abs=1)
+        bucket.credit(-950)
+        assert bucket.wait_time(1) > 0
+
+
+class TestRateLimiter:
+    """Test the RPM/TPM governor."""
+
+    @pytest.mark.asyncio
+    async def test_paces_requests(self):
+        """Test requests beyond the RPM budget wait for refill."""
+        limiter = RateLimiter(rpm=600)  # 10 per second
+        limiter.requests.tokens = 2
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert time.monotonic() - start >= 0.09
+        assert limiter.stats.requests == 3
+        assert limiter.stats.throttled == 1
+
+    @pytest.mark.asyncio
+    async def test_fifo_admission(self):
+        """Test waiting callers are admitted in arrival order."""
+        limiter = RateLimiter(rpm=1200)
+        limiter.requests.tokens = 0
+        order = []
+
+        async def caller(i):
+            await limiter.acquire()
+            order.append(i)
+
+        await asyncio.gather(*(caller(i) for i in range(5)))
+        assert order == list(range(5))
+
+    def test_learns_limits_from_headers(self):
+        """Test OpenAI and Anthropic headers resize the buckets."""
+        limiter = RateLimiter()
+        limiter.update_from_headers(
+            {
+                "x-ratelimit-limit-requests": "500",
+                "x-ratelimit-remaining-requests": "10",
+                "x-ratelimit-limit-tokens": "30000",
+            }
+        )
+        assert limiter.requests.capacity == 500
+        assert limiter.requests.tokens == pytest.approx(10, abs=1)
+        assert limiter.tokens.capacity == 30000
+
+        limiter.update_from_headers({"anthropic-ratelimit-tokens-limit": "40000"})
+        assert limiter.tokens.capacity == 40000
+
+    def test_backoff_and_recovery(self):
+        """Test 429s halve the pacing rate and successes restore it."""
+        limiter = RateLimiter(rpm=100, recovery_step=0.25)
+        pause = limiter.record_rate_limited(headers={"retry-after": "2"})
+
+        assert pause == 2.0
+        assert limiter.stats.rate_scale == 0.5
+        limiter.record_success()
+        limiter.record_success()
+        assert limiter.stats.rate_scale == 1.0
+
+    def testparse_reset(self):
+        """Test the reset formats used by providers."""
+        assert parse_reset("1.5") == 1.5
+        assert parse_reset("6m0s") == 360.0
+        assert parse_reset("20ms") == pytest.approx(0.02)
+        assert parse_reset("2000-01-01T00:00:00Z") == 0.0
+        assert parse_reset("soon") is None
+
+
+class TestRateLimitedProvider:
+    """Test the provider wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self):
+        """Test a 429 found in the exception chain is retried."""
+        inner = FlakyProvider(failures=2)
+        provider = RateLimitedProvider(inner, registry=RateLimiterRegistry())
+
+        response = await provider.complete(MESSAGES)
+
+        assert response.content == "ok"
+        assert inner.calls == 3
+        assert provider.limiter_for(None).stats.rate_limited == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test the error is raised once retries are exhausted."""
+        inner = FlakyProvider(failures=5)
+        provider = RateLimitedProvider(
+            inner, max_retries=1, registry=RateLimiterRegistry()
+        )
+
+        with pytest.raises(ProviderError):
+            await provider.complete(MESSAGES)
+        assert inner.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_reconciles_usage(self):
+        """Test the estimate is replaced by the reported token usage."""
+        inner = FlakyProvider(total_tokens=50)
+        provider = RateLimitedProvider(
+            inner, tpm=10_000, registry=RateLimiterRegistry()
+        )
+
+        await provider.complete(MESSAGES, max_tokens=500)
+
+        assert provider.limiter_for(None).tokens.tokens == pytest.approx(
+            10_000 - 50, abs=5
+        )
+
+    @pytest.mark.asyncio
+    async def test_shared_quota(self):
+        """Test wrappers of the same key and model share a limiter."""
+        registry = RateLimiterRegistry()
+        first = RateLimitedProvider(FlakyProvider(), rpm=100, registry=registry)
+        second = RateLimitedProvider(FlakyProvider(), registry=registry)
+
+        assert first.limiter_for(None) is second.limiter_for(None)
+        assert first.limiter_for("other-model") is not first.limiter_for(None)
+
+    @pytest.mark.asyncio
+    async def test_learns_limits_from_successful_responses(self):
+        """Test rate-limit headers of a successful response resize buckets."""
+        inner = HTTPProvider(
+            {
+                "x-ratelimit-limit-requests": "120",
+                "x-ratelimit-limit-tokens": "9000",
+                "content-type": "application/json",
+            }
+        )
+        provider = RateLimitedProvider(inner, registry=RateLimiterRegistry())
+
+        await provider.complete(MESSAGES)
+
+        limiter = provider.limiter_for(None)
+        assert limiter.requests.capacity == 120
+        assert limiter.tokens.capacity == 9000
+        assert limiter.stats.rate_limited == 0
+        await inner.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_first_chunk(self):
+        """Test streams are retried when rate limited up front."""
+        inner = FlakyProvider(failures=1)
+        provider = RateLimitedProvider(inner, registry=RateLimiterRegistry())
+
+        chunks = [chunk async for chunk in provider.stream(MESSAGES)]
+
+        assert "".join(c.content for c in chunks) == "ok"
+        assert inner.calls == 2
+        assert provider.model == "test-model"
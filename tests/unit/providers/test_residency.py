@@ -0,0 +1,223 @@
+"""Unit tests for the Ollama model residency manager."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agenticraft.providers.ollama import OllamaProvider
+from agenticraft.providers.residency import (
+    OllamaResidencyManager,
+    _keep_alive_seconds,
+)
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+class StandInOllama:
+    """In-process Ollama server that tracks loaded models."""
+
+    def __init__(self, load_ms=2000, hold=None):
+        self.load_ms = load_ms
+        self.hold = hold
+        self.loaded: set[str] = set()
+        self.bodies: list[dict] = []
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.peak_models = 0
+
+    def client(self):
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle), base_url="http://ollama.test"
+        )
+
+    def _load(self, model):
+        """Load a model, returning the load time in nanoseconds."""
+        if model in self.loaded:
+            return 100_000  # already resident
+        self.loaded.add(model)
+        return self.load_ms * 1_000_000
+
+    async def handle(self, request):
+        body = json.loads(request.content) if request.content else {}
+        self.bodies.append(body)
+        if request.url.path == "/api/ps":
+            return httpx.Response(
+                200,
+                json={
+                    "models": [
+                        {"name": f"{m}:latest", "expires_at": "2999-01-01T00:00:00Z"}
+                        for m in sorted(self.loaded)
+                    ]
+                },
+            )
+
+        model = body["model"]
+        if body.get("keep_alive") == 0:
+            self.loaded.discard(model)
+            return httpx.Response(200, json={"model": model, "done": True})
+        if request.url.path == "/api/generate":
+            return httpx.Response(
+                200, json={"model": model, "load_duration": self._load(model)}
+            )
+
+        self.active[model] = self.active.get(model, 0) + 1
+        self.peak[model] = max(self.peak.get(model, 0), self.active[model])
+        self.peak_models = max(
+            self.peak_models, sum(1 for n in self.active.values() if n)
+        )
+        try:
+            load_duration = self._load(model)
+            if self.hold is not None:
+                await self.hold.acquire()
+            else:
+                await asyncio.sleep(0.01)
+        finally:
+            self.active[model] -= 1
+        return httpx.Response(
+            200,
+            json={
+                "model": model,
+                "message": {"role": "assistant", "content": f"from {model}"},
+                "load_duration": load_duration,
+                "done": True,
+            },
+        )
+
+
+def manager_for(server, **kwargs):
+    """Create a residency manager backed by a stand-in server."""
+    provider = OllamaProvider(model="llama3")
+    provider._client = server.client()
+    return OllamaResidencyManager(provider, **kwargs)
+
+
+class TestOllamaResidencyManager:
+    """Test preloading, keep_alive and per-model queues."""
+
+    @pytest.mark.asyncio
+    async def test_preload_records_load_time(self):
+        """Test preloading loads every model and records cold starts."""
+        server = StandInOllama(load_ms=1500)
+        manager = manager_for(server, models=["llama3", "mistral"])
+
+        async with manager:
+            pass
+
+        stats = manager.stats()
+        assert server.loaded == {"llama3", "mistral"}
+        assert stats["llama3"].cold_starts == 1
+        assert stats["llama3"].last_load_ms == 1500
+        assert stats["mistral"].warm
+        assert all(body["keep_alive"] == "30m" for body in server.bodies)
+
+    @pytest.mark.asyncio
+    async def test_warm_requests_are_not_cold_starts(self):
+        """Test requests after preloading do not count as cold starts."""
+        server = StandInOllama()
+        manager = manager_for(server, keep_alive="1h")
+
+        await manager.preload()
+        response = await manager.complete(MESSAGES)
+        cold = await manager.complete(MESSAGES, model="ollama/phi3")
+
+        stats = manager.stats()
+        assert response.content == "from llama3"
+        assert cold.content == "from phi3"
+        assert stats["llama3"].requests == 1
+        assert stats["llama3"].cold_starts == 1  # the preload
+        assert stats["llama3"].loads == 2
+        assert stats["llama3"].last_load_ms == 0.1
+        assert stats["llama3"].average_load_ms == pytest.approx((2000 + 0.1) / 2)
+        assert stats["phi3"].cold_starts == 1
+        assert server.bodies[-1]["keep_alive"] == "1h"
+        assert "keep_alive" not in server.bodies[-1]["options"]
+
+    @pytest.mark.asyncio
+    async def test_requests_queue_per_model(self):
+        """Test concurrency per model stays within max_parallel."""
+        server = StandInOllama()
+        manager = manager_for(server, max_parallel=2)
+
+        await asyncio.gather(
+            *(manager.complete(MESSAGES) for _ in range(6)),
+            *(manager.complete(MESSAGES, model="mistral") for _ in range(3)),
+        )
+
+        assert server.peak == {"llama3": 2, "mistral": 2}
+        stats = manager.stats()
+        assert stats["llama3"].requests == 6
+        assert stats["llama3"].active == stats["llama3"].waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_loaded_model_budget(self):
+        """Test other models wait instead of swapping out a busy one."""
+        server = StandInOllama(hold=asyncio.Semaphore(0))
+        manager = manager_for(server, max_parallel=4, max_loaded_models=1)
+
+        llama = [asyncio.create_task(manager.complete(MESSAGES)) for _ in range(2)]
+        mistral = asyncio.create_task(manager.complete(MESSAGES, model="mistral"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert server.active.get("mistral", 0) == 0
+        assert manager.stats()["mistral"].waiting == 1
+
+        for _ in range(3):
+            server.hold.release()
+        await asyncio.gather(*llama, mistral)
+        assert server.peak_models == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_passes_keep_alive(self):
+        """Test streamed requests are queued and carry keep_alive."""
+        server = StandInOllama()
+        manager = manager_for(server, keep_alive=-1)
+
+        async def handle(request):
+            server.bodies.append(json.loads(request.content))
+            lines = [
+                {"message": {"content": "hi"}, "done": False},
+                {"done": True, "load_duration": 900_000_000},
+            ]
+            body = "".join(json.dumps(line) + "\n" for line in lines)
+            return httpx.Response(200, content=body.encode())
+
+        manager.provider._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handle), base_url="http://ollama.test"
+        )
+
+        chunks = [chunk async for chunk in manager.stream(MESSAGES)]
+
+        assert chunks[0].content == "hi"
+        assert server.bodies[-1]["keep_alive"] == -1
+        assert manager.stats()["llama3"].cold_starts == 1
+        assert manager.is_warm("llama3")
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_unload(self):
+        """Test warm tracking follows the server's loaded models."""
+        server = StandInOllama()
+        manager = manager_for(server, models=["llama3", "mistral"])
+        await manager.preload()
+
+        await manager.unload("mistral")
+        assert not manager.is_warm("mistral")
+
+        server.loaded.add("phi3")
+        assert await manager.refresh() == {"llama3:latest", "phi3:latest"}
+        assert manager.is_warm("phi3")
+        assert not manager.is_warm("mistral")
+
+    def test_keep_alive_durations(self):
+        """Test keep_alive values convert to seconds."""
+        assert _keep_alive_seconds("30m") == 1800
+        assert _keep_alive_seconds("1h30m") == 5400
+        assert _keep_alive_seconds(45) == 45
+        assert _keep_alive_seconds(-1) is None
+        assert _keep_alive_seconds("-1m") is None
+        assert _keep_alive_seconds(None) == 300
+        assert _keep_alive_seconds("600") == 600
+        assert _keep_alive_seconds("0") == 0
+        assert _keep_alive_seconds("-1") is None
@@ -0,0 +1,255 @@
+"""Unit tests for the health-aware routing provider."""
+
+import asyncio
+
+import pytest
+
+from agenticraft.core.exceptions import ProviderError
+from agenticraft.core.provider import BaseProvider, ProviderFactory
+from agenticraft.core.streaming import StreamChunk
+from agenticraft.core.types import CompletionResponse
+from agenticraft.providers.router import (
+    CircuitBreaker,
+    RouteBackend,
+    RoutingProvider,
+)
+
+
+class FakeBackend(BaseProvider):
+    """Provider with configurable delay and failures."""
+
+    def __init__(self, name="fake", delay=0.0, fail=False, model="fake-model", **kw):
+        super().__init__(api_key="test")
+        self.name = name
+        self.model = model
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def complete(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} is down")
+        return CompletionResponse(content=self.name, model=self.model)
+
+    async def stream(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} is down")
+        yield StreamChunk(content=self.name)
+        yield StreamChunk(content="", is_final=True)
+
+    def validate_auth(self):
+        pass
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker transitions."""
+
+    def test_opens_after_threshold_and_probes(self):
+        """Test the circuit opens, allows one probe, then closes."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        breaker.recovery_timeout = 0
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_release_frees_the_probe(self):
+        """Test a probe given up without an outcome lets the next one through."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.release()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """Test a failing probe re-opens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        breaker.recovery_timeout = 60
+        assert breaker.state == "open"
+
+
+class TestRoutingProvider:
+    """Test routing and failover."""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_to_next_backend(self):
+        """Test a failing backend is skipped for the next one."""
+        down = FakeBackend("down", fail=True)
+        up = FakeBackend("up")
+        router = RoutingProvider([down, up], strategy="priority")
+
+        response = await router.complete(MESSAGES)
+
+        assert response.content == "up"
+        assert response.metadata["backend"] == "up/fake-model"
+        assert router.health()["down/fake-model"].failures == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_backend(self):
+        """Test an open circuit costs no further calls."""
+        down = FakeBackend("down", fail=True)
+        up = FakeBackend("up")
+        router = RoutingProvider([down, up], strategy="priority", failure_threshold=2)
+
+        for _ in range(5):
+            await router.complete(MESSAGES)
+
+        assert down.calls == 2
+        assert up.calls == 5
+        assert router.health()["down/fake-model"].circuit == "open"
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_reroutes(self):
+        """Test a hanging backend is abandoned at the deadline."""
+        hung = FakeBackend("hung", delay=10)
+        up = FakeBackend("up")
+        router = RoutingProvider([hung, up], strategy="priority", attempt_timeout=0.02)
+
+        start = asyncio.get_running_loop().time()
+        response = await router.complete(MESSAGES)
+
+        assert response.content == "up"
+        assert asyncio.get_running_loop().time() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_health_strategy_prefers_fast_backend(self):
+        """Test traffic moves to the backend with the lowest latency."""
+        slow = FakeBackend("slow", delay=0.03)
+        fast = FakeBackend("fast")
+        router = RoutingProvider([slow, fast], strategy="health")
+
+        for _ in range(4):
+            await router.complete(MESSAGES)
+
+        assert slow.calls == 1
+        assert fast.calls == 3
+        assert router.route()[0].provider is fast
+
+    @pytest.mark.asyncio
+    async def test_weighted_strategy_respects_weights(self):
+        """Test weighted routing sends most traffic to heavier backends."""
+        heavy = FakeBackend("heavy")
+        light = FakeBackend("light")
+        router = RoutingProvider(
+            [RouteBackend(heavy, weight=9), RouteBackend(light, weight=1)],
+            strategy="weighted",
+        )
+
+        for _ in range(200):
+            await router.complete(MESSAGES)
+
+        assert heavy.calls > 150
+
+    @pytest.mark.asyncio
+    async def test_all_backends_failing(self):
+        """Test the error lists every backend's failure."""
+        router = RoutingProvider(
+            [FakeBackend("a", fail=True), FakeBackend("b", fail=True)]
+        )
+
+        with pytest.raises(ProviderError, match="a is down.*b is down"):
+            await router.complete(MESSAGES)
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_before_first_chunk(self):
+        """Test streams fail over and record time to first token."""
+        slow = FakeBackend("slow", delay=10)
+        up = FakeBackend("up")
+        router = RoutingProvider(
+            [slow, up], strategy="priority", first_token_timeout=0.02
+        )
+
+        chunks = [chunk async for chunk in router.stream(MESSAGES)]
+
+        assert chunks[0].content == "up"
+        assert router.health()["up/fake-model"].ttft_ms is not None
+        assert router.health()["slow/fake-model"].failures == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        """Test a cancelled half-open probe does not wedge the circuit."""
+        backend = FakeBackend("slow", delay=10)
+        router = RoutingProvider([backend], failure_threshold=1, recovery_timeout=0)
+        router.backends[0].breaker.record_failure()
+
+        task = asyncio.create_task(router.complete(MESSAGES))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        backend.delay = 0
+        response = await router.complete(MESSAGES)
+        assert response.content == "slow"
+        assert router.health()["slow/fake-model"].circuit == "closed"
+
+    @pytest.mark.asyncio
+    async def test_closed_stream_releases_probe(self):
+        """Test a consumer closing a probing stream releases the probe."""
+        router = RoutingProvider(
+            [FakeBackend("up")], failure_threshold=1, recovery_timeout=0
+        )
+        breaker = router.backends[0].breaker
+        breaker.record_failure()
+
+        stream = router.stream(MESSAGES)
+        await anext(stream)
+        await stream.aclose()
+
+        assert breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_failed_over(self):
+        """Test invalid requests are raised without opening circuits."""
+
+        class BadRequest(ProviderError):
+            status_code = 400
+
+        first = FakeBackend("first")
+        second = FakeBackend("second")
+
+        async def reject(messages, **kwargs):
+            first.calls += 1
+            raise BadRequest("invalid schema")
+
+        first.complete = reject
+        router = RoutingProvider([first, second], strategy="priority")
+
+        for _ in range(5):
+            with pytest.raises(BadRequest):
+                await router.complete(MESSAGES)
+
+        assert second.calls == 0
+        health = router.health()["first/fake-model"]
+        assert health.failures == 0
+        assert health.circuit == "closed"
+
+    def test_backends_from_factory(self, monkeypatch):
+        """Test (provider, model) pairs are created via ProviderFactory."""
+        monkeypatch.setattr(ProviderFactory, "_providers", {"fake": FakeBackend})
+
+        router = RoutingProvider([("fake", "custom-model")])
+
+        assert isinstance(router.backends[0].provider, FakeBackend)
+        assert router.model == "custom-model"